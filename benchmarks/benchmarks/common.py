@@ -0,0 +1,68 @@
+"""
+Synthetic datasets shared by the benchmarks
+
+All data are generated from a fixed seed, so that the benchmarks do not
+depend on network access or on the datasets shipped with statsmodels.
+"""
+import numpy as np
+import pandas as pd
+
+#: Number of observations for each benchmark size
+SIZES = {'small': 1000, 'medium': 10000, 'large': 100000}
+
+
+def regression_data(nobs, k_exog=10, seed=1234):
+    rs = np.random.RandomState(seed)
+    exog = np.column_stack([np.ones(nobs),
+                            rs.standard_normal((nobs, k_exog - 1))])
+    beta = np.linspace(-1, 1, k_exog) / k_exog
+    linpred = exog.dot(beta)
+    return rs, exog, linpred
+
+
+def linear_data(nobs, k_exog=10, seed=1234):
+    rs, exog, linpred = regression_data(nobs, k_exog, seed)
+    endog = linpred + rs.standard_normal(nobs)
+    return endog, exog
+
+
+def binary_data(nobs, k_exog=10, seed=1234):
+    rs, exog, linpred = regression_data(nobs, k_exog, seed)
+    prob = 1 / (1 + np.exp(-linpred))
+    endog = (rs.uniform(size=nobs) < prob).astype(float)
+    return endog, exog
+
+
+def count_data(nobs, k_exog=10, seed=1234):
+    rs, exog, linpred = regression_data(nobs, k_exog, seed)
+    endog = rs.poisson(np.exp(linpred))
+    return endog, exog
+
+
+def grouped_data(nobs, n_groups, k_exog=5, seed=1234):
+    rs, exog, linpred = regression_data(nobs, k_exog, seed)
+    groups = np.repeat(np.arange(n_groups), int(np.ceil(nobs / n_groups)))
+    groups = groups[:nobs]
+    effects = rs.standard_normal(n_groups)
+    endog = linpred + effects[groups] + rs.standard_normal(nobs)
+    return endog, exog, groups
+
+
+def crossed_data(nobs, levels_a, levels_b, seed=1234):
+    """Two crossed random intercepts, as a DataFrame with a single group"""
+    rs = np.random.RandomState(seed)
+    a = rs.randint(0, levels_a, nobs)
+    b = rs.randint(0, levels_b, nobs)
+    x = rs.standard_normal(nobs)
+    y = (x + rs.standard_normal(levels_a)[a] +
+         0.5 * rs.standard_normal(levels_b)[b] + rs.standard_normal(nobs))
+    return pd.DataFrame({'y': y, 'x': x, 'a': a, 'b': b,
+                         'g': np.ones(nobs)})
+
+
+def seasonal_series(nobs, period=12, seed=1234):
+    rs = np.random.RandomState(seed)
+    t = np.arange(nobs)
+    season = np.sin(2 * np.pi * t / period)
+    noise = rs.standard_normal(nobs + 1)
+    return np.cumsum(noise[1:] + 0.4 * noise[:-1]) * 0.1 + season + 10
@@ -0,0 +1,20 @@
+"""
+Benchmarks for discrete choice models
+"""
+import statsmodels.api as sm
+
+from .common import SIZES, binary_data
+
+
+class LogitFit:
+    params = [list(SIZES)]
+    param_names = ['size']
+
+    def setup(self, size):
+        self.endog, self.exog = binary_data(SIZES[size])
+
+    def time_fit(self, size):
+        sm.Logit(self.endog, self.exog).fit(disp=False)
+
+    def peakmem_fit(self, size):
+        sm.Logit(self.endog, self.exog).fit(disp=False)
@@ -0,0 +1,26 @@
+"""
+Benchmarks for generalized linear models
+"""
+import statsmodels.api as sm
+
+from .common import SIZES, count_data
+
+
+class GLMFit:
+    params = [list(SIZES), ['poisson', 'gamma']]
+    param_names = ['size', 'family']
+
+    def setup(self, size, family):
+        endog, exog = count_data(SIZES[size])
+        if family == 'poisson':
+            self.family = sm.families.Poisson()
+        else:
+            endog = endog + 1.
+            self.family = sm.families.Gamma(sm.families.links.log())
+        self.endog, self.exog = endog, exog
+
+    def time_fit(self, size, family):
+        sm.GLM(self.endog, self.exog, family=self.family).fit()
+
+    def peakmem_fit(self, size, family):
+        sm.GLM(self.endog, self.exog, family=self.family).fit()
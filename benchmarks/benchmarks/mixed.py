@@ -0,0 +1,56 @@
+"""
+Benchmarks for linear mixed effects models
+"""
+import warnings
+
+import statsmodels.api as sm
+
+from .common import crossed_data, grouped_data
+
+SIZES = {'small': 500, 'medium': 5000, 'large': 20000}
+
+
+class MixedLMFit:
+    params = [list(SIZES)]
+    param_names = ['size']
+    timeout = 300
+
+    def setup(self, size):
+        nobs = SIZES[size]
+        self.endog, self.exog, self.groups = grouped_data(
+            nobs, n_groups=nobs // 10)
+
+    def _fit(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            sm.MixedLM(self.endog, self.exog, groups=self.groups).fit()
+
+    def time_fit(self, size):
+        self._fit()
+
+    def peakmem_fit(self, size):
+        self._fit()
+
+
+class MixedLMSparseCrossed:
+    # a factor with `levels` levels crossed with one with 100 levels, as
+    # variance components of a single group
+    params = [[10**4, 10**5]]
+    param_names = ['levels']
+    timeout = 1800
+
+    def setup(self, levels):
+        self.data = crossed_data(3 * levels, levels, 100)
+
+    def _fit(self):
+        vcf = {'a': '0 + C(a)', 'b': '0 + C(b)'}
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            sm.MixedLM.from_formula('y ~ x', groups='g', vc_formula=vcf,
+                                    use_sparse=True, data=self.data).fit()
+
+    def time_fit(self, levels):
+        self._fit()
+
+    def peakmem_fit(self, levels):
+        self._fit()
@@ -0,0 +1,42 @@
+"""
+Benchmarks for nonparametric smoothing and density estimation
+"""
+import numpy as np
+
+from statsmodels.nonparametric.kde import KDEUnivariate
+from statsmodels.nonparametric.smoothers_lowess import lowess
+
+from .common import SIZES
+
+
+class Lowess:
+    params = [list(SIZES)]
+    param_names = ['size']
+    timeout = 300
+
+    def setup(self, size):
+        nobs = SIZES[size]
+        rs = np.random.RandomState(1234)
+        self.exog = np.sort(rs.uniform(0, 10, nobs))
+        self.endog = np.sin(self.exog) + rs.standard_normal(nobs) * 0.5
+
+    def time_lowess(self, size):
+        lowess(self.endog, self.exog, frac=0.1, it=3)
+
+    def peakmem_lowess(self, size):
+        lowess(self.endog, self.exog, frac=0.1, it=3)
+
+
+class KDEUnivariateFit:
+    params = [list(SIZES), [True, False]]
+    param_names = ['size', 'fft']
+
+    def setup(self, size, fft):
+        rs = np.random.RandomState(1234)
+        self.data = rs.standard_normal(SIZES[size])
+
+    def time_fit(self, size, fft):
+        KDEUnivariate(self.data).fit(fft=fft)
+
+    def peakmem_fit(self, size, fft):
+        KDEUnivariate(self.data).fit(fft=fft)
@@ -0,0 +1,58 @@
+"""
+Benchmarks for linear regression and its diagnostics
+"""
+import statsmodels.api as sm
+from statsmodels.stats.diagnostic import het_white
+from statsmodels.stats.sandwich_covariance import cov_cluster
+
+from .common import SIZES, grouped_data, linear_data
+
+
+class OLSFit:
+    params = [list(SIZES)]
+    param_names = ['size']
+
+    def setup(self, size):
+        self.endog, self.exog = linear_data(SIZES[size])
+
+    def time_fit(self, size):
+        sm.OLS(self.endog, self.exog).fit()
+
+    def time_fit_qr(self, size):
+        sm.OLS(self.endog, self.exog).fit(method='qr')
+
+    def peakmem_fit(self, size):
+        sm.OLS(self.endog, self.exog).fit()
+
+
+class HetWhite:
+    params = [list(SIZES)]
+    param_names = ['size']
+
+    def setup(self, size):
+        endog, exog = linear_data(SIZES[size], k_exog=5)
+        self.resid = sm.OLS(endog, exog).fit().resid
+        self.exog = exog
+
+    def time_het_white(self, size):
+        het_white(self.resid, self.exog)
+
+    def peakmem_het_white(self, size):
+        het_white(self.resid, self.exog)
+
+
+class CovCluster:
+    params = [list(SIZES)]
+    param_names = ['size']
+
+    def setup(self, size):
+        nobs = SIZES[size]
+        endog, exog, groups = grouped_data(nobs, n_groups=nobs // 20)
+        self.results = sm.OLS(endog, exog).fit()
+        self.groups = groups
+
+    def time_cov_cluster(self, size):
+        cov_cluster(self.results, self.groups)
+
+    def peakmem_cov_cluster(self, size):
+        cov_cluster(self.results, self.groups)
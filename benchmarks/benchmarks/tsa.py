@@ -0,0 +1,74 @@
+"""
+Benchmarks for time series models and tools
+"""
+import warnings
+
+import numpy as np
+
+from statsmodels.tsa.seasonal import STL
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+from statsmodels.tsa.stattools import acf
+
+from .common import SIZES, seasonal_series
+
+SARIMAX_SIZES = {'small': 100, 'medium': 500, 'large': 2000}
+
+
+class SARIMAXBench:
+    params = [list(SARIMAX_SIZES)]
+    param_names = ['size']
+    timeout = 300
+
+    def setup(self, size):
+        endog = seasonal_series(SARIMAX_SIZES[size])
+        self.mod = SARIMAX(endog, order=(1, 1, 1),
+                           seasonal_order=(0, 1, 1, 12))
+        self.model_params = np.r_[0.2, 0.3, 0.4, 1.]
+
+    def time_fit(self, size):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            self.mod.fit(disp=False)
+
+    def time_filter(self, size):
+        self.mod.filter(self.model_params)
+
+    def time_smooth(self, size):
+        self.mod.smooth(self.model_params)
+
+    def peakmem_fit(self, size):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            self.mod.fit(disp=False)
+
+    def peakmem_smooth(self, size):
+        self.mod.smooth(self.model_params)
+
+
+class STLFit:
+    params = [list(SIZES), [False, True]]
+    param_names = ['size', 'robust']
+
+    def setup(self, size, robust):
+        self.endog = seasonal_series(SIZES[size])
+
+    def time_fit(self, size, robust):
+        STL(self.endog, period=12, robust=robust).fit()
+
+    def peakmem_fit(self, size, robust):
+        STL(self.endog, period=12, robust=robust).fit()
+
+
+class ACF:
+    params = [list(SIZES) + ['xlarge']]
+    param_names = ['size']
+
+    def setup(self, size):
+        nobs = SIZES.get(size, 1000000)
+        self.endog = seasonal_series(nobs)
+
+    def time_acf_fft(self, size):
+        acf(self.endog, nlags=40, fft=True)
+
+    def peakmem_acf_fft(self, size):
+        acf(self.endog, nlags=40, fft=True)
@@ -151,6 +151,8 @@ exts = dict(
     _hamilton_filter={'source': 'statsmodels/tsa/regime_switching/_hamilton_filter.pyx.in'},  # noqa: E501
     _kim_smoother={'source': 'statsmodels/tsa/regime_switching/_kim_smoother.pyx.in'},  # noqa: E501
     _arma_innovations={'source': 'statsmodels/tsa/innovations/_arma_innovations.pyx.in'},  # noqa: E501
+    _glm_kernels={'source': 'statsmodels/genmod/_glm_kernels.pyx'},
+    _sparse_cholesky={'source': 'statsmodels/regression/_sparse_cholesky.pyx'},  # noqa: E501
     linbin={'source': 'statsmodels/nonparametric/linbin.pyx'},
     _smoothers_lowess={'source': 'statsmodels/nonparametric/_smoothers_lowess.pyx'},  # noqa: E501
     kalman_loglike={'source': 'statsmodels/tsa/kalmanf/kalman_loglike.pyx',
@@ -173,6 +175,8 @@ statespace_exts = [
     'statsmodels/tsa/statespace/_smoothers/_univariate_diffuse.pyx.in',
     'statsmodels/tsa/statespace/_simulation_smoother.pyx.in',
     'statsmodels/tsa/statespace/_tools.pyx.in',
+    'statsmodels/tsa/statespace/_batch_filter.pyx',
+    'statsmodels/tsa/statespace/_kalman_score.pyx',
 ]
 
 
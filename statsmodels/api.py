@@ -11,9 +11,10 @@ from .regression.linear_model import OLS, GLS, WLS, GLSAR
 from .regression.recursive_ls import RecursiveLS
 from .regression.quantile_regression import QuantReg
 from .regression.mixed_linear_model import MixedLM
+from .regression.absorbing import AbsorbingLS
 from .genmod import api as genmod
 from .genmod.api import (GLM, GEE, OrdinalGEE, NominalGEE, families,
-                         cov_struct,
+                         cov_struct, AbsorbingPoisson,
                          BinomialBayesMixedGLM, PoissonBayesMixedGLM)
 from . import robust
 from .robust.robust_linear_model import RLM
@@ -8,6 +8,7 @@ from functools import reduce
 
 import numpy as np
 from pandas import DataFrame, Series, isnull, MultiIndex
+from scipy import sparse
 
 import statsmodels.tools.data as data_util
 from statsmodels.tools.decorators import cache_readonly, cache_writable
@@ -24,6 +25,13 @@ def _asarray_2d_null_rows(x):
     Makes sure input is an array and is 2d. Makes sure output is 2d. True
     indicates a null in the rows of 2d x.
     """
+    if sparse.issparse(x):
+        # only the stored values can be nan
+        x = x.tocsr()
+        rows = np.repeat(np.arange(x.shape[0]), np.diff(x.indptr))
+        null_rows = np.zeros(x.shape[0], dtype=bool)
+        null_rows[rows[isnull(x.data)]] = True
+        return null_rows[:, None]
     #Have to have the asarrays because isnull does not account for array_like
     #input
     x = np.asarray(x)
@@ -128,15 +136,23 @@ class ModelData(object):
         else:
             # detect where the constant is
             check_implicit = False
-            exog_max = np.max(self.exog, axis=0)
-            if not np.isfinite(exog_max).all():
-                raise MissingDataError('exog contains inf or nans')
-            exog_min = np.min(self.exog, axis=0)
+            if sparse.issparse(self.exog):
+                exog_max = self.exog.max(axis=0).toarray().ravel()
+                if not np.isfinite(self.exog.data).all():
+                    raise MissingDataError('exog contains inf or nans')
+                exog_min = self.exog.min(axis=0).toarray().ravel()
+            else:
+                exog_max = np.max(self.exog, axis=0)
+                if not np.isfinite(exog_max).all():
+                    raise MissingDataError('exog contains inf or nans')
+                exog_min = np.min(self.exog, axis=0)
             const_idx = np.where(exog_max == exog_min)[0].squeeze()
             self.k_constant = const_idx.size
 
+            # the value of a constant column is its max, this avoids
+            # slicing the columns of a sparse exog
             if self.k_constant == 1:
-                if self.exog[:, const_idx].mean() != 0:
+                if exog_max[const_idx] != 0:
                     self.const_idx = int(const_idx)
                 else:
                     # we only have a zero column and no other constant
@@ -146,7 +162,7 @@ class ModelData(object):
                 # look for ones
                 values = []  # keep values if we need != 0
                 for idx in const_idx:
-                    value = self.exog[:, idx].mean()
+                    value = exog_max[idx]
                     if value == 1:
                         self.k_constant = 1
                         self.const_idx = int(idx)
@@ -168,7 +184,16 @@ class ModelData(object):
                 # should not be here
                 pass
 
-            if check_implicit and not hasconst:
+            if check_implicit and not hasconst and sparse.issparse(self.exog):
+                # look for implicit constant, e.g. a full set of dummies,
+                # by checking whether a column of ones is in the column span
+                from scipy.sparse.linalg import lsqr
+                ones = np.ones(self.exog.shape[0])
+                resid_norm = lsqr(self.exog, ones, atol=1e-10,
+                                  btol=1e-10)[3]
+                self.k_constant = int(resid_norm < 1e-6 * np.sqrt(len(ones)))
+                self.const_idx = None
+            elif check_implicit and not hasconst:
                 # look for implicit constant
                 # Compute rank of augmented matrix
                 augmented_exog = np.column_stack(
@@ -425,13 +450,15 @@ class ModelData(object):
         return endog.squeeze()
 
     def _get_xarr(self, exog):
+        if sparse.issparse(exog):
+            return exog
         if data_util._is_structured_ndarray(exog):
             exog = data_util.struct_to_ndarray(exog)
         return np.asarray(exog)
 
     def _check_integrity(self):
         if self.exog is not None:
-            if len(self.exog) != len(self.endog):
+            if self.exog.shape[0] != len(self.endog):
                 raise ValueError("endog and exog matrices are different sizes")
 
     def wrap_output(self, obj, how='columns', names=None):
@@ -619,7 +646,11 @@ def _make_endog_names(endog):
 
 
 def _make_exog_names(exog):
-    exog_var = exog.var(0)
+    if sparse.issparse(exog):
+        # the range is zero exactly where the variance is
+        exog_var = (exog.max(0) - exog.min(0)).toarray().ravel()
+    else:
+        exog_var = exog.var(0)
     if (exog_var == 0).any():
         # assumes one constant in first or last position
         # avoid exception if more than one constant
@@ -647,6 +678,9 @@ def handle_data_class_factory(endog, exog):
     """
     if data_util._is_using_ndarray_type(endog, exog):
         klass = ModelData
+    elif sparse.issparse(exog):
+        # no metadata to attach for a sparse design
+        klass = ModelData
     elif data_util._is_using_pandas(endog, exog):
         klass = PandasData
     elif data_util._is_using_patsy(endog, exog):
@@ -666,6 +700,9 @@ def handle_data(endog, exog, missing='none', hasconst=None, **kwargs):
         endog = np.asarray(endog)
     if isinstance(exog, (list, tuple)):
         exog = np.asarray(exog)
+    # keep sparse designs sparse, row and column slicing need csr or csc
+    if sparse.issparse(exog) and exog.format not in ('csr', 'csc'):
+        exog = exog.tocsr()
 
     klass = handle_data_class_factory(endog, exog)
     return klass(endog, exog=exog, missing=missing, hasconst=hasconst,
@@ -1,3 +1,8 @@
+from collections import namedtuple
+import itertools
+import os
+import time
+
 from statsmodels.base.elastic_net import RegularizedResults
 from statsmodels.stats.regularized_covariance import _calc_nodewise_row, \
     _calc_nodewise_weight, _calc_approx_inv_cov
@@ -5,6 +10,11 @@ from statsmodels.base.model import LikelihoodModelResults
 from statsmodels.regression.linear_model import OLS
 import numpy as np
 
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
 """
 Distributed estimation routines. Currently, we support several
 methods of distribution
@@ -19,6 +29,9 @@ methods of distribution
           - dask.distributed
           - yarn
           - ipyparallel
+    - with a concurrent.futures process pool, no extra dependencies
+        The partition arrays are placed in shared memory (Python 3.8+)
+        so that only their location is sent to the worker processes.
 
 The framework is very general and allows for a variety of
 estimation methods.  Currently, these include
@@ -362,6 +375,130 @@ def _helper_fit_partition(self, pnum, endog, exog, fit_kwds,
     return results
 
 
+# location of an array in a shared memory block
+_SharedArray = namedtuple("_SharedArray", ["offset", "shape", "dtype"])
+
+# shared memory blocks of the partitions of a worker process, the results
+# may reference the data until they are sent to the parent process
+_open_blocks = []
+
+
+def _close_open_blocks():
+    """closes the blocks of earlier partitions of this worker process
+
+    The results of the earlier partitions have been sent to the parent
+    process at this point.  Views of the blocks can only be held by
+    unreachable reference cycles, which do not read the data, so that the
+    blocks can be unmapped without collecting the cycles first.
+    """
+
+    for shm in list(_open_blocks):
+        try:
+            shm.close()
+        except BufferError:
+            continue
+        _open_blocks.remove(shm)
+
+
+def _share_partition(data):
+    """copies the arrays of a partition into a shared memory block
+
+    Parameters
+    ----------
+    data : tuple
+        endog, exog and the partition specific init_kwds.
+
+    Returns
+    -------
+    shm : SharedMemory or None
+        The shared memory block, None if shared memory is not available
+        or the partition does not contain arrays.
+    data : tuple
+        endog, exog and init_kwds where the arrays are replaced by their
+        location in `shm`.
+    """
+
+    endog, exog, init_kwds_e = data
+    items = [endog, exog] + list(init_kwds_e.values())
+    shared = [isinstance(x, np.ndarray) and not x.dtype.hasobject
+              for x in items]
+    if shared_memory is None or not any(shared):
+        return None, data
+
+    # 64 byte aligned offsets
+    offsets = []
+    size = 0
+    for x, is_shared in zip(items, shared):
+        offsets.append(size)
+        if is_shared:
+            size += -(-x.nbytes // 64) * 64
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+
+    for i, (x, is_shared) in enumerate(zip(items, shared)):
+        if is_shared:
+            view = np.ndarray(x.shape, dtype=x.dtype, buffer=shm.buf,
+                              offset=offsets[i])
+            view[...] = x
+            del view
+            items[i] = _SharedArray(offsets[i], x.shape, x.dtype.str)
+
+    init_kwds_e = dict(zip(init_kwds_e.keys(), items[2:]))
+    return shm, (items[0], items[1], init_kwds_e)
+
+
+def _helper_fit_partition_shared(self, pnum, name, data, fit_kwds):
+    """handles the model fitting for each worker process of
+    fit_processes.
+
+    Parameters
+    ----------
+    self : DistributedModel class instance
+        An instance of DistributedModel.
+    pnum : scalar
+        index of current partition.
+    name : str or None
+        name of the shared memory block that contains the partition.
+    data : tuple
+        endog, exog and the partition specific init_kwds as returned by
+        _share_partition.
+    fit_kwds : dict-like
+        Keywords needed for the model fitting.
+
+    Returns
+    -------
+    pnum : scalar
+        index of current partition.
+    results : estimation_method result.
+    elapsed : float
+        The time used by the worker process in seconds.
+    """
+
+    t0 = time.perf_counter()
+    _close_open_blocks()
+    shm = None
+    if name is not None:
+        shm = shared_memory.SharedMemory(name=name)
+
+    def view(x):
+        if isinstance(x, _SharedArray):
+            return np.ndarray(x.shape, dtype=x.dtype, buffer=shm.buf,
+                              offset=x.offset)
+        return x
+
+    endog, exog, init_kwds_e = data
+    endog, exog = view(endog), view(exog)
+    init_kwds_e = dict((key, view(val)) for key, val in init_kwds_e.items())
+    results = _helper_fit_partition(self, pnum, endog, exog, fit_kwds,
+                                    init_kwds_e)
+    del endog, exog, init_kwds_e
+
+    # closed by the next partition of this worker or at its exit
+    if shm is not None:
+        _open_blocks.append(shm)
+
+    return pnum, results, time.perf_counter() - t0
+
+
 class DistributedModel(object):
     __doc__ = """
     Distributed model class
@@ -418,6 +555,11 @@ class DistributedModel(object):
         See Parameters.
     results_kwds : dict-like
         See Parameters.
+    fit_history : dict
+        Available after fitting with ``parallel_method="processes"``.
+        Contains ``partition_time``, the time in seconds used by the
+        worker process for each partition, and ``completion_order``,
+        the partition indices in the order in which they finished.
 
     Notes
     -----
@@ -474,7 +616,8 @@ class DistributedModel(object):
             self.results_kwds = results_kwds
 
     def fit(self, data_generator, fit_kwds=None, parallel_method="sequential",
-            parallel_backend=None, init_kwds_generator=None):
+            parallel_backend=None, init_kwds_generator=None,
+            max_workers=None):
         """Performs the distributed estimation using the corresponding
         DistributedModel
 
@@ -488,7 +631,8 @@ class DistributedModel(object):
             Keywords needed for the model fitting.
         parallel_method : str
             type of distributed estimation to be used, currently
-            "sequential", "joblib" and "dask" are supported.
+            "sequential", "joblib" and "processes" are supported.
+            "dask" and other clusters are supported through joblib.
         parallel_backend : None or joblib parallel_backend object
             used to allow support for more complicated backends,
             ex: dask.distributed
@@ -496,6 +640,9 @@ class DistributedModel(object):
             Additional keyword generator that produces model init_kwds
             that may vary based on data partition.  The current usecase
             is for WLS and GLS
+        max_workers : int or None
+            The number of worker processes if `parallel_method` is
+            "processes".  If None, the number of processors is used.
 
         Returns
         -------
@@ -515,6 +662,10 @@ class DistributedModel(object):
                                         parallel_backend,
                                         init_kwds_generator)
 
+        elif parallel_method == "processes":
+            results_l = self.fit_processes(data_generator, fit_kwds,
+                                           init_kwds_generator, max_workers)
+
         else:
             raise ValueError("parallel_method: %s is currently not supported"
                              % parallel_method)
@@ -633,6 +784,104 @@ class DistributedModel(object):
 
         return results_l
 
+    def fit_processes(self, data_generator, fit_kwds,
+                      init_kwds_generator=None, max_workers=None):
+        """Performs the distributed estimation in parallel using a
+        concurrent.futures process pool
+
+        Parameters
+        ----------
+        data_generator : generator
+            A generator that produces a sequence of tuples where the first
+            element in the tuple corresponds to an endog array and the
+            element corresponds to an exog array.
+        fit_kwds : dict-like
+            Keywords needed for the model fitting.
+        init_kwds_generator : generator or None
+            Additional keyword generator that produces model init_kwds
+            that may vary based on data partition.  The current usecase
+            is for WLS and GLS
+        max_workers : int or None
+            The number of worker processes.  If None, the number of
+            processors is used.
+
+        Returns
+        -------
+        join_method result.  For the default, _join_debiased, it returns a
+        p length array.
+
+        Notes
+        -----
+        Partitions are read from `data_generator` as the workers become
+        available, at most twice as many partitions as there are worker
+        processes are submitted but not finished at any time.  On Python
+        3.8 and later the arrays of a submitted partition are copied into a
+        shared memory block and the worker processes create views of the
+        block, so the data is not pickled and at most that many partitions
+        are held in shared memory.  The block is unlinked as soon as the
+        partition is finished, a worker process keeps it mapped until it
+        starts its next partition.  Results are collected as the partitions
+        finish, the time used for each partition is stored in
+        ``fit_history``.
+        """
+
+        from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                        wait)
+
+        if init_kwds_generator is None:
+            init_kwds_generator = itertools.repeat({})
+        n_workers = max_workers
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
+        # one partition running and one waiting for each worker
+        max_pending = 2 * n_workers
+
+        blocks = {}
+        pending = set()
+        results_d = {}
+        times_d = {}
+        order = []
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                tup_gen = enumerate(zip(data_generator, init_kwds_generator))
+                while True:
+                    for pnum, ((endog, exog), init_kwds_e) in itertools.islice(
+                            tup_gen, max_pending - len(pending)):
+                        shm, data = _share_partition((endog, exog,
+                                                      init_kwds_e))
+                        name = None if shm is None else shm.name
+                        future = executor.submit(_helper_fit_partition_shared,
+                                                 self, pnum, name, data,
+                                                 fit_kwds)
+                        blocks[future] = shm
+                        pending.add(future)
+                    if not pending:
+                        break
+
+                    done, pending = wait(pending,
+                                         return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pnum, results, elapsed = future.result()
+                        results_d[pnum] = results
+                        times_d[pnum] = elapsed
+                        order.append(pnum)
+                        shm = blocks.pop(future)
+                        if shm is not None:
+                            shm.close()
+                            shm.unlink()
+        finally:
+            for shm in blocks.values():
+                if shm is not None:
+                    shm.close()
+                    shm.unlink()
+
+        n_part = len(order)
+        self.fit_history = {
+            "partition_time": np.array([times_d[i] for i in range(n_part)]),
+            "completion_order": order}
+
+        return [results_d[i] for i in range(n_part)]
+
 
 class DistributedResults(LikelihoodModelResults):
     """
@@ -1,4 +1,5 @@
 import numpy as np
+from scipy import sparse
 from statsmodels.base.model import Results
 import statsmodels.base.wrapper as wrap
 from statsmodels.tools.decorators import cache_readonly
@@ -165,6 +166,11 @@ def fit_elasticnet(model, method="coord_descent", maxiter=100,
         _gen_npfuncs(k, L1_wt, alpha, loglike_kwds, score_kwds, hess_kwds)
         for k in range(k_exog)]
 
+    exog = model.exog
+    if sparse.issparse(exog):
+        # column access for the one-variable models
+        exog = exog.tocsc()
+
     for itr in range(maxiter):
 
         # Sweep through the parameters
@@ -182,13 +188,16 @@ def fit_elasticnet(model, method="coord_descent", maxiter=100,
             # optimization.
             params0 = params.copy()
             params0[k] = 0
-            offset = np.dot(model.exog, params0)
+            offset = exog.dot(params0)
             if model_offset is not None:
                 offset += model_offset
 
             # Create a one-variable model for optimization.
+            exog_k = exog[:, k]
+            if sparse.issparse(exog_k):
+                exog_k = exog_k.toarray()
             model_1var = model.__class__(
-                model.endog, model.exog[:, k], offset=offset, **init_args)
+                model.endog, exog_k, offset=offset, **init_args)
 
             # Do the one-dimensional optimization.
             func, grad, hess = fgh_list[k]
@@ -264,6 +273,245 @@ def fit_elasticnet(model, method="coord_descent", maxiter=100,
     return refit
 
 
+def fit_elasticnet_path(model, alphas=None, L1_wt=1., n_alphas=50,
+                        alpha_min_ratio=1e-3, penalty_weights=None,
+                        screening=True, cv=None, n_jobs=1,
+                        deviance_func=None, maxiter=100, cnvrg_tol=1e-7,
+                        zero_tol=1e-8, check_step=True, loglike_kwds=None,
+                        score_kwds=None, hess_kwds=None):
+    """
+    Return the elastic net regularization path of a regression model.
+
+    Parameters
+    ----------
+    model : model object
+        A statsmodels object implementing ``loglike``, ``score``, and
+        ``hessian``.
+    alphas : array_like, optional
+        The penalty weights at which the path is computed.  The path is
+        always computed from the largest to the smallest value.  If not
+        provided, `n_alphas` values are placed on a log scale between
+        the smallest penalty weight for which all penalized
+        coefficients are zero and `alpha_min_ratio` times that value.
+    L1_wt : scalar
+        The fraction of the penalty given to the L1 penalty term.
+        Must be between 0 and 1 (inclusive).  `alphas` is required if
+        `L1_wt` is zero.
+    n_alphas : int
+        The number of penalty weights if `alphas` is not provided.
+    alpha_min_ratio : float
+        The ratio of the smallest to the largest penalty weight if
+        `alphas` is not provided.
+    penalty_weights : array_like, optional
+        Relative penalty weight of each coefficient.  The penalty of
+        coefficient j is ``alpha * penalty_weights[j]``.  Coefficients
+        with weight zero, e.g. the constant, are not penalized.
+    screening : bool
+        If True, use the sequential strong rule to discard variables
+        before fitting at each penalty weight.  Discarded variables
+        that violate the optimality conditions of the full problem are
+        added back and the fit is repeated, so screening does not
+        change the solution.
+    cv : int or cross-validation iterator, optional
+        If provided, the path is also computed on the training sets of
+        a cross-validation split and the deviance is evaluated on the
+        test sets.  An integer is the number of folds of a
+        ``KFold`` split without shuffling.  Otherwise `cv` needs a
+        ``split`` method that yields boolean train and test masks.
+    n_jobs : int
+        The number of jobs used to fit the cross-validation folds in
+        parallel.  Requires joblib.
+    deviance_func : callable, optional
+        Function with signature ``deviance_func(model, params)`` that
+        returns the deviance.  The default is ``-2 * loglike``.
+    maxiter, cnvrg_tol, zero_tol, check_step, loglike_kwds, score_kwds,
+    hess_kwds
+        Options passed to ``fit_elasticnet`` at each penalty weight.
+
+    Returns
+    -------
+    RegularizedPathResults
+        The coefficient path and summary statistics along the path.
+
+    Notes
+    -----
+    Each fit along the path is started at the solution of the previous
+    penalty weight.  With screening, variables are fit only if they
+    are nonzero at the previous solution or if the score of the
+    penalized log-likelihood at the previous solution is at least
+    ``L1_wt * (2 * alpha - alpha_prev)`` in absolute value (Tibshirani
+    et al., 2012).  Screening is not used for ridge fits (``L1_wt=0``).
+
+    References
+    ----------
+    Friedman, J., Hastie, T. and Tibshirani, R. (2010). Regularization
+    paths for generalized linear models via coordinate descent.
+    Journal of Statistical Software 33(1).
+
+    Tibshirani, R., Bien, J., Friedman, J., Hastie, T., Simon, N.,
+    Taylor, J. and Tibshirani, R. J. (2012). Strong rules for
+    discarding predictors in lasso-type problems. Journal of the Royal
+    Statistical Society: Series B 74(2), 245-266.
+    """
+
+    k_exog = model.exog.shape[1]
+    nobs = model.nobs
+
+    loglike_kwds = {} if loglike_kwds is None else loglike_kwds
+    score_kwds = {} if score_kwds is None else score_kwds
+    hess_kwds = {} if hess_kwds is None else hess_kwds
+    fit_kwds = {"maxiter": maxiter, "cnvrg_tol": cnvrg_tol,
+                "zero_tol": zero_tol, "check_step": check_step,
+                "loglike_kwds": loglike_kwds, "score_kwds": score_kwds,
+                "hess_kwds": hess_kwds}
+
+    if not 0 <= L1_wt <= 1:
+        raise ValueError("L1_wt must be between 0 and 1")
+    if penalty_weights is None:
+        penalty_weights = np.ones(k_exog)
+    else:
+        penalty_weights = np.asarray(penalty_weights, dtype=np.float64)
+        if penalty_weights.shape != (k_exog,):
+            raise ValueError("penalty_weights must have length %d" % k_exog)
+    penalized = penalty_weights > 0
+    if not penalized.any():
+        raise ValueError("at least one coefficient must be penalized")
+
+    init_args = model._get_init_kwds()
+    init_args['hasconst'] = False
+    exog = model.exog
+    if sparse.issparse(exog):
+        exog = exog.tocsc()
+
+    def fit_active(active, alpha, params):
+        cols = np.flatnonzero(active)
+        if len(cols) == 0:
+            return np.zeros(k_exog)
+        elif len(cols) == k_exog:
+            model_active = model
+        else:
+            model_active = model.__class__(
+                model.endog, exog[:, cols], **init_args)
+        rslt = fit_elasticnet(model_active, L1_wt=L1_wt,
+                              alpha=alpha * penalty_weights[cols],
+                              start_params=params[cols], **fit_kwds)
+        params = np.zeros(k_exog)
+        params[cols] = rslt.params
+        return params
+
+    # The path starts at the fit of the unpenalized coefficients.
+    params = np.zeros(k_exog)
+    unpenalized = np.flatnonzero(~penalized)
+    if len(unpenalized) > 0:
+        model_unpen = model.__class__(
+            model.endog, exog[:, unpenalized], **init_args)
+        params[unpenalized] = model_unpen.fit().params
+    grad = model.score(params, **score_kwds) / nobs
+
+    if alphas is None:
+        if L1_wt == 0:
+            raise ValueError("alphas must be provided if L1_wt is 0")
+        alpha_max = np.max(np.abs(grad[penalized]) /
+                           penalty_weights[penalized]) / L1_wt
+        alphas = alpha_max * np.logspace(0, np.log10(alpha_min_ratio),
+                                         n_alphas)
+    else:
+        alphas = np.sort(np.atleast_1d(np.asarray(alphas,
+                                                  dtype=np.float64)))[::-1]
+
+    screening = screening and L1_wt > 0
+    coefs = np.zeros((len(alphas), k_exog))
+    llf = np.zeros(len(alphas))
+    deviance = np.zeros(len(alphas))
+    n_refits = np.zeros(len(alphas), dtype=int)
+    alpha_prev = alphas[0]
+    for i, alpha in enumerate(alphas):
+        if screening:
+            thresh = L1_wt * penalty_weights * (2 * alpha - alpha_prev)
+            active = (params != 0) | ~penalized | (np.abs(grad) >= thresh)
+        else:
+            active = np.ones(k_exog, dtype=bool)
+
+        while True:
+            params = fit_active(active, alpha, params)
+            grad = model.score(params, **score_kwds) / nobs
+            if active.all():
+                break
+            # Check the optimality conditions for the discarded variables
+            bound = L1_wt * penalty_weights * alpha
+            violators = ~active & (np.abs(grad) > bound * (1 + 1e-4))
+            if not violators.any():
+                break
+            active |= violators
+            n_refits[i] += 1
+
+        coefs[i] = params
+        llf[i] = model.loglike(params, **loglike_kwds)
+        if deviance_func is None:
+            deviance[i] = -2 * llf[i]
+        else:
+            deviance[i] = deviance_func(model, params)
+        alpha_prev = alpha
+
+    cv_deviance = None
+    if cv is not None:
+        if np.isscalar(cv):
+            from statsmodels.gam.gam_cross_validation.cross_validators import (
+                KFold)
+            cv = KFold(cv)
+        path_kwds = {"L1_wt": L1_wt, "penalty_weights": penalty_weights,
+                     "screening": screening, "deviance_func": deviance_func}
+        path_kwds.update(fit_kwds)
+        if n_jobs == 1:
+            parallel, p_func = list, _fit_path_fold
+        else:
+            from statsmodels.tools.parallel import parallel_func
+            parallel, p_func, n_jobs = parallel_func(_fit_path_fold, n_jobs,
+                                                     verbose=0)
+        cv_deviance = parallel(
+            p_func(model, train, test, alphas, path_kwds)
+            for train, test in cv.split(model.exog))
+        cv_deviance = np.asarray(cv_deviance)
+
+    return RegularizedPathResults(model, alphas, L1_wt, coefs, llf,
+                                  deviance, cv_deviance=cv_deviance,
+                                  n_refits=n_refits)
+
+
+def _subset_model(model, rows):
+    """
+    Create a model of the same class using a subset of the observations.
+
+    Initialization arguments with one value per observation are subset
+    as well.
+    """
+    nobs = model.endog.shape[0]
+    init_args = model._get_init_kwds()
+    for key, val in init_args.items():
+        if isinstance(val, np.ndarray) and val.ndim > 0 and len(val) == nobs:
+            init_args[key] = val[rows]
+    return model.__class__(model.endog[rows], model.exog[rows], **init_args)
+
+
+def _fit_path_fold(model, train, test, alphas, path_kwds):
+    """
+    Fit the regularization path on the training rows and return the
+    mean deviance per observation on the test rows.
+    """
+    model_train = _subset_model(model, train)
+    model_test = _subset_model(model, test)
+    path = fit_elasticnet_path(model_train, alphas=alphas, **path_kwds)
+    deviance_func = path_kwds["deviance_func"]
+    loglike_kwds = path_kwds["loglike_kwds"]
+    deviance = np.zeros(len(alphas))
+    for i, params in enumerate(path.params):
+        if deviance_func is None:
+            deviance[i] = -2 * model_test.loglike(params, **loglike_kwds)
+        else:
+            deviance[i] = deviance_func(model_test, params)
+    return deviance / model_test.endog.shape[0]
+
+
 def _opt_1d(func, grad, hess, model, start, L1_wt, tol,
             check_step=True):
     """
@@ -381,3 +629,124 @@ class RegularizedResultsWrapper(wrap.ResultsWrapper):
     _wrap_attrs = _attrs
 wrap.populate_wrapper(RegularizedResultsWrapper,  # noqa:E305
                       RegularizedResults)
+
+
+class RegularizedPathResults(object):
+    """
+    Results for the elastic net regularization path of a model
+
+    Parameters
+    ----------
+    model : Model
+        The model instance used to compute the path.
+    alphas : ndarray
+        The penalty weights, in decreasing order.
+    L1_wt : float
+        The fraction of the penalty given to the L1 penalty term.
+    params : ndarray
+        The coefficient path with one row per penalty weight.
+    llf : ndarray
+        The log-likelihood at each penalty weight.
+    deviance : ndarray
+        The deviance at each penalty weight.
+    cv_deviance : ndarray, optional
+        The mean test deviance per observation with one row per
+        cross-validation fold and one column per penalty weight.
+    n_refits : ndarray, optional
+        The number of times variables discarded by screening had to be
+        added back at each penalty weight.
+
+    Attributes
+    ----------
+    df : ndarray
+        The number of nonzero coefficients at each penalty weight.
+    cv_mean : ndarray
+        The mean over folds of `cv_deviance`.
+    cv_se : ndarray
+        The standard error of `cv_mean`.
+    alpha_min : float
+        The penalty weight with the smallest `cv_mean`.
+    alpha_1se : float
+        The largest penalty weight with `cv_mean` within one standard
+        error of the smallest `cv_mean`.
+    """
+    def __init__(self, model, alphas, L1_wt, params, llf, deviance,
+                 cv_deviance=None, n_refits=None):
+        self.model = model
+        self.alphas = alphas
+        self.L1_wt = L1_wt
+        self.params = params
+        self.llf = llf
+        self.deviance = deviance
+        self.cv_deviance = cv_deviance
+        self.n_refits = n_refits
+        self._cache = {}
+
+    @cache_readonly
+    def df(self):
+        return np.count_nonzero(self.params, axis=1)
+
+    def _check_cv(self):
+        if self.cv_deviance is None:
+            raise ValueError("the path was computed without cross-validation")
+
+    @cache_readonly
+    def cv_mean(self):
+        self._check_cv()
+        return self.cv_deviance.mean(0)
+
+    @cache_readonly
+    def cv_se(self):
+        self._check_cv()
+        k_folds = self.cv_deviance.shape[0]
+        return self.cv_deviance.std(0, ddof=1) / np.sqrt(k_folds)
+
+    @cache_readonly
+    def alpha_min(self):
+        return self.alphas[np.argmin(self.cv_mean)]
+
+    @cache_readonly
+    def alpha_1se(self):
+        imin = np.argmin(self.cv_mean)
+        within = self.cv_mean <= self.cv_mean[imin] + self.cv_se[imin]
+        return self.alphas[np.flatnonzero(within)[0]]
+
+    def get_params(self, alpha):
+        """
+        Return the coefficients at a penalty weight on the path.
+
+        Parameters
+        ----------
+        alpha : float
+            A penalty weight in `alphas`.
+
+        Returns
+        -------
+        ndarray
+            The coefficients.
+        """
+        idx = np.flatnonzero(np.isclose(self.alphas, alpha, rtol=1e-10,
+                                        atol=0))
+        if len(idx) == 0:
+            raise ValueError("alpha is not on the path")
+        return self.params[idx[0]]
+
+    def summary_frame(self):
+        """
+        Return the path statistics and coefficients as a DataFrame.
+
+        Returns
+        -------
+        DataFrame
+            One row per penalty weight with columns ``alpha``, ``df``,
+            ``deviance``, ``cv_mean`` and ``cv_se`` if cross-validation
+            was used, followed by the coefficients.
+        """
+        import pandas as pd
+        frame = pd.DataFrame({"alpha": self.alphas, "df": self.df,
+                              "deviance": self.deviance})
+        if self.cv_deviance is not None:
+            frame["cv_mean"] = self.cv_mean
+            frame["cv_se"] = self.cv_se
+        params = pd.DataFrame(self.params, columns=self.model.exog_names)
+        return pd.concat([frame, params], axis=1)
@@ -3,14 +3,15 @@ from statsmodels.compat.python import lzip
 from functools import reduce
 
 import numpy as np
-from scipy import stats
+from scipy import sparse, stats
+from scipy.sparse.linalg import LinearOperator
 from statsmodels.base.data import handle_data
 from statsmodels.tools.data import _is_using_pandas
 from statsmodels.tools.tools import recipr, nan_dot
 from statsmodels.stats.contrast import (ContrastResults, WaldTestResults,
                                         t_test_pairwise)
-from statsmodels.tools.decorators import (cache_readonly,
-                                          cached_value, cached_data)
+from statsmodels.tools.decorators import (cache_readonly, cached_value,
+                                          cached_data, cached_obs_data)
 import statsmodels.base.wrapper as wrap
 from statsmodels.tools.numdiff import approx_fprime
 from statsmodels.tools.sm_exceptions import ValueWarning, \
@@ -426,8 +427,8 @@ class LikelihoodModel(Model):
             'ncg'
                 fhess_p : callable f'(x,*args)
                     Function which computes the Hessian of f times an arbitrary
-                    vector, p.  Should only be supplied if
-                    LikelihoodModel.hessian is None.
+                    vector, p.  If supplied, it is used instead of the
+                    Hessian.
                 avextol : float
                     Stop when the average relative error in the minimizer
                     falls below this amount.
@@ -1089,7 +1090,7 @@ class Results(object):
                     exog = exog.reindex(exog_index)
             exog_index = exog.index
 
-        if exog is not None:
+        if exog is not None and not sparse.issparse(exog):
             exog = np.asarray(exog)
             if exog.ndim == 1 and (self.model.exog.ndim == 1 or
                                    self.model.exog.shape[1] == 1):
@@ -1276,6 +1277,10 @@ class LikelihoodModelResults(Results):
     # by default we use normal distribution
     # can be overwritten by instances or subclasses
 
+    # set by fit(..., store="minimal"); per-observation attributes declared
+    # with cached_obs_data are then recomputed on access instead of cached
+    _store_minimal = False
+
     def __init__(self, model, params, normalized_cov_params=None, scale=1.,
                  **kwargs):
         super(LikelihoodModelResults, self).__init__(model, params)
@@ -1350,6 +1355,10 @@ class LikelihoodModelResults(Results):
                 (self.normalized_cov_params is None)):
             bse_ = np.empty(len(self.params))
             bse_[:] = np.nan
+        elif (not hasattr(self, 'cov_params_default') and
+                isinstance(self.normalized_cov_params, LinearOperator)):
+            bse_ = np.sqrt(self.normalized_cov_params.diagonal() *
+                           self.scale)
         else:
             bse_ = np.sqrt(np.diag(self.cov_params()))
         return bse_
@@ -1420,6 +1429,11 @@ class LikelihoodModelResults(Results):
         OR
 
         ``(scale) * (X.T X)^(-1)[column][:,column]`` if column is 1d
+
+        The covariance can be a scipy LinearOperator, for example
+        `normalized_cov_params` with a sparse exog. It is then only applied
+        to `r_matrix`, `other` or `column`, the dense matrix is formed if
+        none of them is specified.
         """
         if (hasattr(self, 'mle_settings') and
                 self.mle_settings['optimizer'] in ['l1', 'l1_cvxopt_cp']):
@@ -1445,8 +1459,16 @@ class LikelihoodModelResults(Results):
                     scale = self.scale
                 cov_p = self.normalized_cov_params * scale
 
+        # a LinearOperator is only applied to the requested columns
+        lazy = isinstance(cov_p, LinearOperator)
         if column is not None:
             column = np.asarray(column)
+            if lazy:
+                idx = column.ravel()
+                unit = np.zeros((cov_p.shape[0], len(idx)))
+                unit[idx, np.arange(len(idx))] = 1
+                cov_p = cov_p.dot(unit)[idx]
+                return cov_p[0, 0] if column.shape == () else cov_p
             if column.shape == ():
                 return cov_p[column, column]
             else:
@@ -1459,8 +1481,12 @@ class LikelihoodModelResults(Results):
                 other = r_matrix
             else:
                 other = np.asarray(other)
+            if lazy:
+                return dot_fun(r_matrix, cov_p.dot(np.transpose(other)))
             tmp = dot_fun(r_matrix, dot_fun(cov_p, np.transpose(other)))
             return tmp
+        elif lazy:
+            return cov_p.dot(np.eye(cov_p.shape[0]))
         else:  # if r_matrix is None and column is None:
             return cov_p
 
@@ -2182,6 +2208,12 @@ class LikelihoodModelResults(Results):
         Not fully tested for time series models, tsa, and might delete too much
         for prediction or not all that would be possible.
 
+        Models that support ``fit(..., store="minimal")`` offer an
+        alternative that keeps the data: the results do not cache
+        per-observation arrays and recompute them from the model data when
+        they are accessed. For these results, `remove_data` does not
+        evaluate the per-observation attributes before removing the data.
+
         The lists of arrays to delete are maintained as attributes of
         the result and model instance, except for cached values. These
         lists could be changed before calling remove_data.
@@ -2209,9 +2241,16 @@ class LikelihoodModelResults(Results):
             else:
                 cls_attrs[name] = attr
         data_attrs = [x for x in cls_attrs
-                      if isinstance(cls_attrs[x], cached_data)]
+                      if isinstance(cls_attrs[x],
+                                    (cached_data, cached_obs_data))]
         value_attrs = [x for x in cls_attrs
                        if isinstance(cls_attrs[x], cached_value)]
+        if not getattr(self, '_store_minimal', False):
+            # per-observation values are cached as with cache_readonly, they
+            # are evaluated as before; with store="minimal" they would not
+            # be cached anyway
+            value_attrs += [x for x in cls_attrs
+                            if isinstance(cls_attrs[x], cached_obs_data)]
         # make sure the cached for value_attrs are evaluated; this needs to
         # occur _before_ any other attributes are removed.
         for name in value_attrs:
@@ -133,8 +133,8 @@ class Optimizer(object):
             'ncg'
                 fhess_p : callable f'(x,*args)
                     Function which computes the Hessian of f times an arbitrary
-                    vector, p.  Should only be supplied if
-                    LikelihoodModel.hessian is None.
+                    vector, p.  If supplied, it is used instead of the
+                    Hessian.
                 avextol : float
                     Stop when the average relative error in the minimizer
                     falls below this amount.
@@ -520,6 +520,8 @@ def _fit_ncg(f, score, start_params, fargs, kwargs, disp=True,
                  maxiter=100, callback=None, retall=False,
                  full_output=True, hess=None):
     fhess_p = kwargs.setdefault('fhess_p', None)
+    if fhess_p is not None:
+        hess = None
     avextol = kwargs.setdefault('avextol', 1.0000000000000001e-05)
     epsilon = kwargs.setdefault('epsilon', 1.4901161193847656e-08)
     retvals = optimize.fmin_ncg(f, start_params, score, fhess_p=fhess_p,
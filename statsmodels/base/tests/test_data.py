@@ -3,6 +3,7 @@ from numpy.testing import assert_equal, assert_, assert_raises
 import pandas as pd
 import pandas.util.testing as tm
 import pytest
+from scipy import sparse
 
 from statsmodels.base import data as sm_data
 from statsmodels.formula import handle_formula_data
@@ -944,3 +945,41 @@ def test_raise_nonfinite_exog():
     assert_raises(MissingDataError, OLS, y, x)
     x[1, 1] = np.nan
     assert_raises(MissingDataError, OLS, y, x)
+
+
+@pytest.mark.parametrize("fmt", ["csr", "csc", "coo"])
+def test_sparse_exog(fmt):
+    rs = np.random.RandomState(0)
+    groups = rs.randint(0, 4, size=20)
+    dummies = sparse.csr_matrix((np.ones(20), (np.arange(20), groups)),
+                                shape=(20, 4))
+    endog = rs.standard_normal(20)
+
+    # full set of dummies has an implicit constant
+    data = sm_data.handle_data(endog, dummies.asformat(fmt))
+    assert_(sparse.issparse(data.exog))
+    assert_(data.exog.format in ("csr", "csc"))
+    assert_equal(data.k_constant, 1)
+    assert_equal(data.const_idx, None)
+    assert_equal(data.xnames, ["x1", "x2", "x3", "x4"])
+
+    exog = sparse.hstack([np.ones((20, 1)), dummies[:, 1:]], format=fmt)
+    data = sm_data.handle_data(endog, exog)
+    assert_equal(data.k_constant, 1)
+    assert_equal(data.const_idx, 0)
+    assert_equal(data.xnames, ["const", "x1", "x2", "x3"])
+
+    data = sm_data.handle_data(endog, dummies[:, 1:].asformat(fmt))
+    assert_equal(data.k_constant, 0)
+
+
+def test_sparse_exog_missing():
+    exog = sparse.random(20, 3, density=0.5, format="csr", random_state=1)
+    exog.data[0] = np.nan
+    endog = np.arange(20.)
+    endog[5] = np.nan
+    row = np.repeat(np.arange(20), np.diff(exog.indptr))[0]
+    data = sm_data.handle_data(endog, exog, missing="drop")
+    assert_(sparse.issparse(data.exog))
+    assert_equal(data.exog.shape, (18, 3))
+    assert_equal(data.missing_row_idx, sorted([row, 5]))
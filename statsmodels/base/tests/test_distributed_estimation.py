@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 from numpy.testing import assert_equal, assert_, assert_allclose
 from statsmodels.regression.linear_model import OLS
 from statsmodels.genmod.generalized_linear_model import GLM
@@ -7,6 +8,7 @@ from statsmodels.base.distributed_estimation import _calc_grad, \
     _calc_wdesign_mat, _est_regularized_debiased, _join_debiased, \
     _est_regularized_naive, _est_unregularized_naive, _join_naive, \
     DistributedModel
+from statsmodels.base import distributed_estimation
 
 
 def _data_gen(endog, exog, partitions):
@@ -313,6 +315,109 @@ def test_fit_joblib():
                     atol=1e-6, rtol=0)
 
 
+def test_fit_processes():
+
+    # tests that the process pool backend matches the sequential fit,
+    # including partition specific init_kwds
+
+    np.random.seed(435265)
+    X = np.random.normal(size=(50, 3))
+    y = np.random.randint(0, 2, size=50)
+    w = np.random.uniform(0.5, 1.5, size=50)
+
+    for partitions in [1, 3]:
+        mod = DistributedModel(partitions, model_class=OLS)
+        fit = mod.fit(_data_gen(y, X, partitions),
+                      parallel_method="processes", fit_kwds={"alpha": 0.5},
+                      max_workers=2)
+        fit_seq = mod.fit(_data_gen(y, X, partitions),
+                          fit_kwds={"alpha": 0.5})
+        assert_allclose(fit.params, fit_seq.params, atol=1e-12, rtol=0)
+
+    assert_equal(mod.fit_history["partition_time"].shape, (3,))
+    assert_(np.all(mod.fit_history["partition_time"] > 0))
+    assert_equal(sorted(mod.fit_history["completion_order"]), [0, 1, 2])
+
+    mod = DistributedModel(3, model_class=GLM,
+                           init_kwds={"family": Binomial()})
+    init_gen = ({"var_weights": w_p} for w_p, _ in _data_gen(w, X, 3))
+    fit = mod.fit(_data_gen(y, X, 3), parallel_method="processes",
+                  fit_kwds={"alpha": 0.5}, init_kwds_generator=init_gen)
+    init_gen = ({"var_weights": w_p} for w_p, _ in _data_gen(w, X, 3))
+    fit_seq = mod.fit(_data_gen(y, X, 3), fit_kwds={"alpha": 0.5},
+                      init_kwds_generator=init_gen)
+    assert_allclose(fit.params, fit_seq.params, atol=1e-12, rtol=0)
+
+
+@pytest.mark.skipif(distributed_estimation.shared_memory is None,
+                    reason="shared memory requires Python 3.8")
+def test_fit_processes_bounded(monkeypatch):
+
+    # partitions are only read from the generator when a worker becomes
+    # available, so that at most two blocks per worker exist at a time
+
+    share_partition = distributed_estimation._share_partition
+    names = []
+    n_open = []
+
+    def counting_share_partition(data):
+        n = 0
+        for name in names:
+            try:
+                shm = distributed_estimation.shared_memory.SharedMemory(
+                    name=name)
+            except FileNotFoundError:
+                continue
+            shm.close()
+            n += 1
+        n_open.append(n)
+        shm, data = share_partition(data)
+        names.append(shm.name)
+        return shm, data
+
+    monkeypatch.setattr(distributed_estimation, "_share_partition",
+                        counting_share_partition)
+    np.random.seed(435265)
+    X = np.random.normal(size=(120, 3))
+    y = np.random.normal(size=120)
+    mod = DistributedModel(6, model_class=OLS)
+    fit = mod.fit(_data_gen(y, X, 6), parallel_method="processes",
+                  fit_kwds={"alpha": 0.5}, max_workers=1)
+    fit_seq = mod.fit(_data_gen(y, X, 6), fit_kwds={"alpha": 0.5})
+    assert_allclose(fit.params, fit_seq.params, atol=1e-12, rtol=0)
+    assert_equal(len(n_open), 6)
+    assert_(max(n_open) <= 1)
+
+
+@pytest.mark.skipif(distributed_estimation.shared_memory is None,
+                    reason="shared memory requires Python 3.8")
+def test_close_open_blocks():
+
+    # the block of a partition stays open while the results can reference
+    # it and is closed by the next partition of the worker
+
+    open_blocks = distributed_estimation._open_blocks
+    np.random.seed(435265)
+    X = np.random.normal(size=(50, 3))
+    y = np.random.normal(size=50)
+    mod = DistributedModel(1, model_class=OLS)
+    shm, data = distributed_estimation._share_partition((y, X, {}))
+    try:
+        distributed_estimation._helper_fit_partition_shared(
+            mod, 0, shm.name, data, {"alpha": 0.5})
+        assert_equal(len(open_blocks), 1)
+        block = open_blocks[0]
+        assert_(block.buf is not None)
+
+        distributed_estimation._close_open_blocks()
+        assert_equal(len(open_blocks), 0)
+        assert_(block.buf is None)
+    finally:
+        del open_blocks[:]
+        shm.close()
+        shm.unlink()
+
+
 def test_single_partition():
 
     # tests that the results make sense if we have a single partition
@@ -222,7 +222,8 @@ class TestRemoveDataPickleGLM(RemoveDataPickle):
         x = self.exog
         np.random.seed(987689)
         y = x.sum(1) + np.random.randn(x.shape[0])
-        self.results = sm.GLM(y, self.exog).fit()
+        self.model = sm.GLM(y, self.exog)
+        self.results = self.model.fit()
 
     def test_cached_data_removed(self):
         res = self.results
@@ -250,6 +251,18 @@ class TestRemoveDataPickleGLM(RemoveDataPickle):
             res.remove_data()
         assert 'bic' in res._cache
 
+    def test_store_minimal(self):
+        # per-observation values are neither cached nor evaluated by
+        # remove_data with store="minimal"
+        res = self.model.fit(store="minimal")
+        assert_(res.resid_response is not None)
+        assert 'resid_response' not in res._cache
+        res.remove_data()
+        assert 'bic' in res._cache
+        for name in ['resid_response', 'resid_deviance', 'resid_pearson',
+                     'resid_anscombe', 'mu']:
+            assert res._cache[name] is None
+
 
 class TestPickleFormula(RemoveDataPickle):
     @classmethod
@@ -3,6 +3,8 @@ Conditional logistic, Poisson, and multinomial logit regression
 """
 
 import numpy as np
+import pandas as pd
+from scipy.special import gammaln
 import statsmodels.base.model as base
 import statsmodels.regression.linear_model as lm
 import statsmodels.base.wrapper as wrap
@@ -10,7 +12,126 @@ from statsmodels.discrete.discrete_model import (MultinomialResults,
       MultinomialResultsWrapper)
 import collections
 import warnings
-import itertools
+
+
+def _logit_denom(exog, linpred, n1):
+    """
+    Log denominator of the conditional logit likelihood and its gradient.
+
+    The denominator is the sum of exp(linpred) over all subsets of size
+    `n1` of the observations in a group, i.e. the elementary symmetric
+    polynomial of degree `n1`. It is computed for a batch of groups of
+    the same size by the recursion over observations in log space.
+
+    Parameters
+    ----------
+    exog : ndarray, (n_groups, groupsize, k_params)
+        The covariates of the groups.
+    linpred : ndarray, (n_groups, groupsize)
+        The linear predictor including the offset.
+    n1 : int
+        The number of cases in each group.
+
+    Returns
+    -------
+    logdenom : ndarray, (n_groups,)
+        The log of the denominator.
+    grad : ndarray, (n_groups, k_params)
+        The gradient of the log denominator with respect to the
+        parameters.
+    """
+    n_groups, groupsize, k_params = exog.shape
+    if 2 * n1 > groupsize:
+        # sum over the complements, with fewer terms in the recursion
+        logdenom, grad = _logit_denom(exog, -linpred, groupsize - n1)
+        return linpred.sum(1) + logdenom, exog.sum(1) - grad
+
+    # logd[:, j] is the log of the sum over subsets of size j of the
+    # observations processed so far, mean[:, j] is the average of the sum
+    # of exog in a subset weighted by exp(linpred)
+    logd = np.full((n_groups, n1 + 1), -np.inf)
+    logd[:, 0] = 0
+    mean = np.zeros((n_groups, n1 + 1, k_params))
+    with np.errstate(invalid='ignore'):
+        for t in range(groupsize):
+            logd_new = np.logaddexp(logd[:, 1:],
+                                    logd[:, :-1] + linpred[:, t:t + 1])
+            wt = np.exp(logd[:, 1:] - logd_new)
+            # subset sizes that are not yet possible
+            wt[np.isneginf(logd_new)] = 1
+            wt = wt[:, :, None]
+            mean[:, 1:] = (wt * mean[:, 1:] +
+                           (1 - wt) * (mean[:, :-1] + exog[:, t, None, :]))
+            logd[:, 1:] = logd_new
+
+    return logd[:, n1], mean[:, n1]
+
+
+def _mnlogit_denom(lpr, counts):
+    """
+    Log denominator of the conditional multinomial logit likelihood for
+    one group and the probabilities of the categories of each observation.
+
+    The denominator is the sum of exp(sum_i lpr[i, c_i]) over all
+    assignments of categories c_i to the observations of the group with
+    the observed number of observations in each category. It is computed
+    by a forward and backward recursion over the observations, where the
+    states are the number of observations assigned to each category.
+
+    Parameters
+    ----------
+    lpr : ndarray, (groupsize, k_cat)
+        The linear predictor of each observation and category.
+    counts : ndarray, (k_cat,)
+        The number of observations in each category.
+
+    Returns
+    -------
+    logdenom : float
+        The log of the denominator.
+    prob : ndarray, (groupsize, k_cat)
+        The probability that an observation has a category under the
+        conditional distribution of the assignments.
+    """
+    groupsize, k_cat = lpr.shape
+    shape = tuple(np.asarray(counts) + 1)
+    lpr_max = lpr.max(1)
+    h = np.exp(lpr - lpr_max[:, None])
+
+    def shifted(c, shift):
+        ix = [slice(None)] * k_cat
+        ix[c] = slice(1, None) if shift else slice(None, -1)
+        return tuple(ix)
+
+    # forward recursion, each step is rescaled to avoid underflow
+    fwd = [np.zeros(shape)]
+    fwd[0][(0,) * k_cat] = 1
+    fwd_scale = np.zeros(groupsize + 1)
+    for t in range(groupsize):
+        new = np.zeros(shape)
+        for c in range(k_cat):
+            new[shifted(c, True)] += h[t, c] * fwd[t][shifted(c, False)]
+        scale = new.max()
+        fwd.append(new / scale)
+        fwd_scale[t + 1] = fwd_scale[t] + np.log(scale)
+    logdenom = (fwd_scale[-1] + np.log(fwd[-1][tuple(counts)]) +
+                lpr_max.sum())
+
+    # backward recursion and the probabilities of the categories
+    bwd = np.zeros(shape)
+    bwd[tuple(counts)] = 1
+    prob = np.empty((groupsize, k_cat))
+    for t in range(groupsize - 1, -1, -1):
+        new = np.zeros(shape)
+        for c in range(k_cat):
+            prod = h[t, c] * bwd[shifted(c, True)]
+            prob[t, c] = np.sum(fwd[t][shifted(c, False)] * prod)
+            new[shifted(c, False)] += prod
+        # the scale factors of the recursions cancel in the normalization
+        prob[t] /= prob[t].sum()
+        bwd = new / new.max()
+
+    return logdenom, prob
 
 
 class _ConditionalModel(base.LikelihoodModel):
@@ -40,39 +161,32 @@ class _ConditionalModel(base.LikelihoodModel):
         exog = self.exog
         self.k_params = exog.shape[1]
 
-        # Get the row indices for each group
-        row_ix = collections.OrderedDict()
-        for i, g in enumerate(groups):
-            if g not in row_ix:
-                row_ix[g] = []
-            row_ix[g].append(i)
+        # Get the row indices for each group, in the order of their first
+        # appearance
+        codes = pd.factorize(np.asarray(groups))[0]
+        row_ix = np.argsort(codes, kind='mergesort')
+        groupsize = np.bincount(codes)
+        start = np.r_[0, np.cumsum(groupsize)[:-1]]
 
         # Split the data into groups and remove groups with no variation
         endog, exog = np.asarray(endog), np.asarray(exog)
+        endog_sorted = endog.ravel()[row_ix]
+        keep = (np.minimum.reduceat(endog_sorted, start) !=
+                np.maximum.reduceat(endog_sorted, start))
+        bounds = np.cumsum(groupsize)[:-1]
+        ix_grp = [ix for ix, k in zip(np.split(row_ix, bounds), keep) if k]
+
         offset = kwargs.get("offset")
-        self._endog_grp = []
-        self._exog_grp = []
-        self._groupsize = []
         if offset is not None:
             offset = np.asarray(offset)
-            self._offset_grp = []
+            self._offset_grp = [offset[ix] for ix in ix_grp]
         self._offset = []
-        self._sumy = []
-        self.nobs = 0
-        drops = [0, 0]
-        for g, ix in row_ix.items():
-            y = endog[ix].flat
-            if np.std(y) == 0:
-                drops[0] += 1
-                drops[1] += len(y)
-                continue
-            self.nobs += len(y)
-            self._endog_grp.append(y)
-            if offset is not None:
-                self._offset_grp.append(offset[ix])
-            self._groupsize.append(len(y))
-            self._exog_grp.append(exog[ix, :])
-            self._sumy.append(np.sum(y))
+        self._endog_grp = [endog.ravel()[ix] for ix in ix_grp]
+        self._exog_grp = [exog[ix, :] for ix in ix_grp]
+        self._groupsize = list(groupsize[keep])
+        self._sumy = list(np.add.reduceat(endog_sorted, start)[keep])
+        self.nobs = int(np.sum(self._groupsize))
+        drops = [int((~keep).sum()), int(groupsize[~keep].sum())]
 
         if drops[0] > 0:
             msg = ("Dropped %d groups and %d observations for having " +
@@ -242,21 +356,62 @@ class ConditionalLogit(_ConditionalModel):
         self.K = self.exog.shape[1]
         # i.e. self.k_params, for compatibility with MNLogit
 
-    def loglike(self, params):
+        # Groups with the same size and number of cases are stacked, so
+        # that the denominators are computed together.
+        batches = collections.defaultdict(list)
+        for g in range(self._n_groups):
+            batches[(self._groupsize[g], int(self._n1[g]))].append(g)
+        self._batches = []
+        for (_, n1), grps in batches.items():
+            exog = np.array([self._exog_grp[g] for g in grps])
+            ofs = 0
+            if hasattr(self, 'offset'):
+                ofs = np.array([self._offset_grp[g] for g in grps])
+            self._batches.append((n1, exog, ofs))
+        self._xy_sum = np.sum(self._xy, 0)
+        self._endofs_sum = 0
+        if hasattr(self, 'offset'):
+            self._endofs_sum = np.sum(self._endofs)
+        self._denom_cache = None
+
+    def _denom_sum(self, params):
+        """
+        Sum of the log denominators and their gradients over all groups.
+
+        The values at the last `params` are cached.
+        """
+        params = np.asarray(params, dtype=np.float64)
+        key = params.tobytes()
+        if self._denom_cache is not None and self._denom_cache[0] == key:
+            return self._denom_cache[1]
+
+        logdenom, grad = 0., 0.
+        for n1, exog, ofs in self._batches:
+            ld, gr = _logit_denom(exog, np.dot(exog, params) + ofs, n1)
+            logdenom += ld.sum()
+            grad += gr.sum(0)
+        self._denom_cache = (key, (logdenom, grad))
+        return logdenom, grad
 
-        ll = 0
-        for g in range(len(self._endog_grp)):
-            ll += self.loglike_grp(g, params)
+    def loglike(self, params):
 
-        return ll
+        ll = np.dot(self._xy_sum, params) + self._endofs_sum
+        return ll - self._denom_sum(params)[0]
 
     def score(self, params):
 
-        score = 0
-        for g in range(self._n_groups):
-            score += self.score_grp(g, params)
+        return self._xy_sum - self._denom_sum(params)[1]
+
+    def _logdenom_grp(self, grp, params, ofs=None):
 
-        return score
+        if ofs is None:
+            ofs = 0
+
+        exog = self._exog_grp[grp]
+        linpred = np.dot(exog, params) + ofs
+        logdenom, grad = _logit_denom(exog[None], linpred[None],
+                                      int(self._n1[grp]))
+        return logdenom[0], grad[0]
 
     def _denom(self, grp, params, ofs=None):
 
@@ -334,7 +489,7 @@ class ConditionalLogit(_ConditionalModel):
         if ofs is not None:
             llg += self._endofs[grp]
 
-        llg -= np.log(self._denom(grp, params, ofs))
+        llg -= self._logdenom_grp(grp, params, ofs)[0]
 
         return llg
 
@@ -344,8 +499,7 @@ class ConditionalLogit(_ConditionalModel):
         if hasattr(self, 'offset'):
             ofs = self._offset_grp[grp]
 
-        d, h = self._denom_grad(grp, params, ofs)
-        return self._xy[grp] - h / d
+        return self._xy[grp] - self._logdenom_grp(grp, params, ofs)[1]
 
 
 class ConditionalPoisson(_ConditionalModel):
@@ -367,48 +521,53 @@ class ConditionalPoisson(_ConditionalModel):
         Codes defining the groups. This is a required keyword parameter.
     """
 
-    def loglike(self, params):
+    def __init__(self, endog, exog, missing='none', **kwargs):
 
-        ofs = None
-        if hasattr(self, 'offset'):
-            ofs = self._offset_grp
+        super(ConditionalPoisson, self).__init__(
+            endog, exog, missing=missing, **kwargs)
 
-        ll = 0.0
+        # The groups are stacked, the group sums use reduceat
+        self._grp_start = np.r_[0, np.cumsum(self._groupsize)[:-1]]
+        self._grp_exog = np.concatenate(self._exog_grp)
+        self._grp_endog = np.concatenate(
+            [np.asarray(y) for y in self._endog_grp])
+        self._grp_offset = 0
+        if hasattr(self, 'offset'):
+            self._grp_offset = np.concatenate(self._offset_grp)
+        self._sumy_obs = np.repeat(self._sumy, self._groupsize)
 
-        for i in range(len(self._endog_grp)):
+    def _probs(self, params):
+        """
+        Linear predictor, the probabilities of the observations within
+        their groups and the log of the group sums of exp(linpred)
+        """
+        xb = np.dot(self._grp_exog, params) + self._grp_offset
+        xb_max = np.maximum.reduceat(xb, self._grp_start)
+        xb_max = np.repeat(xb_max, self._groupsize)
+        exb = np.exp(xb - xb_max)
+        s = np.repeat(np.add.reduceat(exb, self._grp_start), self._groupsize)
+        return xb, exb / s, np.log(s) + xb_max
 
-            xb = np.dot(self._exog_grp[i], params)
-            if ofs is not None:
-                xb += ofs[i]
-            exb = np.exp(xb)
-            y = self._endog_grp[i]
-            ll += np.dot(y, xb)
-            s = exb.sum()
-            ll -= self._sumy[i] * np.log(s)
+    def loglike(self, params):
 
-        return ll
+        xb, _, logs = self._probs(params)
+        return (np.dot(self._grp_endog, xb) -
+                np.dot(self._sumy, logs[self._grp_start]))
 
     def score(self, params):
 
-        ofs = None
-        if hasattr(self, 'offset'):
-            ofs = self._offset_grp
-
-        score = 0.0
+        prob = self._probs(params)[1]
+        resid = self._grp_endog - self._sumy_obs * prob
+        return np.dot(resid, self._grp_exog)
 
-        for i in range(len(self._endog_grp)):
-
-            x = self._exog_grp[i]
-            xb = np.dot(x, params)
-            if ofs is not None:
-                xb += ofs[i]
-            exb = np.exp(xb)
-            s = exb.sum()
-            y = self._endog_grp[i]
-            score += np.dot(y, x)
-            score -= self._sumy[i] * np.dot(exb, x) / s
+    def hessian(self, params):
 
-        return score
+        prob = self._probs(params)[1]
+        x = self._grp_exog
+        mean = np.add.reduceat(prob[:, None] * x, self._grp_start)
+        hess = np.dot(mean.T * self._sumy, mean)
+        hess -= np.dot(x.T * (self._sumy_obs * prob), x)
+        return hess
 
 
 class ConditionalResults(base.LikelihoodModelResults):
@@ -572,8 +731,11 @@ class ConditionalMNLogit(_ConditionalModel):
 
         return MultinomialResultsWrapper(rslt)
 
-    def loglike(self, params):
-
+    def _denoms(self, params):
+        """
+        Log denominators and the probabilities of the categories for all
+        groups
+        """
         q = self.exog.shape[1]
         c = self.k_cat - 1
 
@@ -581,52 +743,34 @@ class ConditionalMNLogit(_ConditionalModel):
         pmat = np.concatenate((np.zeros((q, 1)), pmat), axis=1)
         lpr = np.dot(self.exog, pmat)
 
-        ll = 0.0
+        logdenom = 0.0
+        prob = np.zeros_like(lpr)
         for ii in self._grp_ix:
-            x = lpr[ii, :]
-            jj = np.arange(x.shape[0], dtype=np.int)
             y = self.endog[ii]
-            denom = 0.0
-            for p in itertools.permutations(y):
-                denom += np.exp(x[(jj, p)].sum())
-            ll += x[(jj, y)].sum() - np.log(denom)
-
-        return ll
-
-
-    def score(self, params):
+            counts = np.bincount(y, minlength=self.k_cat)
+            ld, prob[ii] = _mnlogit_denom(lpr[ii, :], counts)
+            # the enumeration over permutations counts each assignment
+            # prod(counts!) times
+            logdenom += ld + gammaln(counts + 1).sum()
 
-        q = self.exog.shape[1]
-        c = self.k_cat - 1
+        return lpr, logdenom, prob
 
-        pmat = params.reshape((q, c))
-        pmat = np.concatenate((np.zeros((q, 1)), pmat), axis=1)
-        lpr = np.dot(self.exog, pmat)
+    def loglike(self, params):
 
-        grad = np.zeros((q, c))
-        for ii in self._grp_ix:
-            x = lpr[ii, :]
-            jj = np.arange(x.shape[0], dtype=np.int)
-            y = self.endog[ii]
-            denom = 0.0
-            denomg = np.zeros((q, c))
-            for p in itertools.permutations(y):
-                v = np.exp(x[(jj, p)].sum())
-                denom += v
-                for i, r in enumerate(p):
-                    if r != 0:
-                        denomg[:, r - 1] += v * self.exog[ii[i], :]
+        lpr, logdenom, _ = self._denoms(params)
+        jj = np.arange(lpr.shape[0])
+        return lpr[jj, self.endog].sum() - logdenom
 
-            for i, r in enumerate(y):
-                if r != 0:
-                    grad[:, r - 1] += self.exog[ii[i], :]
+    def score(self, params):
 
-            grad -= denomg / denom
+        _, _, prob = self._denoms(params)
+        resid = -prob
+        resid[np.arange(len(resid)), self.endog] += 1
+        grad = np.dot(self.exog.T, resid[:, 1:])
 
         return grad.flatten()
 
 
-
 class ConditionalResultsWrapper(lm.RegressionResultsWrapper):
     pass
 
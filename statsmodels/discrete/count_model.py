@@ -14,7 +14,6 @@ from statsmodels.discrete.discrete_model import (DiscreteModel, CountModel,
                                                  GeneralizedPoisson,
                                                  NegativeBinomialP)
 from statsmodels.distributions import zipoisson, zigenpoisson, zinegbin
-from statsmodels.tools.numdiff import approx_fprime, approx_hess
 from statsmodels.tools.decorators import cache_readonly
 from statsmodels.tools.sm_exceptions import ConvergenceWarning
 from statsmodels.compat.pandas import Appender
@@ -75,11 +74,9 @@ class GenericZeroInflated(CountModel):
         if inflation == 'logit':
             self.model_infl = Logit(np.zeros(self.exog_infl.shape[0]),
                                     self.exog_infl)
-            self._hessian_inflate = self._hessian_logit
         elif inflation == 'probit':
             self.model_infl = Probit(np.zeros(self.exog_infl.shape[0]),
                                     self.exog_infl)
-            self._hessian_inflate = self._hessian_probit
 
         else:
             raise ValueError("inflation == %s, which is not handled"
@@ -98,6 +95,8 @@ class GenericZeroInflated(CountModel):
 
         self._init_keys.extend(['exog_infl', 'inflation'])
         self._null_drop_keys = ['exog_infl']
+        self._deriv_cache = None
+        self._data_attr.append('_deriv_cache')
 
     def loglike(self, params):
         """
@@ -226,6 +225,100 @@ class GenericZeroInflated(CountModel):
         discretefit = self.result_class_reg(self, cntfit)
         return self.result_class_reg_wrapper(discretefit)
 
+    def _derivs_index(self, params):
+        """
+        First and second derivatives of the loglikelihood of each
+        observation with respect to the linear indices.
+
+        The indices are the linear predictor of the inflation model, the
+        linear predictor of the main model and, if the main model has
+        one, its dispersion parameter.  The derivatives of the last
+        `params` are cached, so that the score and the Hessian at the
+        same parameters share the computations.
+
+        Returns
+        -------
+        deriv1 : ndarray, (nobs, k_index)
+        deriv2 : ndarray, (nobs, k_index, k_index)
+        """
+        params = np.asarray(params, dtype=np.float64)
+        key = params.tobytes()
+        cache = self._deriv_cache
+        if cache is not None and cache[0] == key:
+            return cache[1]
+
+        params_infl = params[:self.k_inflate]
+        params_main = params[self.k_inflate:]
+
+        # derivatives of the inflation probability w by its linear index
+        linpred = np.dot(self.exog_infl, params_infl)
+        if self.inflation == 'logit':
+            w = self.model_infl.cdf(linpred)
+            dw = w * (1 - w)
+            d2w = dw * (1 - 2 * w)
+        else:
+            w = self.model_infl.cdf(linpred)
+            dw = self.model_infl.pdf(linpred)
+            d2w = -linpred * dw
+        w = np.clip(w, np.finfo(float).eps, 1 - np.finfo(float).eps)
+
+        # derivatives of the main loglikelihood by its indices
+        main = self.model_main
+        if isinstance(main, Poisson):
+            d1_main = main.score_factor(params_main)[:, None]
+            d2_main = -main.hessian_factor(params_main)[:, None, None]
+        else:
+            d1_main = np.column_stack(main.score_factor(params_main))
+            hf, hfa, hfaa = main.hessian_factor(params_main)
+            d2_main = np.empty((len(hf), 2, 2))
+            d2_main[:, 0, 0] = hf
+            d2_main[:, 0, 1] = d2_main[:, 1, 0] = hfa
+            d2_main[:, 1, 1] = hfaa
+
+        nobs, k_main = d1_main.shape
+        deriv1 = np.empty((nobs, k_main + 1))
+        deriv2 = np.zeros((nobs, k_main + 1, k_main + 1))
+
+        # y > 0: log(1 - w) + llf_main
+        nz = self.endog != 0
+        deriv1[nz, 0] = -dw[nz] / (1 - w[nz])
+        deriv1[nz, 1:] = d1_main[nz]
+        deriv2[nz, 0, 0] = -(d2w[nz] / (1 - w[nz]) + deriv1[nz, 0]**2)
+        deriv2[nz, 1:, 1:] = d2_main[nz]
+
+        # y == 0: log(prob), prob = w + (1 - w) * pmf_main
+        zero = ~nz
+        if zero.any():
+            w, dw, d2w = w[zero], dw[zero], d2w[zero]
+            g, h = d1_main[zero], d2_main[zero]
+            pmf = np.exp(main.loglikeobs(params_main)[zero])
+            prob = w + (1 - w) * pmf
+            fac = (1 - w) * pmf / prob
+            d1_infl = dw * (1 - pmf) / prob
+            d1 = g * fac[:, None]
+            deriv1[zero, 0] = d1_infl
+            deriv1[zero, 1:] = d1
+            d2 = np.empty((zero.sum(), k_main + 1, k_main + 1))
+            d2[:, 0, 0] = d2w * (1 - pmf) / prob - d1_infl**2
+            d2[:, 0, 1:] = d2[:, 1:, 0] = -(
+                g * (dw * pmf / prob)[:, None] + d1 * d1_infl[:, None])
+            d2[:, 1:, 1:] = ((g[:, :, None] * g[:, None, :] + h) *
+                             fac[:, None, None] -
+                             d1[:, :, None] * d1[:, None, :])
+            deriv2[zero] = d2
+
+        self._deriv_cache = (key, (deriv1, deriv2))
+        return deriv1, deriv2
+
+    def _index_exog(self):
+        """
+        Design matrices of the linear indices, see `_derivs_index`.
+        """
+        exog = [self.exog_infl, self.exog]
+        if self.k_exog > self.exog.shape[1]:
+            exog.append(np.ones((self.exog.shape[0], 1)))
+        return exog
+
     def score_obs(self, params):
         """
         Generic Zero Inflated model score (gradient) vector of the log-likelihood
@@ -241,87 +334,13 @@ class GenericZeroInflated(CountModel):
             The score vector of the model, i.e. the first derivative of the
             loglikelihood function, evaluated at `params`
         """
-        params_infl = params[:self.k_inflate]
-        params_main = params[self.k_inflate:]
-
-        y = self.endog
-        w = self.model_infl.predict(params_infl)
-        w = np.clip(w, np.finfo(float).eps, 1 - np.finfo(float).eps)
-        score_main = self.model_main.score_obs(params_main)
-        llf_main = self.model_main.loglikeobs(params_main)
-        llf = self.loglikeobs(params)
-        zero_idx = np.nonzero(y == 0)[0]
-        nonzero_idx = np.nonzero(y)[0]
-
-        mu = self.model_main.predict(params_main)
-
-        dldp = np.zeros((self.exog.shape[0], self.k_exog), dtype=np.float64)
-        dldw = np.zeros_like(self.exog_infl, dtype=np.float64)
-
-        dldp[zero_idx,:] = (score_main[zero_idx].T *
-                     (1 - (w[zero_idx]) / np.exp(llf[zero_idx]))).T
-        dldp[nonzero_idx,:] = score_main[nonzero_idx]
-
-        if self.inflation == 'logit':
-            dldw[zero_idx,:] =  (self.exog_infl[zero_idx].T * w[zero_idx] *
-                                 (1 - w[zero_idx]) *
-                                 (1 - np.exp(llf_main[zero_idx])) /
-                                  np.exp(llf[zero_idx])).T
-            dldw[nonzero_idx,:] = -(self.exog_infl[nonzero_idx].T *
-                                    w[nonzero_idx]).T
-        elif self.inflation == 'probit':
-            return approx_fprime(params, self.loglikeobs)
-
-        return np.hstack((dldw, dldp))
+        deriv1 = self._derivs_index(params)[0]
+        return np.column_stack([ex * deriv1[:, i:i + 1] for i, ex in
+                                enumerate(self._index_exog())])
 
     def score(self, params):
         return self.score_obs(params).sum(0)
 
-    def _hessian_main(self, params):
-        pass
-
-    def _hessian_logit(self, params):
-        params_infl = params[:self.k_inflate]
-        params_main = params[self.k_inflate:]
-
-        y = self.endog
-        w = self.model_infl.predict(params_infl)
-        w = np.clip(w, np.finfo(float).eps, 1 - np.finfo(float).eps)
-        score_main = self.model_main.score_obs(params_main)
-        llf_main = self.model_main.loglikeobs(params_main)
-        llf = self.loglikeobs(params)
-        zero_idx = np.nonzero(y == 0)[0]
-        nonzero_idx = np.nonzero(y)[0]
-
-        hess_arr = np.zeros((self.k_inflate, self.k_exog + self.k_inflate))
-
-        pmf = np.exp(llf)
-
-        #d2l/dw2
-        for i in range(self.k_inflate):
-            for j in range(i, -1, -1):
-                hess_arr[i, j] = ((
-                    self.exog_infl[zero_idx, i] * self.exog_infl[zero_idx, j] *
-                    (w[zero_idx] * (1 - w[zero_idx]) * ((1 -
-                    np.exp(llf_main[zero_idx])) * (1 - 2 * w[zero_idx]) *
-                    np.exp(llf[zero_idx]) - (w[zero_idx] - w[zero_idx]**2) *
-                    (1 - np.exp(llf_main[zero_idx]))**2) /
-                    pmf[zero_idx]**2)).sum() -
-                    (self.exog_infl[nonzero_idx, i] * self.exog_infl[nonzero_idx, j] *
-                    w[nonzero_idx] * (1 - w[nonzero_idx])).sum())
-
-        #d2l/dpdw
-        for i in range(self.k_inflate):
-            for j in range(self.k_exog):
-                hess_arr[i, j + self.k_inflate] = -(score_main[zero_idx, j] *
-                    w[zero_idx] * (1 - w[zero_idx]) *
-                    self.exog_infl[zero_idx, i] / pmf[zero_idx]).sum()
-
-        return hess_arr
-
-    def _hessian_probit(self, params):
-        pass
-
     def hessian(self, params):
         """
         Generic Zero Inflated model Hessian matrix of the loglikelihood
@@ -339,24 +358,18 @@ class GenericZeroInflated(CountModel):
 
         Notes
         -----
+        The Hessian is computed from the second derivatives of the
+        loglikelihood of each observation with respect to the linear
+        predictors of the inflation and the main model and the dispersion
+        parameter, see `score_factor` and `hessian_factor` of the main
+        model.
         """
-        hess_arr_main = self._hessian_main(params)
-        hess_arr_infl = self._hessian_inflate(params)
-
-        if hess_arr_main is None or hess_arr_infl is None:
-            return approx_hess(params, self.loglike)
-
-        dim = self.k_exog + self.k_inflate
-
-        hess_arr = np.zeros((dim, dim))
-
-        hess_arr[:self.k_inflate,:] = hess_arr_infl
-        hess_arr[self.k_inflate:,self.k_inflate:] = hess_arr_main
-
-        tri_idx = np.triu_indices(self.k_exog + self.k_inflate, k=1)
-        hess_arr[tri_idx] = hess_arr.T[tri_idx]
-
-        return hess_arr
+        deriv2 = self._derivs_index(params)[1]
+        exog = self._index_exog()
+        blocks = [[np.dot(ex1.T * deriv2[:, i, j], ex2)
+                   for j, ex2 in enumerate(exog)]
+                  for i, ex1 in enumerate(exog)]
+        return np.block(blocks)
 
     def predict(self, params, exog=None, exog_infl=None, exposure=None,
                 offset=None, which='mean'):
@@ -486,35 +499,6 @@ class ZeroInflatedPoisson(GenericZeroInflated):
         self.result_class_reg = L1ZeroInflatedPoissonResults
         self.result_class_reg_wrapper = L1ZeroInflatedPoissonResultsWrapper
 
-    def _hessian_main(self, params):
-        params_infl = params[:self.k_inflate]
-        params_main = params[self.k_inflate:]
-
-        y = self.endog
-        w = self.model_infl.predict(params_infl)
-        w = np.clip(w, np.finfo(float).eps, 1 - np.finfo(float).eps)
-        score = self.score(params)
-        zero_idx = np.nonzero(y == 0)[0]
-        nonzero_idx = np.nonzero(y)[0]
-
-        mu = self.model_main.predict(params_main)
-
-        hess_arr = np.zeros((self.k_exog, self.k_exog))
-
-        coeff = (1 + w[zero_idx] * (np.exp(mu[zero_idx]) - 1))
-
-        #d2l/dp2
-        for i in range(self.k_exog):
-            for j in range(i, -1, -1):
-                hess_arr[i, j] = ((
-                    self.exog[zero_idx, i] * self.exog[zero_idx, j] *
-                    mu[zero_idx] * (w[zero_idx] - 1) * (1 / coeff -
-                    w[zero_idx] * mu[zero_idx] * np.exp(mu[zero_idx]) /
-                    coeff**2)).sum() - (mu[nonzero_idx] * self.exog[nonzero_idx, i] *
-                    self.exog[nonzero_idx, j]).sum())
-
-        return hess_arr
-
     def _predict_prob(self, params, exog, exog_infl, exposure, offset):
         params_infl = params[:self.k_inflate]
         params_main = params[self.k_inflate:]
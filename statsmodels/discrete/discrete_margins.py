@@ -4,6 +4,7 @@ from statsmodels.compat.python import lzip
 import numpy as np
 from scipy.stats import norm
 from statsmodels.tools.decorators import cache_readonly
+from statsmodels.tools.tools import _row_chunks
 
 #### margeff helper functions ####
 #NOTE: todo marginal effects for group 2
@@ -187,6 +188,216 @@ def _effects_at(effects, at):
         effects = effects[0,:]
     return effects
 
+def _discrete_shifts(x, idx, count):
+    """
+    The change of the discrete columns `idx` of `x` for the two predictions
+    that are compared, and the scale of the difference
+    """
+    xd = x[:, idx]
+    if count:
+        return np.ones_like(xd), -np.ones_like(xd), 0.5
+    return 1 - xd, -xd, 1.
+
+
+def _margeff_index(model, params, exog, method, dummy_idx, count_idx,
+                   at_all=False, chunksize=None):
+    """
+    Marginal effects and their Jacobian for single index models
+
+    The model needs a `_derivative_index` method that returns the
+    prediction as a function of the linear predictor and its first and
+    second derivatives. All dummy and count effects are evaluated in one
+    pass over the rows by shifting the linear predictor.
+
+    Returns
+    -------
+    effects : ndarray
+        The marginal effects for each row of `exog` if `at_all`, otherwise
+        their average.
+    jacobian : ndarray or None
+        The derivative of the average marginal effects with respect to
+        `params`. None if `at_all`.
+    """
+    nobs, k_vars = exog.shape
+    params_exog = params[:k_vars]
+    ey = 'ey' in method
+    ex = 'ex' in method
+    discrete = [(np.asarray(idx), kind) for idx, kind in
+                ((dummy_idx, False), (count_idx, True)) if idx is not None]
+    k_discrete = sum(len(idx) for idx, _ in discrete)
+
+    def derivs(linpred):
+        # the prediction (or its log) and its first two derivatives
+        cdf, pdf, dpdf = model._derivative_index(linpred)
+        if ey:
+            deriv = pdf / cdf
+            return np.log(cdf), deriv, dpdf / cdf - deriv**2
+        return cdf, pdf, dpdf
+
+    effects = np.zeros((nobs, k_vars)) if at_all else np.zeros(k_vars)
+    jac = np.zeros((k_vars, len(params)))
+    jac_discrete = np.zeros((k_vars, len(params)))
+    diag = np.arange(k_vars)
+    size = k_vars + 4 * k_discrete
+    for rows in _row_chunks(nobs, size, chunksize):
+        x = exog[rows]
+        linpred = np.dot(x, params_exog)
+        _, deriv, deriv2 = derivs(linpred)
+        margeff = deriv[:, None] * params_exog
+        if ex:
+            margeff *= x
+        if not at_all:
+            # derivative of deriv(x b) * b_j (* x_j) with respect to b_l
+            if ex:
+                jac[:, :k_vars] += (params_exog[:, None] *
+                                    np.dot(x.T * deriv2, x))
+                jac[diag, diag] += np.dot(deriv, x)
+            else:
+                jac[:, :k_vars] += np.outer(params_exog, np.dot(deriv2, x))
+                jac[diag, diag] += deriv.sum()
+
+        for idx, count in discrete:
+            shift1, shift0, scale = _discrete_shifts(x, idx, count)
+            pred1, deriv1, _ = derivs(linpred[:, None] +
+                                      shift1 * params_exog[idx])
+            pred0, deriv0, _ = derivs(linpred[:, None] +
+                                      shift0 * params_exog[idx])
+            margeff[:, idx] = scale * (pred1 - pred0)
+            if not at_all:
+                jac_d = np.dot((deriv1 - deriv0).T, x)
+                jac_d[np.arange(len(idx)), idx] += (
+                    (deriv1 * shift1).sum(0) - (deriv0 * shift0).sum(0))
+                jac_discrete[idx, :k_vars] += scale * jac_d
+
+        if at_all:
+            effects[rows] = margeff
+        else:
+            effects += margeff.sum(0)
+
+    if at_all:
+        return effects, None
+
+    for idx, _ in discrete:
+        jac[idx] = jac_discrete[idx]
+    return effects / nobs, jac / nobs
+
+
+def _margeff_mnlogit(model, params, exog, method, dummy_idx, count_idx,
+                     at_all=False, chunksize=None):
+    """
+    Marginal effects and their Jacobian for the multinomial logit model
+
+    See `_margeff_index`. The effects of choice q are in the columns
+    ``q * K + j`` as returned by `MNLogit._derivative_exog`.
+    """
+    nobs, K = exog.shape
+    J = int(model.J)
+    params = params.reshape(K, -1, order='F')
+    params_full = np.column_stack((np.zeros(K), params))
+    ey = 'ey' in method
+    ex = 'ex' in method
+    discrete = [(np.asarray(idx), kind) for idx, kind in
+                ((dummy_idx, False), (count_idx, True)) if idx is not None]
+    k_discrete = sum(len(idx) for idx, _ in discrete)
+    # delta_qr for the choices r with parameters
+    delta = np.eye(J)[:, 1:]
+
+    def derivs(linpred):
+        # the probabilities (or their logs) and their derivatives with
+        # respect to the linear predictors, shape (..., J, J-1)
+        prob = model.cdf(linpred.reshape(-1, J - 1))
+        prob = prob.reshape(linpred.shape[:-1] + (J,))
+        deriv = delta - prob[..., None, 1:]
+        if ey:
+            return np.log(prob), deriv
+        return prob, prob[..., None] * deriv
+
+    effects = np.zeros((nobs, K, J)) if at_all else np.zeros((K, J))
+    # jac[q, j, r, l] is the derivative of the effect of variable j on
+    # choice q with respect to params[l, r]
+    jac = np.zeros((J, K, J - 1, K))
+    jac_discrete = np.zeros((J, K, J - 1, K))
+    diag = np.arange(K)
+    size = J * J * K + 4 * k_discrete * J * J
+    for rows in _row_chunks(nobs, size, chunksize):
+        x = exog[rows]
+        prob = model.cdf(np.dot(x, params))
+        prob_r = prob[:, 1:]
+        # dev[i, q, j] = params[j, q] - sum_k prob[i, k] params[j, k]
+        dev = params_full.T - np.dot(prob, params_full.T)[:, None, :]
+        if ey:
+            margeff = dev.copy()
+        else:
+            margeff = prob[:, :, None] * dev
+        if ex:
+            margeff *= x[:, None, :]
+
+        if not at_all:
+            # d margeff[i, q, j] / d params[l, r] =
+            #     x[i, l] * a[i, q, r, j] + (j == l) * c[i, q, r]
+            term = prob_r[:, None, :, None] * dev[:, None, 1:, :]
+            if ey:
+                a = -term
+                c = delta - prob_r[:, None, :]
+            else:
+                c = prob[:, :, None] * (delta - prob_r[:, None, :])
+                a = c[:, :, :, None] * dev[:, :, None, :]
+                a -= prob[:, :, None, None] * term
+            if ex:
+                a = a * x[:, None, None, :]
+                c = c[:, :, :, None] * x[:, None, None, :]
+                c_sum = c.sum(0).transpose(2, 0, 1)
+            else:
+                c_sum = c.sum(0)
+            a = np.broadcast_to(a, (len(x), J, J - 1, K))
+            ax = np.dot(a.reshape(len(x), -1).T, x)
+            jac += ax.reshape(J, J - 1, K, K).transpose(0, 2, 1, 3)
+            jac[:, diag, :, diag] += c_sum
+
+        linpred = np.dot(x, params)
+        for idx, count in discrete:
+            shift1, shift0, scale = _discrete_shifts(x, idx, count)
+            lin1 = linpred[:, None, :] + shift1[:, :, None] * params[idx]
+            lin0 = linpred[:, None, :] + shift0[:, :, None] * params[idx]
+            pred1, deriv1 = derivs(lin1)
+            pred0, deriv0 = derivs(lin0)
+            margeff[:, :, idx] = scale * (pred1 - pred0).transpose(0, 2, 1)
+            if not at_all:
+                nd = len(idx)
+                # jac_d[d, q, r, l]
+                jac_d = np.dot((deriv1 - deriv0).reshape(len(x), -1).T, x)
+                jac_d = jac_d.reshape(nd, J, J - 1, K)
+                jac_d[np.arange(nd), :, :, idx] += (
+                    (deriv1 * shift1[:, :, None, None]).sum(0) -
+                    (deriv0 * shift0[:, :, None, None]).sum(0))
+                jac_discrete[:, idx] += scale * jac_d.transpose(1, 0, 2, 3)
+
+        if at_all:
+            effects[rows] = margeff.transpose(0, 2, 1)
+        else:
+            effects += margeff.sum(0).T
+
+    if at_all:
+        return effects.reshape(nobs, -1, order='F'), None
+
+    for idx, _ in discrete:
+        jac[:, idx] = jac_discrete[:, idx]
+    jac = jac.reshape(J * K, (J - 1) * K)
+    return effects.ravel(order='F') / nobs, jac / nobs
+
+
+def _analytic_margeff(model):
+    """
+    The function computing the analytic marginal effects of `model`, or None
+    """
+    from statsmodels.discrete.discrete_model import MNLogit
+    if isinstance(model, MNLogit):
+        return _margeff_mnlogit
+    if hasattr(model, '_derivative_index'):
+        return _margeff_index
+    return None
+
+
 def _margeff_cov_params_dummy(model, cov_margins, params, exog, dummy_ind,
         method, J):
     r"""
@@ -600,7 +811,7 @@ class DiscreteMargins(object):
         return smry
 
     def get_margeff(self, at='overall', method='dydx', atexog=None,
-                          dummy=False, count=False):
+                          dummy=False, count=False, chunksize=None):
         """Get marginal effects of the fitted model.
 
         Parameters
@@ -648,6 +859,10 @@ class DiscreteMargins(object):
             If False, treats count variables (if present) as continuous.  This
             is the default.  Else if True, the marginal effect is the
             change in probabilities when each observation is increased by one.
+        chunksize : int, optional
+            The number of observations that are processed at a time by the
+            analytic marginal effects. The default depends on the number of
+            parameters.
 
         Returns
         -------
@@ -658,6 +873,12 @@ class DiscreteMargins(object):
         -----
         When using after Poisson, returns the expected number of events
         per period, assuming that the model is loglinear.
+
+        For Logit, Probit, Poisson and MNLogit, the marginal effects and the
+        Jacobian of the delta method are computed from analytic derivatives
+        of the predictions, and all dummy and count effects are evaluated in
+        one pass over the observations. Other models use the numerical
+        derivative of the marginal effects.
         """
         self._reset() # always reset the cache when this is called
         #TODO: if at is not all or overall, we can also put atexog values
@@ -694,14 +915,21 @@ class DiscreteMargins(object):
         exog = _get_margeff_exog(exog, at, atexog, effects_idx)
 
         # get base marginal effects, handled by sub-classes
-        effects = model._derivative_exog(params, exog, method,
-                                                    dummy_idx, count_idx)
+        engine = _analytic_margeff(model)
+        if engine is not None:
+            effects, jacobian = engine(model, params, exog, method,
+                                       dummy_idx, count_idx,
+                                       at_all=(at == 'all'),
+                                       chunksize=chunksize)
+        else:
+            effects = model._derivative_exog(params, exog, method,
+                                             dummy_idx, count_idx)
+            effects = _effects_at(effects, at)
+            jacobian = model._derivative_exog
 
         J = getattr(model, 'J', 1)
         effects_idx = np.tile(effects_idx, J) # adjust for multi-equation.
 
-        effects = _effects_at(effects, at)
-
         if at == 'all':
             if J > 1:
                 K = model.K - np.any(~effects_idx) # subtract constant
@@ -713,7 +941,7 @@ class DiscreteMargins(object):
             # Set standard error of the marginal effects by Delta method.
             margeff_cov, margeff_se = margeff_cov_with_se(model, params, exog,
                                                 results.cov_params(), at,
-                                                model._derivative_exog,
+                                                jacobian,
                                                 dummy_idx, count_idx,
                                                 method, J)
 
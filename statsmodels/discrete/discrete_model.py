@@ -56,6 +56,16 @@ FLOAT_EPS = np.finfo(float).eps
 #TODO: add options for the parameter covariance/variance
 # ie., OIM, EIM, and BHHH see Green 21.4
 
+_compress_param_doc = """
+    compress : bool
+        If True, the observations with identical rows of `exog` (and the
+        offset) are aggregated before fitting. The model is estimated as the
+        equivalent GLM of the unique rows with the number of observations as
+        frequency weights, which has the same parameter estimates and
+        Hessian, see `statsmodels.genmod.generalized_linear_model.GLM`.
+        This pays off if all regressors are categorical. The results are
+        computed for the original observations. Default is False."""
+
 _discrete_models_docs = """
 """
 
@@ -150,6 +160,20 @@ def _validate_l1_method(method):
                          '"l1" or "l1_cvxopt_cp"'.format(method=method))
 
 
+def _hessian_from_factors(exog, hf_params, hf_params_alpha, hf_alpha):
+    """
+    Hessian of a count model with a dispersion parameter from the second
+    derivatives of the loglikelihood of each observation with respect to
+    the linear predictor and the dispersion parameter.
+    """
+    dim = exog.shape[1]
+    hess_arr = np.empty((dim + 1, dim + 1))
+    hess_arr[:-1, :-1] = np.dot(exog.T * hf_params, exog)
+    hess_arr[-1, :-1] = hess_arr[:-1, -1] = np.dot(hf_params_alpha, exog)
+    hess_arr[-1, -1] = hf_alpha.sum()
+    return hess_arr
+
+
 #### Private Model Classes ####
 
 
@@ -176,6 +200,59 @@ class DiscreteModel(base.LikelihoodModel):
         self.df_model = float(rank - 1)
         self.df_resid = float(self.exog.shape[0] - rank)
 
+    def _setup_compress(self, compress, family, offset=0.):
+        """
+        Aggregate the observations with identical rows of exog and offset
+        """
+        self.compress = compress
+        self._init_keys.append('compress')
+        if compress:
+            from statsmodels.genmod.generalized_linear_model import (
+                _compress_glm)
+            self._compress_codes, self._compressed_model = _compress_glm(
+                family, self.endog, self.exog, offset, 1., 1., 1.)
+            self._data_attr.append('_compress_codes')
+
+    def _fit_compressed(self, start_params=None, method='newton', maxiter=35,
+                        full_output=1, disp=1, callback=None, **kwargs):
+        """
+        Fit the GLM of the unique rows and return the results of the model
+
+        The loglikelihood of the aggregated GLM differs from the one of the
+        model by a constant, so that the maximum likelihood estimates and
+        the inverse Hessian are the same. The covariance type is applied to
+        the original observations.
+        """
+        model = self._compressed_model
+        kwds = dict((key, kwargs.pop(key)) for key in
+                    ['cov_type', 'cov_kwds', 'use_t'] if key in kwargs)
+
+        # the means of the unique rows are always predicted perfectly by a
+        # saturated model, only 0 and 1 are perfect predictions
+        endog = model.endog
+        binary = np.all((endog == 0) | (endog == 1))
+
+        def check_perfect_pred(params, *args):
+            fitted = model.predict(params)
+            if (self.raise_on_perfect_prediction and binary and
+                    np.allclose(fitted - endog, 0)):
+                msg = "Perfect separation detected, results not available"
+                raise PerfectSeparationError(msg)
+
+        if callback is None:
+            callback = check_perfect_pred
+        res = base.LikelihoodModel.fit(
+            model, start_params=start_params, method=method,
+            maxiter=maxiter, full_output=full_output, disp=disp,
+            callback=callback, **kwargs)
+        if 'cov_type' in kwds:
+            kwds.setdefault('cov_kwds', {})
+        mlefit = base.LikelihoodModelResults(
+            self, res.params, res.normalized_cov_params, scale=1., **kwds)
+        mlefit.mle_retvals = res.mle_retvals
+        mlefit.mle_settings = res.mle_settings
+        return mlefit
+
     def cdf(self, X):
         """
         The cumulative distribution function of the model.
@@ -205,6 +282,11 @@ class DiscreteModel(base.LikelihoodModel):
         The rest of the docstring is from
         statsmodels.base.model.LikelihoodModel.fit
         """
+        if getattr(self, 'compress', False):
+            return self._fit_compressed(
+                start_params=start_params, method=method, maxiter=maxiter,
+                full_output=full_output, disp=disp, callback=callback,
+                **kwargs)
         if callback is None:
             callback = self._check_perfect_pred
         else:
@@ -457,6 +539,10 @@ class BinaryModel(DiscreteModel):
         array
             Fitted values at exog.
         """
+        if (exog is None and
+                getattr(self, '_compress_codes', None) is not None):
+            predicted = self._compressed_model.predict(params, linear=linear)
+            return predicted[self._compress_codes]
         if exog is None:
             exog = self.exog
         if not linear:
@@ -800,6 +886,11 @@ class CountModel(DiscreteModel):
         If exposure is specified, then it will be logged by the method.
         The user does not need to log it first.
         """
+        if (exog is None and exposure is None and offset is None and
+                getattr(self, '_compress_codes', None) is not None):
+            predicted = self._compressed_model.predict(params, linear=linear)
+            return predicted[self._compress_codes]
+
         # the following is copied from GLM predict (without family/link check)
         # Use fit offset if appropriate
         if offset is None and exog is None and hasattr(self, 'offset'):
@@ -925,7 +1016,16 @@ class Poisson(CountModel):
     exposure : array_like
         Log(exposure) is added to the linear prediction with coefficient
         equal to 1.
-    """ + base._missing_param_doc}
+    """ + base._missing_param_doc + _compress_param_doc}
+
+    def __init__(self, endog, exog, offset=None, exposure=None,
+                 missing='none', compress=False, **kwargs):
+        super(Poisson, self).__init__(endog, exog, offset=offset,
+                                      exposure=exposure, missing=missing,
+                                      **kwargs)
+        offset = (getattr(self, 'offset', 0.) +
+                  getattr(self, 'exposure', 0.))
+        self._setup_compress(compress, self.family, offset=offset)
 
     @property
     def family(self):
@@ -990,6 +1090,14 @@ class Poisson(CountModel):
         y = self.endog
         return np.exp(stats.poisson.logpmf(y, np.exp(X)))
 
+    def _derivative_index(self, X):
+        """
+        The prediction at the linear predictor `X` and its first and second
+        derivatives, used for the marginal effects.
+        """
+        mu = np.exp(X)
+        return mu, mu, mu
+
     def loglike(self, params):
         """
         Loglikelihood of Poisson model
@@ -1527,6 +1635,27 @@ class GeneralizedPoisson(CountModel):
         return L1GeneralizedPoissonResultsWrapper(discretefit)
 
     def score_obs(self, params):
+        dparams, dalpha = self.score_factor(params)
+        return np.column_stack((self.exog * dparams[:, None], dalpha))
+
+    def score_factor(self, params):
+        """
+        Generalized Poisson model score factors for each observation
+
+        Parameters
+        ----------
+        params : array_like
+            The parameters of the model
+
+        Returns
+        -------
+        dparams : ndarray, (nobs,)
+            The derivative of the loglikelihood of each observation with
+            respect to the linear predictor.
+        dalpha : ndarray, (nobs,)
+            The derivative of the loglikelihood of each observation with
+            respect to alpha.
+        """
         if self._transparams:
             alpha = np.exp(params[-1])
         else:
@@ -1534,24 +1663,21 @@ class GeneralizedPoisson(CountModel):
 
         params = params[:-1]
         p = self.parameterization
-        exog = self.exog
-        y = self.endog[:,None]
-        mu = self.predict(params)[:,None]
+        y = self.endog
+        mu = self.predict(params)
         mu_p = np.power(mu, p)
         a1 = 1 + alpha * mu_p
         a2 = mu + alpha * mu_p * y
         a3 = alpha * p * mu ** (p - 1)
         a4 = a3 * y
-        dmudb = mu * exog
 
         dalpha = (mu_p * (y * ((y - 1) / a2 - 2 / a1) + a2 / a1**2))
-        dparams = dmudb * (-a4 / a1 +
-                           a3 * a2 / (a1 ** 2) +
-                           (1 + a4) * ((y - 1) / a2 - 1 / a1) +
-                           1 / mu)
+        dparams = mu * (-a4 / a1 +
+                        a3 * a2 / (a1 ** 2) +
+                        (1 + a4) * ((y - 1) / a2 - 1 / a1) +
+                        1 / mu)
 
-        return np.concatenate((dparams, np.atleast_2d(dalpha)),
-                              axis=1)
+        return dparams, dalpha
 
     def score(self, params):
         score = np.sum(self.score_obs(params), axis=0)
@@ -1608,6 +1734,28 @@ class GeneralizedPoisson(CountModel):
             The Hessian, second derivative of loglikelihood function,
             evaluated at `params`
         """
+        return _hessian_from_factors(self.exog, *self.hessian_factor(params))
+
+    def hessian_factor(self, params):
+        """
+        Generalized Poisson model Hessian factors for each observation
+
+        Parameters
+        ----------
+        params : array_like
+            The parameters of the model
+
+        Returns
+        -------
+        hf_params : ndarray, (nobs,)
+            The second derivative of the loglikelihood of each observation
+            with respect to the linear predictor.
+        hf_params_alpha : ndarray, (nobs,)
+            The second derivative with respect to the linear predictor and
+            alpha.
+        hf_alpha : ndarray, (nobs,)
+            The second derivative with respect to alpha.
+        """
         if self._transparams:
             alpha = np.exp(params[-1])
         else:
@@ -1615,58 +1763,42 @@ class GeneralizedPoisson(CountModel):
 
         params = params[:-1]
         p = self.parameterization
-        exog = self.exog
-        y = self.endog[:,None]
-        mu = self.predict(params)[:,None]
+        y = self.endog
+        mu = self.predict(params)
         mu_p = np.power(mu, p)
         a1 = 1 + alpha * mu_p
         a2 = mu + alpha * mu_p * y
         a3 = alpha * p * mu ** (p - 1)
         a4 = a3 * y
         a5 = p * mu ** (p - 1)
-        dmudb = mu * exog
 
         # for dl/dparams dparams
-        dim = exog.shape[1]
-        hess_arr = np.empty((dim+1,dim+1))
-
-        for i in range(dim):
-            for j in range(i + 1):
-                hess_arr[i,j] = np.sum(mu * exog[:,i,None] * exog[:,j,None] *
-                    (mu * (a3 * a4 / a1**2 -
-                           2 * a3**2 * a2 / a1**3 +
-                           2 * a3 * (a4 + 1) / a1**2 -
-                           a4 * p / (mu * a1) +
-                           a3 * p * a2 / (mu * a1**2) +
-                           (y - 1) * a4 * (p - 1) / (a2 * mu) -
-                           (y - 1) * (1 + a4)**2 / a2**2 -
-                           a4 * (p - 1) / (a1 * mu)) +
-                     ((y - 1) * (1 + a4) / a2 -
-                      (1 + a4) / a1)), axis=0)
-        tri_idx = np.triu_indices(dim, k=1)
-        hess_arr[tri_idx] = hess_arr.T[tri_idx]
+        hf_params = mu * (mu * (a3 * a4 / a1**2 -
+                                2 * a3**2 * a2 / a1**3 +
+                                2 * a3 * (a4 + 1) / a1**2 -
+                                a4 * p / (mu * a1) +
+                                a3 * p * a2 / (mu * a1**2) +
+                                (y - 1) * a4 * (p - 1) / (a2 * mu) -
+                                (y - 1) * (1 + a4)**2 / a2**2 -
+                                a4 * (p - 1) / (a1 * mu)) +
+                          ((y - 1) * (1 + a4) / a2 -
+                           (1 + a4) / a1))
 
         # for dl/dparams dalpha
-        dldpda = np.sum((2 * a4 * mu_p / a1**2 -
-                         2 * a3 * mu_p * a2 / a1**3 -
-                         mu_p * y * (y - 1) * (1 + a4) / a2**2 +
-                         mu_p * (1 + a4) / a1**2 +
-                         a5 * y * (y - 1) / a2 -
-                         2 * a5 * y / a1 +
-                         a5 * a2 / a1**2) * dmudb,
-                        axis=0)
-
-        hess_arr[-1,:-1] = dldpda
-        hess_arr[:-1,-1] = dldpda
+        hf_params_alpha = mu * (2 * a4 * mu_p / a1**2 -
+                                2 * a3 * mu_p * a2 / a1**3 -
+                                mu_p * y * (y - 1) * (1 + a4) / a2**2 +
+                                mu_p * (1 + a4) / a1**2 +
+                                a5 * y * (y - 1) / a2 -
+                                2 * a5 * y / a1 +
+                                a5 * a2 / a1**2)
 
         # for dl/dalpha dalpha
-        dldada = mu_p**2 * (3 * y / a1**2 -
-                            (y / a2)**2. * (y - 1) -
-                            2 * a2 / a1**3)
+        hf_alpha = mu_p**2 * (3 * y / a1**2 -
+                              (y / a2)**2. * (y - 1) -
+                              2 * a2 / a1**3)
 
-        hess_arr[-1,-1] = dldada.sum()
-
-        return hess_arr
+        return hf_params, hf_params_alpha, hf_alpha
 
     def predict(self, params, exog=None, exposure=None, offset=None,
                 which='mean'):
@@ -1720,7 +1852,12 @@ class Logit(BinaryModel):
     exog : array
         A reference to the exogenous design.
     """ % {'params' : base._model_params_doc,
-           'extra_params' : base._missing_param_doc}
+           'extra_params' : base._missing_param_doc + _compress_param_doc}
+
+    def __init__(self, endog, exog, compress=False, **kwargs):
+        super(Logit, self).__init__(endog, exog, **kwargs)
+        from statsmodels.genmod import families
+        self._setup_compress(compress, families.Binomial())
 
     def cdf(self, X):
         """
@@ -1770,6 +1907,15 @@ class Logit(BinaryModel):
         X = np.asarray(X)
         return np.exp(-X)/(1+np.exp(-X))**2
 
+    def _derivative_index(self, X):
+        """
+        The cdf at the linear predictor `X` and its first and second
+        derivatives, used for the marginal effects.
+        """
+        cdf = self.cdf(X)
+        pdf = cdf * (1 - cdf)
+        return cdf, pdf, pdf * (1 - 2 * cdf)
+
     def loglike(self, params):
         """
         Log-likelihood of logit model.
@@ -1973,6 +2119,14 @@ class Probit(BinaryModel):
         X = np.asarray(X)
         return stats.norm._pdf(X)
 
+    def _derivative_index(self, X):
+        """
+        The cdf at the linear predictor `X` and its first and second
+        derivatives, used for the marginal effects.
+        """
+        pdf = self.pdf(X)
+        return self.cdf(X), pdf, -X * pdf
+
 
     def loglike(self, params):
         """
@@ -2150,6 +2304,10 @@ class MNLogit(MultinomialModel):
         A nobs x k array where `nobs` is the number of observations and `k`
         is the number of regressors. An intercept is not included by default
         and should be added by the user. See `statsmodels.tools.add_constant`.
+    chunksize : int, optional
+        The number of observations that are processed at a time when the
+        Hessian is computed. The default depends on the number of
+        parameters.
     %(extra_params)s
 
     Attributes
@@ -2176,10 +2334,20 @@ class MNLogit(MultinomialModel):
     Notes
     -----
     See developer notes for further information on `MNLogit` internals.
+
+    The choice probabilities at the last parameters are cached, so that
+    `loglike`, `score` and `hessian` at the same parameters share their
+    computation. With ``method='ncg'``, `fit` uses products of the Hessian
+    with a vector that are computed without forming the Hessian, which
+    is cheaper than Newton's method for a large number of choices.
     """ % {'extra_params': base._missing_param_doc}
 
-    def __init__(self, endog, exog, **kwargs):
+    def __init__(self, endog, exog, chunksize=None, **kwargs):
         super(MNLogit, self).__init__(endog, exog, **kwargs)
+        self.chunksize = chunksize
+        self._init_keys.append('chunksize')
+        self._softmax_cache = None
+        self._data_attr.append('_softmax_cache')
 
         # Override cov_names since multivariate model
         yname = self.endog_names
@@ -2216,9 +2384,37 @@ class MNLogit(MultinomialModel):
         In the multinomial logit model.
         .. math:: \\frac{\\exp\\left(\\beta_{j}^{\\prime}x_{i}\\right)}{\\sum_{k=0}^{J}\\exp\\left(\\beta_{k}^{\\prime}x_{i}\\right)}
         """
-        eXB = np.column_stack((np.ones(len(X)), np.exp(X)))
+        XB = np.column_stack((np.zeros(len(X)), X))
+        eXB = np.exp(XB - XB.max(1)[:, None])
         return eXB/eXB.sum(1)[:,None]
 
+    def _softmax(self, params):
+        """
+        Probabilities and log-probabilities of all choices
+
+        The values at the last `params` are cached.
+        """
+        # keep complex params for complex step derivatives
+        params = np.asarray(params)
+        if not np.iscomplexobj(params):
+            params = params.astype(np.float64, copy=False)
+        params = params.reshape(self.K, -1, order='F')
+        key = (params.dtype.str, params.tobytes(order='F'))
+        cache = self._softmax_cache
+        if cache is not None and cache[0] == key:
+            return cache[1]
+
+        XB = np.dot(self.exog, params)
+        # shift by the largest index, including the base choice
+        shift = np.maximum(XB.real.max(1), 0)[:, None]
+        logprob = np.column_stack((-shift, XB - shift))
+        eXB = np.exp(logprob)
+        sum_eXB = eXB.sum(1)[:, None]
+        prob = eXB / sum_eXB
+        logprob -= np.log(sum_eXB)
+        self._softmax_cache = (key, (prob, logprob))
+        return prob, logprob
+
     def loglike(self, params):
         """
         Log-likelihood of the multinomial logit model.
@@ -2246,10 +2442,7 @@ class MNLogit(MultinomialModel):
         where :math:`d_{ij}=1` if individual `i` chose alternative `j` and 0
         if not.
         """
-        params = params.reshape(self.K, -1, order='F')
-        d = self.wendog
-        logprob = np.log(self.cdf(np.dot(self.exog,params)))
-        return np.sum(d * logprob)
+        return np.sum(self.loglikeobs(params))
 
     def loglikeobs(self, params):
         """
@@ -2280,10 +2473,8 @@ class MNLogit(MultinomialModel):
         where :math:`d_{ij}=1` if individual `i` chose alternative `j` and 0
         if not.
         """
-        params = params.reshape(self.K, -1, order='F')
-        d = self.wendog
-        logprob = np.log(self.cdf(np.dot(self.exog,params)))
-        return d * logprob
+        logprob = self._softmax(params)[1]
+        return self.wendog * logprob
 
     def score(self, params):
         """
@@ -2310,10 +2501,8 @@ class MNLogit(MultinomialModel):
         In the multinomial model the score matrix is K x J-1 but is returned
         as a flattened array to work with the solvers.
         """
-        params = params.reshape(self.K, -1, order='F')
-        firstterm = self.wendog[:,1:] - self.cdf(np.dot(self.exog,
-                                                  params))[:,1:]
-        #NOTE: might need to switch terms if params is reshaped
+        prob = self._softmax(params)[0]
+        firstterm = self.wendog[:, 1:] - prob[:, 1:]
         return np.dot(firstterm.T, self.exog).flatten()
 
     def loglike_and_score(self, params):
@@ -2323,12 +2512,7 @@ class MNLogit(MultinomialModel):
         Note that both of these returned quantities will need to be negated
         before being minimized by the maximum likelihood fitting machinery.
         """
-        params = params.reshape(self.K, -1, order='F')
-        cdf_dot_exog_params = self.cdf(np.dot(self.exog, params))
-        loglike_value = np.sum(self.wendog * np.log(cdf_dot_exog_params))
-        firstterm = self.wendog[:, 1:] - cdf_dot_exog_params[:, 1:]
-        score_array = np.dot(firstterm.T, self.exog).flatten()
-        return loglike_value, score_array
+        return self.loglike(params), self.score(params)
 
     def score_obs(self, params):
         """
@@ -2355,11 +2539,10 @@ class MNLogit(MultinomialModel):
         as a flattened array. The Jacobian has the observations in rows and
         the flattened array of derivatives in columns.
         """
-        params = params.reshape(self.K, -1, order='F')
-        firstterm = self.wendog[:,1:] - self.cdf(np.dot(self.exog,
-                                                  params))[:,1:]
-        #NOTE: might need to switch terms if params is reshaped
-        return (firstterm[:,:,None] * self.exog[:,None,:]).reshape(self.exog.shape[0], -1)
+        prob = self._softmax(params)[0]
+        firstterm = self.wendog[:, 1:] - prob[:, 1:]
+        return (firstterm[:, :, None] * self.exog[:, None, :]).reshape(
+            self.exog.shape[0], -1)
 
     def hessian(self, params):
         """
@@ -2387,27 +2570,62 @@ class MNLogit(MultinomialModel):
         The actual Hessian matrix has J**2 * K x K elements. Our Hessian
         is reshaped to be square (J*K, J*K) so that the solvers can use it.
 
-        This implementation does not take advantage of the symmetry of
-        the Hessian and could probably be refactored for speed.
+        The Hessian is the sum of a block diagonal matrix and the cross
+        product of the matrix with rows
+        :math:`\\left(p_{i1}x_{i}^{\\prime},...,p_{iJ}x_{i}^{\\prime}\\right)`.
+        The observations are processed in chunks of `chunksize` rows.
         """
-        params = params.reshape(self.K, -1, order='F')
+        prob = self._softmax(params)[0][:, 1:]
         X = self.exog
-        pr = self.cdf(np.dot(X,params))
-        partials = []
-        J = self.J
-        K = self.K
-        for i in range(J-1):
-            for j in range(J-1): # this loop assumes we drop the first col.
-                if i == j:
-                    partials.append(\
-                        -np.dot(((pr[:,i+1]*(1-pr[:,j+1]))[:,None]*X).T,X))
-                else:
-                    partials.append(-np.dot(((pr[:,i+1]*-pr[:,j+1])[:,None]*X).T,X))
-        H = np.array(partials)
-        # the developer's notes on multinomial should clear this math up
-        H = np.transpose(H.reshape(J-1, J-1, K, K), (0, 2, 1, 3)).reshape((J-1)*K, (J-1)*K)
+        J1, K = prob.shape[1], self.K
+        H = np.zeros((J1 * K, J1 * K))
+        diag = np.zeros((J1 * K, K))
+        for rows in tools._row_chunks(self.exog.shape[0], J1 * K,
+                                      self.chunksize):
+            x = X[rows]
+            px = (prob[rows, :, None] * x[:, None, :]).reshape(len(x), -1)
+            H += np.dot(px.T, px)
+            diag += np.dot(px.T, x)
+        idx = np.arange(J1)
+        H.reshape(J1, K, J1, K)[idx, :, idx, :] -= diag.reshape(J1, K, K)
         return H
 
+    def hessian_dot(self, params, vec):
+        """
+        Product of the Hessian of the loglikelihood with a vector
+
+        Parameters
+        ----------
+        params : array_like
+            The parameters of the model
+        vec : array_like
+            The vector of the same length as the flattened parameters.
+
+        Returns
+        -------
+        ndarray, (K * (J-1),)
+            ``hessian(params).dot(vec)`` computed without forming the
+            Hessian.
+        """
+        prob = self._softmax(params)[0][:, 1:]
+        vec = np.asarray(vec).reshape(self.K, -1, order='F')
+        pxv = prob * np.dot(self.exog, vec)
+        pxv -= prob * pxv.sum(1)[:, None]
+        return -np.dot(pxv.T, self.exog).flatten()
+
+    def _fhess_p(self, params, vec):
+        """Hessian product of the objective function of `fit`"""
+        return -self.hessian_dot(params, vec) / self.endog.shape[0]
+
+    @Appender(DiscreteModel.fit.__doc__)
+    def fit(self, start_params=None, method='newton', maxiter=35,
+            full_output=1, disp=1, callback=None, **kwargs):
+        if method == 'ncg':
+            kwargs.setdefault('fhess_p', self._fhess_p)
+        return super(MNLogit, self).fit(
+            start_params=start_params, method=method, maxiter=maxiter,
+            full_output=full_output, disp=disp, callback=callback, **kwargs)
+
 
 #TODO: Weibull can replaced by a survival analsysis function
 # like stat's streg (The cox model as well)
@@ -3042,6 +3260,28 @@ class NegativeBinomialP(CountModel):
             The score vector of the model, i.e. the first derivative of the
             loglikelihood function, evaluated at `params`
         """
+        dparams, dalpha = self.score_factor(params)
+        return np.column_stack((self.exog * dparams[:, None], dalpha))
+
+    def score_factor(self, params):
+        """
+        Generalized Negative Binomial (NB-P) model score factors for each
+        observation
+
+        Parameters
+        ----------
+        params : array_like
+            The parameters of the model
+
+        Returns
+        -------
+        dparams : ndarray, (nobs,)
+            The derivative of the loglikelihood of each observation with
+            respect to the linear predictor.
+        dalpha : ndarray, (nobs,)
+            The derivative of the loglikelihood of each observation with
+            respect to alpha.
+        """
         if self._transparams:
             alpha = np.exp(params[-1])
         else:
@@ -3065,11 +3305,10 @@ class NegativeBinomialP(CountModel):
         dparams = (a4 * dgterm -
                    a3 / a2 +
                    y / mu)
-        dparams = (self.exog.T * mu * dparams).T
+        dparams = mu * dparams
         dalpha = -a1 / alpha * dgterm
 
-        return np.concatenate((dparams, np.atleast_2d(dalpha).T),
-                              axis=1)
+        return dparams, dalpha
 
     def score(self, params):
         """
@@ -3107,6 +3346,29 @@ class NegativeBinomialP(CountModel):
         hessian : ndarray, 2-D
             The hessian matrix of the model.
         """
+        return _hessian_from_factors(self.exog, *self.hessian_factor(params))
+
+    def hessian_factor(self, params):
+        """
+        Generalized Negative Binomial (NB-P) model Hessian factors for each
+        observation
+
+        Parameters
+        ----------
+        params : array_like
+            The parameters of the model
+
+        Returns
+        -------
+        hf_params : ndarray, (nobs,)
+            The second derivative of the loglikelihood of each observation
+            with respect to the linear predictor.
+        hf_params_alpha : ndarray, (nobs,)
+            The second derivative with respect to the linear predictor and
+            alpha.
+        hf_alpha : ndarray, (nobs,)
+            The second derivative with respect to alpha.
+        """
         if self._transparams:
             alpha = np.exp(params[-1])
         else:
@@ -3115,7 +3377,6 @@ class NegativeBinomialP(CountModel):
 
         p = 2 - self.parameterization
         y = self.endog
-        exog = self.exog
         mu = self.predict(params)
 
         mu_p = mu**p
@@ -3129,44 +3390,31 @@ class NegativeBinomialP(CountModel):
         dgpart = digamma(a3) - digamma(a1)
         pgpart = polygamma(1, a3) - polygamma(1, a1)
 
-        dim = exog.shape[1]
-        hess_arr = np.zeros((dim + 1, dim + 1))
-
-        coeff = mu**2 * (((1 + a4)**2 * a3 / a2**2 -
-                          a3 / a2 * (p - 1) * a4 / mu -
-                          y / mu**2 -
-                          2 * a4 * (1 + a4) / a2 +
-                          p * a4 / mu * (lprob + dgpart + 2) -
-                          a4 / mu * (lprob + dgpart + 1) +
-                          a4**2 * pgpart) +
-                         (-(1 + a4) * a3 / a2 +
-                          y / mu +
-                          a4 * (lprob + dgpart + 1)) / mu)
-
-        for i in range(dim):
-            hess_arr[i, :-1] = np.sum(self.exog[:, :].T * self.exog[:, i] * coeff, axis=1)
-
-
-        hess_arr[-1,:-1] = (self.exog[:, :].T * mu * a1 *
-                ((1 + a4) * (1 - a3 / a2) / a2 -
-                 p * (lprob + dgpart + 2) / mu +
-                 p / mu * (a3 + p * a1) / a2 -
-                 a4 * pgpart) / alpha).sum(axis=1)
-
-
-        da2 = (a1 * (2 * lprob +
-                     2 * dgpart + 3 -
-                     2 * a3 / a2
-                     + a1 * pgpart
-                     - 2 * prob +
-                     prob * a3 / a2) / alpha**2)
-
-        hess_arr[-1, -1] = da2.sum()
-
-        tri_idx = np.triu_indices(dim + 1, k=1)
-        hess_arr[tri_idx] = hess_arr.T[tri_idx]
-
-        return hess_arr
+        hf_params = mu**2 * (((1 + a4)**2 * a3 / a2**2 -
+                              a3 / a2 * (p - 1) * a4 / mu -
+                              y / mu**2 -
+                              2 * a4 * (1 + a4) / a2 +
+                              p * a4 / mu * (lprob + dgpart + 2) -
+                              a4 / mu * (lprob + dgpart + 1) +
+                              a4**2 * pgpart) +
+                             (-(1 + a4) * a3 / a2 +
+                              y / mu +
+                              a4 * (lprob + dgpart + 1)) / mu)
+
+        hf_params_alpha = (mu * a1 *
+                           ((1 + a4) * (1 - a3 / a2) / a2 -
+                            p * (lprob + dgpart + 2) / mu +
+                            p / mu * (a3 + p * a1) / a2 -
+                            a4 * pgpart) / alpha)
+
+        hf_alpha = (a1 * (2 * lprob +
+                          2 * dgpart + 3 -
+                          2 * a3 / a2
+                          + a1 * pgpart
+                          - 2 * prob +
+                          prob * a3 / a2) / alpha**2)
+
+        return hf_params, hf_params_alpha, hf_alpha
 
     @Appender(_get_start_params_null_docs)
     def _get_start_params_null(self):
@@ -3550,7 +3798,7 @@ class DiscreteResults(base.LikelihoodModelResults):
         return yname, yname_list
 
     def get_margeff(self, at='overall', method='dydx', atexog=None,
-            dummy=False, count=False):
+            dummy=False, count=False, chunksize=None):
         """Get marginal effects of the fitted model.
 
         Parameters
@@ -3599,6 +3847,10 @@ class DiscreteResults(base.LikelihoodModelResults):
             If False, treats count variables (if present) as continuous.  This
             is the default.  Else if True, the marginal effect is the
             change in probabilities when each observation is increased by one.
+        chunksize : int, optional
+            The number of observations that are processed at a time by the
+            analytic marginal effects of Logit, Probit, Poisson and MNLogit.
+            The default depends on the number of parameters.
 
         Returns
         -------
@@ -3622,7 +3874,8 @@ class DiscreteResults(base.LikelihoodModelResults):
         period, assuming that the model is loglinear.
         """
         from statsmodels.discrete.discrete_margins import DiscreteMargins
-        return DiscreteMargins(self, (at, method, atexog, dummy, count))
+        return DiscreteMargins(self, (at, method, atexog, dummy, count,
+                                      chunksize))
 
     def summary(self, yname=None, xname=None, title=None, alpha=.05,
                 yname_list=None):
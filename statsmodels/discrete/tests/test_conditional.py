@@ -322,3 +322,72 @@ def test_conditional_mnlogit_3d():
 
     # Smoke test
     result.summary()
+
+
+def test_logit_batched():
+    # Compare the batched recursion to the denominators of each group,
+    # groups of different sizes with more cases than controls in some
+    np.random.seed(3842)
+    g = np.repeat(np.arange(30), np.tile([3, 4, 7], 10))
+    n = len(g)
+    y = (np.random.uniform(size=n) < 0.6).astype(np.float64)
+    x = np.random.normal(size=(n, 2))
+    offset = np.random.normal(size=n)
+
+    model = ConditionalLogit(y, x, groups=g, offset=offset)
+    for params in np.r_[0.5, -1], np.r_[2, 1]:
+        ll = 0
+        score = 0
+        for k in range(model._n_groups):
+            ofs = model._offset_grp[k]
+            d, h = model._denom_grad(k, params, ofs)
+            ll += (np.dot(model._xy[k], params) + model._endofs[k] -
+                   np.log(d))
+            score += model._xy[k] - h / d
+        assert_allclose(model.loglike(params), ll, rtol=1e-10)
+        assert_allclose(model.score(params), score, rtol=1e-8)
+        ll_grp = [model.loglike_grp(k, params)
+                  for k in range(model._n_groups)]
+        assert_allclose(np.sum(ll_grp), ll, rtol=1e-10)
+
+    # no overflow in the denominators
+    assert np.isfinite(model.loglike(np.r_[300, -300]))
+
+
+def test_poisson_hessian():
+
+    np.random.seed(3842)
+    g = np.repeat(np.arange(20), 5)
+    x = np.random.normal(size=(100, 2))
+    y = np.random.poisson(np.exp(0.5 * x[:, 0]))
+    model = ConditionalPoisson(y, x, groups=g)
+
+    params = np.r_[0.5, -0.2]
+    hess = model.hessian(params)
+    assert_allclose(hess, approx_fprime(params, model.score, centered=True),
+                    rtol=1e-6)
+
+
+def test_conditional_mnlogit_permutations():
+    # Compare to the sum over all permutations of the responses
+    import itertools
+
+    np.random.seed(3842)
+    y = np.r_[0, 1, 2, 2, 1, 0, 2, 1, 1, 0, 0, 2]
+    g = np.r_[0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1]
+    x = np.random.normal(size=(12, 2))
+    model = ConditionalMNLogit(y, x, groups=g)
+
+    params = np.r_[0.5, -1, 1, 0.2]
+    pmat = np.c_[np.zeros(2), params.reshape((2, 2))]
+    lpr = np.dot(x, pmat)
+    ll = 0
+    for ii in np.arange(7), np.arange(7, 12):
+        jj = np.arange(len(ii))
+        denom = sum(np.exp(lpr[ii][jj, p].sum())
+                    for p in itertools.permutations(y[ii]))
+        ll += lpr[ii][jj, y[ii]].sum() - np.log(denom)
+    assert_allclose(model.loglike(params), ll, rtol=1e-10)
+    assert_allclose(model.score(params),
+                    approx_fprime(params, model.loglike, centered=True),
+                    rtol=1e-6)
@@ -554,3 +554,36 @@ class TestZeroInflatedNegativeBinomialP_predict2(object):
         mean2 = ((1 - self.res.predict(which='prob-zero').mean()) *
                  self.res.predict(which='mean-nonzero').mean())
         assert_allclose(mean1, mean2, atol=0.2)
+
+
+@pytest.mark.parametrize('inflation', ['logit', 'probit'])
+@pytest.mark.parametrize('model_class', [sm.ZeroInflatedPoisson,
+                                         sm.ZeroInflatedGeneralizedPoisson,
+                                         sm.ZeroInflatedNegativeBinomialP])
+def test_analytic_derivatives(model_class, inflation):
+    from statsmodels.tools.numdiff import approx_fprime, approx_hess
+    np.random.seed(987125)
+    nobs = 500
+    exog = sm.add_constant(np.random.randn(nobs))
+    exog_infl = sm.add_constant(np.random.randn(nobs))
+    endog = np.random.poisson(np.exp(0.5 + 0.3 * exog[:, 1]))
+    endog[np.random.rand(nobs) < 0.3] = 0
+    mod = model_class(endog, exog, exog_infl=exog_infl, inflation=inflation)
+    params = np.array([-0.5, 0.2, 0.5, 0.3, 0.1])[:mod.k_inflate + mod.k_exog]
+
+    score_obs = mod.score_obs(params)
+    assert_allclose(score_obs,
+                    approx_fprime(params, mod.loglikeobs, centered=True),
+                    rtol=1e-6, atol=1e-7)
+    assert_allclose(mod.score(params), score_obs.sum(0))
+    hess = mod.hessian(params)
+    assert_allclose(hess, approx_hess(params, mod.loglike), rtol=1e-4,
+                    atol=1e-4 * np.abs(hess).max())
+    # the numerical derivative of the analytic score is more precise
+    assert_allclose(hess, approx_fprime(params, mod.score, centered=True),
+                    rtol=1e-6, atol=1e-6)
+    # cached derivatives are not reused for other params
+    params = params * 0.9
+    assert_allclose(mod.hessian(params),
+                    approx_fprime(params, mod.score, centered=True),
+                    rtol=1e-6, atol=1e-6)
@@ -33,6 +33,7 @@ from .results.results_discrete import Spector, DiscreteL1, RandHIE, Anes
 from statsmodels.tools.sm_exceptions import (PerfectSeparationError,
                                              SpecificationWarning)
 from scipy.stats import nbinom
+from statsmodels.tools.numdiff import approx_fprime
 
 try:
     import cvxopt  # noqa:F401
@@ -1418,6 +1419,40 @@ class TestMNLogitLBFGSBaseZero(CheckMNLogitBaseZero):
         cls.res2 = res2
 
 
+class TestMNLogitNCGBaseZero(CheckMNLogitBaseZero):
+    @classmethod
+    def setup_class(cls):
+        data = sm.datasets.anes96.load(as_pandas=False)
+        cls.data = data
+        exog = data.exog
+        exog = sm.add_constant(exog, prepend=False)
+        # small chunks to check the chunked hessian
+        mymodel = MNLogit(data.endog, exog, chunksize=100)
+        cls.res1 = mymodel.fit(method="ncg", disp=0, maxiter=100,
+                               avextol=1e-12)
+        res2 = Anes.mnlogit_basezero
+        cls.res2 = res2
+
+
+def test_mnlogit_hessian():
+    data = sm.datasets.anes96.load(as_pandas=False)
+    exog = sm.add_constant(data.exog, prepend=False)
+    mod = MNLogit(data.endog, exog)
+    params = Anes.mnlogit_basezero.params.ravel(order='F')
+    hess = mod.hessian(params)
+    hess_chunked = MNLogit(data.endog, exog, chunksize=7).hessian(params)
+    assert_allclose(hess_chunked, hess, rtol=1e-12)
+    assert_allclose(hess, approx_fprime(params, mod.score, centered=True),
+                    rtol=1e-6, atol=1e-6 * np.abs(hess).max())
+    vec = np.linspace(-1, 1, len(params))
+    assert_allclose(mod.hessian_dot(params, vec), hess.dot(vec), rtol=1e-10)
+
+    # large linear predictors do not overflow
+    loglike = mod.loglike(params * 1000)
+    assert np.isfinite(loglike)
+    assert_allclose(mod.loglike_and_score(params * 1000)[0], loglike)
+
+
 def test_perfect_prediction():
     cur_dir = os.path.dirname(os.path.abspath(__file__))
     iris_dir = os.path.join(cur_dir, '..', '..', 'genmod', 'tests', 'results')
@@ -2410,3 +2445,35 @@ def test_t_test():
 
     assert_allclose(t1.effect, t2.effect)
     assert_allclose(f1.statistic, f2.statistic)
+
+
+@pytest.mark.parametrize('model_class', [Logit, Poisson])
+@pytest.mark.parametrize('cov_type', ['nonrobust', 'HC0'])
+def test_compress(model_class, cov_type):
+    np.random.seed(987125)
+    nobs = 2000
+    group = np.random.randint(0, 4, size=(nobs, 2))
+    exog = np.column_stack((np.ones(nobs), group[:, 0] == 1,
+                            group[:, 0] == 2, group[:, 1])).astype(float)
+    linpred = exog.dot([-0.5, 0.3, -0.2, 0.1])
+    kwds = {}
+    if model_class is Logit:
+        endog = np.random.binomial(1, 1 / (1 + np.exp(-linpred)))
+    else:
+        kwds['exposure'] = np.random.randint(1, 3, size=nobs)
+        endog = np.random.poisson(np.exp(linpred) * kwds['exposure'])
+    res1 = model_class(endog, exog, **kwds).fit(disp=0, cov_type=cov_type)
+    mod = model_class(endog, exog, compress=True, **kwds)
+    # the exposure doubles the number of unique rows
+    n_unique = 12 if model_class is Logit else 24
+    assert_equal(mod._compressed_model.nobs, n_unique)
+    res2 = mod.fit(disp=0, cov_type=cov_type)
+    for attr in ['params', 'bse', 'llf', 'fittedvalues', 'resid_pearson']:
+        assert_allclose(getattr(res2, attr), getattr(res1, attr),
+                        rtol=1e-10, atol=1e-12, err_msg=attr)
+    assert_allclose(res2.llnull, res1.llnull, rtol=1e-7)
+    assert_equal(res2.cov_type, cov_type)
+    assert_allclose(res2.predict(exog[:5]), res1.predict(exog[:5]),
+                    rtol=1e-10)
+    assert_allclose(res2.get_margeff().margeff, res1.get_margeff().margeff,
+                    rtol=1e-8)
@@ -7,8 +7,13 @@ Author: Josef Perktold
 
 import numpy as np
 from numpy.testing import assert_allclose
+import pytest
+
+from statsmodels.discrete import discrete_margins
 from statsmodels.discrete.discrete_model import (Poisson, NegativeBinomial,
-                                                 NegativeBinomialP)
+                                                 NegativeBinomialP, Logit,
+                                                 Probit, MNLogit)
+from statsmodels.tools.numdiff import approx_fprime
 from statsmodels.tools.tools import add_constant
 
 import statsmodels.discrete.tests.results.results_count_margins as res_stata
@@ -126,3 +131,64 @@ class TestNegBinPMargin(CheckMarginMixin):
         cls.res1 = res_stata.results_negbin_margins_cont
         cls.rtol_fac = 5e1
         # negbin has lower agreement with Stata in this case
+
+
+@pytest.mark.parametrize('model_class', [Logit, Probit, Poisson])
+@pytest.mark.parametrize('at', ['overall', 'mean', 'all'])
+@pytest.mark.parametrize('method', ['dydx', 'eydx'])
+def test_margeff_analytic(model_class, at, method, monkeypatch):
+    # the analytic derivatives agree with the numerical derivatives
+    np.random.seed(987125)
+    nobs = 300
+    x = np.column_stack((np.random.randn(nobs, 2),
+                         np.random.randint(0, 2, nobs),
+                         np.random.poisson(2, nobs), np.ones(nobs)))
+    linpred = x[:, :4].dot([0.5, -0.5, 0.5, 0.2]) - 0.5
+    if model_class is Poisson:
+        y = np.random.poisson(np.exp(linpred))
+    else:
+        y = (np.random.rand(nobs) < 1 / (1 + np.exp(-linpred))).astype(float)
+    res = model_class(y, x).fit(disp=0)
+    kwds = dict(at=at, method=method, dummy=True, count=True)
+
+    marge = res.get_margeff(chunksize=77, **kwds)
+    monkeypatch.setattr(discrete_margins, '_analytic_margeff',
+                        lambda model: None)
+    marge_num = res.get_margeff(**kwds)
+    assert_allclose(marge.margeff, marge_num.margeff, rtol=1e-7)
+    if at != 'all':
+        assert_allclose(marge.margeff_cov, marge_num.margeff_cov, rtol=1e-5,
+                        atol=1e-12)
+
+
+def test_margeff_mnlogit_analytic():
+    np.random.seed(987125)
+    nobs = 300
+    x = np.column_stack((np.random.randn(nobs, 2),
+                         np.random.randint(0, 2, nobs), np.ones(nobs)))
+    y = np.random.randint(0, 3, nobs)
+    res = MNLogit(y, x).fit(disp=0)
+    model, params = res.model, res.params
+
+    marge = res.get_margeff(dummy=True, chunksize=77)
+
+    def margeff(p):
+        p = p.reshape(params.shape, order='F')
+        prob = model.predict(p)
+        x1 = x.copy()
+        x1[:, 2] = 1
+        x0 = x.copy()
+        x0[:, 2] = 0
+        dummy = (model.predict(p, x1) - model.predict(p, x0)).mean(0)
+        pdf = prob[:, :, None]
+        beta = np.column_stack((np.zeros(x.shape[1]), p)).T
+        dydx = pdf * (beta[None] - (pdf * beta[None]).sum(1)[:, None])
+        dydx = dydx.mean(0)
+        dydx[:, 2] = dummy
+        return dydx.T[:-1].ravel('F')
+
+    assert_allclose(marge.margeff.ravel('F'), margeff(params.ravel('F')),
+                    rtol=1e-8)
+    jac = approx_fprime(params.ravel('F'), margeff, centered=True)
+    cov = jac.dot(res.cov_params()).dot(jac.T)
+    assert_allclose(marge.margeff_cov, cov, rtol=1e-5, atol=1e-12)
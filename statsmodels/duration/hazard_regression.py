@@ -126,9 +126,9 @@ class PHSurvivalTime(object):
         if max(nv) != min(nv):
             raise ValueError("endog, status, strata, and " +
                              "entry must all have the same length")
-        if min(time) < 0:
+        if np.min(time) < 0:
             raise ValueError("endog must be non-negative")
-        if min(entry) < 0:
+        if np.min(entry) < 0:
             raise ValueError("entry time must be non-negative")
 
         # In Stata, this is entry >= time, in R it is >.
@@ -137,12 +137,9 @@ class PHSurvivalTime(object):
                              "after event or censoring times")
 
         # Get the row indices for the cases in each stratum
-        stu = np.unique(strata)
-        #sth = {x: [] for x in stu} # needs >=2.7
-        sth = dict([(x, []) for x in stu])
-        for i,k in enumerate(strata):
-            sth[k].append(i)
-        stratum_rows = [np.asarray(sth[k], dtype=np.int32) for k in stu]
+        stu, stix = np.unique(strata, return_inverse=True)
+        ii = np.argsort(stix, kind="mergesort").astype(np.int32)
+        stratum_rows = np.split(ii, np.cumsum(np.bincount(stix))[:-1])
         stratum_names = stu
 
         # Remove strata with no events
@@ -158,20 +155,18 @@ class PHSurvivalTime(object):
         # Remove subjects whose entry time occurs after the last event
         # in their stratum.
         for stx,ix in enumerate(stratum_rows):
-            last_failure = max(time[ix][status[ix] == 1])
+            last_failure = np.max(time[ix][status[ix] == 1])
 
             # Stata uses < here, R uses <=
-            ii = [i for i,t in enumerate(entry[ix]) if
-                  t <= last_failure]
+            ii = np.flatnonzero(entry[ix] <= last_failure)
             stratum_rows[stx] = stratum_rows[stx][ii]
 
         # Remove subjects who are censored before the first event in
         # their stratum.
         for stx,ix in enumerate(stratum_rows):
-            first_failure = min(time[ix][status[ix] == 1])
+            first_failure = np.min(time[ix][status[ix] == 1])
 
-            ii = [i for i,t in enumerate(time[ix]) if
-                  t >= first_failure]
+            ii = np.flatnonzero(time[ix] >= first_failure)
             stratum_rows[stx] = stratum_rows[stx][ii]
 
         # Order by time within each stratum
@@ -205,20 +200,35 @@ class PHSurvivalTime(object):
 
         # Precalculate some indices needed to fit Cox models.
         # Distinct failure times within a stratum are always taken to
-        # be sorted in ascending order.
+        # be sorted in ascending order.  Since the cases are sorted by
+        # time, the risk set at the k^th unique failure time in a
+        # stratum consists of the cases with enter_ix >= k, except for
+        # those with exit_ix > k.
         #
-        # ufailt_ix[stx][k] is a list of indices for subjects who fail
-        # at the k^th sorted unique failure time in stratum stx
+        # ufailt[stx] contains the unique failure times in stratum stx
         #
-        # risk_enter[stx][k] is a list of indices for subjects who
-        # enter the risk set at the k^th sorted unique failure time in
-        # stratum stx
+        # enter_ix[stx][i] is the index of the last unique failure time
+        # at which case i is at risk
         #
-        # risk_exit[stx][k] is a list of indices for subjects who exit
-        # the risk set at the k^th sorted unique failure time in
-        # stratum stx
-        self.ufailt_ix, self.risk_enter, self.risk_exit, self.ufailt =\
-            [], [], [], []
+        # exit_ix[stx][i] is the index of the first unique failure time
+        # at which case i is at risk
+        #
+        # fail_ix[stx] contains the indices of the cases that fail, in
+        # order of their failure times, and fail_time_ix[stx] the index
+        # of the unique failure time at which they fail
+        #
+        # nfail[stx][k] is the number of cases that fail at the k^th
+        # unique failure time
+        #
+        # fail_rank[stx] contains the positions of the failures among
+        # the failures with the same failure time, used for the Efron
+        # method of handling ties
+        self.ufailt, self.enter_ix, self.exit_ix = [], [], []
+        self.fail_ix, self.fail_time_ix, self.nfail = [], [], []
+        self.fail_rank = []
+
+        # Whether any cases in the stratum are left truncated
+        self._truncated = []
 
         for stx in range(self.nstrat):
 
@@ -230,35 +240,81 @@ class PHSurvivalTime(object):
             uft = np.unique(ft)
             nuft = len(uft)
 
-            # Indices of cases that fail at each unique failure time
-            #uft_map = {x:i for i,x in enumerate(uft)} # requires >=2.7
-            uft_map = dict([(x, i) for i,x in enumerate(uft)]) # 2.6
-            uft_ix = [[] for k in range(nuft)]
-            for ix,ti in zip(ift,ft):
-                uft_ix[uft_map[ti]].append(ix)
-
-            # Indices of cases (failed or censored) that enter the
-            # risk set at each unique failure time.
-            risk_enter1 = [[] for k in range(nuft)]
-            for i,t in enumerate(self.time_s[stx]):
-                ix = np.searchsorted(uft, t, "right") - 1
-                if ix >= 0:
-                    risk_enter1[ix].append(i)
-
-            # Indices of cases (failed or censored) that exit the
-            # risk set at each unique failure time.
-            risk_exit1 = [[] for k in range(nuft)]
-            for i,t in enumerate(self.entry_s[stx]):
-                ix = np.searchsorted(uft, t)
-                risk_exit1[ix].append(i)
+            fti = np.searchsorted(uft, ft)
+            nfail = np.bincount(fti, minlength=nuft)
+            rank = np.arange(len(ift)) - np.searchsorted(fti, fti)
+
+            enter_ix = np.searchsorted(uft, self.time_s[stx], "right") - 1
+            exit_ix = np.searchsorted(uft, self.entry_s[stx])
 
             self.ufailt.append(uft)
-            self.ufailt_ix.append([np.asarray(x, dtype=np.int32)
-                                   for x in uft_ix])
-            self.risk_enter.append([np.asarray(x, dtype=np.int32)
-                                    for x in risk_enter1])
-            self.risk_exit.append([np.asarray(x, dtype=np.int32)
-                                   for x in risk_exit1])
+            self.enter_ix.append(enter_ix)
+            self.exit_ix.append(exit_ix)
+            self.fail_ix.append(ift)
+            self.fail_time_ix.append(fti)
+            self.nfail.append(nfail)
+            self.fail_rank.append(rank)
+
+            self._truncated.append(np.any(exit_ix > 0))
+
+    @property
+    def ufailt_ix(self):
+        """
+        ufailt_ix[stx][k] is an array of indices for subjects who fail
+        at the k^th sorted unique failure time in stratum stx
+        """
+        if not hasattr(self, "_ufailt_ix"):
+            self._ufailt_ix = []
+            for stx in range(self.nstrat):
+                fti = self.fail_time_ix[stx]
+                bounds = np.searchsorted(fti,
+                                         np.arange(1, len(self.ufailt[stx])))
+                ix = self.fail_ix[stx].astype(np.int32)
+                self._ufailt_ix.append(np.split(ix, bounds))
+        return self._ufailt_ix
+
+    @property
+    def risk_enter(self):
+        """
+        risk_enter[stx][k] is an array of indices for subjects who enter
+        the risk set at the k^th sorted unique failure time in stratum
+        stx
+        """
+        if not hasattr(self, "_risk_enter"):
+            self._risk_enter = []
+            for stx in range(self.nstrat):
+                enter_ix = self.enter_ix[stx]
+                ii = np.flatnonzero(enter_ix >= 0)
+                bounds = np.searchsorted(enter_ix[ii],
+                                         np.arange(1, len(self.ufailt[stx])))
+                self._risk_enter.append(
+                    np.split(ii.astype(np.int32), bounds))
+        return self._risk_enter
+
+    @property
+    def risk_exit(self):
+        """
+        risk_exit[stx][k] is an array of indices for subjects who exit
+        the risk set at the k^th sorted unique failure time in stratum
+        stx
+        """
+        if not hasattr(self, "_risk_exit"):
+            self._risk_exit = []
+            for stx in range(self.nstrat):
+                exit_ix = self.exit_ix[stx]
+                ii = np.argsort(exit_ix, kind="mergesort")
+                bounds = np.searchsorted(exit_ix[ii],
+                                         np.arange(1, len(self.ufailt[stx])))
+                self._risk_exit.append(np.split(ii.astype(np.int32), bounds))
+        return self._risk_exit
+
+
+def _reverse_cumsum(x):
+    """
+    Returns the sums of x[k:] for each position k.
+    """
+
+    return np.cumsum(x[::-1])[::-1]
 
 
 class PHReg(model.LikelihoodModel):
@@ -334,9 +390,9 @@ class PHReg(model.LikelihoodModel):
         # TODO: not used?
         self.missing = missing
 
-        self.df_resid = (np.float(self.exog.shape[0] -
-                                  np.linalg.matrix_rank(self.exog)))
-        self.df_model = np.float(np.linalg.matrix_rank(self.exog))
+        rank = np.linalg.matrix_rank(self.exog)
+        self.df_resid = np.float(self.exog.shape[0] - rank)
+        self.df_model = np.float(rank)
 
         ties = ties.lower()
         if ties not in ("efron", "breslow"):
@@ -566,53 +622,90 @@ class PHReg(model.LikelihoodModel):
         else:
             return self.efron_hessian(params)
 
-    def breslow_loglike(self, params):
+    def _stratum_linpred(self, params, stx, center=True):
         """
-        Returns the value of the log partial likelihood function
-        evaluated at `params`, using the Breslow method to handle tied
-        times.
+        Returns the linear predictor and the hazard multipliers
+        (exponentiated linear predictor) for the cases in stratum
+        `stx`.  If `center` is True, the linear predictor is shifted
+        so that its maximum is zero.
         """
 
         surv = self.surv
+        linpred = np.dot(surv.exog_s[stx], params)
+        if surv.offset_s is not None:
+            linpred += surv.offset_s[stx]
+        if center:
+            linpred -= linpred.max()
+        e_linpred = np.exp(linpred)
 
-        like = 0.
+        return linpred, e_linpred
 
-        # Loop over strata
-        for stx in range(surv.nstrat):
+    def _risk_set_sums(self, stx, e_linpred, exog=True):
+        """
+        Returns the sums of the hazard multipliers, and of the hazard
+        multipliers times exog, over the risk set (xp0, xp1) and over
+        the failures (xp0f, xp1f) at each unique failure time in
+        stratum `stx`.  If `exog` is False, xp1 and xp1f are None.
+        """
+
+        surv = self.surv
+        nuft = len(surv.ufailt[stx])
+        ift = surv.fail_ix[stx]
 
-            uft_ix = surv.ufailt_ix[stx]
+        elx = [e_linpred]
+        if exog:
             exog_s = surv.exog_s[stx]
-            nuft = len(uft_ix)
+            elx += [e_linpred * exog_s[:, j] for j in range(exog_s.shape[1])]
 
-            linpred = np.dot(exog_s, params)
-            if surv.offset_s is not None:
-                linpred += surv.offset_s[stx]
-            linpred -= linpred.max()
-            e_linpred = np.exp(linpred)
+        xp, xpf = [], []
+        for v in elx:
+            # Cases whose last time at risk is at or after each failure
+            # time, less the left truncated cases that have not yet
+            # entered.
+            u = _reverse_cumsum(
+                np.bincount(surv.enter_ix[stx], weights=v, minlength=nuft))
+            if surv._truncated[stx]:
+                u[:-1] -= _reverse_cumsum(np.bincount(
+                    surv.exit_ix[stx], weights=v, minlength=nuft))[1:]
+            xp.append(u)
 
-            xp0 = 0.
+            # Cases that fail at each failure time
+            xpf.append(np.bincount(surv.fail_time_ix[stx], weights=v[ift],
+                                   minlength=nuft))
 
-            # Iterate backward through the unique failure times.
-            for i in range(nuft)[::-1]:
+        if exog:
+            return (xp[0], np.column_stack(xp[1:]), xpf[0],
+                    np.column_stack(xpf[1:]))
+        return xp[0], None, xpf[0], None
 
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                xp0 += e_linpred[ix].sum()
+    def _window_sums(self, stx, a):
+        """
+        Returns, for each case in stratum `stx`, the sum of `a` over
+        the unique failure times at which the case is at risk.  The
+        first axis of `a` corresponds to the unique failure times.
+        """
 
-                # Account for all cases that fail at this point.
-                ix = uft_ix[i]
-                like += (linpred[ix] - np.log(xp0)).sum()
+        surv = self.surv
+        ca = np.cumsum(a, axis=0)
+        ca = np.concatenate((np.zeros((1,) + a.shape[1:]), ca))
+        return ca[surv.enter_ix[stx] + 1] - ca[surv.exit_ix[stx]]
 
-                # Update for cases leaving the risk set.
-                ix = surv.risk_exit[stx][i]
-                xp0 -= e_linpred[ix].sum()
+    def _efron_denom(self, stx, xp0, xp0f):
+        """
+        Returns the Efron weights J and the corresponding risk set
+        sums `xp0 - J*xp0f` for each failure in stratum `stx`.
+        """
 
-        return like
+        surv = self.surv
+        fti = surv.fail_time_ix[stx]
+        J = surv.fail_rank[stx] / surv.nfail[stx][fti]
+        c0 = xp0[fti] - J * xp0f[fti]
+        return J, c0
 
-    def efron_loglike(self, params):
+    def breslow_loglike(self, params):
         """
         Returns the value of the log partial likelihood function
-        evaluated at `params`, using the Efron method to handle tied
+        evaluated at `params`, using the Breslow method to handle tied
         times.
         """
 
@@ -623,37 +716,37 @@ class PHReg(model.LikelihoodModel):
         # Loop over strata
         for stx in range(surv.nstrat):
 
-            # exog and linear predictor for this stratum
-            exog_s = surv.exog_s[stx]
-            linpred = np.dot(exog_s, params)
-            if surv.offset_s is not None:
-                linpred += surv.offset_s[stx]
-            linpred -= linpred.max()
-            e_linpred = np.exp(linpred)
+            linpred, e_linpred = self._stratum_linpred(params, stx)
+            xp0, _, _, _ = self._risk_set_sums(stx, e_linpred, exog=False)
+
+            # Each case that fails at a given time contributes the log
+            # risk set total at that time.
+            like += linpred[surv.fail_ix[stx]].sum()
+            like -= np.dot(surv.nfail[stx], np.log(xp0))
 
-            xp0 = 0.
+        return like
+
+    def efron_loglike(self, params):
+        """
+        Returns the value of the log partial likelihood function
+        evaluated at `params`, using the Efron method to handle tied
+        times.
+        """
 
-            # Iterate backward through the unique failure times.
-            uft_ix = surv.ufailt_ix[stx]
-            nuft = len(uft_ix)
-            for i in range(nuft)[::-1]:
+        surv = self.surv
 
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                xp0 += e_linpred[ix].sum()
-                xp0f = e_linpred[uft_ix[i]].sum()
+        like = 0.
 
-                # Account for all cases that fail at this point.
-                ix = uft_ix[i]
-                like += linpred[ix].sum()
+        # Loop over strata
+        for stx in range(surv.nstrat):
 
-                m = len(ix)
-                J = np.arange(m, dtype=np.float64) / m
-                like -= np.log(xp0 - J*xp0f).sum()
+            linpred, e_linpred = self._stratum_linpred(params, stx)
+            xp0, _, xp0f, _ = self._risk_set_sums(stx, e_linpred,
+                                                  exog=False)
+            _, c0 = self._efron_denom(stx, xp0, xp0f)
 
-                # Update for cases leaving the risk set.
-                ix = surv.risk_exit[stx][i]
-                xp0 -= e_linpred[ix].sum()
+            like += linpred[surv.fail_ix[stx]].sum()
+            like -= np.log(c0).sum()
 
         return like
 
@@ -670,43 +763,11 @@ class PHReg(model.LikelihoodModel):
         # Loop over strata
         for stx in range(surv.nstrat):
 
-            # Indices of subjects in the stratum
-            strat_ix = surv.stratum_rows[stx]
-
-            # Unique failure times in the stratum
-            uft_ix = surv.ufailt_ix[stx]
-            nuft = len(uft_ix)
-
-            # exog and linear predictor for the stratum
-            exog_s = surv.exog_s[stx]
-            linpred = np.dot(exog_s, params)
-            if surv.offset_s is not None:
-                linpred += surv.offset_s[stx]
-            linpred -= linpred.max()
-            e_linpred = np.exp(linpred)
-
-            xp0, xp1 = 0., 0.
+            _, e_linpred = self._stratum_linpred(params, stx)
+            xp0, xp1, _, _ = self._risk_set_sums(stx, e_linpred)
 
-            # Iterate backward through the unique failure times.
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                if len(ix) > 0:
-                    v = exog_s[ix,:]
-                    xp0 += e_linpred[ix].sum()
-                    xp1 += (e_linpred[ix][:,None] * v).sum(0)
-
-                # Account for all cases that fail at this point.
-                ix = uft_ix[i]
-                grad += (exog_s[ix,:] - xp1 / xp0).sum(0)
-
-                # Update for cases leaving the risk set.
-                ix = surv.risk_exit[stx][i]
-                if len(ix) > 0:
-                    v = exog_s[ix,:]
-                    xp0 -= e_linpred[ix].sum()
-                    xp1 -= (e_linpred[ix][:,None] * v).sum(0)
+            grad += surv.exog_s[stx][surv.fail_ix[stx], :].sum(0)
+            grad -= np.dot(surv.nfail[stx] / xp0, xp1)
 
         return grad
 
@@ -723,53 +784,18 @@ class PHReg(model.LikelihoodModel):
         # Loop over strata
         for stx in range(surv.nstrat):
 
-            # Indices of cases in the stratum
-            strat_ix = surv.stratum_rows[stx]
+            _, e_linpred = self._stratum_linpred(params, stx)
+            xp0, xp1, xp0f, xp1f = self._risk_set_sums(stx, e_linpred)
+            J, c0 = self._efron_denom(stx, xp0, xp0f)
 
-            # exog and linear predictor of the stratum
-            exog_s = surv.exog_s[stx]
-            linpred = np.dot(exog_s, params)
-            if surv.offset_s is not None:
-                linpred += surv.offset_s[stx]
-            linpred -= linpred.max()
-            e_linpred = np.exp(linpred)
+            # Sum the Efron terms over the failures at each time
+            fti = surv.fail_time_ix[stx]
+            nuft = len(xp0)
+            a = np.bincount(fti, weights=1 / c0, minlength=nuft)
+            b = np.bincount(fti, weights=J / c0, minlength=nuft)
 
-            xp0, xp1 = 0., 0.
-
-            # Iterate backward through the unique failure times.
-            uft_ix = surv.ufailt_ix[stx]
-            nuft = len(uft_ix)
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                if len(ix) > 0:
-                    v = exog_s[ix,:]
-                    xp0 += e_linpred[ix].sum()
-                    xp1 += (e_linpred[ix][:,None] * v).sum(0)
-                ixf = uft_ix[i]
-                if len(ixf) > 0:
-                    v = exog_s[ixf,:]
-                    xp0f = e_linpred[ixf].sum()
-                    xp1f = (e_linpred[ixf][:,None] * v).sum(0)
-
-                    # Consider all cases that fail at this point.
-                    grad += v.sum(0)
-
-                    m = len(ixf)
-                    J = np.arange(m, dtype=np.float64) / m
-                    numer = xp1 - np.outer(J, xp1f)
-                    denom = xp0 - np.outer(J, xp0f)
-                    ratio = numer / denom
-                    rsum = ratio.sum(0)
-                    grad -= rsum
-
-                # Update for cases leaving the risk set.
-                ix = surv.risk_exit[stx][i]
-                if len(ix) > 0:
-                    v = exog_s[ix,:]
-                    xp0 -= e_linpred[ix].sum()
-                    xp1 -= (e_linpred[ix][:,None] * v).sum(0)
+            grad += surv.exog_s[stx][surv.fail_ix[stx], :].sum(0)
+            grad -= np.dot(a, xp1) - np.dot(b, xp1f)
 
         return grad
 
@@ -786,43 +812,17 @@ class PHReg(model.LikelihoodModel):
         # Loop over strata
         for stx in range(surv.nstrat):
 
-            uft_ix = surv.ufailt_ix[stx]
-            nuft = len(uft_ix)
-
             exog_s = surv.exog_s[stx]
+            _, e_linpred = self._stratum_linpred(params, stx)
+            xp0, xp1, _, _ = self._risk_set_sums(stx, e_linpred)
+            m = surv.nfail[stx]
 
-            linpred = np.dot(exog_s, params)
-            if surv.offset_s is not None:
-                linpred += surv.offset_s[stx]
-            linpred -= linpred.max()
-            e_linpred = np.exp(linpred)
+            # The risk set second moments enter through each case's
+            # total weight over the times at which it is at risk.
+            w = e_linpred * self._window_sums(stx, m / xp0)
+            hess += np.dot(exog_s.T * w, exog_s)
+            hess -= np.dot(xp1.T * (m / xp0**2), xp1)
 
-            xp0, xp1, xp2 = 0., 0., 0.
-
-            # Iterate backward through the unique failure times.
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                if len(ix) > 0:
-                    xp0 += e_linpred[ix].sum()
-                    v = exog_s[ix,:]
-                    xp1 += (e_linpred[ix][:,None] * v).sum(0)
-                    elx = e_linpred[ix]
-                    xp2 += np.einsum("ij,ik,i->jk", v, v, elx)
-
-                # Account for all cases that fail at this point.
-                m = len(uft_ix[i])
-                hess += m*(xp2 / xp0  - np.outer(xp1, xp1) / xp0**2)
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_exit[stx][i]
-                if len(ix) > 0:
-                    xp0 -= e_linpred[ix].sum()
-                    v = exog_s[ix,:]
-                    xp1 -= (e_linpred[ix][:,None] * v).sum(0)
-                    elx = e_linpred[ix]
-                    xp2 -= np.einsum("ij,ik,i->jk", v, v, elx)
         return -hess
 
     def efron_hessian(self, params):
@@ -840,54 +840,30 @@ class PHReg(model.LikelihoodModel):
         for stx in range(surv.nstrat):
 
             exog_s = surv.exog_s[stx]
-
-            linpred = np.dot(exog_s, params)
-            if surv.offset_s is not None:
-                linpred += surv.offset_s[stx]
-            linpred -= linpred.max()
-            e_linpred = np.exp(linpred)
-
-            xp0, xp1, xp2 = 0., 0., 0.
-
-            # Iterate backward through the unique failure times.
-            uft_ix = surv.ufailt_ix[stx]
-            nuft = len(uft_ix)
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                if len(ix) > 0:
-                    xp0 += e_linpred[ix].sum()
-                    v = exog_s[ix,:]
-                    xp1 += (e_linpred[ix][:,None] * v).sum(0)
-                    elx = e_linpred[ix]
-                    xp2 += np.einsum("ij,ik,i->jk", v, v, elx)
-
-                ixf = uft_ix[i]
-                if len(ixf) > 0:
-                    v = exog_s[ixf,:]
-                    xp0f = e_linpred[ixf].sum()
-                    xp1f = (e_linpred[ixf][:,None] * v).sum(0)
-                    elx = e_linpred[ixf]
-                    xp2f = np.einsum("ij,ik,i->jk", v, v, elx)
-
-                # Account for all cases that fail at this point.
-                m = len(uft_ix[i])
-                J = np.arange(m, dtype=np.float64) / m
-                c0 = xp0 - J*xp0f
-                hess += xp2 * np.sum(1 / c0)
-                hess -= xp2f * np.sum(J / c0)
-                mat = (xp1[None, :] - np.outer(J, xp1f)) / c0[:, None]
-                hess -= np.einsum("ij,ik->jk", mat, mat)
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_exit[stx][i]
-                if len(ix) > 0:
-                    xp0 -= e_linpred[ix].sum()
-                    v = exog_s[ix,:]
-                    xp1 -= (e_linpred[ix][:,None] * v).sum(0)
-                    elx = e_linpred[ix]
-                    xp2 -= np.einsum("ij,ik,i->jk", v, v, elx)
+            _, e_linpred = self._stratum_linpred(params, stx)
+            xp0, xp1, xp0f, xp1f = self._risk_set_sums(stx, e_linpred)
+            J, c0 = self._efron_denom(stx, xp0, xp0f)
+
+            fti = surv.fail_time_ix[stx]
+            ift = surv.fail_ix[stx]
+            nuft = len(xp0)
+            a = np.bincount(fti, weights=1 / c0, minlength=nuft)
+            b = np.bincount(fti, weights=J / c0, minlength=nuft)
+            a2 = np.bincount(fti, weights=1 / c0**2, minlength=nuft)
+            b2 = np.bincount(fti, weights=J / c0**2, minlength=nuft)
+            c2 = np.bincount(fti, weights=J**2 / c0**2, minlength=nuft)
+
+            w = e_linpred * self._window_sums(stx, a)
+            hess += np.dot(exog_s.T * w, exog_s)
+            wf = e_linpred[ift] * b[fti]
+            hess -= np.dot(exog_s[ift, :].T * wf, exog_s[ift, :])
+
+            # Outer products of (xp1 - J*xp1f) / c0, summed over the
+            # failures
+            hess -= np.dot(xp1.T * a2, xp1)
+            mat = np.dot(xp1.T * b2, xp1f)
+            hess += mat + mat.T
+            hess -= np.dot(xp1f.T * c2, xp1f)
 
         return -hess
 
@@ -967,56 +943,34 @@ class PHReg(model.LikelihoodModel):
         # Use to set undefined values to NaN.
         mask = np.zeros(self.exog.shape[0], dtype=np.int32)
 
-        w_avg = self.weighted_covariate_averages(params)
-
         # Loop over strata
         for stx in range(surv.nstrat):
 
-            uft_ix = surv.ufailt_ix[stx]
             exog_s = surv.exog_s[stx]
-            nuft = len(uft_ix)
             strat_ix = surv.stratum_rows[stx]
 
-            xp0 = 0.
+            _, e_linpred = self._stratum_linpred(params, stx)
+            xp0, xp1, _, _ = self._risk_set_sums(stx, e_linpred)
+            w_avg = xp1 / xp0[:, None]
 
-            linpred = np.dot(exog_s, params)
-            if surv.offset_s is not None:
-                linpred += surv.offset_s[stx]
-            linpred -= linpred.max()
-            e_linpred = np.exp(linpred)
-
-            at_risk_ix = set([])
-
-            # Iterate backward through the unique failure times.
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                at_risk_ix |= set(ix)
-                xp0 += e_linpred[ix].sum()
-
-                atr_ix = list(at_risk_ix)
-                leverage = exog_s[atr_ix, :] - w_avg[stx][i, :]
-
-                # Event indicators
-                d = np.zeros(exog_s.shape[0])
-                d[uft_ix[i]] = 1
-
-                # The increment in the cumulative hazard
-                dchaz = len(uft_ix[i]) / xp0
+            # The increment in the cumulative hazard
+            dchaz = surv.nfail[stx] / xp0
 
-                # Piece of the martingale residual
-                mrp = d[atr_ix] - e_linpred[atr_ix] * dchaz
+            # Contribution of each failure at its failure time
+            ift = surv.fail_ix[stx]
+            fti = surv.fail_time_ix[stx]
+            score_resid[strat_ix[ift], :] = exog_s[ift, :] - w_avg[fti, :]
 
-                # Update the score residuals
-                ii = strat_ix[atr_ix]
-                score_resid[ii,:] += leverage * mrp[:, None]
-                mask[ii] = 1
+            # Contribution of the cumulative hazard over the times at
+            # which each case is at risk
+            h = self._window_sums(stx, dchaz)
+            hx = self._window_sums(stx, dchaz[:, None] * w_avg)
+            score_resid[strat_ix, :] -= (e_linpred[:, None] *
+                                         (exog_s * h[:, None] - hx))
 
-                # Update for cases leaving the risk set.
-                ix = surv.risk_exit[stx][i]
-                at_risk_ix -= set(ix)
-                xp0 -= e_linpred[ix].sum()
+            # Cases that are never at risk have undefined residuals
+            at_risk = surv.exit_ix[stx] <= surv.enter_ix[stx]
+            mask[strat_ix[at_risk]] = 1
 
         jj = np.flatnonzero(mask == 0)
         if len(jj) > 0:
@@ -1050,40 +1004,13 @@ class PHReg(model.LikelihoodModel):
         surv = self.surv
 
         averages = []
-        xp0, xp1 = 0., 0.
 
         # Loop over strata
         for stx in range(surv.nstrat):
 
-            uft_ix = surv.ufailt_ix[stx]
-            exog_s = surv.exog_s[stx]
-            nuft = len(uft_ix)
-
-            average_s = np.zeros((len(uft_ix), exog_s.shape[1]),
-                                  dtype=np.float64)
-
-            linpred = np.dot(exog_s, params)
-            if surv.offset_s is not None:
-                linpred += surv.offset_s[stx]
-            linpred -= linpred.max()
-            e_linpred = np.exp(linpred)
-
-            # Iterate backward through the unique failure times.
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                xp0 += e_linpred[ix].sum()
-                xp1 += np.dot(e_linpred[ix], exog_s[ix, :])
-
-                average_s[i, :] = xp1 / xp0
-
-                # Update for cases leaving the risk set.
-                ix = surv.risk_exit[stx][i]
-                xp0 -= e_linpred[ix].sum()
-                xp1 -= np.dot(e_linpred[ix], exog_s[ix, :])
-
-            averages.append(average_s)
+            _, e_linpred = self._stratum_linpred(params, stx)
+            xp0, xp1, _, _ = self._risk_set_sums(stx, e_linpred)
+            averages.append(xp1 / xp0[:, None])
 
         return averages
 
@@ -1118,32 +1045,12 @@ class PHReg(model.LikelihoodModel):
         for stx in range(surv.nstrat):
 
             uft = surv.ufailt[stx]
-            uft_ix = surv.ufailt_ix[stx]
-            exog_s = surv.exog_s[stx]
-            nuft = len(uft_ix)
-
-            linpred = np.dot(exog_s, params)
-            if surv.offset_s is not None:
-                linpred += surv.offset_s[stx]
-            e_linpred = np.exp(linpred)
-
-            xp0 = 0.
-            h0 = np.zeros(nuft, dtype=np.float64)
-
-            # Iterate backward through the unique failure times.
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                xp0 += e_linpred[ix].sum()
 
-                # Account for all cases that fail at this point.
-                ix = uft_ix[i]
-                h0[i] = len(ix) / xp0
+            _, e_linpred = self._stratum_linpred(params, stx, center=False)
+            xp0, _, _, _ = self._risk_set_sums(stx, e_linpred, exog=False)
 
-                # Update for cases leaving the risk set.
-                ix = surv.risk_exit[stx][i]
-                xp0 -= e_linpred[ix].sum()
+            # Nelson-Aalen increments at the unique failure times
+            h0 = surv.nfail[stx] / xp0
 
             cumhaz = np.cumsum(h0) - h0
             current_strata_surv = np.exp(-cumhaz)
@@ -414,3 +414,36 @@ strata_f = (False, True)
                          list(itertools.product(fnames, ties, entry_f, strata_f)))
 def test_r(fname, ties, entry_f, strata_f):
     TestPHReg.do1(fname, ties, entry_f, strata_f)
+
+
+@pytest.mark.parametrize('ties', ["breslow", "efron"])
+def test_derivatives(ties):
+    # Analytic derivatives against numerical derivatives, with heavy
+    # ties, left truncation, strata and an offset.
+    from statsmodels.tools.numdiff import approx_fprime
+
+    np.random.seed(4123)
+    n = 300
+    exog = np.random.normal(size=(n, 3))
+    time = np.round(np.random.exponential(size=n), 1)
+    status = (np.random.uniform(size=n) < 0.7).astype(float)
+    entry = np.where(np.random.uniform(size=n) < 0.5,
+                     time * np.random.uniform(size=n), 0)
+    strata = np.random.randint(0, 3, n)
+    offset = 0.1 * np.random.normal(size=n)
+
+    mod = PHReg(time, exog, status=status, entry=entry, strata=strata,
+                offset=offset, ties=ties)
+    params = np.r_[0.3, -0.2, 0.1]
+
+    score = mod.score(params)
+    assert_allclose(score, approx_fprime(params, mod.loglike, centered=True),
+                    rtol=1e-6)
+    assert_allclose(mod.hessian(params),
+                    approx_fprime(params, mod.score, centered=True),
+                    rtol=1e-6, atol=1e-6)
+
+    if ties == "breslow":
+        # The score residuals add up to the score
+        assert_allclose(np.nansum(mod.score_residuals(params), 0), score,
+                        rtol=1e-8)
@@ -1,6 +1,13 @@
 """
 Private experimental module for miscellaneous Tweedie functions.
 
+The log-likelihood of the compound Poisson-Gamma case, 1 < p < 2, is
+evaluated with the series expansion of Dunn and Smyth (2005). All
+observations are handled at once: the summation bounds of each observation
+are found by a vectorized search around the largest term, and the terms of
+observations with similar bounds are evaluated together in blocks and
+summed in log-space.
+
 References
 ----------
 
@@ -8,6 +15,10 @@ Dunn, Peter K. and Smyth,  Gordon K. 2001. Tweedie family densities: methods of
     evaluation. In Proceedings of the 16th International Workshop on
     Statistical Modelling, Odense, Denmark, 2–6 July.
 
+Dunn, Peter K. and Smyth, Gordon K. 2005. Series evaluation of Tweedie
+    exponential dispersion model densities. Statistics and Computing 15:
+    267–280.
+
 Jørgensen, B., Demétrio, C.G.B., Kristensen, E., Banta, G.T., Petersen, H.C.,
     Delefosse, M.: Bias-corrected Pearson estimating functions for Taylor’s
     power law applied to benthic macrofauna data. Stat. Probab. Lett. 81,
@@ -20,6 +31,12 @@ import numpy as np
 from scipy._lib._util import _lazywhere as lazywhere
 from scipy.special import gammaln
 
+# terms smaller than the largest term by this factor in log-space are
+# negligible in double precision
+_LOG_TOL = 37
+# maximum number of terms that are evaluated at once
+_BLOCK_SIZE = 2 ** 18
+
 
 def _theta(mu, p):
     return np.where(p == 1, np.log(mu), mu ** (1 - p) / (1 - p))
@@ -29,10 +46,17 @@ def _alpha(p):
     return (2 - p) / (1 - p)
 
 
-def _logWj(y, j, p, phi):
+def _logz(y, p, phi):
     alpha = _alpha(p)
-    logz = (-alpha * np.log(y) + alpha * np.log(p - 1) - (1 - alpha) *
+    return (-alpha * np.log(y) + alpha * np.log(p - 1) - (1 - alpha) *
             np.log(phi) - np.log(2 - p))
+
+
+def _logWj(y, j, p, phi):
+    return _logWj_z(_logz(y, p, phi), j, _alpha(p))
+
+
+def _logWj_z(logz, j, alpha):
     return (j * logz - gammaln(1 + j) - gammaln(-alpha * j))
 
 
@@ -40,47 +64,263 @@ def kappa(mu, p):
     return mu ** (2 - p) / (2 - p)
 
 
-@np.vectorize
-def _sumw(y, j_l, j_u, logWmax, p, phi):
-    j = np.arange(j_l, j_u + 1)
-    sumw = np.sum(np.exp(_logWj(y, j, p, phi) - logWmax))
-    return sumw
+def _series_bounds(logz, jmax, alpha, logw_max):
+    """
+    Summation bounds of the series
+
+    The terms are log-concave in j. Starting at the largest term, the
+    bounds are moved outward with doubling steps until the terms are
+    negligible, so that the number of passes grows only with the logarithm
+    of the number of terms.
+    """
+    tol = logw_max - _LOG_TOL
+    bounds = []
+    for direction in (-1, 1):
+        j = jmax.copy()
+        step = np.ones_like(jmax)
+        active = np.ones(jmax.shape, dtype=bool)
+        while active.any():
+            cand = j[active] + direction * step[active]
+            cand = np.maximum(cand, 1)
+            j[active] = cand
+            step[active] *= 2
+            keep = _logWj_z(logz[active], cand, alpha) > tol[active]
+            if direction == -1:
+                keep &= cand > 1
+            active[active] = keep
+        bounds.append(j)
+    return bounds
+
+
+def _sum_series(y, p, phi, moments=False):
+    """
+    Log of the sum of the series and optionally the moments of j
+
+    The mean and variance of j under the normalized terms are the
+    derivatives of the log of the sum with respect to log(z).
+    """
+    y, phi = np.broadcast_arrays(np.asarray(y, dtype=float),
+                                 np.asarray(phi, dtype=float))
+    shape = y.shape
+    y, phi = y.ravel(), phi.ravel()
+    alpha = _alpha(p)
+    logz = _logz(y, p, phi)
+    jmax = np.maximum(np.round(y ** (2 - p) / ((2 - p) * phi)), 1)
+    logw_max = _logWj_z(logz, jmax, alpha)
+    j_l, j_u = _series_bounds(logz, jmax, alpha, logw_max)
+
+    # evaluate observations with numbers of terms that differ by less than
+    # a factor of two together
+    nterms = (j_u - j_l + 1).astype(np.int64)
+    size_class = np.ceil(np.log2(nterms)).astype(np.int64)
+    sumw = np.empty_like(y)
+    if moments:
+        mean_j, var_j = np.empty_like(y), np.empty_like(y)
+    for cls in np.unique(size_class):
+        members = np.nonzero(size_class == cls)[0]
+        nrows = max(1, _BLOCK_SIZE // nterms[members].max())
+        for start in range(0, members.shape[0], nrows):
+            idx = members[start:start + nrows]
+            j = j_l[idx, None] + np.arange(nterms[idx].max())
+            w = np.exp(_logWj_z(logz[idx, None], j, alpha) -
+                       logw_max[idx, None])
+            w[j > j_u[idx, None]] = 0
+            sumw[idx] = w.sum(1)
+            if moments:
+                # center at the largest term for accuracy
+                dj = j - jmax[idx, None]
+                mean = (w * dj).sum(1) / sumw[idx]
+                var_j[idx] = (w * dj ** 2).sum(1) / sumw[idx] - mean ** 2
+                mean_j[idx] = mean + jmax[idx]
+    logw = (logw_max + np.log(sumw)).reshape(shape)
+    if moments:
+        return logw, mean_j.reshape(shape), var_j.reshape(shape)
+    return logw
 
 
 def logW(y, p, phi):
+    """
+    Log of the sum of the series W(y, phi, p) for y > 0 and 1 < p < 2
+
+    Parameters
+    ----------
+    y : ndarray
+        Positive observations.
+    p : float
+        The variance power.
+    phi : array_like
+        The dispersion of each observation.
+
+    Returns
+    -------
+    ndarray
+        The log of the sum of the series for each observation.
+    """
+    return _sum_series(y, p, phi)
+
+
+def _loglike_zero(mu, p, phi):
+    return -kappa(mu, p) / phi
+
+
+def _loglike_series(y, mu, p, phi):
+    theta = _theta(mu, p)
+    return logW(y, p, phi) - np.log(y) + (y * theta - kappa(mu, p)) / phi
+
+
+def _loglike_saddlepoint(y, mu, p, phi):
+    dev = 2 * (y ** (2 - p) / ((1 - p) * (2 - p)) -
+               y * mu ** (1 - p) / (1 - p) + mu ** (2 - p) / (2 - p))
+    return -0.5 * np.log(2 * np.pi * phi * y ** p) - dev / (2 * phi)
+
+
+def loglike_obs(y, mu, p, phi, method='series'):
+    """
+    Log-likelihood of each observation for 1 < p < 2
+
+    Parameters
+    ----------
+    y : array_like
+        The observations.
+    mu : array_like
+        The means.
+    p : float
+        The variance power, 1 < p < 2.
+    phi : array_like
+        The dispersion, the scale divided by the variance weights.
+    method : {'series', 'saddlepoint'}
+        'series' sums the series expansion of the density. 'saddlepoint'
+        uses the saddlepoint approximation of the density of positive
+        observations, which is faster but not exact for small
+        observations. The probability of a zero is exact for both.
+
+    Returns
+    -------
+    ndarray
+        The log-likelihood of each observation.
+    """
+    if method == 'series':
+        func = _loglike_series
+    elif method == 'saddlepoint':
+        func = _loglike_saddlepoint
+    else:
+        raise ValueError('method must be "series" or "saddlepoint"')
+    y, mu, phi = np.broadcast_arrays(np.asarray(y, dtype=float),
+                                     np.asarray(mu, dtype=float),
+                                     np.asarray(phi, dtype=float))
+    return lazywhere(y > 0, (y, mu, phi),
+                     f=lambda y, mu, phi: func(y, mu, p, phi),
+                     f2=lambda y, mu, phi: _loglike_zero(mu, p, phi))
+
+
+def estimate_scale(y, mu, p, freq_weights=1., var_weights=1., start=None,
+                   method='series', tol=1e-8, maxiter=100):
+    """
+    Maximum likelihood estimate of the scale for 1 < p < 2
+
+    Parameters
+    ----------
+    y : ndarray
+        The observations.
+    mu : ndarray
+        The means.
+    p : float
+        The variance power, 1 < p < 2.
+    freq_weights : array_like
+        The frequency weights of the observations.
+    var_weights : array_like
+        The variance weights, the dispersion of an observation is the
+        scale divided by its variance weight.
+    start : float, optional
+        Starting value. The default is the Pearson estimate.
+    method : {'series', 'saddlepoint'}
+        See `loglike_obs`.
+    tol : float
+        Convergence tolerance for the change in the log of the scale.
+    maxiter : int
+        Maximum number of Newton steps.
+
+    Returns
+    -------
+    scale : float
+        The estimated scale.
+    llf : float
+        The loglikelihood at the estimated scale.
+
+    Notes
+    -----
+    With the series, the log of the scale is estimated by Newton's method
+    with step halving. The derivatives of the series with respect to the
+    log of the scale are the mean and variance of j under the normalized
+    terms and are computed in the same pass as the sum. With the
+    saddlepoint approximation, the estimate has a closed form.
+    """
+    y, mu, freq_weights, var_weights = np.broadcast_arrays(
+        *[np.asarray(arr, dtype=float)
+          for arr in (y, mu, freq_weights, var_weights)])
+    pos = y > 0
+    kappa0 = np.sum((freq_weights * var_weights * kappa(mu, p))[~pos])
+    y, mu = y[pos], mu[pos]
+    freq_weights, var_weights = freq_weights[pos], var_weights[pos]
+    if method == 'saddlepoint':
+        dev = 2 * (y ** (2 - p) / ((1 - p) * (2 - p)) -
+                   y * mu ** (1 - p) / (1 - p) + mu ** (2 - p) / (2 - p))
+        scale = ((np.sum(freq_weights * var_weights * dev) + 2 * kappa0) /
+                 np.sum(freq_weights))
+        llf = (np.sum(freq_weights * _loglike_saddlepoint(
+            y, mu, p, scale / var_weights)) - kappa0 / scale)
+        return scale, llf
+    elif method != 'series':
+        raise ValueError('method must be "series" or "saddlepoint"')
+
     alpha = _alpha(p)
-    jmax = y ** (2 - p) / ((2 - p) * phi)
-    logWmax = np.array((1 - alpha) * jmax)
-    tol = logWmax - 37  # Machine accuracy for 64 bit.
-    j = np.ceil(jmax)
-    while (_logWj(y, np.ceil(j), p, phi) > tol).any():
-        j = np.where(_logWj(y, j, p, phi) > tol, j + 1, j)
-    j_u = j
-    j = np.floor(jmax)
-    j = np.where(j > 1, j, 1)
-    while (_logWj(y, j, p, phi) > tol).any() and (j > 1).any():
-        j = np.where(_logWj(y, j, p, phi) > tol, j - 1, 1)
-    j_l = j
-    sumw = _sumw(y, j_l, j_u, logWmax, p, phi)
-    return logWmax + np.log(sumw)
+    # y * theta - kappa of the positive observations
+    cw = var_weights * (y * _theta(mu, p) - kappa(mu, p))
+    const = np.sum(freq_weights * np.log(y))
+
+    def derivs(log_scale):
+        scale = np.exp(log_scale)
+        logw, mean_j, var_j = _sum_series(y, p, scale / var_weights,
+                                          moments=True)
+        cws = np.sum(freq_weights * cw) / scale
+        llf = np.sum(freq_weights * logw) - const + cws - kappa0 / scale
+        score = (-(1 - alpha) * np.sum(freq_weights * mean_j) - cws +
+                 kappa0 / scale)
+        hess = ((1 - alpha) ** 2 * np.sum(freq_weights * var_j) + cws -
+                kappa0 / scale)
+        return llf, score, hess
+
+    if start is None:
+        start = (np.sum(freq_weights * var_weights * (y - mu) ** 2 /
+                        mu ** p) / np.sum(freq_weights))
+        start = start if start > 0 else 1.
+    log_scale = np.log(start)
+    llf, score, hess = derivs(log_scale)
+    for _ in range(maxiter):
+        # gradient step with unit length where the loglikelihood is convex
+        step = -score / hess if hess < 0 else np.sign(score)
+        while True:
+            llf_new, score_new, hess_new = derivs(log_scale + step)
+            if llf_new >= llf or abs(step) < tol:
+                break
+            step /= 2
+        log_scale += step
+        llf, score, hess = llf_new, score_new, hess_new
+        if abs(step) < tol:
+            break
+    return np.exp(log_scale), llf
 
 
 def density_at_zero(y, mu, p, phi):
-    return np.exp(-(mu ** (2 - p)) / (phi * (2 - p)))
+    return np.exp(_loglike_zero(mu, p, phi))
 
 
 def density_otherwise(y, mu, p, phi):
-    theta = _theta(mu, p)
-    logd = logW(y, p, phi) - np.log(y) + (1 / phi * (y * theta - kappa(mu, p)))
-    return np.exp(logd)
+    return np.exp(_loglike_series(y, mu, p, phi))
 
 
 def series_density(y, mu, p, phi):
-    density = lazywhere(np.array(y) > 0,
-                        (y, mu, p, phi),
-                        f=density_otherwise,
-                        f2=density_at_zero)
-    return density
+    return np.exp(loglike_obs(y, mu, p, phi))
 
 
 if __name__ == '__main__':
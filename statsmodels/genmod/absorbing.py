@@ -0,0 +1,306 @@
+"""
+Poisson pseudo maximum likelihood with absorbed high-dimensional fixed effects
+
+License: 3-clause BSD
+"""
+import warnings
+
+import numpy as np
+
+from statsmodels.genmod import families
+from statsmodels.genmod.generalized_linear_model import (
+    GLM, GLMResults, GLMResultsWrapper)
+from statsmodels.regression.absorbing import (
+    _absorb_codes, _absorb_doc, _absorb_groups, _absorb_options_doc,
+    _absorbed_columns)
+from statsmodels.tools.grouputils import absorbed_df, demean_groups
+from statsmodels.tools.sm_exceptions import (
+    CollinearityWarning, ConvergenceWarning, PerfectSeparationError)
+import statsmodels.base.model as base
+import statsmodels.regression._tools as reg_tools
+
+__all__ = ['AbsorbingPoisson']
+
+
+class AbsorbingPoisson(GLM):
+    __doc__ = """
+    Poisson pseudo maximum likelihood with absorbed fixed effects
+
+    Estimates the Poisson regression of `endog` on `exog` and a full set of
+    dummy variables for each factor in `absorb` without forming the dummy
+    variables.
+
+    %(params)s
+    %(absorb)s
+    offset : array_like or None
+        An offset to be included in the model.
+    exposure : array_like or None
+        Log(exposure) will be added to the linear prediction in the model.
+    family : Poisson, optional
+        Only the Poisson family with the log link is supported.
+    %(options)s
+    %(extra_params)s
+
+    Attributes
+    ----------
+    absorb_groups : list of Group
+        The factors that are absorbed.
+    df_absorbed : int
+        The number of absorbed parameters, i.e. the rank of the dummy
+        variables of all factors.
+    separated : ndarray
+        Boolean array of the observations in a level of a factor where all
+        observations are zero. These are perfectly predicted by the absorbed
+        effects and have to be dropped before fitting the model.
+    linpred_absorbed : ndarray
+        The sum of the estimated absorbed effects for each observation. Set
+        by `fit`.
+
+    See Also
+    --------
+    GLM : Generalized linear models.
+    statsmodels.regression.absorbing.AbsorbingLS
+        Least squares with absorbed fixed effects.
+
+    Notes
+    -----
+    The model is estimated by iteratively reweighted least squares, where
+    the fixed effects are partialled out of the working dependent variable
+    and of `exog` in each iteration by weighted alternating projections. The
+    partialled out effects of the previous iteration are used as starting
+    point, so that later iterations need only a few sweeps. The iterations
+    stop when the relative change in the deviance is less than `tol`.
+
+    After fitting, the estimated absorbed effects are part of the offset of
+    the model, so that `predict` without new `exog`, `loglike` and the
+    residuals of the results include them. `score_obs` and `hessian` use
+    `exog` with the absorbed effects partialled out and are therefore only
+    valid at the estimated parameters. They are used by the robust
+    covariances, e.g. ``cov_type='cluster'``.
+
+    The degrees of freedom are computed as in `AbsorbingLS`.
+
+    References
+    ----------
+    Correia, S., P. Guimaraes and T. Zylkin. 2020. "Fast Poisson estimation
+    with high-dimensional fixed effects." The Stata Journal 20 (1): 95-115.
+    """ % {'params': base._model_params_doc,
+           'absorb': _absorb_doc,
+           'options': _absorb_options_doc,
+           'extra_params': base._missing_param_doc + base._extra_param_doc}
+
+    def __init__(self, endog, exog, absorb, offset=None, exposure=None,
+                 family=None, missing='none', demean_tol=1e-8,
+                 demean_maxiter=1000, **kwargs):
+        if family is None:
+            family = families.Poisson()
+        elif not (isinstance(family, families.Poisson) and
+                  isinstance(family.link, families.links.Log)):
+            raise ValueError('AbsorbingPoisson requires the Poisson family '
+                             'with the log link')
+        self._demean_options = dict(tol=demean_tol, maxiter=demean_maxiter)
+        self._absorb_codes, index = _absorb_codes(absorb)
+        super(AbsorbingPoisson, self).__init__(
+            endog, exog, family=family, offset=offset, exposure=exposure,
+            missing=missing, absorb=index, **kwargs)
+        self._offset_exposure_base = self._offset_exposure
+        self.linpred_absorbed = None
+        self.separated = self._find_separated()
+        self._data_attr.extend(['exog_absorbed', 'linpred_absorbed',
+                                '_offset_exposure_base'])
+
+    def initialize(self):
+        """
+        Initialize the model.
+        """
+        super(AbsorbingPoisson, self).initialize()
+        self.absorb_groups = _absorb_groups(self)
+        self.df_absorbed = absorbed_df(self.absorb_groups)
+        const_idx = self.data.const_idx
+        self._add_mean = self.k_constant > 0 and const_idx is not None
+        self.exog_absorbed = None
+
+    def _find_separated(self):
+        """Observations in levels that only have zero counts"""
+        keep = np.ones(self.endog.shape[0], dtype=bool)
+        changed = True
+        while changed:
+            changed = False
+            for group in self.absorb_groups:
+                sums = np.bincount(group.group_int, weights=self.endog * keep,
+                                   minlength=group.n_groups)
+                drop = keep & (sums[group.group_int] == 0)
+                if drop.any():
+                    keep &= ~drop
+                    changed = True
+        return ~keep
+
+    def predict(self, params, exog=None, exposure=None, offset=None,
+                linear=False):
+        """
+        Return predicted values
+
+        Without `exog`, `exposure` and `offset`, the predictions include the
+        estimated absorbed effects if the model has been fit. Otherwise, see
+        `GLM.predict`.
+        """
+        if (exog is None and exposure is None and offset is None and
+                self.linpred_absorbed is not None):
+            linpred = self.exog.dot(params) + self._offset_exposure
+            return linpred if linear else self.family.fitted(linpred)
+        return super(AbsorbingPoisson, self).predict(
+            params, exog=exog, exposure=exposure, offset=offset,
+            linear=linear)
+
+    def score_obs(self, params, scale=None):
+        """
+        Score of the parameters of `exog` for each observation
+
+        Uses `exog` with the absorbed effects partialled out, see Notes.
+        """
+        score_factor = self.score_factor(params, scale=scale)
+        return score_factor[:, None] * self.exog_absorbed
+
+    def hessian(self, params, scale=None, observed=None):
+        """
+        Hessian of the loglikelihood of the parameters of `exog`
+
+        Uses `exog` with the absorbed effects partialled out, see Notes.
+        """
+        factor = self.hessian_factor(params, scale=scale, observed=observed)
+        exog = self.exog_absorbed
+        return -np.dot(exog.T * factor, exog)
+
+    def _demean(self, data, absorbed_part, weights):
+        """Partial out the absorbed effects starting from a previous fit"""
+        demeaned = demean_groups(data - absorbed_part, self.absorb_groups,
+                                 weights=weights, **self._demean_options)[0]
+        absorbed_part = data - demeaned
+        if self._add_mean:
+            demeaned += np.average(data, axis=0, weights=weights)
+        return demeaned, absorbed_part
+
+    def fit(self, start_params=None, maxiter=100, tol=1e-8,
+            cov_type='nonrobust', cov_kwds=None, use_t=None, **kwargs):
+        """
+        Fit the model by iteratively reweighted least squares.
+
+        Parameters
+        ----------
+        start_params : array_like, optional
+            Initial guess of the parameters of `exog`. The absorbed effects
+            start at zero. If None, the starting values of the family are
+            used.
+        maxiter : int, optional
+            The maximum number of iterations.
+        tol : float
+            Convergence tolerance for the relative change in the deviance.
+        cov_type : str
+            The type of parameter estimate covariance matrix to compute, see
+            `GLM.fit`.
+        cov_kwds : dict-like
+            Extra arguments for calculating the covariance of the parameter
+            estimates.
+        use_t : bool
+            If True, the Student t-distribution is used for inference.
+        **kwargs
+            Not used.
+
+        Returns
+        -------
+        GLMResults
+            The results with the absorbed effects included in the fitted
+            values.
+        """
+        if self.separated.any():
+            raise PerfectSeparationError(
+                '%d observations are in levels of the absorbed factors with '
+                'only zero counts and are perfectly predicted. Drop the '
+                'observations in the separated attribute of the model.'
+                % self.separated.sum())
+        family = self.family
+        endog, exog = self.endog, self.exog
+        offset = self._offset_exposure_base
+        if start_params is None:
+            mu = family.starting_mu(endog)
+            lin_pred = family.predict(mu)
+        else:
+            lin_pred = exog.dot(start_params) + offset
+            mu = family.fitted(lin_pred)
+        dev = family.deviance(endog, mu, self.var_weights, self.freq_weights)
+        history = dict(params=[np.inf], deviance=[np.inf, dev])
+
+        absorbed_part = 0.
+        absorbed_exog = None
+        converged = False
+        for iteration in range(maxiter):
+            weights = self.iweights * family.weights(mu)
+            wlsendog = (lin_pred - offset +
+                        family.link.deriv(mu) * (endog - mu))
+            data = np.column_stack((wlsendog, exog))
+            demeaned, absorbed_part = self._demean(data, absorbed_part,
+                                                   weights)
+            if absorbed_exog is None:
+                absorbed_exog = _absorbed_columns(
+                    data, data - absorbed_part, weights,
+                    self._demean_options['tol'])[1:]
+                if self._add_mean:
+                    absorbed_exog[self.data.const_idx] = False
+                if absorbed_exog.any():
+                    names = [self.exog_names[i]
+                             for i in np.nonzero(absorbed_exog)[0]]
+                    warnings.warn('The columns %s of exog are collinear with '
+                                  'the absorbed effects. Their parameters '
+                                  'are set to zero.' % ', '.join(names),
+                                  CollinearityWarning)
+            demeaned[:, 1:][:, absorbed_exog] = 0
+            wls_results = reg_tools._MinimalWLS(
+                demeaned[:, 0], demeaned[:, 1:], weights, check_endog=True,
+                check_weights=True).fit(method='lstsq')
+            params = wls_results.params
+            resid = demeaned[:, 0] - demeaned[:, 1:].dot(params)
+            lin_pred = wlsendog - resid + offset
+            mu = family.fitted(lin_pred)
+            dev_old = dev
+            dev = family.deviance(endog, mu, self.var_weights,
+                                  self.freq_weights)
+            history['params'].append(params)
+            history['deviance'].append(dev)
+            if np.abs(dev - dev_old) <= tol * (np.abs(dev) + 0.1):
+                converged = True
+                break
+
+        if not converged:
+            warnings.warn('AbsorbingPoisson did not converge in %d '
+                          'iterations' % maxiter, ConvergenceWarning)
+
+        weights = self.iweights * family.weights(mu)
+        exog_absorbed = self._demean(exog, absorbed_part[:, 1:], weights)[0]
+        exog_absorbed[:, absorbed_exog] = 0
+        linpred_absorbed = lin_pred - offset - exog.dot(params)
+        rank = reg_tools._matrix_rank(exog_absorbed)
+        k_constant = int(self._add_mean)
+        wexog = exog_absorbed * np.sqrt(weights)[:, None]
+        normalized_cov_params = np.linalg.pinv(wexog.T.dot(wexog))
+
+        # the model keeps the state of the last fit, which is only changed
+        # once the fit has succeeded; the iterations above only depend on
+        # the data and the options of the model
+        self.mu = mu
+        self.weights = weights
+        self.exog_absorbed = exog_absorbed
+        self.linpred_absorbed = linpred_absorbed
+        self._offset_exposure = offset + linpred_absorbed
+        self.df_model = rank - k_constant
+        self.df_resid = (self.wnobs - rank -
+                         (self.df_absorbed - k_constant))
+        self.scale = self.estimate_scale(mu)
+        glm_results = GLMResults(self, params, normalized_cov_params,
+                                 self.scale, cov_type=cov_type,
+                                 cov_kwds=cov_kwds, use_t=use_t)
+        glm_results.method = 'IRLS'
+        glm_results.mle_settings = {'optimizer': 'IRLS'}
+        history['iteration'] = iteration + 1
+        glm_results.fit_history = history
+        glm_results.converged = converged
+        return GLMResultsWrapper(glm_results)
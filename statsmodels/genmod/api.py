@@ -1,9 +1,10 @@
 __all__ = [
-    "GLM", "GEE", "OrdinalGEE", "NominalGEE",
+    "GLM", "GEE", "OrdinalGEE", "NominalGEE", "AbsorbingPoisson",
     "BinomialBayesMixedGLM", "PoissonBayesMixedGLM",
     "families", "cov_struct"
 ]
 from .generalized_linear_model import GLM
+from .absorbing import AbsorbingPoisson
 from .generalized_estimating_equations import GEE, OrdinalGEE, NominalGEE
 from .bayes_mixed_glm import BinomialBayesMixedGLM, PoissonBayesMixedGLM
 from . import families
@@ -179,6 +179,51 @@ class CovStruct(object):
         soln = [spl.cho_solve(vco, x) for x in rhs]
         return soln
 
+    def covariance_matrix_solve_batch(self, expval, index, stdev, rhs):
+        """
+        Solves matrix equations `covmat * soln = rhs` for a batch of
+        clusters that all have the same size.
+
+        Parameters
+        ----------
+        expval : ndarray
+            The expected values of endog, with shape (n_clust, m) for
+            `n_clust` clusters of size `m`.
+        index : ndarray
+            The group indices of the clusters, with shape (n_clust,).
+        stdev : ndarray
+            The standard deviation of endog for each observation, with
+            shape (n_clust, m).
+        rhs : list/tuple of ndarray
+            A set of right-hand sides, each of shape (n_clust, m) or
+            (n_clust, m, q).
+
+        Returns
+        -------
+        soln : list of ndarray
+            The solutions to the matrix equations, with the same shapes
+            as the right-hand sides.
+
+        Notes
+        -----
+        Returns None if the solver fails.
+
+        This default implementation calls `covariance_matrix_solve`
+        for each cluster.  Subclasses can reimplement it to solve all
+        clusters in the batch with vectorized operations.
+        """
+
+        soln = [np.empty_like(x, dtype=np.float64) for x in rhs]
+        for j, i in enumerate(index):
+            rslt = self.covariance_matrix_solve(
+                expval[j], i, stdev[j], [x[j] for x in rhs])
+            if rslt is None:
+                return None
+            for x, y in zip(soln, rslt):
+                x[j] = y
+
+        return soln
+
     def summary(self):
         """
         Returns a text summary of the current estimate of the
@@ -213,6 +258,11 @@ class Independence(CovStruct):
                 rslt.append(x / v[:, None])
         return rslt
 
+    @Appender(CovStruct.covariance_matrix_solve_batch.__doc__)
+    def covariance_matrix_solve_batch(self, expval, index, stdev, rhs):
+        v = stdev ** 2
+        return [x / v if x.ndim == 2 else x / v[:, :, None] for x in rhs]
+
     def summary(self):
         return ("Observations within a cluster are modeled "
                 "as being independent.")
@@ -233,34 +283,26 @@ class Exchangeable(CovStruct):
     @Appender(CovStruct.update.__doc__)
     def update(self, params):
 
-        endog = self.model.endog_li
-
-        nobs = self.model.nobs
-
-        varfunc = self.model.family.variance
-
-        cached_means = self.model.cached_means
-
-        has_weights = self.model.weights is not None
-        weights_li = self.model.weights
-
-        residsq_sum, scale = 0, 0
-        fsum1, fsum2, n_pairs = 0., 0., 0.
-        for i in range(self.model.num_group):
-            expval, _ = cached_means[i]
-            stdev = np.sqrt(varfunc(expval))
-            resid = (endog[i] - expval) / stdev
-            f = weights_li[i] if has_weights else 1.
-
-            ssr = np.sum(resid * resid)
-            scale += f * ssr
-            fsum1 += f * len(endog[i])
-
-            residsq_sum += f * (resid.sum() ** 2 - ssr) / 2
-            ngrp = len(resid)
-            npr = 0.5 * ngrp * (ngrp - 1)
-            fsum2 += f * npr
-            n_pairs += npr
+        model = self.model
+        nobs = model.nobs
+        varfunc = model.family.variance
+
+        # Cluster-wise sums of the Pearson residuals and their squares
+        expval, _ = model._cached_means_flat
+        resid = (model._endog_flat - expval) / np.sqrt(varfunc(expval))
+        starts = model._cluster_bounds[:-1]
+        ngrp = np.diff(model._cluster_bounds)
+        ssr = np.add.reduceat(resid * resid, starts)
+        rsum = np.add.reduceat(resid, starts)
+        npr = 0.5 * ngrp * (ngrp - 1)
+
+        f = model.weights_li if model.weights is not None else 1.
+
+        scale = np.sum(f * ssr)
+        fsum1 = np.sum(f * ngrp)
+        residsq_sum = np.sum(f * (rsum ** 2 - ssr) / 2)
+        fsum2 = np.sum(f * npr)
+        n_pairs = np.sum(npr)
 
         ddof = self.model.ddof_scale
         scale /= (fsum1 * (nobs - ddof) / float(nobs))
@@ -298,6 +340,24 @@ class Exchangeable(CovStruct):
 
         return rslt
 
+    @Appender(CovStruct.covariance_matrix_solve_batch.__doc__)
+    def covariance_matrix_solve_batch(self, expval, index, stdev, rhs):
+
+        k = expval.shape[1]
+        c = self.dep_params / (1. - self.dep_params)
+        c /= 1. + self.dep_params * (k - 1)
+
+        rslt = []
+        for x in rhs:
+            sd = stdev if x.ndim == 2 else stdev[:, :, None]
+            x1 = x / sd
+            y = x1 / (1. - self.dep_params)
+            y -= c * x1.sum(1)[:, None]
+            y /= sd
+            rslt.append(y)
+
+        return rslt
+
     def summary(self):
         return ("The correlation between two observations in the " +
                 "same cluster is %.3f" % self.dep_params)
@@ -524,6 +584,8 @@ class Stationary(CovStruct):
         if not self.grid:
             time = self.model.time[:, 0].astype(np.int32)
             self.time = self.model.cluster_list(time)
+            self._time_flat = np.concatenate(self.time)
+            self._time_start = np.cumsum([0] + [len(x) for x in self.time])
 
     @Appender(CovStruct.update.__doc__)
     def update(self, params):
@@ -634,6 +696,47 @@ class Stationary(CovStruct):
         r[0:self.max_lag] = self.dep_params[1:]
         return [stationary_solve(r, x) for x in rhs]
 
+    @Appender(CovStruct.covariance_matrix_solve_batch.__doc__)
+    def covariance_matrix_solve_batch(self, expval, index, stdev, rhs):
+
+        n_clust, k = expval.shape
+
+        if self.grid:
+            # All clusters of the same size share the same Toeplitz
+            # correlation matrix, so the clusters are solved together
+            # as columns of a single right-hand side.
+            from statsmodels.tools.linalg import stationary_solve
+            r = np.zeros(k)
+            r[0:self.max_lag] = self.dep_params[1:]
+            rslt = []
+            for x in rhs:
+                xt = np.moveaxis(x, 1, 0).reshape(k, -1)
+                y = stationary_solve(r, xt).reshape((k,) + x.shape[:1] +
+                                                    x.shape[2:])
+                rslt.append(np.moveaxis(y, 0, 1))
+            return rslt
+
+        ix = self._time_start[index][:, None] + np.arange(k)
+        time = self._time_flat[ix]
+        dx = np.abs(time[:, :, None] - time[:, None, :])
+        cmat = np.where(dx <= self.max_lag,
+                        self.dep_params[np.minimum(dx, self.max_lag)], 0.)
+        ii = np.arange(k)
+        cmat[:, ii, ii] = 1
+        vmat = cmat * stdev[:, :, None] * stdev[:, None, :]
+
+        # Fall back to solving cluster by cluster, which projects
+        # matrices that are not positive definite.
+        try:
+            np.linalg.cholesky(vmat)
+        except np.linalg.LinAlgError:
+            return super(Stationary, self).covariance_matrix_solve_batch(
+                expval, index, stdev, rhs)
+
+        self.cov_adjust.extend([0] * n_clust)
+        return [np.linalg.solve(vmat, x[:, :, None])[:, :, 0] if x.ndim == 2
+                else np.linalg.solve(vmat, x) for x in rhs]
+
     def summary(self):
 
         lag = np.arange(self.max_lag + 1)
@@ -687,6 +790,7 @@ class Autoregressive(CovStruct):
             self.dist_func = dist_func
 
         self.designx = None
+        self._pairs = None
 
         # The autocorrelation parameter
         self.dep_params = 0.
@@ -703,10 +807,12 @@ class Autoregressive(CovStruct):
         time = self.model.time_li
 
         # Only need to compute this once
-        if self.designx is not None:
+        if self.designx is not None and self._pairs is not None:
             designx = self.designx
         else:
             designx = []
+            pairs = []
+            bounds = self.model._cluster_bounds
             for i in range(self.model.num_group):
 
                 ngrp = len(endog[i])
@@ -719,12 +825,16 @@ class Autoregressive(CovStruct):
                         designx.append(self.dist_func(time[i][j1, :],
                                                       time[i][j2, :]))
 
+                # Positions of the pairs in the concatenated data
+                j1, j2 = np.tril_indices(ngrp, -1)
+                pairs.append(bounds[i] + np.column_stack((j1, j2)))
+
             designx = np.array(designx)
             self.designx = designx
+            self._pairs = np.concatenate(pairs).astype(np.intp)
 
         scale = self.model.estimate_scale()
         varfunc = self.model.family.variance
-        cached_means = self.model.cached_means
 
         # Weights
         var = 1. - self.dep_params ** (2 * designx)
@@ -732,19 +842,10 @@ class Autoregressive(CovStruct):
         wts = 1. / var
         wts /= wts.sum()
 
-        residmat = []
-        for i in range(self.model.num_group):
-
-            expval, _ = cached_means[i]
-            stdev = np.sqrt(scale * varfunc(expval))
-            resid = (endog[i] - expval) / stdev
-
-            ngrp = len(resid)
-            for j1 in range(ngrp):
-                for j2 in range(j1):
-                    residmat.append([resid[j1], resid[j2]])
-
-        residmat = np.array(residmat)
+        expval, _ = self.model._cached_means_flat
+        stdev = np.sqrt(scale * varfunc(expval))
+        resid = (self.model._endog_flat - expval) / stdev
+        residmat = resid[self._pairs]
 
         # Need to minimize this
         def fitfunc(a):
@@ -844,6 +945,43 @@ class Autoregressive(CovStruct):
 
         return soln
 
+    @Appender(CovStruct.covariance_matrix_solve_batch.__doc__)
+    def covariance_matrix_solve_batch(self, expval, index, stdev, rhs):
+
+        k = expval.shape[1]
+
+        if k == 1:
+            return [x / (stdev ** 2 if x.ndim == 2 else
+                         stdev[:, :, None] ** 2) for x in rhs]
+
+        soln = []
+        if k == 2:
+            mat = np.array([[1, -self.dep_params], [-self.dep_params, 1]])
+            mat /= (1. - self.dep_params ** 2)
+            for x in rhs:
+                sd = stdev if x.ndim == 2 else stdev[:, :, None]
+                x1 = np.tensordot(x / sd, mat, axes=(1, 1))
+                x1 = np.moveaxis(x1, -1, 1) / sd
+                soln.append(x1)
+            return soln
+
+        # The same tri-diagonal inverse as in `covariance_matrix_solve`,
+        # applied along the second axis.
+        c0 = (1. + self.dep_params ** 2) / (1. - self.dep_params ** 2)
+        c1 = 1. / (1. - self.dep_params ** 2)
+        c2 = -self.dep_params / (1. - self.dep_params ** 2)
+        for x in rhs:
+            sd = stdev if x.ndim == 2 else stdev[:, :, None]
+            y = c0 * x
+            y[:, :-1] += c2 * x[:, 1:]
+            y[:, 1:] += c2 * x[:, :-1]
+            y[:, 0] = c1 * x[:, 0] + c2 * x[:, 1]
+            y[:, -1] = c1 * x[:, -1] + c2 * x[:, -2]
+            y /= sd
+            soln.append(y)
+
+        return soln
+
     def summary(self):
 
         return ("Autoregressive(1) dependence parameter: %.3f\n" %
@@ -13,6 +13,7 @@ import numpy as np
 from scipy import special
 from . import links as L
 from . import varfuncs as V
+from statsmodels.genmod import _tweedie_compound_poisson as _tweedie
 
 FLOAT_EPS = np.finfo(float).eps
 
@@ -1344,7 +1345,8 @@ class Tweedie(Family):
         The variance power. The default is 1.
     eql : bool
         If True, the Extended Quasi-Likelihood is used, else the
-        likelihood is used (however the latter is not implemented).
+        likelihood is used (however the latter is only implemented for
+        var_power between 1 and 2).
         If eql is True, var_power must be between 1 and 2.
 
     Attributes
@@ -1364,10 +1366,20 @@ class Tweedie(Family):
 
     Notes
     -----
-    Loglikelihood function not implemented because of the complexity of
-    calculating an infinite series of summations. The variance power can be
-    estimated using the ``estimate_tweedie_power`` function that is part of the
+    For var_power strictly between 1 and 2, the loglikelihood of the
+    compound Poisson-Gamma distribution is computed by summing the series
+    expansion of the density of Dunn and Smyth (2005). For other values of
+    var_power, the loglikelihood is not implemented and is NaN unless eql
+    is True. The variance power can be estimated using the
+    ``estimate_tweedie_power`` function or by profile likelihood using the
+    ``profile_tweedie_power`` function that are part of the
     statsmodels.genmod.generalized_linear_model.GLM class.
+
+    References
+    ----------
+    Dunn, P.K. and Smyth, G.K. (2005). Series evaluation of Tweedie
+    exponential dispersion model densities. Statistics and Computing 15,
+    267-280.
     """
     links = [L.log, L.Power]
     variance = V.Power(power=1.5)
@@ -1473,18 +1485,27 @@ class Tweedie(Family):
 
         Notes
         -----
-        If eql is True, the Extended Quasi-Likelihood is used.  At present,
-        this method returns NaN if eql is False.  When the actual likelihood
-        is implemented, it will be accessible by setting eql to False.
+        If eql is True, the Extended Quasi-Likelihood is used. If eql is
+        False, the loglikelihood is computed from the series expansion of
+        the density for var_power strictly between 1 and 2, the dispersion
+        of an observation is `scale / var_weights`. This method returns NaN
+        for other values of var_power if eql is False.
 
         References
         ----------
         JA Nelder, D Pregibon (1987).  An extended quasi-likelihood function.
         Biometrika 74:2, pp 221-232.  https://www.jstor.org/stable/2336136
+
+        Dunn, P.K. and Smyth, G.K. (2005). Series evaluation of Tweedie
+        exponential dispersion model densities. Statistics and Computing 15,
+        267-280.
         """
         if not self.eql:
-            # We have not yet implemented the actual likelihood
-            return np.nan
+            p = self.var_power
+            if p <= 1 or p >= 2:
+                # We have not yet implemented the actual likelihood
+                return np.nan
+            return _tweedie.loglike_obs(endog, mu, p, scale / var_weights)
 
         # Equations 9-10 or Nelder and Pregibon
         p = self.var_power
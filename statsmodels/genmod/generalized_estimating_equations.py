@@ -484,7 +484,9 @@ class GEE(base.Model):
          'family_doc': _gee_family_doc,
          'example': _gee_example})
 
-    cached_means = None
+    _cached_means = None
+    _cached_means_flat = None
+    _exog_flat = None
 
     def __init__(self, endog, exog, groups, time=None, family=None,
                  cov_struct=None, missing='none', offset=None,
@@ -595,10 +597,9 @@ class GEE(base.Model):
 
         # Create list of row indices for each group
         group_labels, ix = np.unique(self.groups, return_inverse=True)
-        se = pd.Series(index=np.arange(len(ix)))
-        gb = se.groupby(ix).groups
-        dk = [(lb, np.asarray(gb[k])) for k, lb in enumerate(group_labels)]
-        self.group_indices = dict(dk)
+        order = np.argsort(ix, kind="mergesort")
+        bounds = np.cumsum(np.bincount(ix))[:-1]
+        self.group_indices = dict(zip(group_labels, np.split(order, bounds)))
         self.group_labels = group_labels
 
         # Convert the data to the internal representation, which is a
@@ -633,6 +634,19 @@ class GEE(base.Model):
             self.constraint.exog_fulltrans_li = \
                 self.cluster_list(self.constraint.exog_fulltrans)
 
+        # The estimating equations are evaluated on the concatenated
+        # cluster data, with clusters of the same size solved together.
+        group_ns = np.array([len(y) for y in self.endog_li])
+        self._cluster_bounds = np.cumsum(np.r_[0, group_ns])
+        self._size_buckets = []
+        for m in np.unique(group_ns):
+            ix = np.flatnonzero(group_ns == m)
+            pos = self._cluster_bounds[ix][:, None] + np.arange(m)
+            self._size_buckets.append((ix, pos))
+        self._endog_flat = np.concatenate(self.endog_li)
+        if self.offset_li is not None:
+            self._offset_flat = np.concatenate(self.offset_li)
+
         self.family = family
 
         self.cov_struct.initialize(self)
@@ -760,6 +774,59 @@ class GEE(base.Model):
 
         return model
 
+    @property
+    def cached_means(self):
+        """
+        List of (expval, lin_pred) tuples for the clusters, at the
+        parameters most recently passed to `update_cached_means`.
+        """
+        if self._cached_means is None and \
+                self._cached_means_flat is not None:
+            bounds = self._cluster_bounds[1:-1]
+            expval, lpr = self._cached_means_flat
+            self._cached_means = list(zip(np.split(expval, bounds),
+                                          np.split(lpr, bounds)))
+        return self._cached_means
+
+    @cached_means.setter
+    def cached_means(self, value):
+        self._cached_means = value
+        if value is None:
+            self._cached_means_flat = None
+        else:
+            self._cached_means_flat = (
+                np.concatenate([x[0] for x in value]),
+                np.concatenate([x[1] for x in value]))
+
+    def _cluster_exog(self):
+        """
+        Returns the concatenation of `exog_li`.
+        """
+        # exog_li is temporarily replaced when handling constraints
+        if self._exog_flat is None or self._exog_flat[0] is not self.exog_li:
+            self._exog_flat = (self.exog_li, np.concatenate(self.exog_li))
+        return self._exog_flat[1]
+
+    def _size_bucket_data(self):
+        """
+        Yields the data needed to evaluate the estimating equations,
+        for buckets of clusters that have the same size.
+
+        Each item is a tuple (index, expval, sdev, dmat, resid, f).
+        `index` contains the group indices of the clusters in the
+        bucket, `expval`, `sdev` and `resid` have shape (n_clust, m),
+        `dmat` has shape (n_clust, m, p) and `f` contains the cluster
+        weights, or is 1 if the model has no weights.
+        """
+        expval, lpr = self._cached_means_flat
+        resid = self._endog_flat - expval
+        dmat = self.mean_deriv(self._cluster_exog(), lpr)
+        sdev = np.sqrt(self.family.variance(expval))
+
+        for ix, pos in self._size_buckets:
+            f = self.weights_li[ix] if self.weights is not None else 1.
+            yield ix, expval[pos], sdev[pos], dmat[pos], resid[pos], f
+
     def cluster_list(self, array):
         """
         Returns `array` split into subarrays corresponding to the
@@ -908,27 +975,20 @@ class GEE(base.Model):
         elif isinstance(self.scaletype, float):
             return np.array(self.scaletype)
 
-        endog = self.endog_li
-        cached_means = self.cached_means
+        expval, _ = self._cached_means_flat
         nobs = self.nobs
         varfunc = self.family.variance
 
-        scale = 0.
-        fsum = 0.
-        for i in range(self.num_group):
-
-            if len(endog[i]) == 0:
-                continue
-
-            expval, _ = cached_means[i]
+        sdev = np.sqrt(varfunc(expval))
+        resid = (self._endog_flat - expval) / sdev
 
-            f = self.weights_li[i] if self.weights is not None else 1.
-
-            sdev = np.sqrt(varfunc(expval))
-            resid = (endog[i] - expval) / sdev
-
-            scale += f * np.sum(resid ** 2)
-            fsum += f * len(endog[i])
+        if self.weights is not None:
+            f = np.repeat(self.weights_li, np.diff(self._cluster_bounds))
+            scale = np.sum(f * resid ** 2)
+            fsum = np.sum(f)
+        else:
+            scale = np.sum(resid ** 2)
+            fsum = len(resid)
 
         scale /= (fsum * (nobs - self.ddof_scale) / float(nobs))
 
@@ -1001,31 +1061,19 @@ class GEE(base.Model):
             incorporate the scale.
         """
 
-        endog = self.endog_li
-        exog = self.exog_li
-
-        cached_means = self.cached_means
-
-        varfunc = self.family.variance
-
         bmat, score = 0, 0
-        for i in range(self.num_group):
-
-            expval, lpr = cached_means[i]
-            resid = endog[i] - expval
-            dmat = self.mean_deriv(exog[i], lpr)
-            sdev = np.sqrt(varfunc(expval))
+        for ix, expval, sdev, dmat, resid, f in self._size_bucket_data():
 
-            rslt = self.cov_struct.covariance_matrix_solve(expval, i,
-                                                           sdev, (dmat, resid))
+            rslt = self.cov_struct.covariance_matrix_solve_batch(
+                expval, ix, sdev, (dmat, resid))
             if rslt is None:
                 return None, None
             vinv_d, vinv_resid = tuple(rslt)
 
-            f = self.weights_li[i] if self.weights is not None else 1.
-
-            bmat += f * np.dot(dmat.T, vinv_d)
-            score += f * np.dot(dmat.T, vinv_resid)
+            p = dmat.shape[2]
+            fdmat = (dmat * np.reshape(f, (-1, 1, 1))).reshape(-1, p)
+            bmat += np.dot(fdmat.T, vinv_d.reshape(-1, p))
+            score += np.dot(fdmat.T, vinv_resid.ravel())
 
         update = np.linalg.solve(bmat, score)
 
@@ -1042,25 +1090,15 @@ class GEE(base.Model):
         keep the cached means up to date.
         """
 
-        endog = self.endog_li
-        exog = self.exog_li
-        offset = self.offset_li
+        lpr = np.dot(self._cluster_exog(), mean_params)
+        if self.offset_li is not None:
+            lpr += self._offset_flat
+        expval = self.family.link.inverse(lpr)
 
-        linkinv = self.family.link.inverse
-
-        self.cached_means = []
-
-        for i in range(self.num_group):
-
-            if len(endog[i]) == 0:
-                continue
-
-            lpr = np.dot(exog[i], mean_params)
-            if offset is not None:
-                lpr += offset[i]
-            expval = linkinv(lpr)
-
-            self.cached_means.append((expval, lpr))
+        # The per-cluster list is only formed if `cached_means` is
+        # accessed.
+        self._cached_means_flat = (expval, lpr)
+        self._cached_means = None
 
     def _covmat(self):
         """
@@ -1082,32 +1120,23 @@ class GEE(base.Model):
            obtaining score test results.
         """
 
-        endog = self.endog_li
-        exog = self.exog_li
-        varfunc = self.family.variance
-        cached_means = self.cached_means
-
         # Calculate the naive (model-based) and robust (sandwich)
         # covariances.
         bmat, cmat = 0, 0
-        for i in range(self.num_group):
-
-            expval, lpr = cached_means[i]
-            resid = endog[i] - expval
-            dmat = self.mean_deriv(exog[i], lpr)
-            sdev = np.sqrt(varfunc(expval))
+        for ix, expval, sdev, dmat, resid, f in self._size_bucket_data():
 
-            rslt = self.cov_struct.covariance_matrix_solve(
-                expval, i, sdev, (dmat, resid))
+            rslt = self.cov_struct.covariance_matrix_solve_batch(
+                expval, ix, sdev, (dmat, resid))
             if rslt is None:
                 return None, None, None, None
             vinv_d, vinv_resid = tuple(rslt)
 
-            f = self.weights_li[i] if self.weights is not None else 1.
-
-            bmat += f * np.dot(dmat.T, vinv_d)
-            dvinv_resid = f * np.dot(dmat.T, vinv_resid)
-            cmat += np.outer(dvinv_resid, dvinv_resid)
+            p = dmat.shape[2]
+            fdmat = (dmat * np.reshape(f, (-1, 1, 1))).reshape(-1, p)
+            bmat += np.dot(fdmat.T, vinv_d.reshape(-1, p))
+            dvinv_resid = np.einsum('gmi,gm->gi', dmat, vinv_resid)
+            dvinv_resid *= np.reshape(f, (-1, 1))
+            cmat += np.dot(dvinv_resid.T, dvinv_resid)
 
         scale = self.estimate_scale()
 
@@ -1124,40 +1153,30 @@ class GEE(base.Model):
     def _bc_covmat(self, cov_naive):
 
         cov_naive = cov_naive / self.scaling_factor
-        endog = self.endog_li
-        exog = self.exog_li
-        varfunc = self.family.variance
-        cached_means = self.cached_means
         scale = self.estimate_scale()
 
         bcm = 0
-        for i in range(self.num_group):
-
-            expval, lpr = cached_means[i]
-            resid = endog[i] - expval
-            dmat = self.mean_deriv(exog[i], lpr)
-            sdev = np.sqrt(varfunc(expval))
+        for ix, expval, sdev, dmat, resid, f in self._size_bucket_data():
 
-            rslt = self.cov_struct.covariance_matrix_solve(
-                expval, i, sdev, (dmat,))
+            rslt = self.cov_struct.covariance_matrix_solve_batch(
+                expval, ix, sdev, (dmat,))
             if rslt is None:
                 return None
             vinv_d = rslt[0]
             vinv_d /= scale
 
-            hmat = np.dot(vinv_d, cov_naive)
-            hmat = np.dot(hmat, dmat.T).T
+            hmat = np.matmul(np.dot(dmat, cov_naive.T),
+                             np.swapaxes(vinv_d, 1, 2))
 
-            f = self.weights_li[i] if self.weights is not None else 1.
-
-            aresid = np.linalg.solve(np.eye(len(resid)) - hmat, resid)
-            rslt = self.cov_struct.covariance_matrix_solve(
-                expval, i, sdev, (aresid,))
+            m = resid.shape[1]
+            aresid = np.linalg.solve(np.eye(m) - hmat, resid[:, :, None])
+            rslt = self.cov_struct.covariance_matrix_solve_batch(
+                expval, ix, sdev, (aresid[:, :, 0],))
             if rslt is None:
                 return None
-            srt = rslt[0]
-            srt = f * np.dot(dmat.T, srt) / scale
-            bcm += np.outer(srt, srt)
+            srt = np.einsum('gmi,gm->gi', dmat, rslt[0])
+            srt *= np.reshape(f, (-1, 1)) / scale
+            bcm += np.dot(srt.T, srt)
 
         cov_robust_bc = np.dot(cov_naive, np.dot(bcm, cov_naive))
         cov_robust_bc *= self.scaling_factor
@@ -17,12 +17,17 @@ Hardin, J.W. and Hilbe, J.M. 2007.  "Generalized Linear Models and
 McCullagh, P. and Nelder, J.A.  1989.  "Generalized Linear Models." 2nd ed.
     Chapman & Hall, Boca Rotan.
 """
+import copy
+import time
+
 import numpy as np
+from scipy import sparse
 
 from . import families
+from . import _glm_kernels
 
-from statsmodels.tools.decorators import (cache_readonly,
-                                          cached_data, cached_value)
+from statsmodels.tools.decorators import (cache_readonly, cached_obs_data,
+                                          cached_value)
 from statsmodels.compat.pandas import Appender
 
 import statsmodels.base.model as base
@@ -39,6 +44,8 @@ from statsmodels.graphics._regressionplots_doc import (
 from . import _prediction as pred
 from statsmodels.genmod._prediction import PredictionResults
 
+from statsmodels.tools.grouputils import factorize_rows
+from statsmodels.tools.validation import string_like
 from statsmodels.tools.sm_exceptions import (PerfectSeparationError,
                                              DomainWarning,
                                              HessianInversionWarning)
@@ -53,6 +60,107 @@ def _check_convergence(criterion, iteration, atol, rtol):
                        atol=atol, rtol=rtol)
 
 
+def _compress_glm(family, endog, exog, offset, freq_weights, var_weights,
+                  n_trials):
+    """
+    Aggregate the observations with identical rows of exog and offset
+
+    Returns the unique row of each observation and the GLM of the unique
+    rows. The endog of a unique row is the mean of the observations weighted
+    by the product of the frequency weights, variance weights and number of
+    trials, which is split into the summed frequency weights and a variance
+    weight. The loglikelihood and score of the GLM are then the same as
+    those of the original observations up to a constant.
+    """
+    if sparse.issparse(exog):
+        raise ValueError('compress is not available with a sparse exog')
+    nobs = endog.shape[0]
+    offset, freq_weights, var_weights, n_trials = [
+        np.broadcast_to(arr, (nobs,))
+        for arr in (offset, freq_weights, var_weights, n_trials)]
+    codes, first = factorize_rows((exog, offset))
+    weights = freq_weights * var_weights * n_trials
+    freq_weights_c = np.bincount(codes, weights=freq_weights)
+    weights_c = np.bincount(codes, weights=weights)
+    endog_c = np.bincount(codes, weights=weights * endog)
+    nonzero = weights_c != 0
+    endog_c[nonzero] /= weights_c[nonzero]
+    var_weights_c = np.zeros_like(weights_c)
+    nonzero = freq_weights_c != 0
+    var_weights_c[nonzero] = weights_c[nonzero] / freq_weights_c[nonzero]
+
+    family = copy.copy(family)
+    if isinstance(family, families.Binomial):
+        # the trials are in the variance weights
+        family.n = 1
+    offset_c = offset[first] if np.any(offset != 0) else None
+    model = GLM(endog_c, exog[first], family=family, offset=offset_c,
+                freq_weights=freq_weights_c, var_weights=var_weights_c)
+    return codes, model
+
+
+def _irls_kernel(model):
+    """
+    Fused IRLS update for the family and link of the model
+
+    Returns None if there is no compiled kernel for the combination.
+    Otherwise returns a function that maps the linear predictor to mu, the
+    unscaled deviance and the weights and working response of the next
+    iteration in a single pass over the observations.
+    """
+    family = model.family
+    family_type, link_type = type(family), type(family.link)
+    args = ()
+    if (family_type is families.Binomial and
+            link_type in (families.links.Logit, families.links.logit)):
+        kernel = _glm_kernels.binomial_logit
+    elif family_type in (families.Poisson, families.Gamma, families.Tweedie):
+        if link_type not in (families.links.Log, families.links.log):
+            return None
+        if family_type is families.Poisson:
+            kernel = _glm_kernels.poisson_log
+        elif family_type is families.Gamma:
+            kernel = _glm_kernels.gamma_log
+        else:
+            kernel = _glm_kernels.tweedie_log
+            args = (float(family.var_power),)
+    elif (family_type is families.Gaussian and
+            link_type is families.links.identity):
+        kernel = _glm_kernels.gaussian_identity
+    else:
+        return None
+    if model.endog.ndim != 1 or sparse.issparse(model.exog):
+        return None
+
+    nobs = model.endog.shape[0]
+
+    def _as_float(arr):
+        return np.ascontiguousarray(np.broadcast_to(arr, (nobs,)),
+                                    dtype=np.float64)
+
+    dev_weights = model.freq_weights * model.var_weights
+    if family_type is families.Binomial:
+        dev_weights = dev_weights * family.n
+    data = [_as_float(arr) for arr in
+            (model.endog, None, model._offset_exposure,
+             model.iweights * model.n_trials, dev_weights)]
+
+    def update(lin_pred):
+        data[1] = _as_float(lin_pred)
+        mu, weights, wlsendog = np.empty((3, nobs))
+        dev = kernel(*data, mu, weights, wlsendog, *args)
+        return mu, dev, weights, wlsendog
+
+    return update
+
+
+def _path_deviance(model, params):
+    # deviance along a regularization path, module level for pickling
+    mu = model.predict(params)
+    return model.family.deviance(model.endog, mu, model.var_weights,
+                                 model.freq_weights)
+
+
 class GLM(base.LikelihoodModel):
     __doc__ = """
     Generalized Linear Models
@@ -95,6 +203,9 @@ class GLM(base.LikelihoodModel):
         WARNING: Using weights is not verified yet for all possible options
         and results, see Notes.
     %(extra_params)s
+    compress : bool
+        If True, the observations with identical rows of `exog` and the
+        offset are aggregated before fitting, see Notes. Default is False.
 
     Attributes
     ----------
@@ -259,13 +370,29 @@ class GLM(base.LikelihoodModel):
     interpretation. The loglikelihood is not correctly specified in this case,
     and statistics based on it, such AIC or likelihood ratio tests, are not
     appropriate.
+
+    With ``compress=True``, the rows of `exog` and the offset including
+    log(exposure) are factorized once when the model is created. ``fit``
+    estimates the model on the unique rows, where `endog` is the weighted
+    mean of each group, the frequency weights are summed, and the variance
+    weights (and the number of trials of ``Binomial``) are combined into
+    the variance weights of the group. The loglikelihood of the aggregated
+    model differs only by a constant, so that the parameter estimates and
+    their nonrobust covariance are the same as without compression, while
+    each iteration only costs the number of unique rows. This pays off if
+    all regressors are categorical. The fitted values and residuals of the
+    results are mapped back to the original observations when they are
+    accessed. The scale, the loglikelihood, the deviance and the robust
+    covariances are computed from the original observations. The
+    `fit_history` refers to the aggregated model. ``fit_regularized`` and
+    ``fit_constrained`` do not use the compression.
     """ % {'extra_params': base._missing_param_doc}
     # Maximum number of endogenous variables when using a formula
     _formula_max_endog = 2
 
     def __init__(self, endog, exog, family=None, offset=None,
                  exposure=None, freq_weights=None, var_weights=None,
-                 missing='none', **kwargs):
+                 missing='none', compress=False, **kwargs):
 
         if (family is not None) and not isinstance(family.link,
                                                    tuple(family.safe_links)):
@@ -306,9 +433,9 @@ class GLM(base.LikelihoodModel):
         # things to remove_data
         self._data_attr.extend(['weights', 'mu', 'freq_weights',
                                 'var_weights', 'iweights', '_offset_exposure',
-                                'n_trials'])
+                                'n_trials', '_compress_codes'])
         # register kwds for __init__, offset and exposure are added by super
-        self._init_keys.append('family')
+        self._init_keys.extend(['family', 'compress'])
 
         self._setup_binomial()
         # internal usage for recreating a model
@@ -325,12 +452,22 @@ class GLM(base.LikelihoodModel):
         self._offset_exposure = offset_exposure
 
         self.scaletype = None
+        self.compress = compress
+        if compress:
+            self._compress_codes, self._compressed_model = _compress_glm(
+                self.family, self.endog, self.exog, self._offset_exposure,
+                self.freq_weights, self.var_weights, self.n_trials)
 
     def initialize(self):
         """
         Initialize a generalized linear model.
         """
-        self.df_model = np.linalg.matrix_rank(self.exog) - 1
+        if sparse.issparse(self.exog):
+            # the ordering of the factorization is reused by the IRLS fits
+            self._xpx_inv = reg_tools._SparseXpxInverse(self.exog)
+            self.df_model = self._xpx_inv.rank - 1
+        else:
+            self.df_model = reg_tools._matrix_rank(self.exog) - 1
 
         if (self.freq_weights is not None) and \
            (self.freq_weights.shape[0] == self.endog.shape[0]):
@@ -407,7 +544,7 @@ class GLM(base.LikelihoodModel):
         """
         Evaluate the log-likelihood for a generalized linear model.
         """
-        lin_pred = np.dot(self.exog, params) + self._offset_exposure
+        lin_pred = self.exog.dot(params) + self._offset_exposure
         expval = self.family.link.inverse(lin_pred)
         if scale is None:
             scale = self.estimate_scale(expval)
@@ -456,7 +593,7 @@ class GLM(base.LikelihoodModel):
             the sum of `score_obs`
         """
         score_factor = self.score_factor(params, scale=scale)
-        return np.dot(score_factor, self.exog)
+        return self.exog.T.dot(score_factor)
 
     def score_factor(self, params, scale=None):
         """weights for score for each observation
@@ -575,9 +712,12 @@ class GLM(base.LikelihoodModel):
             else:
                 observed = True
 
-        tmp = getattr(self, '_tmp_like_exog', np.empty_like(self.exog))
-
         factor = self.hessian_factor(params, scale=scale, observed=observed)
+        if sparse.issparse(self.exog):
+            hess = self.exog.T.dot(reg_tools._sparse_whiten(self.exog, factor))
+            return -hess.toarray()
+
+        tmp = getattr(self, '_tmp_like_exog', np.empty_like(self.exog))
         np.multiply(self.exog.T, factor, out=tmp.T)
         return -tmp.T.dot(self.exog)
 
@@ -811,6 +951,110 @@ class GLM(base.LikelihoodModel):
             raise NotImplementedError('Only brentq can currently be used')
         return power
 
+    def profile_tweedie_power(self, low=1.01, high=1.99, method='series',
+                              xtol=1e-4, **kwargs):
+        """
+        Tweedie specific function to estimate the variance power by profile
+        likelihood.
+
+        For each power that is tried, the model is refit starting at the
+        parameters of the previous fit and the scale is estimated by
+        maximum likelihood given the fitted means, using Newton steps with
+        derivatives that are computed together with the series of the
+        density. The power that maximizes this profile loglikelihood is
+        found by bounded Brent minimization.
+
+        Parameters
+        ----------
+        low : float, optional
+            Low end of the search interval for the power. Must be larger
+            than 1. Defaults to 1.01.
+        high : float, optional
+            High end of the search interval for the power. Must be smaller
+            than 2. Defaults to 1.99.
+        method : {'series', 'saddlepoint'}, optional
+            The evaluation of the loglikelihood. 'series' sums the series
+            expansion of the density. 'saddlepoint' uses the saddlepoint
+            approximation for positive observations, which is faster but
+            only accurate if the scale is small relative to the
+            observations.
+        xtol : float, optional
+            Absolute tolerance for the estimated power.
+        **kwargs
+            Additional keyword arguments passed to the fit method of the
+            refit models.
+
+        Returns
+        -------
+        Bunch
+            A dict-like object with the estimated ``power``, its maximum
+            likelihood ``scale``, the profile loglikelihood ``llf``, the
+            ``results`` of the model with the estimated power and scale and
+            the ``profile``, an array with the powers that were tried in
+            the first column and their profile loglikelihood in the second.
+
+        See Also
+        --------
+        estimate_tweedie_power
+            Estimate the power from the Pearson residuals.
+
+        Notes
+        -----
+        The loglikelihood of the Tweedie distribution is only available for
+        powers between 1 and 2, where it is a compound Poisson-Gamma
+        distribution.
+
+        References
+        ----------
+        Dunn, P.K. and Smyth, G.K. (2005). Series evaluation of Tweedie
+        exponential dispersion model densities. Statistics and Computing
+        15, 267-280.
+        """
+        from scipy import optimize
+
+        from statsmodels.genmod import _tweedie_compound_poisson as tweedie
+        from statsmodels.tools.tools import Bunch
+
+        if not isinstance(self.family, families.Tweedie):
+            raise ValueError('profile_tweedie_power requires the Tweedie '
+                             'family')
+        if not 1 < low < high < 2:
+            raise ValueError('the search interval must be inside (1, 2)')
+        endog = self.endog
+        freq_weights = self.freq_weights
+        var_weights = self.var_weights
+        offset = self._offset_exposure
+        offset = offset if np.ndim(offset) > 0 else None
+        fits = {}
+        start_params = [kwargs.pop('start_params', None)]
+
+        def fit(power, scale=None):
+            family = families.Tweedie(link=self.family.link, var_power=power,
+                                      eql=self.family.eql)
+            model = GLM(endog, self.exog, family=family, offset=offset,
+                        freq_weights=freq_weights, var_weights=var_weights)
+            return model.fit(start_params=start_params[0], scale=scale,
+                             **kwargs)
+
+        def nllf_power(power):
+            res = fit(power)
+            start_params[0] = res.params
+            scale, llf = tweedie.estimate_scale(
+                endog, res.mu, power, freq_weights=freq_weights,
+                var_weights=var_weights, start=res.scale, method=method)
+            fits[power] = (res.params, scale, llf)
+            return -llf
+
+        opt = optimize.minimize_scalar(nllf_power, bounds=(low, high),
+                                       method='bounded',
+                                       options={'xatol': xtol})
+        power = opt.x
+        start_params[0], scale, llf = fits[power]
+        results = fit(power, scale=scale)
+        profile = np.array(sorted((key, val[2]) for key, val in fits.items()))
+        return Bunch(power=power, scale=scale, llf=llf, results=results,
+                     profile=profile)
+
     def predict(self, params, exog=None, exposure=None, offset=None,
                 linear=False):
         """
@@ -844,7 +1088,14 @@ class GLM(base.LikelihoodModel):
         `offset` values in the fit will be ignored.
 
         Exposure values must be strictly positive.
+
+        With ``compress=True``, the predictions for the model data are
+        computed for the unique rows and mapped back to the observations.
         """
+        if (exog is None and exposure is None and offset is None and
+                getattr(self, '_compress_codes', None) is not None):
+            predicted = self._compressed_model.predict(params, linear=linear)
+            return predicted[self._compress_codes]
 
         # Use fit offset if appropriate
         if offset is None and exog is None and hasattr(self, 'offset'):
@@ -869,7 +1120,10 @@ class GLM(base.LikelihoodModel):
         if exog is None:
             exog = self.exog
 
-        linpred = np.dot(exog, params) + offset + exposure
+        if sparse.issparse(exog):
+            linpred = exog.dot(params) + offset + exposure
+        else:
+            linpred = np.dot(exog, params) + offset + exposure
         if linear:
             return linpred
         else:
@@ -938,7 +1192,8 @@ class GLM(base.LikelihoodModel):
 
     def fit(self, start_params=None, maxiter=100, method='IRLS', tol=1e-8,
             scale=None, cov_type='nonrobust', cov_kwds=None, use_t=None,
-            full_output=True, disp=False, max_start_irls=3, **kwargs):
+            full_output=True, disp=False, max_start_irls=3, store='full',
+            **kwargs):
         """
         Fits a generalized linear model for a given family.
 
@@ -982,6 +1237,13 @@ class GLM(base.LikelihoodModel):
             The number of IRLS iterations used to obtain starting
             values for gradient optimization.  Only relevant if
             `method` is set to something other than 'IRLS'.
+        store : {'full', 'minimal'}
+            If 'minimal', the fitted mean `mu` and the IRLS weights are not
+            kept on the model, and residuals, fitted values and the null
+            model fit are recomputed from the model data whenever they are
+            accessed on the results instead of being cached. The results
+            then only hold arrays whose size does not depend on the number
+            of observations. Default is 'full'.
         atol : float, optional
             (available with IRLS fits) The absolute tolerance criterion that
             must be satisfied. Defaults to ``tol``. Convergence is attained
@@ -995,7 +1257,8 @@ class GLM(base.LikelihoodModel):
             (available with IRLS fits) Defaults to ``'deviance'``. Can
             optionally be ``'params'``.
         wls_method : str, optional
-            (available with IRLS fits) options are 'lstsq', 'pinv' and 'qr'
+            (available with IRLS fits) options are 'lstsq', 'pinv', 'qr'
+            and 'cholesky'
             specifies which linear algebra function to use for the irls
             optimization. Default is `lstsq` which uses the same underlying
             svd based approach as 'pinv', but is faster during iterations.
@@ -1003,6 +1266,20 @@ class GLM(base.LikelihoodModel):
             near-singular cases by truncating small singular values based
             on `rcond` of the respective numpy.linalg function. 'qr' is
             only valid for cases that are not singular nor near-singular.
+            'cholesky' solves the normal equations X'WX with a Cholesky
+            decomposition in buffers that are reused in all iterations and
+            falls back to a pivoted QR decomposition if X'WX is
+            ill-conditioned. It is the fastest option for designs with many
+            more observations than variables. The final covariance of the
+            parameters is computed by 'pinv'.
+        fused_kernel : bool, optional
+            (available with IRLS fits) If True, the default, the mean, the
+            weights, the working response and the deviance are computed by
+            a compiled kernel in a single pass over the observations for
+            the Binomial family with the logit link, the Poisson, Gamma and
+            Tweedie families with the log link and the Gaussian family with
+            the identity link. Other families and links, and subclasses of
+            them, always use the methods of the family.
         optim_hessian : {'eim', 'oim'}, optional
             (available with scipy optimizer fits) When 'oim'--the default--the
             observed Hessian is used in fitting. 'eim' is the expected Hessian.
@@ -1018,16 +1295,26 @@ class GLM(base.LikelihoodModel):
         as `results_wls` attribute.
         """
         self.scaletype = scale
+        store = string_like(store, 'store', options=('full', 'minimal'))
+
+        if self.compress:
+            return self._fit_compressed(
+                start_params=start_params, maxiter=maxiter, method=method,
+                tol=tol, cov_type=cov_type, cov_kwds=cov_kwds, use_t=use_t,
+                full_output=full_output, disp=disp,
+                max_start_irls=max_start_irls, store=store, **kwargs)
 
         if method.lower() == "irls":
             if cov_type.lower() == 'eim':
                 cov_type = 'nonrobust'
             return self._fit_irls(start_params=start_params, maxiter=maxiter,
                                   tol=tol, scale=scale, cov_type=cov_type,
-                                  cov_kwds=cov_kwds, use_t=use_t, **kwargs)
+                                  cov_kwds=cov_kwds, use_t=use_t,
+                                  store=store, **kwargs)
         else:
             self._optim_hessian = kwargs.get('optim_hessian')
-            self._tmp_like_exog = np.empty_like(self.exog)
+            if not sparse.issparse(self.exog):
+                self._tmp_like_exog = np.empty_like(self.exog)
             fit_ = self._fit_gradient(start_params=start_params,
                                       method=method,
                                       maxiter=maxiter,
@@ -1036,16 +1323,59 @@ class GLM(base.LikelihoodModel):
                                       disp=disp, cov_type=cov_type,
                                       cov_kwds=cov_kwds, use_t=use_t,
                                       max_start_irls=max_start_irls,
-                                      **kwargs)
+                                      store=store, **kwargs)
             del self._optim_hessian
-            del self._tmp_like_exog
+            self.__dict__.pop('_tmp_like_exog', None)
             return fit_
 
+    def _fit_compressed(self, start_params=None, maxiter=100, method='IRLS',
+                        tol=1e-8, cov_type='nonrobust', cov_kwds=None,
+                        use_t=None, store='full', **kwargs):
+        """
+        Fit the model on the unique rows of exog and the offset.
+
+        The parameters and their normalized covariance are estimated with
+        the aggregated model, the scale and the results are computed for
+        the original observations.
+        """
+        # the normalized covariance of the aggregated model does not depend
+        # on the scale, 'eim' selects the expected information
+        if cov_type.lower() == 'eim':
+            cov_type_compressed, cov_type = 'eim', 'nonrobust'
+        else:
+            cov_type_compressed = 'nonrobust'
+        kwargs.pop('attach_wls', None)
+        res = self._compressed_model.fit(
+            start_params=start_params, maxiter=maxiter, method=method,
+            tol=tol, scale=1., cov_type=cov_type_compressed, **kwargs)
+
+        params = res.params
+        mu = self.predict(params)
+        self.scale = self.estimate_scale(mu)
+        if store == 'full':
+            self.mu = mu
+            self.weights = (self.iweights * self.n_trials *
+                            self.family.weights(mu))
+
+        results_class = getattr(self, '_results_class', GLMResults)
+        results_class_wrapper = getattr(self, '_results_class_wrapper',
+                                        GLMResultsWrapper)
+        glm_results = results_class(self, params, res.normalized_cov_params,
+                                    self.scale, cov_type=cov_type,
+                                    cov_kwds=cov_kwds, use_t=use_t,
+                                    store=store)
+        glm_results.method = res.method
+        for attr in ['mle_settings', 'mle_retvals', 'converged']:
+            if hasattr(res, attr):
+                setattr(glm_results, attr, getattr(res, attr))
+        glm_results.fit_history = res.fit_history
+        return results_class_wrapper(glm_results)
+
     def _fit_gradient(self, start_params=None, method="newton",
                       maxiter=100, tol=1e-8, full_output=True,
                       disp=True, scale=None, cov_type='nonrobust',
                       cov_kwds=None, use_t=None, max_start_irls=3,
-                      **kwargs):
+                      store='full', **kwargs):
         """
         Fits a generalized linear model for a given family iteratively
         using the scipy gradient optimizers.
@@ -1063,6 +1393,9 @@ class GLM(base.LikelihoodModel):
                                        **kwargs)
             start_params = irls_rslt.params
             del irls_rslt
+            if store == 'minimal':
+                self.__dict__.pop('mu', None)
+                self.__dict__.pop('weights', None)
 
         rslt = super(GLM, self).fit(start_params=start_params, tol=tol,
                                     maxiter=maxiter, full_output=full_output,
@@ -1099,7 +1432,7 @@ class GLM(base.LikelihoodModel):
                                     cov_p,
                                     scale,
                                     cov_type=cov_type, cov_kwds=cov_kwds,
-                                    use_t=use_t)
+                                    use_t=use_t, store=store)
 
         # TODO: iteration count is not always available
         history = {'iteration': 0}
@@ -1114,7 +1447,7 @@ class GLM(base.LikelihoodModel):
 
     def _fit_irls(self, start_params=None, maxiter=100, tol=1e-8,
                   scale=None, cov_type='nonrobust', cov_kwds=None,
-                  use_t=None, **kwargs):
+                  use_t=None, store='full', **kwargs):
         """
         Fits a generalized linear model for a given family using
         iteratively reweighted least squares (IRLS).
@@ -1124,6 +1457,7 @@ class GLM(base.LikelihoodModel):
         rtol = kwargs.get('rtol', 0.)
         tol_criterion = kwargs.get('tol_criterion', 'deviance')
         wls_method = kwargs.get('wls_method', 'lstsq')
+        fused_kernel = kwargs.get('fused_kernel', True)
         atol = tol if atol is None else atol
 
         endog = self.endog
@@ -1133,7 +1467,7 @@ class GLM(base.LikelihoodModel):
             mu = self.family.starting_mu(self.endog)
             lin_pred = self.family.predict(mu)
         else:
-            lin_pred = np.dot(wlsexog, start_params) + self._offset_exposure
+            lin_pred = wlsexog.dot(start_params) + self._offset_exposure
             mu = self.family.fitted(lin_pred)
         self.scale = self.estimate_scale(mu)
         dev = self.family.deviance(self.endog, mu, self.var_weights,
@@ -1145,9 +1479,14 @@ class GLM(base.LikelihoodModel):
 
         # first guess on the deviance is assumed to be scaled by 1.
         # params are none to start, so they line up with the deviance
-        history = dict(params=[np.inf, start_params], deviance=[np.inf, dev])
+        history = dict(params=[np.inf, start_params], deviance=[np.inf, dev],
+                       iteration_time=[])
         converged = False
         criterion = history[tol_criterion]
+        if wls_method == 'cholesky' and maxiter > 0:
+            wls_mod = reg_tools._CholeskyWLS(wlsexog)
+        kernel = _irls_kernel(self) if fused_kernel else None
+        next_weights = next_wlsendog = None
         # This special case is used to get the likelihood for a specific
         # params vector.
         if maxiter == 0:
@@ -1156,38 +1495,63 @@ class GLM(base.LikelihoodModel):
             wls_results = lm.RegressionResults(self, start_params, None)
             iteration = 0
         for iteration in range(maxiter):
-            self.weights = (self.iweights * self.n_trials *
-                            self.family.weights(mu))
-            wlsendog = (lin_pred + self.family.link.deriv(mu) * (self.endog-mu)
-                        - self._offset_exposure)
-            wls_mod = reg_tools._MinimalWLS(wlsendog, wlsexog,
-                                            self.weights, check_endog=True,
-                                            check_weights=True)
-            wls_results = wls_mod.fit(method=wls_method)
-            lin_pred = np.dot(self.exog, wls_results.params)
+            start_time = time.perf_counter()
+            if next_weights is not None:
+                self.weights, wlsendog = next_weights, next_wlsendog
+            else:
+                self.weights = (self.iweights * self.n_trials *
+                                self.family.weights(mu))
+                wlsendog = (lin_pred + self.family.link.deriv(mu) *
+                            (self.endog - mu) - self._offset_exposure)
+            if wls_method == 'cholesky':
+                wls_results = wls_mod.fit(wlsendog, self.weights,
+                                          check_endog=True,
+                                          check_weights=True)
+            else:
+                wls_mod = reg_tools._MinimalWLS(
+                    wlsendog, wlsexog, self.weights, check_endog=True,
+                    check_weights=True,
+                    xpx_like=getattr(self, '_xpx_inv', None))
+                wls_results = wls_mod.fit(method=wls_method)
+            lin_pred = self.exog.dot(wls_results.params)
             lin_pred += self._offset_exposure
-            mu = self.family.fitted(lin_pred)
-            history = self._update_history(wls_results, mu, history)
+            if kernel is not None:
+                # weights and working response of the next iteration
+                mu, dev, next_weights, next_wlsendog = kernel(lin_pred)
+                history['params'].append(wls_results.params)
+                history['deviance'].append(dev / self.scale)
+            else:
+                mu = self.family.fitted(lin_pred)
+                history = self._update_history(wls_results, mu, history)
             self.scale = self.estimate_scale(mu)
             if endog.squeeze().ndim == 1 and np.allclose(mu - endog, 0):
                 msg = "Perfect separation detected, results not available"
                 raise PerfectSeparationError(msg)
             converged = _check_convergence(criterion, iteration + 1, atol,
                                            rtol)
+            history['iteration_time'].append(time.perf_counter() - start_time)
             if converged:
                 break
         self.mu = mu
 
         if maxiter > 0:  # Only if iterative used
-            wls_method2 = 'pinv' if wls_method == 'lstsq' else wls_method
+            wls_method2 = wls_method
+            if wls_method in ('lstsq', 'cholesky'):
+                wls_method2 = 'pinv'
             wls_model = lm.WLS(wlsendog, wlsexog, self.weights)
-            wls_results = wls_model.fit(method=wls_method2)
+            wls_model._xpx_like = getattr(self, '_xpx_inv', None)
+            wls_results = wls_model.fit(method=wls_method2, store=store)
+
+        if store == 'minimal':
+            # both are nobs arrays; the results recompute mu when needed
+            self.__dict__.pop('mu', None)
+            self.__dict__.pop('weights', None)
 
         glm_results = GLMResults(self, wls_results.params,
                                  wls_results.normalized_cov_params,
                                  self.scale,
                                  cov_type=cov_type, cov_kwds=cov_kwds,
-                                 use_t=use_t)
+                                 use_t=use_t, store=store)
 
         glm_results.method = "IRLS"
         glm_results.mle_settings = {}
@@ -1309,6 +1673,65 @@ class GLM(base.LikelihoodModel):
 
         return results
 
+    def fit_regularized_path(self, alphas=None, L1_wt=1., cv=None, n_jobs=1,
+                             **kwargs):
+        r"""
+        Compute the elastic net regularization path.
+
+        Parameters
+        ----------
+        alphas : array_like, optional
+            The penalty weights.  The path is computed from the largest
+            to the smallest value.  If not provided, a log-spaced grid
+            starting at the smallest penalty weight for which all
+            penalized coefficients are zero is used.
+        L1_wt : float
+            Must be in [0, 1].  The L1 penalty has weight L1_wt and the
+            L2 penalty has weight 1 - L1_wt.
+        cv : int or cross-validation iterator, optional
+            If provided, the test set deviance along the path is
+            computed for each fold, e.g. ``cv=5`` for 5-fold
+            cross-validation.
+        n_jobs : int
+            The number of folds fit in parallel.  Requires joblib.
+        **kwargs
+            Additional keyword arguments, see ``fit_elasticnet_path``
+            in ``statsmodels.base.elastic_net``.  These include
+            `n_alphas`, `alpha_min_ratio`, `penalty_weights` (e.g. 0
+            for the constant), `screening` and the options of
+            `fit_regularized`.
+
+        Returns
+        -------
+        RegularizedPathResults
+            The path with the coefficient matrix ``params`` (one row
+            per alpha), ``deviance``, ``df`` and the cross-validation
+            results ``cv_mean``, ``cv_se``, ``alpha_min`` and
+            ``alpha_1se`` if `cv` is provided.
+
+        Notes
+        -----
+        The function that is minimized at each alpha is the same as in
+        `fit_regularized`:
+
+        .. math::
+
+            -loglike/n + alpha*((1-L1\_wt)*|params|_2^2/2 + L1\_wt*|params|_1)
+
+        Each fit is warm started at the solution for the previous alpha,
+        and the strong rule is used to restrict the fit to the variables
+        that are likely to be nonzero.  The deviance is the family
+        deviance.
+        """
+        from statsmodels.base.elastic_net import fit_elasticnet_path
+
+        defaults = {"maxiter": 50, "cnvrg_tol": 1e-10, "zero_tol": 1e-10}
+        defaults.update(kwargs)
+
+        return fit_elasticnet_path(self, alphas=alphas, L1_wt=L1_wt, cv=cv,
+                                   n_jobs=n_jobs,
+                                   deviance_func=_path_deviance, **defaults)
+
     def fit_constrained(self, constraints, start_params=None, **fit_kwds):
         """fit the model subject to linear equality constraints
 
@@ -1385,7 +1808,8 @@ class GLMResults(base.LikelihoodModelResults):
         See GLM.df_resid
     fit_history : dict
         Contains information about the iterations. Its keys are `iterations`,
-        `deviance` and `params`.
+        `deviance` and `params`. IRLS fits also contain `iteration_time`,
+        the time in seconds spent in each iteration.
     model : class instance
         Pointer to GLM model instance that called fit.
     nobs : float
@@ -1410,12 +1834,14 @@ class GLMResults(base.LikelihoodModelResults):
     """
 
     def __init__(self, model, params, normalized_cov_params, scale,
-                 cov_type='nonrobust', cov_kwds=None, use_t=None):
+                 cov_type='nonrobust', cov_kwds=None, use_t=None,
+                 store='full'):
         super(GLMResults, self).__init__(
                 model,
                 params,
                 normalized_cov_params=normalized_cov_params,
                 scale=scale)
+        self._store_minimal = store == 'minimal'
         self.family = model.family
         self._endog = model.endog
         self.nobs = model.endog.shape[0]
@@ -1473,7 +1899,7 @@ class GLMResults(base.LikelihoodModelResults):
             get_robustcov_results(self, cov_type=cov_type, use_self=True,
                                   use_t=use_t, **cov_kwds)
 
-    @cached_data
+    @cached_obs_data
     def resid_response(self):
         """
         Respnose residuals.  The response residuals are defined as
@@ -1481,7 +1907,7 @@ class GLMResults(base.LikelihoodModelResults):
         """
         return self._n_trials * (self._endog-self.mu)
 
-    @cached_data
+    @cached_obs_data
     def resid_pearson(self):
         """
         Pearson residuals.  The Pearson residuals are defined as
@@ -1493,7 +1919,7 @@ class GLMResults(base.LikelihoodModelResults):
                 np.sqrt(self._var_weights) /
                 np.sqrt(self.family.variance(self.mu)))
 
-    @cached_data
+    @cached_obs_data
     def resid_working(self):
         """
         Working residuals.  The working residuals are defined as
@@ -1505,7 +1931,7 @@ class GLMResults(base.LikelihoodModelResults):
         val *= self._n_trials
         return val
 
-    @cached_data
+    @cached_obs_data
     def resid_anscombe(self):
         """
         Anscombe residuals.  See statsmodels.families.family for distribution-
@@ -1519,7 +1945,7 @@ class GLMResults(base.LikelihoodModelResults):
                                           var_weights=self._var_weights,
                                           scale=1.)
 
-    @cached_data
+    @cached_obs_data
     def resid_anscombe_scaled(self):
         """
         Scaled Anscombe residuals.  See statsmodels.families.family for
@@ -1529,7 +1955,7 @@ class GLMResults(base.LikelihoodModelResults):
                                           var_weights=self._var_weights,
                                           scale=self.scale)
 
-    @cached_data
+    @cached_obs_data
     def resid_anscombe_unscaled(self):
         """
         Unscaled Anscombe residuals.  See statsmodels.families.family for
@@ -1539,7 +1965,7 @@ class GLMResults(base.LikelihoodModelResults):
                                           var_weights=self._var_weights,
                                           scale=1.)
 
-    @cached_data
+    @cached_obs_data
     def resid_deviance(self):
         """
         Deviance residuals.  See statsmodels.families.family for distribution-
@@ -1561,7 +1987,7 @@ class GLMResults(base.LikelihoodModelResults):
         chisqsum = np.sum(chisq)
         return chisqsum
 
-    @cached_data
+    @cached_obs_data
     def fittedvalues(self):
         """
         Linear predicted values for the fitted model.
@@ -1569,14 +1995,14 @@ class GLMResults(base.LikelihoodModelResults):
         """
         return self.mu
 
-    @cached_data
+    @cached_obs_data
     def mu(self):
         """
         See GLM docstring.
         """
         return self.model.predict(self.params)
 
-    @cache_readonly
+    @cached_obs_data
     def null(self):
         """
         Fitted values of the null model
@@ -1685,7 +2111,7 @@ class GLMResults(base.LikelihoodModelResults):
 
         return res
 
-    def get_hat_matrix_diag(self, observed=True):
+    def get_hat_matrix_diag(self, observed=True, chunksize=None):
         """
         Compute the diagonal of the hat matrix
 
@@ -1695,6 +2121,10 @@ class GLMResults(base.LikelihoodModelResults):
             If true, then observed hessian is used in the hat matrix
             computation. If false, then the expected hessian is used.
             In the case of a canonical link function both are the same.
+        chunksize : int, optional
+            The number of observations that are processed at a time. The
+            diagonal is computed from a thin QR decomposition of the
+            weighted exog that is updated by blocks of observations.
 
         Returns
         -------
@@ -1702,13 +2132,16 @@ class GLMResults(base.LikelihoodModelResults):
             The diagonal of the hat matrix computed from the observed
             or expected hessian.
         """
+        from statsmodels.stats.outliers_influence import (
+            _hat_matrix_diag, _pinv_factor)
+
         weights = self.model.hessian_factor(self.params, observed=observed)
         wexog = np.sqrt(weights)[:, None] * self.model.exog
 
-        hd = (wexog * np.linalg.pinv(wexog).T).sum(1)
-        return hd
+        factor = _pinv_factor(wexog, chunksize)
+        return _hat_matrix_diag(wexog, factor, chunksize=chunksize)
 
-    def get_influence(self, observed=True):
+    def get_influence(self, observed=True, chunksize=None):
         """
         Get an instance of GLMInfluence with influence and outlier measures
 
@@ -1718,6 +2151,9 @@ class GLMResults(base.LikelihoodModelResults):
             If true, then observed hessian is used in the hat matrix
             computation. If false, then the expected hessian is used.
             In the case of a canonical link function both are the same.
+        chunksize : int, optional
+            The number of observations that are processed at a time in the
+            computation of the hat matrix diagonal and of ``d_params``.
 
         Returns
         -------
@@ -1737,10 +2173,12 @@ class GLMResults(base.LikelihoodModelResults):
         wendog = weights_sqrt * self.model.endog
 
         # using get_hat_matrix_diag has duplicated computation
-        hat_matrix_diag = self.get_hat_matrix_diag(observed=observed)
+        hat_matrix_diag = self.get_hat_matrix_diag(observed=observed,
+                                                   chunksize=chunksize)
         infl = GLMInfluence(self, endog=wendog, exog=wexog,
-                         resid=self.resid_pearson,
-                         hat_matrix_diag=hat_matrix_diag)
+                            resid=self.resid_pearson,
+                            hat_matrix_diag=hat_matrix_diag,
+                            chunksize=chunksize)
         return infl
 
     @Appender(base.LikelihoodModelResults.remove_data.__doc__)
@@ -0,0 +1,601 @@
+"""
+Generalized linear models estimated by IRLS over blocks of data
+
+The data are read block by block from a source that can be iterated over
+repeatedly, once per iteration, and only the weighted normal equations of
+the iteratively reweighted least squares problem are held in memory.
+
+License: 3-clause BSD
+"""
+from collections.abc import Mapping
+
+import numpy as np
+
+from statsmodels.base.covtype import descriptions
+from statsmodels.base.data import handle_data
+import statsmodels.base.model as base
+from statsmodels.genmod import families
+from statsmodels.genmod.generalized_linear_model import (
+    GLMResults, GLMResultsWrapper, _check_convergence)
+from statsmodels.regression.incremental import IncrementalWLS
+from statsmodels.tools.decorators import cache_readonly
+from statsmodels.tools.sm_exceptions import PerfectSeparationError
+from statsmodels.tools.tools import _row_chunks
+
+__all__ = ['IncrementalGLM', 'IncrementalGLMResults']
+
+_block_keys = ('endog', 'exog', 'offset', 'exposure', 'freq_weights',
+               'var_weights')
+
+
+def _as_glm_block(block):
+    """Convert one block of data to float arrays"""
+    if isinstance(block, Mapping):
+        unknown = set(block) - set(_block_keys)
+        if unknown:
+            raise ValueError('unknown keys in block: %s'
+                             % ', '.join(sorted(unknown)))
+        endog, exog = block['endog'], block['exog']
+    else:
+        endog, exog = block
+        block = {}
+    endog = np.asarray(endog, dtype=np.double)
+    if endog.ndim == 2 and endog.shape[1] == 1:
+        endog = endog[:, 0]
+    exog = np.asarray(exog, dtype=np.double)
+    if exog.ndim == 1:
+        exog = exog[:, None]
+    nobs = exog.shape[0]
+    if endog.shape[0] != nobs:
+        raise ValueError('endog and exog blocks have different numbers of '
+                         'observations')
+
+    def _extra(key, default):
+        value = block.get(key)
+        if value is None:
+            return default
+        value = np.asarray(value, dtype=np.double).ravel()
+        if value.shape[0] != nobs:
+            raise ValueError('%s must have the same length as endog' % key)
+        return value
+
+    offset = _extra('offset', np.zeros(nobs))
+    exposure = _extra('exposure', None)
+    if exposure is not None:
+        offset = offset + np.log(exposure)
+    freq_weights = _extra('freq_weights', np.ones(nobs))
+    var_weights = _extra('var_weights', np.ones(nobs))
+    extra = (block.get('freq_weights') is not None,
+             block.get('var_weights') is not None, exposure is not None)
+    return endog, exog, offset, freq_weights, var_weights, extra
+
+
+class IncrementalGLM(object):
+    """
+    Generalized linear model estimated by IRLS over blocks of data
+
+    Parameters
+    ----------
+    chunks : callable or iterable
+        The source of the data. Either a callable that returns a new
+        iterator over the blocks each time it is called, e.g., a generator
+        function, or an iterable that can be iterated over repeatedly, e.g.,
+        a list. Iterators that are exhausted after one pass are not
+        supported since every iteration of the IRLS algorithm reads all
+        blocks. Each block is either a tuple ``(endog, exog)`` or a dict
+        with the keys ``'endog'`` and ``'exog'`` and optionally
+        ``'offset'``, ``'exposure'``, ``'freq_weights'`` and
+        ``'var_weights'``, which have the same meaning as in `GLM`. The
+        values can be arrays, memory-mapped arrays, Series or DataFrames.
+    family : Family instance, optional
+        The family of the model, see `GLM`. The default is Gaussian.
+    hasconst : {None, bool}, optional
+        Indicates whether exog contains a user-supplied constant. If None,
+        constant columns are detected across all blocks.
+
+    Attributes
+    ----------
+    nobs : int
+        The number of observations, set by `fit`.
+    wnobs : float
+        The sum of the frequency weights, set by `fit`.
+    rank : int
+        The rank of exog, set by `fit`.
+
+    See Also
+    --------
+    statsmodels.genmod.generalized_linear_model.GLM
+        GLM estimation with the full data set in memory.
+    statsmodels.regression.incremental.IncrementalWLS
+        Incremental weighted least squares.
+
+    Notes
+    -----
+    Each iteration of the IRLS algorithm is one pass over the data. The
+    working response and weights are computed block by block from the
+    current parameters, and only the weighted normal equations and a few
+    scalars, such as the deviance and Pearson's chi2 statistic, are
+    accumulated. The iterations and the convergence criterion, the
+    change in the deviance, are the same as in `GLM.fit` with
+    ``method='IRLS'``, except that the default starting values of the mean
+    are computed from the mean of the response in each block.
+
+    The results have the same parameters, covariance and goodness of fit
+    statistics as `GLM`. Statistics that are not available after the
+    iterations, such as ``llf`` and ``null_deviance``, are computed with
+    another pass over the data when they are first used. Per observation
+    arrays such as residuals and fitted values are not available.
+
+    Examples
+    --------
+    Blocks read from a csv file
+
+    >>> def chunks():
+    ...     for df in pd.read_csv('data.csv', chunksize=1000000):
+    ...         yield {'endog': df['y'], 'exog': df[['const', 'x']],
+    ...                'exposure': df['time']}
+    >>> mod = IncrementalGLM(chunks, family=sm.families.Poisson())
+    >>> res = mod.fit()
+
+    Blocks of rows of arrays on disk
+
+    >>> mod = IncrementalGLM.from_arrays(np.load('y.npy', mmap_mode='r'),
+    ...                                  np.load('x.npy', mmap_mode='r'),
+    ...                                  family=sm.families.Poisson())
+    """
+
+    def __init__(self, chunks, family=None, hasconst=None):
+        if not callable(chunks) and iter(chunks) is chunks:
+            raise TypeError('chunks must be a callable or an iterable that '
+                            'can be iterated over more than once, not an '
+                            'iterator')
+        if family is None:
+            family = families.Gaussian()
+        self._chunks = chunks
+        self.family = family
+        self.hasconst = hasconst
+        self.data = None
+        self.scaletype = None
+        self.nobs = None
+        self.wnobs = None
+        self.rank = None
+        self.k_constant = None
+        self._has_freq_weights = False
+        self._has_var_weights = False
+        self._endog_mean = None
+        self._data_attr = []
+
+    @classmethod
+    def from_arrays(cls, endog, exog, family=None, offset=None,
+                    exposure=None, freq_weights=None, var_weights=None,
+                    chunksize=None, hasconst=None):
+        """
+        Create a model that reads blocks of rows of arrays
+
+        Parameters
+        ----------
+        endog : array_like
+            The response variable. Can be a memory-mapped array.
+        exog : array_like
+            The explanatory variables. Can be a memory-mapped array.
+        family : Family instance, optional
+            The family of the model. The default is Gaussian.
+        offset, exposure, freq_weights, var_weights : array_like, optional
+            See `GLM`.
+        chunksize : int, optional
+            The number of rows in each block. The default depends on the
+            number of columns of exog.
+        hasconst : {None, bool}, optional
+            Indicates whether exog contains a user-supplied constant.
+
+        Returns
+        -------
+        IncrementalGLM
+            The model instance.
+        """
+        arrays = dict(endog=endog, exog=exog, offset=offset,
+                      exposure=exposure, freq_weights=freq_weights,
+                      var_weights=var_weights)
+        arrays = {key: val for key, val in arrays.items() if val is not None}
+        k_exog = np.shape(exog)[1] if np.ndim(exog) == 2 else 1
+        slices = _row_chunks(len(endog), k_exog, chunksize)
+
+        def chunks():
+            for sl in slices:
+                yield {key: val.iloc[sl] if hasattr(val, 'iloc') else val[sl]
+                       for key, val in arrays.items()}
+
+        return cls(chunks, family=family, hasconst=hasconst)
+
+    def _iter_blocks(self):
+        """Iterate over the converted blocks of the data"""
+        chunks = self._chunks() if callable(self._chunks) else self._chunks
+        binomial = isinstance(self.family, families.Binomial)
+        for block in chunks:
+            if self.data is None:
+                self._initialize(block)
+            block = _as_glm_block(block)
+            endog, exog, offset, freq_weights, var_weights, extra = block
+            if exog.shape[0] == 0:
+                continue
+            if binomial:
+                endog, n_trials = self.family.initialize(endog, freq_weights)
+            else:
+                n_trials = 1
+            self._has_freq_weights |= extra[0]
+            self._has_var_weights |= extra[1]
+            if extra[2] and not isinstance(self.family.link,
+                                           families.links.Log):
+                raise ValueError("exposure can only be used with the log "
+                                 "link function")
+            yield (endog, exog, offset, freq_weights, var_weights, n_trials)
+
+    def _initialize(self, block):
+        """Set up the variable names from the first block"""
+        if isinstance(block, Mapping):
+            endog, exog = block['endog'], block['exog']
+        else:
+            endog, exog = block
+        endog = endog.iloc[:1] if hasattr(endog, 'iloc') else endog[:1]
+        exog = exog.iloc[:1] if hasattr(exog, 'iloc') else exog[:1]
+        if np.ndim(endog) == 2 and np.shape(endog)[1] == 2:
+            # binomial counts of successes and failures
+            endog = np.asarray(endog)[:, 0]
+        # a single row is enough to extract the variable names
+        data = handle_data(endog, exog, hasconst=False)
+        # ynames and xnames are cached from the data on first access, store
+        # them before the data is dropped
+        data.ynames, data.xnames = data.ynames, data.xnames
+        data.endog = data.exog = data.orig_endog = data.orig_exog = None
+        self.data = data
+
+    @property
+    def endog_names(self):
+        """Name of the endogenous variable."""
+        return self.data.ynames
+
+    @property
+    def exog_names(self):
+        """Names of the exogenous variables."""
+        return self.data.xnames
+
+    @property
+    def df_model(self):
+        """The rank of exog minus the number of constants."""
+        return float(self.rank - self.k_constant)
+
+    @property
+    def df_resid(self):
+        """The sum of the frequency weights minus the rank of exog."""
+        return float(self.wnobs - self.rank)
+
+    def _estimate_scale(self, deviance, chi2):
+        """The scale from the deviance and the Pearson chi2 statistic"""
+        scaletype = self.scaletype
+        if not scaletype:
+            if isinstance(self.family, (families.Binomial, families.Poisson,
+                                        families.NegativeBinomial)):
+                return 1.
+            return chi2 / self.df_resid
+        if isinstance(scaletype, float):
+            return np.array(scaletype)
+        if isinstance(scaletype, str):
+            if scaletype.lower() == 'x2':
+                return chi2 / self.df_resid
+            elif scaletype.lower() == 'dev':
+                return deviance / self.df_resid
+        raise ValueError("Scale %s with type %s not understood" %
+                         (scaletype, type(scaletype)))
+
+    def _irls_pass(self, params, wls_method):
+        """
+        One pass over the data at `params`
+
+        Returns the accumulator of the weighted least squares problem of the
+        next iteration and the deviance, the Pearson chi2 statistic without
+        and with the number of trials, and whether all fitted values are
+        equal to the response. If params is None, the starting values of the
+        mean are used.
+        """
+        family = self.family
+        wls = IncrementalWLS(method=wls_method, hasconst=self.hasconst)
+        deviance = chi2 = pearson_chi2 = 0.
+        sum_y = sum_w = wnobs = 0.
+        nobs = 0
+        perfect = True
+        for block in self._iter_blocks():
+            endog, exog, offset, freq_weights, var_weights, n_trials = block
+            if params is None:
+                mu = family.starting_mu(endog)
+                lin_pred = family.predict(mu)
+            else:
+                lin_pred = exog.dot(params) + offset
+                mu = family.fitted(lin_pred)
+            iweights = freq_weights * var_weights
+            deviance += family.deviance(endog, mu, var_weights, freq_weights)
+            resid2 = (endog - mu) ** 2 * iweights / family.variance(mu)
+            chi2 += resid2.sum()
+            pearson_chi2 += (resid2 * n_trials).sum()
+            perfect &= np.allclose(mu - endog, 0)
+
+            weights = iweights * n_trials * family.weights(mu)
+            wlsendog = (lin_pred - offset +
+                        family.link.deriv(mu) * (endog - mu))
+            wls.update(wlsendog, exog, weights)
+
+            sum_y += np.dot(iweights * n_trials, endog)
+            sum_w += np.sum(iweights * n_trials)
+            wnobs += freq_weights.sum()
+            nobs += endog.shape[0]
+        if wls.data is None:
+            raise ValueError('chunks did not provide any observations')
+        self.nobs = nobs
+        self.wnobs = wnobs
+        self._endog_mean = sum_y / sum_w
+        return wls, deviance, chi2, pearson_chi2, perfect
+
+    def _stats_pass(self, params, scale, null_mu=None, sandwich=False):
+        """
+        Pass over the data for the statistics that need the final scale
+
+        Returns the loglikelihood, and the deviance and loglikelihood at the
+        constant mean `null_mu` if it is not None, and the outer product of
+        the scores and the observed Hessian with scale 1 if `sandwich` is
+        True.
+        """
+        family = self.family
+        k = len(params)
+        llf = null_deviance = llnull = 0.
+        meat = np.zeros((k, k))
+        hessian = np.zeros((k, k))
+        for block in self._iter_blocks():
+            endog, exog, offset, freq_weights, var_weights, n_trials = block
+            mu = family.fitted(exog.dot(params) + offset)
+            llf += family.loglike(endog, mu, var_weights=var_weights,
+                                  freq_weights=freq_weights, scale=scale)
+            if null_mu is not None:
+                null = np.full(endog.shape, null_mu)
+                null_deviance += family.deviance(endog, null, var_weights,
+                                                 freq_weights)
+                llnull += family.loglike(endog, null, var_weights=var_weights,
+                                         freq_weights=freq_weights,
+                                         scale=scale)
+            if sandwich:
+                iweights = freq_weights * var_weights * n_trials
+                deriv = family.link.deriv(mu)
+                variance = family.variance(mu)
+                score_factor = (endog - mu) / deriv / variance * iweights
+                meat += np.dot(exog.T * (score_factor ** 2 / freq_weights),
+                               exog)
+                tmp = (variance * family.link.deriv2(mu) +
+                       family.variance.deriv(mu) * deriv)
+                tmp *= score_factor / iweights
+                oim_factor = iweights / (deriv ** 2 * variance) * (1 + tmp)
+                hessian -= np.dot(exog.T * oim_factor, exog)
+        return llf, null_deviance, llnull, meat, hessian
+
+    def predict(self, params, exog=None, exposure=None, offset=None,
+                linear=False):
+        """
+        Return predicted values for a design matrix
+
+        Parameters
+        ----------
+        params : array_like
+            Parameters / coefficients of a GLM.
+        exog : array_like
+            Design / exogenous data. Required since the model does not keep
+            the data.
+        exposure : array_like, optional
+            Exposure time values.
+        offset : array_like, optional
+            Offset values.
+        linear : bool
+            If True, returns the linear predicted values. If False,
+            returns the value of the inverse of the model's link function at
+            the linear predicted values.
+
+        Returns
+        -------
+        ndarray
+            Array of predicted values.
+        """
+        if exog is None:
+            raise ValueError('exog is required since IncrementalGLM does not '
+                             'keep the data')
+        linpred = np.dot(exog, params)
+        if offset is not None:
+            linpred = linpred + offset
+        if exposure is not None:
+            linpred = linpred + np.log(exposure)
+        return linpred if linear else self.family.fitted(linpred)
+
+    def fit(self, start_params=None, maxiter=100, tol=1e-8, scale=None,
+            cov_type='nonrobust', use_t=None, wls_method='pinv'):
+        """
+        Fit the model by IRLS with one pass over the data per iteration
+
+        Parameters
+        ----------
+        start_params : array_like, optional
+            Initial guess of the solution. If None, the starting values of
+            the mean are computed by the family from each block.
+        maxiter : int, optional
+            The maximum number of iterations.
+        tol : float
+            Convergence tolerance for the change in the deviance.
+        scale : str or float, optional
+            The scale / dispersion of the model, see `GLM.fit`.
+        cov_type : {'nonrobust', 'HC0'}
+            The covariance of the parameter estimates. 'HC0' requires
+            another pass over the data.
+        use_t : bool, optional
+            If True, the Student t-distribution is used for inference.
+        wls_method : {'pinv', 'qr'}
+            The method used to accumulate and solve the weighted least
+            squares problem in each iteration, see `IncrementalWLS`.
+
+        Returns
+        -------
+        IncrementalGLMResults
+            The estimation results.
+        """
+        if cov_type not in ('nonrobust', 'HC0'):
+            raise ValueError("cov_type must be 'nonrobust' or 'HC0'")
+        if maxiter < 1:
+            raise ValueError('maxiter must be at least 1')
+        self.scaletype = scale
+        if start_params is not None:
+            start_params = np.asarray(start_params, dtype=np.double)
+
+        params = start_params
+        history = dict(params=[np.inf, start_params], deviance=[np.inf])
+        criterion = history['deviance']
+        converged = False
+        scale_ = None
+        for iteration in range(maxiter + 1):
+            wls, dev, chi2, pearson_chi2, perfect = self._irls_pass(
+                params, wls_method)
+            if self.rank is None:
+                self.rank = wls.rank
+                self.k_constant = wls.k_constant
+            scale_old = scale_
+            scale_ = self._estimate_scale(dev, chi2)
+            # as in GLM, the deviance is scaled by the previous estimate
+            history['deviance'].append(dev / (scale_ if scale_old is None
+                                              else scale_old))
+            if iteration > 0:
+                if perfect:
+                    msg = "Perfect separation detected, results not available"
+                    raise PerfectSeparationError(msg)
+                converged = _check_convergence(criterion, iteration, tol, 0.)
+                if converged or iteration == maxiter:
+                    break
+            wls_results = wls.fit()
+            params = wls_results.params
+            history['params'].append(params)
+
+        glm_results = IncrementalGLMResults(
+            self, params, wls_results.normalized_cov_params, scale_,
+            cov_type=cov_type, use_t=use_t, deviance=dev,
+            pearson_chi2=pearson_chi2)
+        glm_results.method = 'IRLS'
+        glm_results.mle_settings = {'optimizer': 'IRLS',
+                                    'wls_method': wls_method}
+        history['iteration'] = iteration
+        glm_results.fit_history = history
+        glm_results.converged = converged
+        return GLMResultsWrapper(glm_results)
+
+
+class IncrementalGLMResults(GLMResults):
+    """
+    Results of a GLM estimated by IncrementalGLM
+
+    The parameters, covariance, deviance, Pearson chi2 and the statistics
+    that are derived from them are the same as in `GLMResults`. ``llf``,
+    ``null_deviance`` and ``llnull`` are computed with another pass over
+    the data when they are first used. Per observation arrays such as
+    residuals and fitted values are not available.
+    """
+
+    def __init__(self, model, params, normalized_cov_params, scale,
+                 cov_type='nonrobust', use_t=None, deviance=None,
+                 pearson_chi2=None):
+        base.LikelihoodModelResults.__init__(
+            self, model, params, normalized_cov_params=normalized_cov_params,
+            scale=scale)
+        self.family = model.family
+        self.nobs = model.nobs
+        self.df_resid = model.df_resid
+        self.df_model = model.df_model
+        self._cache = {'deviance': deviance, 'pearson_chi2': pearson_chi2}
+        self._store_minimal = False
+        self.use_t = False if use_t is None else use_t
+
+        self.cov_type = cov_type
+        if cov_type == 'nonrobust':
+            self.cov_kwds = {'description': 'Standard Errors assume that the' +
+                             ' covariance matrix of the errors is correctly ' +
+                             'specified.'}
+        else:
+            self.cov_kwds = {'description': descriptions['HC0']}
+            self.cov_params_default = self.cov_HC0
+
+    @cache_readonly
+    def _pass_stats(self):
+        return self.model._stats_pass(self.params, self.scale,
+                                      null_mu=self.model._endog_mean)
+
+    @cache_readonly
+    def llf(self):
+        """
+        Value of the loglikelihood function evalued at params.
+
+        Requires a pass over the data.
+        """
+        scale = self.scale
+        family = self.family
+        if (isinstance(family, families.Gaussian) and
+                isinstance(family.link, families.links.Power) and
+                family.link.power == 1.):
+            # pearson_chi2 is the weighted sum of squared residuals
+            scale = self.pearson_chi2 / self.model.wnobs
+            return self.model._stats_pass(self.params, scale)[0]
+        return self._pass_stats[0]
+
+    @cache_readonly
+    def null_deviance(self):
+        """
+        The deviance of the model with a constant as the only regressor.
+
+        Requires a pass over the data.
+        """
+        return self._pass_stats[1]
+
+    @cache_readonly
+    def llnull(self):
+        """
+        Log-likelihood of the model with a constant as the only regressor.
+
+        Requires a pass over the data.
+        """
+        return self._pass_stats[2]
+
+    @cache_readonly
+    def cov_HC0(self):
+        """
+        Heteroscedasticity robust covariance matrix.
+
+        Requires a pass over the data.
+        """
+        meat, hessian = self.model._stats_pass(self.params, self.scale,
+                                               sandwich=True)[3:]
+        hessian_inv = np.linalg.inv(hessian)
+        return hessian_inv.dot(meat).dot(hessian_inv)
+
+    def _not_available(self):
+        raise ValueError('per observation results are not available for '
+                         'incrementally estimated models.')
+
+    resid_response = resid_pearson = resid_working = resid_anscombe = \
+        resid_anscombe_scaled = resid_anscombe_unscaled = \
+        resid_deviance = fittedvalues = mu = null = \
+        property(_not_available)
+
+    def get_prediction(self, exog=None, exposure=None, offset=None,
+                       transform=True, linear=False, row_labels=None):
+        if exog is None:
+            raise ValueError('exog is required since the model does not '
+                             'keep the data')
+        return super(IncrementalGLMResults, self).get_prediction(
+            exog=exog, exposure=exposure, offset=offset, transform=transform,
+            linear=linear, row_labels=row_labels)
+
+    get_prediction.__doc__ = GLMResults.get_prediction.__doc__
+
+    def get_hat_matrix_diag(self, observed=True, chunksize=None):
+        self._not_available()
+
+    def get_influence(self, observed=True, chunksize=None):
+        self._not_available()
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_allclose, assert_equal
+
+from statsmodels.genmod import families
+from statsmodels.genmod.absorbing import AbsorbingPoisson
+from statsmodels.genmod.generalized_linear_model import GLM
+from statsmodels.tools.sm_exceptions import (ConvergenceWarning,
+                                             PerfectSeparationError)
+from statsmodels.tools.tools import add_constant
+
+
+def gen_data(nobs=600, seed=0):
+    rs = np.random.RandomState(seed)
+    firm = rs.randint(0, 30, size=nobs)
+    year = rs.randint(0, 6, size=nobs)
+    x = rs.standard_normal((nobs, 2)) + 0.05 * firm[:, None]
+    linpred = (x.dot([0.3, -0.2]) + 0.02 * firm + 0.3 * np.sin(year))
+    exposure = rs.uniform(1, 3, size=nobs)
+    y = rs.poisson(exposure * np.exp(linpred))
+    return y, x, firm, year, exposure
+
+
+def dummies(*groups):
+    return np.column_stack([pd.get_dummies(g).values[:, 1:] for g in groups])
+
+
+@pytest.mark.parametrize('n_factors', [1, 2])
+def test_absorbing_poisson(n_factors):
+    y, x, firm, year, exposure = gen_data()
+    factors = [firm, year][:n_factors]
+    exog = add_constant(x)
+    mod = AbsorbingPoisson(y, exog, absorb=factors, exposure=exposure,
+                           demean_tol=1e-12)
+    mod_d = GLM(y, np.column_stack((exog, dummies(*factors))),
+                family=families.Poisson(), exposure=exposure)
+    res_d0 = mod_d.fit(tol=1e-12)
+    for cov_type, cov_kwds in [('nonrobust', None), ('HC0', None),
+                               ('cluster', {'groups': firm,
+                                            'use_correction': False})]:
+        res = mod.fit(tol=1e-12, cov_type=cov_type, cov_kwds=cov_kwds)
+        res_d = mod_d.fit(tol=1e-12, cov_type=cov_type, cov_kwds=cov_kwds)
+        assert res.converged
+        assert_allclose(res.params[1:], res_d.params[1:3], rtol=1e-7)
+        assert_allclose(res.bse[1:], res_d.bse[1:3], rtol=1e-6)
+
+    res = mod.fit(tol=1e-12)
+    assert_allclose(res.llf, res_d0.llf, rtol=1e-10)
+    assert_allclose(res.deviance, res_d0.deviance, rtol=1e-8)
+    assert_allclose(res.mu, res_d0.mu, rtol=1e-7)
+    assert_allclose(res.resid_pearson, res_d0.resid_pearson, atol=1e-7)
+    assert_allclose(mod.predict(res.params), res_d0.fittedvalues, rtol=1e-7)
+    assert_equal(res.df_resid, res_d0.df_resid)
+    assert_equal(res.df_model, 2)
+    assert_allclose(mod.linpred_absorbed,
+                    np.log(res.mu) - np.log(exposure) - exog.dot(res.params),
+                    atol=1e-10)
+    # new exog does not include the absorbed effects
+    assert_allclose(mod.predict(res.params, exog[:5], linear=True),
+                    exog[:5].dot(res.params))
+
+    # refitting with and without constant
+    res2 = AbsorbingPoisson(y, x, absorb=factors, exposure=exposure,
+                            demean_tol=1e-12).fit(tol=1e-12)
+    assert_allclose(res2.params, res.params[1:], rtol=1e-7)
+    assert_allclose(res2.bse, res.bse[1:], rtol=1e-6)
+    assert_allclose(res2.llf, res.llf, rtol=1e-10)
+    assert_equal(res2.df_resid, res.df_resid)
+
+
+def test_refit():
+    # a second fit of the same model does not depend on the first one
+    y, x, firm, year, exposure = gen_data()
+    mod = AbsorbingPoisson(y, x, absorb=[firm, year], exposure=exposure)
+    with pytest.warns(ConvergenceWarning):
+        mod.fit(maxiter=2)
+    res = mod.fit(tol=1e-12)
+    res_ref = AbsorbingPoisson(y, x, absorb=[firm, year],
+                               exposure=exposure).fit(tol=1e-12)
+    assert_allclose(res.params, res_ref.params, rtol=1e-10)
+    assert_allclose(res.bse, res_ref.bse, rtol=1e-10)
+    assert_allclose(res.llf, res_ref.llf, rtol=1e-12)
+    assert_equal(res.fit_history['iteration'],
+                 res_ref.fit_history['iteration'])
+
+
+def test_separated():
+    y, x, firm, year, _ = gen_data()
+    y[firm == 3] = 0
+    mod = AbsorbingPoisson(y, x, absorb=[firm, year])
+    assert_equal(mod.separated, firm == 3)
+    with pytest.raises(PerfectSeparationError, match='separated'):
+        mod.fit()
+    keep = ~mod.separated
+    res = AbsorbingPoisson(y[keep], x[keep],
+                           absorb=[firm[keep], year[keep]]).fit()
+    assert res.converged
+
+
+def test_invalid_family():
+    y, x, firm, _, _ = gen_data()
+    with pytest.raises(ValueError, match='Poisson'):
+        AbsorbingPoisson(y, x, absorb=firm, family=families.Gaussian())
@@ -2008,3 +2008,49 @@ def test_quasipoisson(reg):
         # but the naive covariance does.
         assert_allclose(result2.cov_naive / result1.cov_naive,
                         result2.scale * np.ones_like(result2.cov_naive))
+
+
+@pytest.mark.parametrize("cs", [
+    cov_struct.Independence(), cov_struct.Exchangeable(),
+    cov_struct.Autoregressive(), cov_struct.Stationary(max_lag=2),
+    cov_struct.Stationary(max_lag=2, grid=True),
+    cov_struct.Nested()])
+def test_covariance_matrix_solve_batch(cs):
+
+    np.random.seed(8234)
+
+    # Clusters of sizes 1 to 5 in random order, the grid version of
+    # Stationary needs clusters longer than max_lag.
+    sizes = np.tile(np.arange(1, 6), 8)
+    if getattr(cs, "grid", False):
+        sizes += 2
+    grp = np.repeat(np.arange(40), sizes)
+    grp = np.random.permutation(grp)
+    n = len(grp)
+    x = np.random.normal(size=(n, 3))
+    y = np.random.poisson(np.exp(0.2 * x[:, 0]))
+    dep_data = np.random.randint(0, 3, size=n) if \
+        isinstance(cs, cov_struct.Nested) else None
+
+    model = gee.GEE(y, x, groups=grp, family=families.Poisson(),
+                    cov_struct=cs, dep_data=dep_data)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        result = model.fit()
+
+    for ix, expval, sdev, dmat, resid, _ in model._size_bucket_data():
+        soln = cs.covariance_matrix_solve_batch(expval, ix, sdev,
+                                                (dmat, resid))
+        for j, i in enumerate(ix):
+            soln1 = cs.covariance_matrix_solve(expval[j], i, sdev[j],
+                                               (dmat[j], resid[j]))
+            assert_allclose(soln[0][j], soln1[0], rtol=1e-10, atol=1e-12)
+            assert_allclose(soln[1][j], soln1[1], rtol=1e-10, atol=1e-12)
+
+    # The cluster-wise mean cache agrees with the flat cache
+    cm = model.cached_means
+    assert_equal(len(cm), 40)
+    for i in range(40):
+        lpr = np.dot(model.exog_li[i], result.params)
+        assert_allclose(cm[i][1], lpr)
+        assert_allclose(cm[i][0], np.exp(lpr))
@@ -9,9 +9,11 @@ from numpy.testing import (assert_almost_equal, assert_equal, assert_raises,
 import pandas as pd
 from pandas.testing import assert_series_equal
 import pytest
-from scipy import stats
+from scipy import integrate, optimize, stats
+from scipy.special import logsumexp
 
 import statsmodels.api as sm
+from statsmodels.genmod import generalized_linear_model as glm
 from statsmodels.genmod.generalized_linear_model import GLM
 from statsmodels.tools.tools import add_constant
 from statsmodels.tools.sm_exceptions import PerfectSeparationError
@@ -1318,16 +1320,23 @@ def test_glm_irls_method():
     res1 = mod.fit()
     res2 = mod.fit(wls_method='pinv', attach_wls=True)
     res3 = mod.fit(wls_method='qr', attach_wls=True)
+    res4 = mod.fit(wls_method='cholesky', attach_wls=True)
     # fit_gradient does not attach mle_settings
     res_g1 = mod.fit(start_params=res1.params, method='bfgs')
 
-    for r in [res1, res2, res3]:
+    for r in [res1, res2, res3, res4]:
         assert_equal(r.mle_settings['optimizer'], 'IRLS')
         assert_equal(r.method, 'IRLS')
+        assert_equal(len(r.fit_history['iteration_time']),
+                     r.fit_history['iteration'])
 
     assert_equal(res1.mle_settings['wls_method'], 'lstsq')
     assert_equal(res2.mle_settings['wls_method'], 'pinv')
     assert_equal(res3.mle_settings['wls_method'], 'qr')
+    assert_equal(res4.mle_settings['wls_method'], 'cholesky')
+    assert_allclose(res4.params, res1.params, rtol=1e-10)
+    assert_allclose(res4.bse, res1.bse, rtol=1e-10)
+    assert_(hasattr(res4.results_wls.model, 'pinv_wexog'))
 
     assert_(hasattr(res2.results_wls.model, 'pinv_wexog'))
     assert_(hasattr(res3.results_wls.model, 'exog_Q'))
@@ -1336,6 +1345,124 @@ def test_glm_irls_method():
     assert_equal(res_g1.method, 'bfgs')
 
 
+@pytest.mark.parametrize('family', [
+    sm.families.Poisson(), sm.families.Binomial(),
+    sm.families.Gamma(sm.families.links.log())])
+def test_glm_irls_cholesky(family):
+    np.random.seed(987126)
+    exog = add_constant(np.random.randn(300, 3))
+    mu = family.fitted(exog.dot([0.5, 0.2, -0.1, 0.1]))
+    if isinstance(family, sm.families.Binomial):
+        endog = np.random.binomial(1, mu)
+    elif isinstance(family, sm.families.Gamma):
+        endog = np.random.gamma(2, mu / 2)
+    else:
+        endog = np.random.poisson(mu)
+    weights = np.random.uniform(0.5, 2, 300)
+    mod = GLM(endog, exog, family=family, var_weights=weights)
+    res1 = mod.fit()
+    res2 = mod.fit(wls_method='cholesky')
+    assert_equal(res2.fit_history['iteration'], res1.fit_history['iteration'])
+    assert_allclose(res2.params, res1.params, rtol=1e-10)
+    assert_allclose(res2.bse, res1.bse, rtol=1e-10)
+    assert_allclose(res2.llf, res1.llf, rtol=1e-12)
+
+
+@pytest.mark.parametrize('family', [
+    sm.families.Poisson(), sm.families.Binomial(),
+    sm.families.Gamma(sm.families.links.log())])
+@pytest.mark.parametrize('method', ['irls', 'newton'])
+def test_glm_compress(family, method):
+    np.random.seed(987125)
+    nobs = 2000
+    group = np.random.randint(0, 3, size=(nobs, 2))
+    exog = np.column_stack((np.ones(nobs), group == 1)).astype(float)
+    offset = 0.1 * np.random.randint(0, 2, size=nobs)
+    freq_weights = np.random.randint(1, 3, size=nobs)
+    var_weights = np.random.uniform(0.5, 2, size=nobs)
+    mu = family.fitted(exog.dot([-0.3, 0.2, -0.1]) + offset)
+    if isinstance(family, sm.families.Binomial):
+        n_trials = np.random.randint(1, 5, size=nobs)
+        success = np.random.binomial(n_trials, mu)
+        endog = np.column_stack((success, n_trials - success))
+    elif isinstance(family, sm.families.Gamma):
+        endog = np.random.gamma(2, mu / 2)
+    else:
+        endog = np.random.poisson(mu)
+    kwds = dict(family=family, offset=offset, freq_weights=freq_weights,
+                var_weights=var_weights)
+    res1 = GLM(endog, exog, **kwds).fit(method=method)
+    mod = GLM(endog, exog, compress=True, **kwds)
+    assert_equal(mod._compressed_model.nobs, 8)
+    res2 = mod.fit(method=method)
+    for attr in ['params', 'bse', 'scale', 'llf', 'deviance', 'pearson_chi2',
+                 'null_deviance', 'fittedvalues', 'resid_deviance']:
+        assert_allclose(getattr(res2, attr), getattr(res1, attr),
+                        rtol=1e-6, atol=1e-6, err_msg=attr)
+    res1 = GLM(endog, exog, **kwds).fit(cov_type='HC0', scale='X2')
+    res2 = GLM(endog, exog, compress=True, **kwds).fit(cov_type='HC0',
+                                                       scale='X2')
+    assert_allclose(res2.scale, res1.scale, rtol=1e-7)
+    assert_allclose(res2.bse, res1.bse, rtol=1e-7)
+    assert_allclose(res2.predict(exog[:5], offset=np.zeros(5)),
+                    res1.predict(exog[:5], offset=np.zeros(5)), rtol=1e-7)
+
+
+@pytest.mark.parametrize('family', [
+    sm.families.Poisson(), sm.families.Binomial(),
+    sm.families.Gamma(sm.families.links.log()), sm.families.Gaussian(),
+    sm.families.Tweedie(sm.families.links.log(), var_power=1.),
+    sm.families.Tweedie(sm.families.links.log(), var_power=1.5),
+    sm.families.Tweedie(sm.families.links.log(), var_power=2.)])
+def test_glm_fused_kernel(family):
+    np.random.seed(987127)
+    nobs = 500
+    exog = add_constant(np.random.randn(nobs, 3))
+    offset = np.random.uniform(-0.2, 0.2, nobs)
+    mu = family.fitted(exog.dot([0.5, 0.2, -0.1, 0.1]) + offset)
+    if isinstance(family, sm.families.Binomial):
+        n_trials = np.random.randint(1, 5, size=nobs)
+        success = np.random.binomial(n_trials, mu)
+        endog = np.column_stack((success, n_trials - success))
+    elif isinstance(family, sm.families.Gaussian):
+        endog = mu + np.random.randn(nobs)
+    elif getattr(family, 'var_power', 2) == 1.5:
+        endog = np.random.poisson(mu) * np.random.gamma(2, 0.5, nobs)
+    elif getattr(family, 'var_power', 2) == 1:
+        endog = np.random.poisson(mu)
+    else:
+        endog = np.random.gamma(2, mu / 2)
+    mod = GLM(endog, exog, family=family, offset=offset,
+              freq_weights=np.random.randint(1, 3, size=nobs),
+              var_weights=np.random.uniform(0.5, 2, nobs))
+    assert glm._irls_kernel(mod) is not None
+    res1 = mod.fit(fused_kernel=False)
+    res2 = mod.fit()
+    assert_equal(res2.fit_history['iteration'], res1.fit_history['iteration'])
+    assert_allclose(res2.fit_history['deviance'][1:],
+                    res1.fit_history['deviance'][1:], rtol=1e-12)
+    assert_allclose(res2.params, res1.params, rtol=1e-12, atol=1e-14)
+    assert_allclose(res2.bse, res1.bse, rtol=1e-12)
+    assert_allclose(res2.scale, res1.scale, rtol=1e-12)
+    assert_allclose(res2.mu, res1.mu, rtol=1e-12)
+
+
+def test_glm_fused_kernel_selection():
+    exog = add_constant(np.arange(10.))
+    endog = np.arange(10.) % 2
+    links = sm.families.links
+
+    class PoissonSubclass(sm.families.Poisson):
+        pass
+
+    for family in [sm.families.Binomial(links.probit()),
+                   sm.families.Poisson(links.identity()),
+                   sm.families.Gaussian(links.log()),
+                   sm.families.InverseGaussian(), PoissonSubclass()]:
+        mod = GLM(endog + 1, exog, family=family)
+        assert glm._irls_kernel(mod) is None
+
+
 class CheckWtdDuplicationMixin(object):
     decimal_params = DECIMAL_4
 
@@ -2086,6 +2213,103 @@ def testTweediePowerEstimate():
     assert_allclose(p, res2.params[1], rtol=0.25)
 
 
+def _tweedie_compound_poisson_sample(mu, p, scale, random_state):
+    # sums of Poisson numbers of Gamma variables
+    lam = mu ** (2 - p) / (scale * (2 - p))
+    shape = (2 - p) / (p - 1)
+    counts = random_state.poisson(lam)
+    gamma_scale = scale * (p - 1) * mu ** (p - 1)
+    endog = np.zeros(len(mu))
+    pos = counts > 0
+    endog[pos] = random_state.gamma(shape * counts[pos], gamma_scale[pos])
+    return endog
+
+
+def test_tweedie_loglike_series():
+    from statsmodels.genmod import _tweedie_compound_poisson as tweedie
+    np.random.seed(4323)
+    endog = np.concatenate(([0, 0], np.random.gamma(1, 3, 30)))
+    mu = np.random.uniform(0.5, 5, len(endog))
+    for p in [1.05, 1.5, 1.9]:
+        for scale in [0.1, 1., 20.]:
+            fam = sm.families.Tweedie(var_power=p)
+            llf = fam.loglike_obs(endog, mu, scale=scale)
+            # mixture of Gamma densities over the Poisson counts
+            lam = mu ** (2 - p) / (scale * (2 - p))
+            shape = (2 - p) / (p - 1)
+            gamma_scale = scale * (p - 1) * mu ** (p - 1)
+            n = np.arange(1, 3000)[:, None]
+            terms = (stats.poisson.logpmf(n, lam[2:]) +
+                     stats.gamma.logpdf(endog[2:], shape * n,
+                                        scale=gamma_scale[2:]))
+            expected = np.concatenate((-lam[:2], logsumexp(terms, axis=0)))
+            assert_allclose(llf, expected, rtol=1e-10, atol=1e-10)
+            # the saddlepoint approximation is exact for zeros
+            llf2 = tweedie.loglike_obs(endog, mu, p, scale,
+                                       method='saddlepoint')
+            assert_allclose(llf2[:2], expected[:2], rtol=1e-12)
+
+    # the density integrates to one
+    mu, p, scale = 3., 1.5, 2.
+    dens = integrate.quad(
+        lambda y: tweedie.series_density(y, mu, p, scale), 0, 200,
+        limit=200)[0]
+    assert_allclose(dens + tweedie.series_density(0., mu, p, scale), 1,
+                    rtol=1e-8)
+    fam = sm.families.Tweedie(var_power=1)
+    assert np.isnan(fam.loglike(endog, np.ones(len(endog))))
+
+
+def test_tweedie_estimate_scale():
+    from statsmodels.genmod import _tweedie_compound_poisson as tweedie
+    rs = np.random.RandomState(4324)
+    mu = np.exp(rs.normal(1, 0.4, 500))
+    endog = _tweedie_compound_poisson_sample(mu, 1.6, 2., rs)
+    freq_weights = rs.randint(1, 3, 500)
+    var_weights = rs.uniform(0.5, 2, 500)
+    for method in ['series', 'saddlepoint']:
+        def nllf(log_scale):
+            llf = tweedie.loglike_obs(endog, mu, 1.6,
+                                      np.exp(log_scale) / var_weights,
+                                      method=method)
+            return -np.sum(freq_weights * llf)
+        opt = optimize.minimize_scalar(nllf, bracket=(0, 0.1), tol=1e-10)
+        scale, llf = tweedie.estimate_scale(endog, mu, 1.6, freq_weights,
+                                            var_weights, method=method)
+        assert_allclose(scale, np.exp(opt.x), rtol=1e-7)
+        assert_allclose(llf, -opt.fun, rtol=1e-12)
+
+
+def test_tweedie_profile_power():
+    rs = np.random.RandomState(4325)
+    nobs = 2000
+    exog = add_constant(rs.standard_normal((nobs, 2)))
+    mu = np.exp(exog.dot([1., 0.3, -0.2]))
+    endog = _tweedie_compound_poisson_sample(mu, 1.6, 2., rs)
+    mod = GLM(endog, exog, family=sm.families.Tweedie(var_power=1.3))
+    res = mod.profile_tweedie_power(xtol=1e-6)
+    assert_allclose(res.power, 1.6, atol=0.05)
+    assert_allclose(res.scale, 2., rtol=0.1)
+    assert_allclose(res.results.family.var_power, res.power)
+    assert_allclose(res.results.scale, res.scale)
+    assert_allclose(res.results.llf, res.llf, rtol=1e-10)
+    assert_equal(res.profile.shape[1], 2)
+    assert_allclose(res.profile[:, 1].max(), res.llf)
+    # the profile loglikelihood is maximized by the estimates
+    for power in [res.power - 0.01, res.power + 0.01]:
+        mod2 = GLM(endog, exog, family=sm.families.Tweedie(var_power=power))
+        res2 = mod2.fit()
+        for scale in [res.scale, res.scale * 0.99, res.scale * 1.01]:
+            assert res2.family.loglike(endog, res2.mu, scale=scale) < res.llf
+
+    res3 = mod.profile_tweedie_power(method='saddlepoint')
+    assert 1 < res3.power < 2
+    with pytest.raises(ValueError):
+        mod.profile_tweedie_power(low=0.9)
+    with pytest.raises(ValueError):
+        GLM(endog, exog).profile_tweedie_power()
+
+
 class TestRegularized(object):
 
     def test_regularized(self):
@@ -2130,6 +2354,40 @@ class TestRegularized(object):
                 llf_sm = plf(sm_result.params)
                 assert_equal(np.sign(llf_sm - llf_r), 1)
 
+    def test_regularized_path(self):
+
+        np.random.seed(8123)
+        n, p = 200, 6
+        exog = sm.add_constant(np.random.normal(size=(n, p)))
+        lin_pred = 0.5 + exog[:, 1] - 0.5 * exog[:, 2]
+        endog = np.random.poisson(np.exp(lin_pred))
+        offset = np.random.uniform(-0.1, 0.1, size=n)
+        model = GLM(endog, exog, family=sm.families.Poisson(), offset=offset)
+        weights = np.r_[0, np.ones(p)]
+
+        path = model.fit_regularized_path(n_alphas=6, penalty_weights=weights,
+                                          cv=3)
+        # only the unpenalized constant at the largest alpha
+        assert_equal(path.df[0], 1)
+        res_const = GLM(endog, exog[:, 0], family=sm.families.Poisson(),
+                        offset=offset).fit()
+        assert_allclose(path.params[0, 0], res_const.params[0], rtol=1e-6)
+        assert_allclose(path.deviance[0], res_const.deviance, rtol=1e-6)
+
+        for i in [2, 5]:
+            alpha = path.alphas[i]
+            rslt = model.fit_regularized(alpha=alpha * weights,
+                                         start_params=path.params[i])
+            assert_allclose(rslt.params, path.params[i], atol=1e-5)
+            mu = model.predict(path.params[i])
+            assert_allclose(path.deviance[i],
+                            model.family.deviance(endog, mu), rtol=1e-10)
+
+        assert_equal(path.cv_deviance.shape, (3, 6))
+        assert path.alphas[0] >= path.alpha_1se >= path.alpha_min
+        with pytest.raises(ValueError, match="not on the path"):
+            path.get_params(2 * path.alphas[0])
+
 
 class TestConvergence(object):
     @classmethod
@@ -2284,3 +2542,55 @@ def test_non_invertible_hessian_fails_summary():
         mod = sm.GLM(data.endog, data.exog, family=sm.families.Gamma())
         res = mod.fit(maxiter=1, method='bfgs', max_start_irls=0)
         res.summary()
+
+
+@pytest.mark.parametrize("method", ["irls", "newton"])
+def test_store_minimal(method):
+    data = cpunish.load_pandas()
+    exog = add_constant(data.exog, prepend=False)
+    mod = GLM(data.endog, exog, family=sm.families.Poisson())
+    res = mod.fit(method=method, cov_type="HC0")
+    mod_min = GLM(data.endog, exog, family=sm.families.Poisson())
+    res_min = mod_min.fit(method=method, cov_type="HC0", store="minimal")
+    assert not hasattr(mod_min, "mu")
+    assert_allclose(res_min.params, res.params, rtol=1e-8)
+    assert_allclose(res_min.bse, res.bse, rtol=1e-8)
+    assert_allclose(res_min.llnull, res.llnull, rtol=1e-10)
+    assert_allclose(res_min.resid_deviance, res.resid_deviance, rtol=1e-8)
+    res_min.summary()
+    cache = res_min._results._cache
+    for attr in ["mu", "null", "fittedvalues", "resid_deviance",
+                 "resid_pearson"]:
+        assert attr not in cache
+
+
+def test_sparse_exog():
+    from scipy import sparse
+    rs = np.random.RandomState(987125)
+    nobs = 500
+    groups = rs.randint(0, 10, size=nobs)
+    dummies = sparse.csr_matrix((np.ones(nobs), (np.arange(nobs), groups)))
+    exog = sparse.hstack([dummies, rs.standard_normal((nobs, 2))],
+                         format="csr")
+    exog_dense = exog.toarray()
+    endog = rs.poisson(np.exp(exog_dense.dot(np.linspace(-0.5, 0.5, 12))))
+
+    mod = GLM(endog, exog, family=sm.families.Poisson())
+    mod_dense = GLM(endog, exog_dense, family=sm.families.Poisson())
+    res = mod.fit()
+    res_dense = mod_dense.fit()
+    assert_equal(mod.df_model, mod_dense.df_model)
+    assert_allclose(res.params, res_dense.params, rtol=1e-7)
+    assert_allclose(res.bse, res_dense.bse, rtol=1e-7)
+    assert_allclose(res.llf, res_dense.llf, rtol=1e-10)
+    assert_allclose(res.predict(exog[:5]), res_dense.fittedvalues[:5],
+                    rtol=1e-7)
+    res.summary()
+
+    res = mod.fit(method="newton")
+    assert_allclose(res.params, res_dense.params, rtol=1e-7)
+
+    kwds = {"alpha": 0.005, "L1_wt": 0.5}
+    res = mod.fit_regularized(**kwds)
+    res_dense = mod_dense.fit_regularized(**kwds)
+    assert_allclose(res.params, res_dense.params, rtol=1e-7, atol=1e-10)
@@ -76,7 +76,10 @@ class CheckWeight(object):
         if isinstance(self, TestGlmGaussianWLS):
             # This will not work right now either
             return None
-        if not isinstance(self, (TestGlmGaussianAwNr, TestGlmGammaAwNr)):
+        if isinstance(self, TestGlmTweedieAwNr):
+            # R does not compute the Tweedie loglikelihood
+            assert np.isfinite(res1.llf)
+        elif not isinstance(self, (TestGlmGaussianAwNr, TestGlmGammaAwNr)):
             # Matching R is hard
             assert_allclose(res1.llf, res2.ll, atol=1e-6, rtol=1e-7)
         assert_allclose(res1.deviance, res2.deviance, atol=1e-6, rtol=1e-7)
@@ -0,0 +1,133 @@
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_allclose, assert_equal
+
+from statsmodels.genmod import families
+from statsmodels.genmod.generalized_linear_model import GLM
+from statsmodels.genmod.incremental import IncrementalGLM
+from statsmodels.tools.tools import add_constant
+
+
+def gen_data(family, nobs=1000, nvar=3):
+    rs = np.random.RandomState(1234567)
+    x = add_constant(rs.standard_normal((nobs, nvar)))
+    offset = rs.uniform(-0.2, 0.2, nobs)
+    exposure = rs.uniform(1, 3, nobs)
+    freq_weights = rs.randint(1, 4, nobs).astype(float)
+    var_weights = rs.uniform(0.5, 2, nobs)
+    linpred = x.dot(np.linspace(0.2, -0.2, nvar + 1)) + offset
+    if not isinstance(family.link, families.links.Log):
+        exposure = None
+    else:
+        linpred += np.log(exposure)
+    mu = family.fitted(linpred)
+    if isinstance(family, families.Poisson):
+        y = rs.poisson(mu)
+    elif isinstance(family, families.Binomial):
+        y = (rs.uniform(size=nobs) < mu).astype(float)
+    elif isinstance(family, families.Gamma):
+        y = rs.gamma(2, mu / 2)
+    else:
+        y = mu + rs.standard_normal(nobs)
+    return dict(endog=y, exog=x, offset=offset, exposure=exposure,
+                freq_weights=freq_weights, var_weights=var_weights)
+
+
+attributes = ['params', 'bse', 'pvalues', 'scale', 'deviance',
+              'pearson_chi2', 'llf', 'aic', 'bic', 'null_deviance', 'llnull',
+              'df_model', 'df_resid', 'nobs']
+
+family_list = [families.Poisson(), families.Binomial(),
+               families.Binomial(families.links.probit()),
+               families.Gamma(families.links.log()), families.Gaussian()]
+
+
+@pytest.mark.parametrize('family', family_list)
+@pytest.mark.parametrize('cov_type', ['nonrobust', 'HC0'])
+def test_glm(family, cov_type):
+    data = gen_data(family)
+    mod = IncrementalGLM.from_arrays(family=family, chunksize=137, **data)
+    res = mod.fit(cov_type=cov_type)
+    ref = GLM(family=copy.deepcopy(family), **data).fit(cov_type=cov_type)
+    assert_equal(res.fit_history['iteration'], ref.fit_history['iteration'])
+    for attr in attributes:
+        assert_allclose(getattr(res, attr), getattr(ref, attr), rtol=1e-9,
+                        err_msg=attr)
+    assert_allclose(res.cov_params(), ref.cov_params(), rtol=1e-9)
+    x = data['exog'][:5]
+    assert_allclose(res.predict(x, offset=np.zeros(5)),
+                    ref.predict(x, offset=np.zeros(5)), rtol=1e-9)
+
+
+def test_sources():
+    family = families.Poisson()
+    data = gen_data(family)
+    df = pd.DataFrame(data['exog'], columns=['const', 'a', 'b', 'c'])
+    df['y'] = data['endog']
+    df['time'] = data['exposure']
+    ref = GLM(df['y'], df[['const', 'a', 'b', 'c']], family=family,
+              exposure=data['exposure']).fit(scale='x2')
+
+    def chunks():
+        for i in range(0, len(df), 300):
+            block = df.iloc[i:i + 300]
+            yield {'endog': block['y'],
+                   'exog': block[['const', 'a', 'b', 'c']],
+                   'exposure': block['time']}
+
+    res = IncrementalGLM(chunks, family=family).fit(scale='x2')
+    assert_allclose(res.params, ref.params, rtol=1e-9)
+    assert_allclose(res.bse, ref.bse, rtol=1e-9)
+    assert isinstance(res.params, pd.Series)
+    assert_equal(list(res.params.index), ['const', 'a', 'b', 'c'])
+    assert 'IncrementalGLM' in str(res.summary())
+
+    # a list of tuples can be iterated over repeatedly
+    blocks = [(data['endog'][i:i + 300], data['exog'][i:i + 300])
+              for i in range(0, len(df), 300)]
+    res = IncrementalGLM(blocks, family=family).fit()
+    ref = GLM(data['endog'], data['exog'], family=family).fit()
+    assert_allclose(res.params, ref.params, rtol=1e-9)
+
+
+def test_binomial_counts():
+    rs = np.random.RandomState(1234567)
+    x = add_constant(rs.standard_normal((200, 2)))
+    n_trials = rs.randint(1, 10, 200)
+    success = rs.binomial(n_trials, 0.4)
+    endog = np.column_stack((success, n_trials - success))
+    # the models change the number of trials of the family
+    res = IncrementalGLM.from_arrays(endog, x, family=families.Binomial(),
+                                     chunksize=33).fit()
+    ref = GLM(endog, x, family=families.Binomial()).fit()
+    for attr in ['params', 'bse', 'deviance', 'pearson_chi2', 'llf']:
+        assert_allclose(getattr(res, attr), getattr(ref, attr), rtol=1e-9,
+                        err_msg=attr)
+
+
+def test_errors():
+    data = gen_data(families.Poisson())
+    blocks = iter([(data['endog'], data['exog'])])
+    with pytest.raises(TypeError):
+        IncrementalGLM(blocks)
+    mod = IncrementalGLM.from_arrays(data['endog'], data['exog'],
+                                     exposure=data['exposure'],
+                                     family=families.Gaussian())
+    with pytest.raises(ValueError, match='exposure'):
+        mod.fit()
+    mod = IncrementalGLM([{'endog': data['endog'], 'exog': data['exog'],
+                           'weights': data['var_weights']}])
+    with pytest.raises(ValueError, match='unknown keys'):
+        mod.fit()
+    mod = IncrementalGLM.from_arrays(data['endog'], data['exog'],
+                                     family=families.Poisson())
+    with pytest.raises(ValueError, match='cov_type'):
+        mod.fit(cov_type='HC1')
+    res = mod.fit()
+    with pytest.raises(ValueError, match='not available'):
+        res.resid_pearson
+    with pytest.raises(ValueError, match='exog is required'):
+        res.predict()
@@ -13,6 +13,8 @@ from patsy import DesignInfo
 from statsmodels.compat.pandas import Substitution
 from statsmodels.base.model import Model
 from statsmodels.iolib import summary2
+from statsmodels.tools.decorators import cache_readonly
+from statsmodels.tools.tools import pinv_extended
 __docformat__ = 'restructuredtext en'
 
 _hypotheses_doc = \
@@ -547,3 +549,363 @@ class MultivariateTestResults(object):
                 df = pd.DataFrame(self.results[key]['constant_C'])
                 summ.add_df(df)
         return summ
+
+
+class MultiOLS(Model):
+    """
+    Many linear regressions with a common design matrix
+
+    Each column of `endog` is regressed on the same `exog`.  The design
+    matrix is factorized only once and the parameters, standard errors and
+    fit statistics of all regressions are computed with vectorized
+    operations.
+
+    Parameters
+    ----------
+    endog : array_like
+        A nobs x k_endog array where each column is a dependent variable.
+    exog : array_like
+        A nobs x k_exog array of independent variables. An intercept is not
+        included by default and should be added by the user.
+    weights : array_like, optional
+        A 1d array of weights shared by all regressions. If supplied, the
+        regressions are estimated by WLS. The weights are interpreted as in
+        WLS.
+    missing : str
+        Available options are 'none', 'drop', and 'raise'. If 'none', no nan
+        checking is done. If 'drop', any observations with nans in any
+        column are dropped. If 'raise', an error is raised. Default is 'none'.
+    hasconst : None or bool
+        Indicates whether the RHS includes a user-supplied constant. See
+        :class:`statsmodels.regression.linear_model.OLS`.
+
+    See Also
+    --------
+    statsmodels.regression.linear_model.OLS
+    statsmodels.regression.linear_model.WLS
+
+    Notes
+    -----
+    The results contain the vectorized statistics for all dependent
+    variables.  A full ``RegressionResults`` instance for a single dependent
+    variable is created on demand by ``MultiOLSResults.get_response_results``
+    and reuses the factorization of the design matrix.
+
+    Examples
+    --------
+    >>> mod = MultiOLS(endog, exog)
+    >>> res = mod.fit()
+    >>> res.params  # k_exog x k_endog
+    >>> res.get_response_results(0).summary()
+    """
+    _formula_max_endog = None
+
+    def __init__(self, endog, exog, weights=None, missing='none',
+                 hasconst=None, **kwargs):
+        if weights is not None:
+            kwargs['weights'] = np.asarray(weights, dtype=float).squeeze()
+        super(MultiOLS, self).__init__(endog, exog, missing=missing,
+                                       hasconst=hasconst, **kwargs)
+        if self.endog.ndim == 1:
+            self.endog = self.endog[:, None]
+        if weights is None:
+            self.weights = None
+        elif self.weights.shape != (self.endog.shape[0],):
+            raise ValueError('weights must be a 1d array with the same '
+                             'length as endog')
+        self.nobs = float(self.exog.shape[0])
+        self.k_endog = self.endog.shape[1]
+
+    def whiten(self, x):
+        """
+        Whiten an array using the square root of the weights.
+
+        Parameters
+        ----------
+        x : array_like
+            Data to be whitened.
+
+        Returns
+        -------
+        ndarray
+            The whitened values sqrt(weights)*x.
+        """
+        x = np.asarray(x)
+        if self.weights is None:
+            return x
+        return np.sqrt(self.weights)[:, None] * x
+
+    def fit(self, method='pinv'):
+        """
+        Estimate all regressions.
+
+        Parameters
+        ----------
+        method : str, optional
+            Can be "pinv", "qr".  "pinv" uses the Moore-Penrose pseudoinverse
+            to solve the least squares problem. "qr" uses the QR
+            factorization.
+
+        Returns
+        -------
+        MultiOLSResults
+            The vectorized estimation results.
+        """
+        wexog = self.whiten(self.exog)
+        wendog = self.whiten(self.endog)
+        if method == 'pinv':
+            pinv_wexog, singular_values = pinv_extended(wexog)
+            normalized_cov_params = pinv_wexog.dot(pinv_wexog.T)
+            rank = matrix_rank(np.diag(singular_values))
+            params = pinv_wexog.dot(wendog)
+            factor = {'pinv_wexog': pinv_wexog}
+        elif method == 'qr':
+            q, r = np.linalg.qr(wexog)
+            normalized_cov_params = inv(r.T.dot(r))
+            singular_values = svd(r, 0, 0)
+            rank = matrix_rank(r)
+            params = solve(r, q.T.dot(wendog))
+            factor = {'exog_Q': q, 'exog_R': r}
+        else:
+            raise ValueError('method has to be "pinv" or "qr"')
+        factor['normalized_cov_params'] = normalized_cov_params
+        factor['wexog_singular_values'] = singular_values
+        factor['rank'] = rank
+        return MultiOLSResults(self, params, normalized_cov_params, rank,
+                               factor, method)
+
+
+class MultiOLSResults(object):
+    """
+    Results of the regressions estimated by MultiOLS
+
+    Parameters
+    ----------
+    model : MultiOLS
+        The model instance.
+    params : ndarray
+        The k_exog x k_endog array of estimated parameters.
+    normalized_cov_params : ndarray
+        The normalized covariance of the parameters, common to all
+        regressions.
+    rank : int
+        The rank of the whitened design matrix.
+    factor : dict
+        The factorization of the design matrix that is reused by the results
+        of the individual regressions.
+    method : str
+        The method used in the estimation.
+
+    Notes
+    -----
+    Arrays with a dimension for the dependent variables are returned as
+    DataFrames or Series if the data were provided as pandas objects.
+    """
+
+    def __init__(self, model, params, normalized_cov_params, rank, factor,
+                 method):
+        self.model = model
+        self._params = params
+        self.normalized_cov_params = normalized_cov_params
+        self.rank = rank
+        self.k_constant = model.k_constant
+        self.nobs = model.nobs
+        self.df_model = float(rank - model.k_constant)
+        self.df_resid = model.nobs - rank
+        self._factor = factor
+        self._method = method
+        self._use_pandas = isinstance(model.data.orig_endog, pd.DataFrame)
+        self._response_results = {}
+        self._cache = {}
+
+    def _wrap(self, value):
+        """Attach the variable names if the data are pandas"""
+        if not self._use_pandas:
+            return value
+        ynames = self.model.endog_names
+        if value.ndim == 1:
+            return pd.Series(value, index=ynames)
+        index = self.model.exog_names
+        if value.shape[0] != len(index):
+            index = self.model.data.row_labels
+        return pd.DataFrame(value, index=index, columns=ynames)
+
+    @cache_readonly
+    def params(self):
+        """The k_exog x k_endog array of estimated parameters."""
+        return self._wrap(self._params)
+
+    @cache_readonly
+    def fittedvalues(self):
+        """The predicted values of all regressions."""
+        return self._wrap(self.model.exog.dot(self._params))
+
+    @cache_readonly
+    def resid(self):
+        """The residuals of all regressions."""
+        return self._wrap(self.model.endog - self.model.exog.dot(self._params))
+
+    @cache_readonly
+    def _wresid(self):
+        model = self.model
+        return model.whiten(model.endog) - model.whiten(model.exog).dot(
+            self._params)
+
+    @cache_readonly
+    def ssr(self):
+        """Sum of squared (whitened) residuals of each regression."""
+        return self._wrap((self._wresid ** 2).sum(0))
+
+    @cache_readonly
+    def scale(self):
+        """The residual variance ssr/(n-p) of each regression."""
+        return self._wrap(np.asarray(self.ssr) / self.df_resid)
+
+    @cache_readonly
+    def bse(self):
+        """The standard errors of the parameter estimates."""
+        cov_diag = np.diag(self.normalized_cov_params)
+        bse = np.sqrt(np.outer(cov_diag, np.asarray(self.scale)))
+        return self._wrap(bse)
+
+    @cache_readonly
+    def tvalues(self):
+        """The t-statistics of the parameter estimates."""
+        return self._wrap(self._params / np.asarray(self.bse))
+
+    @cache_readonly
+    def pvalues(self):
+        """The two-sided p-values of the t-statistics."""
+        tvalues = np.abs(np.asarray(self.tvalues))
+        return self._wrap(stats.t.sf(tvalues, self.df_resid) * 2)
+
+    def conf_int(self, alpha=.05):
+        """
+        Compute the confidence intervals of the parameters.
+
+        Parameters
+        ----------
+        alpha : float, optional
+            The `alpha` level for the confidence interval. The default
+            `alpha` = .05 returns a 95% confidence interval.
+
+        Returns
+        -------
+        lower : {ndarray, DataFrame}
+            The k_exog x k_endog lower bounds.
+        upper : {ndarray, DataFrame}
+            The k_exog x k_endog upper bounds.
+        """
+        q = stats.t.ppf(1 - alpha / 2., self.df_resid)
+        bse = np.asarray(self.bse)
+        return (self._wrap(self._params - q * bse),
+                self._wrap(self._params + q * bse))
+
+    @cache_readonly
+    def centered_tss(self):
+        """The total (weighted) sum of squares centered about the mean."""
+        model = self.model
+        if model.weights is None:
+            centered = model.endog - model.endog.mean(0)
+            return self._wrap((centered ** 2).sum(0))
+        weights = model.weights
+        mean = np.average(model.endog, axis=0, weights=weights)
+        return self._wrap(weights.dot((model.endog - mean) ** 2))
+
+    @cache_readonly
+    def uncentered_tss(self):
+        """The sum of the squared values of the (whitened) endog."""
+        wendog = self.model.whiten(self.model.endog)
+        return self._wrap((wendog ** 2).sum(0))
+
+    @cache_readonly
+    def rsquared(self):
+        """
+        R-squared of each regression.
+
+        Computed using the centered total sum of squares if the model
+        includes a constant and the uncentered total sum of squares
+        otherwise.
+        """
+        tss = self.centered_tss if self.k_constant else self.uncentered_tss
+        return self._wrap(1 - np.asarray(self.ssr) / np.asarray(tss))
+
+    @cache_readonly
+    def rsquared_adj(self):
+        """Adjusted R-squared of each regression."""
+        rsquared = np.asarray(self.rsquared)
+        return self._wrap(1 - (np.divide(self.nobs - self.k_constant,
+                                         self.df_resid) * (1 - rsquared)))
+
+    @cache_readonly
+    def llf(self):
+        """Profile log-likelihood of each regression."""
+        nobs2 = self.nobs / 2.0
+        llf = -np.log(np.asarray(self.ssr)) * nobs2
+        llf -= (1 + np.log(np.pi / nobs2)) * nobs2
+        if self.model.weights is not None:
+            llf += 0.5 * np.sum(np.log(self.model.weights))
+        return self._wrap(llf)
+
+    def predict(self, exog=None):
+        """
+        Predicted values of all regressions.
+
+        Parameters
+        ----------
+        exog : array_like, optional
+            The values for which to predict. If None, the fitted values are
+            returned.
+
+        Returns
+        -------
+        ndarray
+            The nobs x k_endog array of predicted values.
+        """
+        if exog is None:
+            return self.fittedvalues
+        return np.asarray(exog).dot(self._params)
+
+    def get_response_results(self, idx):
+        """
+        Full regression results of a single dependent variable.
+
+        Parameters
+        ----------
+        idx : {int, str}
+            Column index or name of the dependent variable.
+
+        Returns
+        -------
+        RegressionResults
+            The results of OLS, or WLS if the model has weights, for the
+            selected dependent variable. The factorization of the design
+            matrix is shared with this instance and not recomputed.
+        """
+        from statsmodels.regression.linear_model import OLS, WLS
+
+        if isinstance(idx, str):
+            idx = list(self.model.endog_names).index(idx)
+        if idx in self._response_results:
+            return self._response_results[idx]
+        model = self.model
+        endog = model.data.orig_endog
+        if isinstance(endog, pd.DataFrame):
+            endog = endog.iloc[:, idx]
+        else:
+            endog = model.endog[:, idx]
+        exog = model.data.orig_exog
+        if exog.shape[0] != model.exog.shape[0]:
+            # missing values were dropped
+            exog = model.exog
+            endog = model.endog[:, idx]
+        hasconst = bool(model.k_constant)
+        if model.weights is None:
+            mod = OLS(endog, exog, hasconst=hasconst)
+        else:
+            mod = WLS(endog, exog, weights=model.weights, hasconst=hasconst)
+        for key, value in self._factor.items():
+            setattr(mod, key, value)
+        res = mod.fit(method=self._method)
+        self._response_results[idx] = res
+        return res
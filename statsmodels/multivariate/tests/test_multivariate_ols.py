@@ -2,8 +2,12 @@
 
 import numpy as np
 import pandas as pd
-from statsmodels.multivariate.multivariate_ols import _MultivariateOLS
-from numpy.testing import assert_array_almost_equal, assert_raises
+import pytest
+from statsmodels.multivariate.multivariate_ols import (
+    _MultivariateOLS, MultiOLS)
+from statsmodels.regression.linear_model import OLS, WLS
+from numpy.testing import (assert_array_almost_equal, assert_raises,
+                           assert_allclose)
 import patsy
 
 data = pd.DataFrame([['Morphine', 'N', .04, .20, .10, .08],
@@ -199,3 +203,52 @@ def test_affine_hypothesis():
     assert_array_almost_equal(r0['test1']['stat'].values, a, decimal=4)
     r0.summary(show_contrast_L=True, show_transform_M=True,
                show_constant_C=True)
+
+
+@pytest.mark.parametrize('method', ['pinv', 'qr'])
+@pytest.mark.parametrize('weighted', [False, True])
+def test_multi_ols(method, weighted):
+    rs = np.random.RandomState(2342)
+    nobs, k_endog = 200, 6
+    exog = np.column_stack([np.ones(nobs), rs.standard_normal((nobs, 3))])
+    endog = exog.dot(rs.standard_normal((4, k_endog)))
+    endog += rs.standard_normal((nobs, k_endog))
+    weights = rs.chisquare(5, nobs) / 5 if weighted else None
+    res = MultiOLS(endog, exog, weights=weights).fit(method=method)
+    assert res.params.shape == (4, k_endog)
+    for i in range(k_endog):
+        if weighted:
+            ref = WLS(endog[:, i], exog, weights=weights).fit()
+        else:
+            ref = OLS(endog[:, i], exog).fit()
+        for attr in ['params', 'bse', 'tvalues', 'pvalues', 'resid',
+                     'fittedvalues']:
+            assert_allclose(getattr(res, attr)[..., i], getattr(ref, attr),
+                            rtol=1e-10)
+        for attr in ['rsquared', 'rsquared_adj', 'ssr', 'scale', 'llf',
+                     'centered_tss', 'uncentered_tss']:
+            assert_allclose(getattr(res, attr)[i], getattr(ref, attr),
+                            rtol=1e-10)
+        lower, upper = res.conf_int()
+        assert_allclose(np.column_stack([lower[:, i], upper[:, i]]),
+                        ref.conf_int(), rtol=1e-10)
+        res_i = res.get_response_results(i)
+        assert_allclose(res_i.params, ref.params, rtol=1e-10)
+        assert_allclose(res_i.bse, ref.bse, rtol=1e-10)
+        assert_allclose(res_i.rsquared, ref.rsquared, rtol=1e-10)
+
+
+def test_multi_ols_pandas():
+    endog = data[['Histamine0', 'Histamine1', 'Histamine3', 'Histamine5']]
+    exog = patsy.dmatrix('Drug * Depleted', data, return_type='dataframe')
+    res = MultiOLS(endog, exog).fit()
+    assert list(res.params.columns) == list(endog.columns)
+    assert list(res.params.index) == list(exog.columns)
+    assert list(res.rsquared.index) == list(endog.columns)
+    res_i = res.get_response_results('Histamine1')
+    ref = OLS(endog['Histamine1'], exog).fit()
+    assert_allclose(res_i.params, ref.params, rtol=1e-10)
+    assert res_i.model.endog_names == 'Histamine1'
+    assert res.get_response_results(1) is res_i
+    assert_allclose(res.params['Histamine1'], ref.params, rtol=1e-10)
+    assert_allclose(res.rsquared['Histamine1'], ref.rsquared, rtol=1e-10)
@@ -0,0 +1,285 @@
+#!python
+#cython: language_level=3, wraparound=False, boundscheck=False, cdivision=True
+"""
+Sparse Cholesky factorization with a reusable symbolic analysis
+
+The symmetric positive definite matrix ``C`` is given in compressed sparse
+column format, already permuted with a fill reducing ordering; only the
+entries on and above the diagonal are used. `symbolic` computes the
+elimination tree and the sparsity pattern of the lower triangular factor
+``L`` once, `numeric` then computes the values of ``L`` for any matrix with
+the same pattern. The factor is stored in compressed sparse column format
+with the diagonal entry first in each column and the row indices in
+increasing order.
+
+The trailing columns of the factor are often dense after a fill reducing
+ordering, for example for crossed random effects. Only the leading `nsparse`
+columns are then factored here, `numeric` returns the Schur complement of
+the trailing block, which is factored by the caller with dense linear
+algebra, and the triangular solves and the selected inverse take the
+trailing block of the factor or of the inverse as a dense array.
+
+The up-looking algorithm follows T. A. Davis, Direct Methods for Sparse
+Linear Systems, SIAM, 2006. `selected_inverse` computes the entries of
+``C^{-1}`` on the pattern of ``L`` with the recursion of Takahashi, Fagan
+and Chen (1973).
+
+License: 3-clause BSD
+"""
+from libc.math cimport INFINITY, sqrt
+import numpy as np
+
+
+cdef Py_ssize_t _ereach(const Py_ssize_t[::1] Cp, const Py_ssize_t[::1] Ci,
+                        Py_ssize_t k, const Py_ssize_t[::1] parent,
+                        Py_ssize_t[::1] s, Py_ssize_t[::1] w) nogil:
+    # Nonzero pattern of row k of L in topological order in s[top:n]
+    cdef Py_ssize_t n = s.shape[0], top = n, i, p, length
+    w[k] = k
+    for p in range(Cp[k], Cp[k + 1]):
+        i = Ci[p]
+        if i > k:
+            continue
+        length = 0
+        while w[i] != k:
+            s[length] = i
+            length += 1
+            w[i] = k
+            i = parent[i]
+        while length > 0:
+            top -= 1
+            length -= 1
+            s[top] = s[length]
+    return top
+
+
+def symbolic(const Py_ssize_t[::1] Cp, const Py_ssize_t[::1] Ci):
+    """
+    Elimination tree and pattern of the Cholesky factor
+
+    Returns
+    -------
+    parent : ndarray
+        The elimination tree, -1 for the roots.
+    Lp : ndarray
+        The column pointers of L.
+    Li : ndarray
+        The row indices of L.
+    """
+    cdef Py_ssize_t n = Cp.shape[0] - 1, i, k, p, top, inext
+    parent_arr = np.empty(n, dtype=np.intp)
+    ancestor_arr = np.empty(n, dtype=np.intp)
+    s_arr = np.empty(n, dtype=np.intp)
+    w_arr = np.empty(n, dtype=np.intp)
+    Lp_arr = np.zeros(n + 1, dtype=np.intp)
+    cdef Py_ssize_t[::1] parent = parent_arr, ancestor = ancestor_arr
+    cdef Py_ssize_t[::1] s = s_arr, w = w_arr, Lp = Lp_arr
+    cdef Py_ssize_t[::1] c, Li
+
+    with nogil:
+        for k in range(n):
+            parent[k] = -1
+            ancestor[k] = -1
+            for p in range(Cp[k], Cp[k + 1]):
+                i = Ci[p]
+                while i != -1 and i < k:
+                    inext = ancestor[i]
+                    ancestor[i] = k
+                    if inext == -1:
+                        parent[i] = k
+                    i = inext
+
+        # column counts
+        for k in range(n):
+            w[k] = -1
+        for k in range(n):
+            top = _ereach(Cp, Ci, k, parent, s, w)
+            for p in range(top, n):
+                Lp[s[p] + 1] += 1
+            Lp[k + 1] += 1
+        for k in range(n):
+            Lp[k + 1] += Lp[k]
+
+    Li_arr = np.empty(Lp[n], dtype=np.intp)
+    c_arr = np.array(Lp_arr[:n])
+    Li = Li_arr
+    c = c_arr
+    with nogil:
+        for k in range(n):
+            w[k] = -1
+        for k in range(n):
+            top = _ereach(Cp, Ci, k, parent, s, w)
+            for p in range(top, n):
+                i = s[p]
+                Li[c[i]] = k
+                c[i] += 1
+            Li[c[k]] = k
+            c[k] += 1
+    return parent_arr, Lp_arr, Li_arr
+
+
+def numeric(const Py_ssize_t[::1] Cp, const Py_ssize_t[::1] Ci,
+            const double[::1] Cx, const Py_ssize_t[::1] parent,
+            const Py_ssize_t[::1] Lp, const Py_ssize_t[::1] Li,
+            double[::1] Lx, double[:, ::1] S, double drop_tol=-1):
+    """
+    Values of the Cholesky factor
+
+    The values of the leading ``n - m`` columns are written to `Lx`, the
+    pattern is the one returned by `symbolic`. The lower triangle of the
+    ``m x m`` array `S` is set to the Schur complement of the trailing
+    block. Returns -1 on success, otherwise the column at which the matrix
+    was found not to be positive definite.
+
+    If `drop_tol` is nonnegative, a leading column whose pivot is at most
+    `drop_tol` times its diagonal entry in ``C`` is linearly dependent on
+    the previous columns and is dropped instead. Its diagonal entry in
+    `Lx` is set to infinity and the entries of the later rows in the
+    column to zero, the factor is then the one of ``C`` without the
+    dropped rows and columns, and the solves and the selected inverse
+    return zeros for them.
+    """
+    cdef Py_ssize_t n = Cp.shape[0] - 1, i, j, k, p, top
+    cdef Py_ssize_t t = n - S.shape[0], info = -1
+    cdef double d, d0, lki
+    x_arr = np.zeros(n)
+    s_arr = np.empty(n, dtype=np.intp)
+    w_arr = np.empty(n, dtype=np.intp)
+    c_arr = np.array(Lp[:n], dtype=np.intp)
+    cdef double[::1] x = x_arr
+    cdef Py_ssize_t[::1] s = s_arr, w = w_arr, c = c_arr
+    with nogil:
+        for k in range(n):
+            w[k] = -1
+        for k in range(n):
+            top = _ereach(Cp, Ci, k, parent, s, w)
+            for p in range(Cp[k], Cp[k + 1]):
+                if Ci[p] <= k:
+                    x[Ci[p]] = Cx[p]
+            d = d0 = x[k]
+            x[k] = 0
+            # the leading columns precede their ancestors in the reach
+            for p in range(top, n):
+                i = s[p]
+                if i >= t:
+                    continue
+                lki = x[i] / Lx[Lp[i]]
+                x[i] = 0
+                for j in range(Lp[i] + 1, c[i]):
+                    x[Li[j]] -= Lx[j] * lki
+                d -= lki * lki
+                Lx[c[i]] = lki
+                c[i] += 1
+            if k >= t:
+                for p in range(top, n):
+                    i = s[p]
+                    if i >= t:
+                        S[k - t, i - t] = x[i]
+                        x[i] = 0
+                S[k - t, k - t] = d
+                continue
+            if d <= 0 or d <= drop_tol * d0:
+                if drop_tol < 0:
+                    info = k
+                    break
+                d = INFINITY
+            Lx[c[k]] = sqrt(d)
+            c[k] += 1
+    return info
+
+
+def solve_lower(const Py_ssize_t[::1] Lp, const Py_ssize_t[::1] Li,
+                const double[::1] Lx, double[:, ::1] b, Py_ssize_t nsparse):
+    """
+    Forward substitution in place with the leading `nsparse` columns of L
+
+    The trailing rows of `b` are updated with the leading columns, the
+    solve with the trailing block is left to the caller.
+    """
+    cdef Py_ssize_t m = b.shape[1], i, j, p, r
+    cdef double v
+    with nogil:
+        for j in range(nsparse):
+            v = Lx[Lp[j]]
+            for r in range(m):
+                b[j, r] /= v
+            for p in range(Lp[j] + 1, Lp[j + 1]):
+                i = Li[p]
+                v = Lx[p]
+                for r in range(m):
+                    b[i, r] -= v * b[j, r]
+
+
+def solve_upper(const Py_ssize_t[::1] Lp, const Py_ssize_t[::1] Li,
+                const double[::1] Lx, double[:, ::1] b, Py_ssize_t nsparse):
+    """
+    Back substitution in place with the transpose of the leading `nsparse`
+    columns of L, the trailing rows of `b` must already be solved.
+    """
+    cdef Py_ssize_t m = b.shape[1], i, j, p, r
+    cdef double v
+    with nogil:
+        for j in range(nsparse - 1, -1, -1):
+            for p in range(Lp[j] + 1, Lp[j + 1]):
+                i = Li[p]
+                v = Lx[p]
+                for r in range(m):
+                    b[j, r] -= v * b[i, r]
+            v = Lx[Lp[j]]
+            for r in range(m):
+                b[j, r] /= v
+
+
+def selected_inverse(const Py_ssize_t[::1] Lp, const Py_ssize_t[::1] Li,
+                     const double[::1] Lx, const double[:, ::1] Z22):
+    """
+    Entries of ``(L L')^{-1}`` on the pattern of L
+
+    Returns the values in the order of `Li` for the leading ``n - m``
+    columns, the lower triangle of `Z22` is the ``m x m`` trailing block of
+    the inverse. The
+    pattern of a Cholesky factor is closed under the recursion, so that
+    all entries that are needed are computed before they are used: for k
+    in the pattern of column j, the pattern of column k contains the rows
+    of column j that are larger than k.
+    """
+    cdef Py_ssize_t n = Lp.shape[0] - 1, i, j, k, p, r
+    cdef Py_ssize_t t = n - Z22.shape[0]
+    cdef double ljj, lkj, acc
+    Zx_arr = np.zeros(Lp[n])
+    mark_arr = np.full(n, -1, dtype=np.intp)
+    cdef double[::1] Zx = Zx_arr
+    cdef Py_ssize_t[::1] mark = mark_arr
+    cdef double[::1] lval = np.zeros(n), z = np.zeros(n)
+    with nogil:
+        for j in range(t - 1, -1, -1):
+            ljj = Lx[Lp[j]]
+            for p in range(Lp[j] + 1, Lp[j + 1]):
+                i = Li[p]
+                mark[i] = j
+                lval[i] = Lx[p]
+                z[i] = 0
+            # z = Z[s, s] L[s, j] for the pattern s of column j, using the
+            # lower triangle of Z by columns
+            for p in range(Lp[j] + 1, Lp[j + 1]):
+                k = Li[p]
+                lkj = Lx[p]
+                if k >= t:
+                    z[k] += Z22[k - t, k - t] * lkj
+                    for r in range(p + 1, Lp[j + 1]):
+                        i = Li[r]
+                        z[i] += Z22[i - t, k - t] * lkj
+                        z[k] += Z22[i - t, k - t] * lval[i]
+                    continue
+                z[k] += Zx[Lp[k]] * lkj
+                for r in range(Lp[k] + 1, Lp[k + 1]):
+                    i = Li[r]
+                    if mark[i] == j:
+                        z[i] += Zx[r] * lkj
+                        z[k] += Zx[r] * lval[i]
+            acc = 1. / ljj
+            for p in range(Lp[j] + 1, Lp[j + 1]):
+                Zx[p] = -z[Li[p]] / ljj
+                acc -= Lx[p] * Zx[p]
+            Zx[Lp[j]] = acc / ljj
+    return Zx_arr
@@ -1,7 +1,252 @@
 import numpy as np
+from scipy import linalg, sparse
+from scipy.linalg import lapack
+from scipy.sparse.linalg import LinearOperator, lsqr, splu
+
+from statsmodels.regression import _sparse_cholesky
 from statsmodels.tools.tools import Bunch
 
 
+def _sparse_whiten(exog, w_half):
+    """
+    Multiply the rows of a sparse exog by w_half, keeping the format.
+    """
+    if np.isscalar(w_half):
+        return exog * w_half
+    return sparse.diags(w_half).dot(exog).asformat(exog.format)
+
+
+def _fill_reducing_order(pattern):
+    """
+    Fill reducing symmetric ordering of a sparse symmetric matrix.
+
+    `pattern` has nonnegative entries and a positive diagonal. The ordering
+    only depends on the sparsity pattern, a diagonally dominant matrix with
+    this pattern is factored by SuperLU without pivoting. As in AMD, dense
+    rows, for example of a constant or of continuous regressors, are
+    ordered last; they fill in anyway and slow down the minimum degree
+    ordering. Returns the permutation `perm`, the permuted matrix is
+    ``pattern[perm][:, perm]``.
+    """
+    pattern = pattern.tocsc()
+    k = pattern.shape[0]
+    dense = np.diff(pattern.indptr) > max(16, 10 * np.sqrt(k))
+    keep = np.nonzero(~dense)[0]
+    if len(keep) == 0:
+        return np.arange(k)
+    sub = pattern[keep][:, keep]
+    dd = sub + sparse.diags(np.asarray(sub.sum(0)).ravel())
+    lu = splu(dd.tocsc(), permc_spec='MMD_AT_PLUS_A', diag_pivot_thresh=0.,
+              options=dict(SymmetricMode=True))
+    return np.concatenate((keep[np.argsort(lu.perm_c)],
+                           np.nonzero(dense)[0]))
+
+
+class _SparseXpxInverse(LinearOperator):
+    """
+    Pseudoinverse of exog.T exog for a scipy.sparse exog.
+
+    Parameters
+    ----------
+    exog : sparse matrix
+        The nobs x k design.
+    like : _SparseXpxInverse, optional
+        The inverse for a design with the same sparsity pattern, for example
+        exog with other weights. Its ordering and symbolic factorization are
+        reused.
+
+    Attributes
+    ----------
+    rank : int
+        The numerical rank of exog.
+    dropped : ndarray
+        Boolean array, True for the columns that are linearly dependent on
+        the other columns.
+    null_space : {ndarray, None}
+        Orthonormal basis of the null space of exog without the unit vectors
+        of its zero columns, None if it is empty.
+
+    Notes
+    -----
+    The cross-product is factored with a sparse Cholesky factorization in a
+    fill reducing order. A column whose pivot is at most 1e-10 times its
+    diagonal entry, that is whose uncentered R-squared on the previous
+    columns exceeds 1 - 1e-10, is treated as linearly dependent on them and
+    is dropped from the factor, which is then the factor of the
+    cross-product of the remaining columns. The null space is spanned by
+    the dropped columns minus their projection on the remaining ones, and
+    the generalized inverse given by the factor is projected on its
+    orthogonal complement to obtain the Moore-Penrose pseudoinverse. The
+    basis is a dense k x d array for d dependent columns that are not zero,
+    which is intended for a small number of dependencies, for example a
+    constant with the dummies of all levels of several factors.
+
+    Applying the operator solves with the factor, the dense k x k
+    pseudoinverse is only formed by `toarray`. `diagonal` uses the selected
+    inverse of the factor, whose cost depends on the fill-in and not on
+    k ** 2.
+    """
+
+    def __init__(self, exog, like=None):
+        xpx = exog.T.dot(exog).tocsc()
+        k = xpx.shape[0]
+        super(_SparseXpxInverse, self).__init__(np.float64, (k, k))
+        if like is None:
+            self._symbolic = self._analyze(xpx)
+        else:
+            self._symbolic = like._symbolic
+        sym = self._symbolic
+
+        mat = xpx.tocoo()
+        keys = sym.iperm[mat.col].astype(np.int64) * k + sym.iperm[mat.row]
+        cx = np.zeros(len(sym.ci))
+        cx[np.searchsorted(sym.ckeys, keys)] = mat.data
+        self._lx = np.empty(len(sym.li))
+        _sparse_cholesky.numeric(sym.cp, sym.ci, cx, sym.parent, sym.lp,
+                                 sym.li, self._lx, np.zeros((0, 0)), 1e-10)
+        dropped = np.isinf(self._lx[sym.lp[:-1]])[sym.iperm]
+        self.dropped = dropped
+        self.rank = int(k - dropped.sum())
+        self.null_space = None
+        # The unit vectors of zero columns are in the null space and are
+        # orthogonal to the rest of it, the factor already gives zeros for
+        # them, so that only the other dropped columns need a basis.
+        cols = np.nonzero(dropped & (xpx.diagonal() > 0))[0]
+        if len(cols) > 0:
+            # the solve is zero in the rows of the dropped columns
+            basis = -self._solve(xpx[:, cols].toarray())
+            basis[cols, np.arange(len(cols))] = 1
+            self.null_space = np.linalg.qr(basis)[0]
+
+    @staticmethod
+    def _analyze(xpx):
+        """Fill reducing ordering and symbolic factorization of xpx"""
+        k = xpx.shape[0]
+        pattern = (abs(xpx) + sparse.identity(k)).tocsc()
+        perm = _fill_reducing_order(pattern)
+        iperm = np.empty_like(perm)
+        iperm[perm] = np.arange(k)
+        cmat = pattern[perm, :][:, perm].tocsc()
+        cmat.sort_indices()
+        cp = cmat.indptr.astype(np.intp)
+        ci = cmat.indices.astype(np.intp)
+        parent, lp, li = _sparse_cholesky.symbolic(cp, ci)
+        ckeys = np.repeat(np.arange(k, dtype=np.int64), np.diff(cp)) * k + ci
+        return Bunch(perm=perm, iperm=iperm, cp=cp, ci=ci, ckeys=ckeys,
+                     parent=parent, lp=lp, li=li)
+
+    def _solve(self, rhs):
+        """Solve with the factor, zero in the rows of the dropped columns"""
+        sym = self._symbolic
+        k = self.shape[0]
+        b = np.array(rhs, dtype=np.float64).reshape(k, -1)[sym.perm]
+        b = np.ascontiguousarray(b)
+        _sparse_cholesky.solve_lower(sym.lp, sym.li, self._lx, b, k)
+        _sparse_cholesky.solve_upper(sym.lp, sym.li, self._lx, b, k)
+        x = np.empty_like(b)
+        x[sym.perm] = b
+        return x.reshape(np.shape(rhs))
+
+    def _project(self, x):
+        """Project x on the orthogonal complement of the null space"""
+        if self.null_space is None:
+            return x
+        return x - self.null_space.dot(self.null_space.T.dot(x))
+
+    def _matmat(self, x):
+        return self._project(self._solve(self._project(x)))
+
+    def _matvec(self, x):
+        return self._matmat(x)
+
+    def _adjoint(self):
+        return self
+
+    def diagonal(self):
+        """The diagonal of the pseudoinverse"""
+        sym = self._symbolic
+        zx = _sparse_cholesky.selected_inverse(sym.lp, sym.li, self._lx,
+                                               np.zeros((0, 0)))
+        diag = zx[sym.lp[:-1]][sym.iperm]
+        if self.null_space is not None:
+            null = self.null_space
+            gnull = self._solve(null)
+            diag += (null * (null.dot(null.T.dot(gnull)) - 2 * gnull)).sum(1)
+        return diag
+
+    def toarray(self):
+        """The dense k x k pseudoinverse"""
+        inv = self._matmat(np.eye(self.shape[0]))
+        inv += inv.T
+        inv /= 2
+        return inv
+
+
+def _matrix_rank(exog):
+    """
+    Rank of exog.
+
+    For sparse exog the rank is computed from the sparse factorization of
+    the cross-product, see `_SparseXpxInverse`.
+    """
+    if sparse.issparse(exog):
+        return _SparseXpxInverse(exog).rank
+    return np.linalg.matrix_rank(exog)
+
+
+def _sparse_lsqr(wexog, wendog):
+    # tolerances tight enough to match the dense solvers
+    return lsqr(wexog, wendog, atol=1e-12, btol=1e-12, conlim=1e12)[0]
+
+
+def _sparse_solve(wexog, wendog, like=None):
+    """
+    Minimum norm least squares parameters for a scipy.sparse design.
+
+    `like` is passed to `_SparseXpxInverse`.
+    """
+    xpx_inv = _SparseXpxInverse(wexog, like=like)
+    return xpx_inv.dot(np.asarray(wexog.T.dot(wendog), dtype=float))
+
+
+def _sparse_lstsq(wexog, wendog, method='pinv', xpx_inv=None):
+    """
+    Least squares with a scipy.sparse design without densifying it.
+
+    Parameters
+    ----------
+    wexog : sparse matrix
+        The nobs x k (whitened) design.
+    wendog : ndarray
+        The (whitened) response.
+    method : {'pinv', 'lsqr'}
+        'pinv' solves the normal equations with a sparse Cholesky
+        factorization of wexog.T wexog. 'lsqr' uses
+        scipy.sparse.linalg.lsqr for the parameters, which does not form
+        the cross-product.
+    xpx_inv : _SparseXpxInverse, optional
+        The pseudoinverse of wexog.T wexog if it is already available.
+
+    Returns
+    -------
+    params : ndarray
+        The minimum norm least squares solution.
+    normalized_cov_params : _SparseXpxInverse
+        The pseudoinverse of wexog.T wexog as a LinearOperator.
+    singular_values : None
+        The singular values are computed on demand by the results.
+    rank : int
+        The numerical rank of wexog.
+    """
+    if xpx_inv is None:
+        xpx_inv = _SparseXpxInverse(wexog)
+    if method == 'lsqr':
+        params = _sparse_lsqr(wexog, wendog)
+    else:
+        params = xpx_inv.dot(np.asarray(wexog.T.dot(wendog), dtype=float))
+    return params, xpx_inv, None, xpx_inv.rank
+
+
 class _MinimalWLS(object):
     """
     Minimal implementation of WLS optimized for performance.
@@ -25,6 +270,9 @@ class _MinimalWLS(object):
     check_weights : bool, optional
         Flag indicating whether to check for inf/nan in weights.
         If True and any are found, ValueError is raised.
+    xpx_like : _SparseXpxInverse, optional
+        For a sparse exog, the factorization for a design with the same
+        sparsity pattern whose ordering is reused.
 
     Notes
     -----
@@ -38,10 +286,11 @@ class _MinimalWLS(object):
     msg = 'NaN, inf or invalid value detected in {0}, estimation infeasible.'
 
     def __init__(self, endog, exog, weights=1.0, check_endog=False,
-                 check_weights=False):
+                 check_weights=False, xpx_like=None):
         self.endog = endog
         self.exog = exog
         self.weights = weights
+        self.xpx_like = xpx_like
         w_half = np.sqrt(weights)
         if check_weights:
             if not np.all(np.isfinite(w_half)):
@@ -52,7 +301,9 @@ class _MinimalWLS(object):
                 raise ValueError(self.msg.format('endog'))
 
         self.wendog = w_half * endog
-        if np.isscalar(weights):
+        if sparse.issparse(exog):
+            self.wexog = _sparse_whiten(exog, w_half)
+        elif np.isscalar(weights):
             self.wexog = w_half * exog
         else:
             self.wexog = w_half[:, None] * exog
@@ -71,6 +322,10 @@ class _MinimalWLS(object):
               * "qr" uses the QR factorization.
               * "lstsq" uses the least squares implementation in numpy.linalg
 
+            If exog is a scipy.sparse matrix, "lstsq" uses
+            scipy.sparse.linalg.lsqr and "pinv" solves the normal equations.
+            "qr" is not available.
+
         Returns
         -------
         results : namedtuple
@@ -91,6 +346,18 @@ class _MinimalWLS(object):
         --------
         statsmodels.regression.linear_model.WLS
         """
+        if sparse.issparse(self.wexog):
+            if method == 'qr':
+                raise ValueError('method "qr" is not available with a '
+                                 'sparse exog')
+            method = 'lsqr' if method == 'lstsq' else method
+            if method == 'lsqr':
+                # avoid forming the k x k cross-product in each iteration
+                params = _sparse_lsqr(self.wexog, self.wendog)
+            else:
+                params = _sparse_solve(self.wexog, self.wendog,
+                                       like=self.xpx_like)
+            return self.results(params)
         if method == 'pinv':
             pinv_wexog = np.linalg.pinv(self.wexog)
             params = pinv_wexog.dot(self.wendog)
@@ -122,3 +389,107 @@ class _MinimalWLS(object):
 
         return Bunch(params=params, fittedvalues=fitted_values, resid=resid,
                      model=self, scale=scale)
+
+
+class _CholeskyWLS(object):
+    """
+    WLS by the Cholesky factorization of X'WX for iterative fits.
+
+    The design is fixed and the weighted least squares problem is solved
+    for new `endog` and `weights` in each call to ``fit``. The buffers of
+    the size of `exog` are allocated once and reused, so that the
+    iterations do not copy the design.
+
+    Parameters
+    ----------
+    exog : ndarray
+        A nobs x k array of regressors. It is not copied.
+    rcond : float, optional
+        The Cholesky solution is only used if the estimated reciprocal
+        condition number of X'WX is larger than `rcond`. Otherwise the
+        problem is solved by the QR decomposition with column pivoting of
+        the whitened design. Default is the square root of the machine
+        epsilon.
+
+    Notes
+    -----
+    Forming X'WX squares the condition number of the design, so that the
+    normal equations are only solved for well conditioned problems. With
+    a rank deficient design, the QR fallback returns a basic solution with
+    the parameters of the dependent columns set to zero instead of the
+    minimum norm solution of "pinv". The fitted values are the same.
+    """
+
+    msg = _MinimalWLS.msg
+
+    def __init__(self, exog, rcond=None):
+        if sparse.issparse(exog):
+            raise ValueError('method "cholesky" is not available with a '
+                             'sparse exog')
+        self.exog = exog
+        if rcond is None:
+            rcond = np.sqrt(np.finfo(np.double).eps)
+        self.rcond = rcond
+        k = exog.shape[1]
+        # Fortran order, so that the QR fallback can overwrite it
+        self._wexog = np.empty(exog.shape, order='F')
+        self._xwx = np.empty((k, k))
+
+    def fit(self, endog, weights, check_endog=False, check_weights=False):
+        """
+        Estimate the parameters of the weighted least squares problem.
+
+        Parameters
+        ----------
+        endog : ndarray
+            1-d endogenous response variable.
+        weights : ndarray
+            1-d array of nonnegative weights.
+        check_endog : bool, optional
+            Flag indicating whether to check for inf/nan in endog.
+            If True and any are found, ValueError is raised.
+        check_weights : bool, optional
+            Flag indicating whether to check for inf/nan or negative values
+            in weights. If True and any are found, ValueError is raised.
+
+        Returns
+        -------
+        results : Bunch
+            Contains `params` and `method`, which is "cholesky" or "qr"
+            depending on the factorization that was used.
+        """
+        if check_weights:
+            if not (np.all(np.isfinite(weights)) and np.all(weights >= 0)):
+                raise ValueError(self.msg.format('weights'))
+        if check_endog:
+            if not np.all(np.isfinite(endog)):
+                raise ValueError(self.msg.format('endog'))
+
+        exog = self.exog
+        wexog = np.multiply(exog, weights[:, None], out=self._wexog)
+        xwx = np.dot(wexog.T, exog, out=self._xwx)
+        anorm = np.abs(xwx).sum(0).max()
+        try:
+            factor = linalg.cho_factor(xwx, overwrite_a=True,
+                                       check_finite=False)
+            rcond, info = lapack.dpocon(factor[0], anorm)
+            use_cholesky = info == 0 and rcond > self.rcond
+        except linalg.LinAlgError:
+            use_cholesky = False
+        if use_cholesky:
+            params = linalg.cho_solve(factor, wexog.T.dot(endog),
+                                      check_finite=False)
+            return Bunch(params=params, method='cholesky')
+
+        w_half = np.sqrt(weights)
+        wexog = np.multiply(exog, w_half[:, None], out=self._wexog)
+        q, r, perm = linalg.qr(wexog, overwrite_a=True, mode='economic',
+                               pivoting=True, check_finite=False)
+        diag = np.abs(np.diag(r))
+        tol = diag[0] * max(exog.shape) * np.finfo(np.double).eps
+        rank = int(np.sum(diag > tol))
+        params = np.zeros(exog.shape[1])
+        params[perm[:rank]] = linalg.solve_triangular(
+            r[:rank, :rank], q[:, :rank].T.dot(w_half * endog),
+            check_finite=False)
+        return Bunch(params=params, method='qr')
@@ -0,0 +1,300 @@
+"""
+Linear regression with absorbed high-dimensional fixed effects
+
+The fixed effects are partialled out of the dependent and explanatory
+variables by alternating projections, so that the dummy variables are never
+formed.
+
+License: 3-clause BSD
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from statsmodels.regression.linear_model import (
+    WLS, RegressionResults, RegressionResultsWrapper)
+from statsmodels.tools.decorators import cache_readonly, cached_obs_data
+from statsmodels.tools.grouputils import Group, absorbed_df, demean_groups
+from statsmodels.tools.sm_exceptions import (CollinearityWarning,
+                                             MissingDataError)
+import statsmodels.base.model as base
+import statsmodels.base.wrapper as wrap
+import statsmodels.regression._tools as reg_tools
+
+__all__ = ['AbsorbingLS', 'AbsorbingLSResults']
+
+
+def _absorb_codes(absorb):
+    """
+    Integer codes of the factors to absorb
+
+    Returns a float array of shape (nobs, n_factors) with missing levels coded
+    as nan, and the row index of the observations with nan for the rows with
+    missing levels. The data handling only supports extra 1d arrays, the
+    index is passed to the model in place of the codes so that the missing
+    data options apply.
+    """
+    if isinstance(absorb, pd.Series):
+        columns = [absorb]
+    elif isinstance(absorb, pd.DataFrame):
+        columns = [absorb.iloc[:, i] for i in range(absorb.shape[1])]
+    elif isinstance(absorb, (list, tuple)):
+        columns = [np.asarray(col) for col in absorb]
+    else:
+        absorb = np.asarray(absorb)
+        columns = [absorb] if absorb.ndim == 1 else list(absorb.T)
+    if not columns:
+        raise ValueError('absorb must contain at least one factor')
+    codes = np.column_stack([pd.factorize(col)[0] for col in columns])
+    codes = codes.astype(float)
+    codes[codes < 0] = np.nan
+    index = np.arange(codes.shape[0], dtype=float)
+    index[np.isnan(codes).any(1)] = np.nan
+    return codes, index
+
+
+def _absorb_groups(model):
+    """
+    Replace the row index in `model.absorb` by the codes and return Groups
+    """
+    index = np.asarray(model.absorb)
+    if np.isnan(index).any():
+        raise MissingDataError('absorb contains missing levels. Use '
+                               'missing="drop" to drop the observations.')
+    codes = model._absorb_codes[index.astype(np.int64)]
+    del model._absorb_codes
+    model.absorb = codes
+    return [Group(codes[:, i].astype(np.int64))
+            for i in range(codes.shape[1])]
+
+
+def _absorbed_columns(data, data_demeaned, weights, tol):
+    """Columns that are (numerically) explained by the absorbed effects"""
+    mean = np.average(data, axis=0, weights=weights)
+    norm0 = np.sqrt(np.dot(weights, (data - mean) ** 2))
+    norm = np.sqrt(np.dot(weights, data_demeaned ** 2))
+    return norm <= np.sqrt(tol) * norm0
+
+
+_absorb_doc = """\
+absorb : array_like
+    The factors whose fixed effects are absorbed. A 1d array for a single
+    factor, or a 2d array, DataFrame or list of 1d arrays with one factor
+    per column. The levels can be of any type; missing levels are handled
+    according to `missing`.
+"""
+
+_absorb_options_doc = """\
+demean_tol : float, optional
+    Convergence tolerance of the alternating projections used to partial
+    out the fixed effects. See `statsmodels.tools.grouputils.demean_groups`.
+demean_maxiter : int, optional
+    Maximum number of sweeps of the alternating projections.
+"""
+
+
+class AbsorbingLS(WLS):
+    __doc__ = """
+    Least squares with absorbed fixed effects
+
+    Estimates the linear regression of `endog` on `exog` and a full set of
+    dummy variables for each factor in `absorb` without forming the dummy
+    variables.
+
+    %(params)s
+    %(absorb)s
+    weights : array_like, optional
+        A 1d array of weights as in `WLS`. Default is no weighting.
+    %(options)s
+    %(extra_params)s
+
+    Attributes
+    ----------
+    absorb_groups : list of Group
+        The factors that are absorbed.
+    df_absorbed : int
+        The number of absorbed parameters, i.e. the rank of the dummy
+        variables of all factors.
+    absorb_iterations : int
+        The number of sweeps of the alternating projections.
+    absorbed_exog : ndarray
+        Boolean array indicating the columns of `exog` that are collinear
+        with the absorbed effects. Their parameters are set to zero.
+
+    See Also
+    --------
+    WLS : Weighted least squares.
+    statsmodels.genmod.absorbing.AbsorbingPoisson
+        Poisson pseudo maximum likelihood with absorbed fixed effects.
+    statsmodels.tools.grouputils.demean_groups
+        The alternating projections.
+
+    Notes
+    -----
+    By the Frisch-Waugh-Lovell theorem, the parameters of `exog` and the
+    residuals are the same as in the regression that includes the dummy
+    variables. The (weighted) group means of all factors are removed from
+    `endog` and `exog` by alternating projections, and the regression is
+    estimated on the transformed data.
+
+    If `exog` contains a constant, the overall means are added back after
+    removing the fixed effects, so that the constant is estimated and the
+    absorbed effects of each factor are normalized to a weighted mean of
+    zero.
+
+    The residual degrees of freedom are the number of observations minus
+    the rank of `exog` and the number of absorbed parameters, see
+    `statsmodels.tools.grouputils.absorbed_df`. The absorbed parameters are
+    exact for up to two factors and conservative otherwise. The small sample
+    correction of the cluster robust covariance only counts the parameters
+    of `exog`, which is appropriate if the fixed effects are nested within
+    the clusters.
+
+    `rsquared` is the coefficient of determination of the full model
+    including the absorbed effects, `rsquared_within` the one of the
+    regression after removing them. The model's `predict` does not include
+    the absorbed effects; `fittedvalues` of the results does.
+
+    Examples
+    --------
+    >>> import statsmodels.api as sm
+    >>> mod = sm.AbsorbingLS(y, sm.add_constant(x),
+    ...                      absorb=data[['firm', 'year']])
+    >>> res = mod.fit(cov_type='cluster',
+    ...               cov_kwds={'groups': data['firm']})
+    """ % {'params': base._model_params_doc,
+           'absorb': _absorb_doc,
+           'options': _absorb_options_doc,
+           'extra_params': base._missing_param_doc + base._extra_param_doc}
+
+    def __init__(self, endog, exog, absorb, weights=1., missing='none',
+                 hasconst=None, demean_tol=1e-8, demean_maxiter=1000,
+                 **kwargs):
+        # needed in initialize, which is called by super
+        self._demean_options = dict(tol=demean_tol, maxiter=demean_maxiter)
+        self._absorb_codes, index = _absorb_codes(absorb)
+        super(AbsorbingLS, self).__init__(
+            endog, exog, weights=weights, missing=missing, hasconst=hasconst,
+            absorb=index, **kwargs)
+
+    def initialize(self):
+        """Remove the absorbed effects from endog and exog"""
+        self.absorb_groups = _absorb_groups(self)
+        self.df_absorbed = absorbed_df(self.absorb_groups)
+        weights = np.broadcast_to(self.weights, self.endog.shape)
+
+        data = np.column_stack((self.endog, self.exog))
+        data_demeaned, self.absorb_iterations = demean_groups(
+            data, self.absorb_groups, weights=weights,
+            **self._demean_options)
+        absorbed = _absorbed_columns(data, data_demeaned, weights,
+                                     self._demean_options['tol'])[1:]
+        const_idx = self.data.const_idx
+        self._add_mean = self.k_constant > 0 and const_idx is not None
+        if self._add_mean:
+            absorbed[const_idx] = False
+            data_demeaned += np.average(data, axis=0, weights=weights)
+        if absorbed.any():
+            names = [self.exog_names[i] for i in np.nonzero(absorbed)[0]]
+            warnings.warn('The columns %s of exog are collinear with the '
+                          'absorbed effects. Their parameters are set to '
+                          'zero.' % ', '.join(names), CollinearityWarning)
+        data_demeaned[:, 1:][:, absorbed] = 0
+        self.absorbed_exog = absorbed
+        self.endog_absorbed = data_demeaned[:, 0]
+        self.exog_absorbed = data_demeaned[:, 1:]
+
+        self.wendog = self.whiten(self.endog_absorbed)
+        self.wexog = self.whiten(self.exog_absorbed)
+        self.nobs = float(self.wexog.shape[0])
+        self.rank = reg_tools._matrix_rank(self.wexog)
+        # the constant is part of the absorbed effects if not added back
+        k_constant = int(self._add_mean)
+        self._df_model = float(self.rank - k_constant)
+        self._df_resid = self.nobs - self.rank - (self.df_absorbed -
+                                                  k_constant)
+        self._data_attr.extend(['endog_absorbed', 'exog_absorbed'])
+
+    def fit(self, method='pinv', cov_type='nonrobust', cov_kwds=None,
+            use_t=None, **kwargs):
+        """
+        Fit the model with the absorbed effects removed.
+
+        Parameters
+        ----------
+        method : {"pinv", "qr"}, optional
+            The least squares method, see `WLS.fit`.
+        cov_type : str, optional
+            See `regression.linear_model.RegressionResults` for a description
+            of the available covariance estimators.
+        cov_kwds : list or None, optional
+            See `linear_model.RegressionResults.get_robustcov_results` for a
+            description required keywords for alternative covariance
+            estimators.
+        use_t : bool, optional
+            Flag indicating to use the Student's t distribution when computing
+            p-values.
+        **kwargs
+            Additional keyword arguments that contain information used when
+            constructing a model using the formula interface.
+
+        Returns
+        -------
+        AbsorbingLSResults
+            The model estimation results.
+        """
+        res = super(AbsorbingLS, self).fit(method=method)
+        lfit = AbsorbingLSResults(
+            self, res.params, normalized_cov_params=self.normalized_cov_params,
+            cov_type=cov_type, cov_kwds=cov_kwds, use_t=use_t, **kwargs)
+        return AbsorbingLSResultsWrapper(lfit)
+
+
+class AbsorbingLSResults(RegressionResults):
+    """
+    Results of a regression with absorbed fixed effects
+
+    The residuals and fitted values include the absorbed effects. See
+    `RegressionResults` for the other attributes.
+    """
+
+    @cached_obs_data
+    def resid(self):
+        """The residuals of the model including the absorbed effects."""
+        model = self.model
+        return model.endog_absorbed - model.exog_absorbed.dot(self.params)
+
+    @cached_obs_data
+    def fittedvalues(self):
+        """The fitted values including the absorbed effects."""
+        return self.model.endog - self.resid
+
+    @cached_obs_data
+    def absorbed_effects(self):
+        """The sum of the estimated absorbed effects for each observation."""
+        return self.fittedvalues - self.model.predict(self.params)
+
+    @cache_readonly
+    def rsquared_within(self):
+        """
+        R-squared of the regression after removing the absorbed effects.
+        """
+        model = self.model
+        weights = np.broadcast_to(model.weights, model.endog.shape)
+        endog = model.endog_absorbed
+        if model._add_mean:
+            endog = endog - np.average(endog, weights=weights)
+        return 1 - self.ssr / np.dot(weights, endog ** 2)
+
+
+class AbsorbingLSResultsWrapper(RegressionResultsWrapper):
+    _attrs = {'absorbed_effects': 'rows'}
+    _wrap_attrs = wrap.union_dicts(RegressionResultsWrapper._wrap_attrs,
+                                   _attrs)
+    _methods = {}
+    _wrap_methods = wrap.union_dicts(RegressionResultsWrapper._wrap_methods,
+                                     _methods)
+
+
+wrap.populate_wrapper(AbsorbingLSResultsWrapper, AbsorbingLSResults)
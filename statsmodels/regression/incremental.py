@@ -0,0 +1,784 @@
+"""
+Incremental (out-of-core) OLS and WLS
+
+Estimates linear regressions from a stream of data blocks by accumulating
+sufficient statistics, so that the full design matrix never has to be held
+in memory.  Partial accumulators computed on different processes can be
+merged.
+
+License: 3-clause BSD
+"""
+import copy
+
+import numpy as np
+from pandas.util._decorators import Appender, Substitution
+from scipy import linalg, stats
+
+from statsmodels.base.data import handle_data
+from statsmodels.tools.decorators import cache_readonly, cache_writable
+from statsmodels.tools.sm_exceptions import MissingDataError
+from statsmodels.tools.validation import string_like
+from statsmodels.regression.linear_model import (
+    RegressionResults, RegressionResultsWrapper)
+
+__all__ = ['IncrementalOLS', 'IncrementalWLS',
+           'IncrementalRegressionResults']
+
+
+_doc = """
+Incremental %(model_type)s Least Squares
+
+Estimates the regression from a stream of data blocks.
+
+Parameters
+----------
+method : {'qr', 'pinv'}, optional
+    Method used to accumulate and solve the least squares problem.
+
+    * 'qr' - Tall-skinny QR. The triangular factor of the whitened design
+      and response is updated with each block. Numerically stable, the
+      sum of squared residuals is also computed from the factor.
+    * 'pinv' - Accumulate the cross-products %(cross_products)s and solve
+      using the Moore-Penrose pseudoinverse. Faster but less accurate for
+      ill-conditioned designs.
+hasconst : {None, bool}, optional
+    Indicates whether the design contains a user-supplied constant. If None,
+    constant columns are detected across all blocks.
+
+See Also
+--------
+statsmodels.regression.linear_model.%(model)s
+    %(model)s estimation with the full data set in memory.
+
+Notes
+-----
+The accumulator holds only the k x k sufficient statistics together with a
+few scalars, so that memory use does not depend on the number of
+observations.  Blocks are added using ``update``, and accumulators built on
+different partitions of the data, for example in different processes, can be
+combined using ``merge``.  Accumulators are picklable.
+
+``fit`` returns an ``IncrementalRegressionResults`` instance. Statistics that
+depend on the individual residuals, such as the heteroscedasticity robust
+covariances and the residual diagnostics in ``summary``, require a second
+pass over the data, see ``IncrementalRegressionResults.update_resid``. When
+the data source can be iterated over more than once, ``fit`` performs the
+second pass if ``resid_chunks`` is provided.
+
+Examples
+--------
+>>> from statsmodels.regression.incremental import Incremental%(model)s
+>>> mod = Incremental%(model)s()
+>>> for %(update_args)s in chunks:
+...     mod.update(%(update_args)s)
+>>> res = mod.fit(resid_chunks=chunks)
+
+Accumulators of different partitions of the data can be merged
+
+>>> mod = Incremental%(model)s()
+>>> for part in partitions:
+...     mod.merge(part)
+"""
+
+
+def _as_chunk_arrays(endog, exog, weights):
+    """Convert one block of data to float arrays"""
+    endog = np.asarray(endog, dtype=np.double).squeeze()
+    endog = np.atleast_1d(endog)
+    exog = np.asarray(exog, dtype=np.double)
+    if exog.ndim == 1:
+        exog = exog[:, None]
+    if endog.ndim != 1 or exog.ndim != 2:
+        raise ValueError('endog must be 1-d and exog must be 2-d')
+    if endog.shape[0] != exog.shape[0]:
+        raise ValueError('endog and exog blocks have different numbers of '
+                         'observations')
+    if weights is None:
+        w_half = np.ones_like(endog)
+    else:
+        weights = np.asarray(weights, dtype=np.double)
+        if weights.ndim == 0:
+            weights = np.repeat(weights, endog.shape[0])
+        if weights.shape != endog.shape:
+            raise ValueError('weights must have the same length as endog')
+        w_half = np.sqrt(weights)
+        if not np.all(np.isfinite(w_half)):
+            raise ValueError('NaN, inf or invalid value detected in weights')
+    return endog, exog, w_half
+
+
+@Substitution(model_type='Weighted', model='WLS',
+              update_args='endog, exog, weights',
+              cross_products="X'WX and X'Wy")
+@Appender(_doc)
+class IncrementalWLS(object):
+    _weighted = True
+
+    def __init__(self, method='qr', hasconst=None):
+        self.method = string_like(method, 'method', options=('qr', 'pinv'))
+        self.hasconst = hasconst
+        self.data = None
+        self.k_exog = None
+        self.nobs = 0
+        self._xpx = None
+        self._r = None
+        self._xpy = None
+        self._ypy = 0.0
+        self._sum_w = 0.0
+        self._sum_wy = 0.0
+        self._xpw = None
+        self._sum_log_w = 0.0
+        self._exog_min = None
+        self._exog_max = None
+        self._data_attr = []
+        self._reset()
+
+    def _initialize(self, endog, exog):
+        """Set up names and storage from the first block"""
+        # a single row is enough to extract the variable names
+        data = handle_data(endog[:1], exog[:1], hasconst=False)
+        # ynames and xnames are cached from the data on first access, store
+        # them before the data is dropped
+        data.ynames, data.xnames = data.ynames, data.xnames
+        data.endog = data.exog = data.orig_endog = data.orig_exog = None
+        self.data = data
+        self._initialize_statistics(np.shape(exog)[1]
+                                    if np.ndim(exog) == 2 else 1)
+
+    def _initialize_statistics(self, k):
+        """Empty statistics for k regressors"""
+        self.k_exog = k
+        self._xpx = np.zeros((k, k))
+        # triangular factor of [wexog, wendog]
+        self._r = np.zeros((0, k + 1))
+        self._xpy = np.zeros(k)
+        self._xpw = np.zeros(k)
+        self._exog_min = np.full(k, np.inf)
+        self._exog_max = np.full(k, -np.inf)
+
+    def update(self, endog, exog, weights=None):
+        """
+        Add a block of observations to the accumulator.
+
+        Parameters
+        ----------
+        endog : array_like
+            1-d endogenous response variable for the block.
+        exog : array_like
+            A nobs_block x k array with the regressors for the block.
+        weights : array_like, optional
+            1-d array of weights for the block, interpreted as in WLS.
+
+        Returns
+        -------
+        IncrementalWLS
+            The updated instance.
+        """
+        if not self._weighted and weights is not None:
+            raise ValueError('weights are not supported by {0}. Use '
+                             'IncrementalWLS.'.format(type(self).__name__))
+        if self.data is None:
+            self._initialize(endog, exog)
+        endog, exog, w_half = _as_chunk_arrays(endog, exog, weights)
+        if exog.shape[1] != self.k_exog:
+            raise ValueError('exog must have {0} columns'.format(self.k_exog))
+        if endog.shape[0] == 0:
+            return self
+        exog_min = exog.min(0)
+        exog_max = exog.max(0)
+        if not (np.all(np.isfinite(exog_max)) and
+                np.all(np.isfinite(exog_min))):
+            raise MissingDataError('exog contains inf or nans')
+        wendog = w_half * endog
+        wexog = w_half[:, None] * exog
+        ypy = wendog @ wendog
+        if not np.isfinite(ypy):
+            raise MissingDataError('endog contains inf or nans')
+
+        if self.method == 'qr':
+            self._qr_update(np.column_stack([wexog, wendog]))
+        self._xpx += wexog.T @ wexog
+        self._xpy += wexog.T @ wendog
+        self._xpw += wexog.T @ w_half
+        self._ypy += ypy
+        self._sum_wy += wendog @ w_half
+        self._sum_w += w_half @ w_half
+        if weights is not None:
+            self._sum_log_w += np.sum(np.log(w_half ** 2))
+        self._exog_min = np.minimum(self._exog_min, exog_min)
+        self._exog_max = np.maximum(self._exog_max, exog_max)
+        self.nobs += endog.shape[0]
+        self._reset()
+        return self
+
+    def _qr_update(self, wdata):
+        """Update the triangular factor with rows of [wexog, wendog]"""
+        r = np.linalg.qr(np.vstack([self._r, wdata]), mode='r')
+        self._r = r[:self.k_exog + 1]
+
+    def merge(self, other):
+        """
+        Merge the statistics of another accumulator into this instance.
+
+        Parameters
+        ----------
+        other : IncrementalWLS
+            An accumulator built using the same variables, e.g., on a
+            different partition of the data.
+
+        Returns
+        -------
+        IncrementalWLS
+            The updated instance.
+        """
+        if not isinstance(other, IncrementalWLS):
+            raise TypeError('other must be an IncrementalWLS instance')
+        if other.method != self.method:
+            raise ValueError('accumulators must use the same method')
+        if other.hasconst != self.hasconst:
+            raise ValueError('accumulators must use the same hasconst')
+        if other.data is None:
+            return self
+        if self.data is None:
+            self.data = copy.copy(other.data)
+            self._initialize_statistics(other.k_exog)
+        if other.k_exog != self.k_exog:
+            raise ValueError('accumulators have different numbers of '
+                             'regressors')
+        if self.method == 'qr':
+            self._qr_update(other._r)
+        self._xpx += other._xpx
+        self._xpy += other._xpy
+        self._xpw += other._xpw
+        self._ypy += other._ypy
+        self._sum_wy += other._sum_wy
+        self._sum_w += other._sum_w
+        self._sum_log_w += other._sum_log_w
+        self._exog_min = np.minimum(self._exog_min, other._exog_min)
+        self._exog_max = np.maximum(self._exog_max, other._exog_max)
+        self.nobs += other.nobs
+        self._reset()
+        return self
+
+    def _reset(self):
+        self._k_constant = None
+        self._rank = None
+
+    def _handle_constant(self):
+        """Detect constant columns using the statistics of all blocks"""
+        const_idx = None
+        if self.hasconst is False:
+            return 0, const_idx
+        is_const = self._exog_max == self._exog_min
+        values = self._exog_max[is_const]
+        nonzero = np.where(is_const)[0][values != 0]
+        if nonzero.size:
+            ones = np.where(is_const)[0][values == 1]
+            const_idx = int(ones[0] if ones.size else nonzero[0])
+            return 1, const_idx
+        if self.hasconst:
+            return 1, const_idx
+        # look for an implicit constant using the augmented cross-product
+        augmented = np.empty((self.k_exog + 1, self.k_exog + 1))
+        augmented[0, 0] = self._sum_w
+        augmented[0, 1:] = augmented[1:, 0] = self._xpw
+        augmented[1:, 1:] = self._xpx
+        rank_augm = np.linalg.matrix_rank(augmented, hermitian=True)
+        return int(rank_augm == self.rank), const_idx
+
+    @property
+    def k_constant(self):
+        """Number of constant columns, either 0 or 1."""
+        if self._k_constant is None:
+            self._k_constant, const_idx = self._handle_constant()
+            self.data.k_constant = self._k_constant
+            self.data.const_idx = const_idx
+        return self._k_constant
+
+    @property
+    def rank(self):
+        """Rank of the whitened design matrix."""
+        if self._rank is None:
+            if self.method == 'qr':
+                self._rank = np.linalg.matrix_rank(self._r[:, :-1])
+            else:
+                self._rank = np.linalg.matrix_rank(self._xpx, hermitian=True)
+        return self._rank
+
+    @property
+    def df_model(self):
+        """
+        The model degree of freedom.
+
+        The dof is defined as the rank of the regressor matrix minus 1 if a
+        constant is included.
+        """
+        return float(self.rank - self.k_constant)
+
+    @property
+    def df_resid(self):
+        """
+        The residual degree of freedom.
+
+        The dof is defined as the number of observations minus the rank of
+        the regressor matrix.
+        """
+        return float(self.nobs - self.rank)
+
+    @property
+    def endog_names(self):
+        """Name of the endogenous variable."""
+        return self.data.ynames
+
+    @property
+    def exog_names(self):
+        """Names of the exogenous variables."""
+        return self.data.xnames
+
+    def _ssr(self, params):
+        """Sum of squared whitened residuals at params"""
+        params = np.asarray(params)
+        if self.method == 'qr':
+            # the norm of [wexog, wendog] @ [-params, 1] is the norm of the
+            # triangular factor times the same vector, which avoids the
+            # cancellation of the expanded quadratic form below
+            resid = self._r @ np.append(-params, 1.)
+            return resid @ resid
+        return (self._ypy - 2 * params @ self._xpy
+                + params @ self._xpx @ params)
+
+    def _wexog_singular_values(self):
+        """Singular values of the whitened design matrix"""
+        if self.method == 'qr':
+            return np.linalg.svd(self._r[:, :-1], 0, 0)
+        eigvals = np.linalg.eigvalsh(self._xpx)
+        return np.sqrt(np.clip(eigvals, 0, None))
+
+    def loglike(self, params):
+        """
+        Compute the value of the gaussian log-likelihood function at params.
+
+        Parameters
+        ----------
+        params : array_like
+            The parameter estimates.
+
+        Returns
+        -------
+        float
+            The value of the profile log-likelihood function, computed from
+            the accumulated statistics.
+
+        See Also
+        --------
+        statsmodels.regression.linear_model.WLS.loglike
+        """
+        nobs2 = self.nobs / 2.0
+        llf = -np.log(self._ssr(params)) * nobs2
+        llf -= (1 + np.log(np.pi / nobs2)) * nobs2
+        llf += 0.5 * self._sum_log_w
+        return llf
+
+    def predict(self, params, exog=None):
+        """
+        Return linear predicted values from a design matrix.
+
+        Parameters
+        ----------
+        params : array_like
+            Parameters of a linear model.
+        exog : array_like
+            Design / exogenous data. Required since the model does not store
+            the data.
+
+        Returns
+        -------
+        array_like
+            An array of fitted values.
+        """
+        if exog is None:
+            raise ValueError('exog is required since {0} does not keep the '
+                             'data'.format(type(self).__name__))
+        return np.dot(exog, params)
+
+    def fit(self, cov_type='nonrobust', cov_kwds=None, use_t=None,
+            resid_chunks=None):
+        """
+        Estimate the model parameters from the accumulated statistics.
+
+        Parameters
+        ----------
+        cov_type : {'nonrobust', 'HC0', 'HC1', 'HC2', 'HC3'}, optional
+            Covariance estimator. The heteroscedasticity robust estimators
+            require a pass over the data through `resid_chunks` or
+            ``IncrementalRegressionResults.update_resid``.
+        cov_kwds : dict, optional
+            Not used by the available covariance estimators.
+        use_t : bool, optional
+            Flag indicating to use the Student's t distribution when computing
+            p-values.
+        resid_chunks : iterable, optional
+            Iterable yielding the same blocks of data that were used in
+            ``update``, as tuples (endog, exog) or (endog, exog, weights).
+            If provided, the results compute the residual based statistics
+            with a second pass over the data.
+
+        Returns
+        -------
+        IncrementalRegressionResults
+            The model estimation results.
+        """
+        if self.data is None:
+            raise ValueError('update must be called at least once before fit')
+        k = self.k_exog
+        if self.method == 'qr':
+            r, qty = self._r[:k, :k], self._r[:k, k]
+            if self.rank == r.shape[0] == r.shape[1]:
+                params = linalg.solve_triangular(r, qty)
+                r_inv = linalg.solve_triangular(r, np.eye(k))
+            else:
+                # minimum norm solution of a rank deficient design as in OLS
+                r_inv = np.linalg.pinv(r)
+                params = r_inv @ qty
+            normalized_cov_params = r_inv @ r_inv.T
+        else:
+            normalized_cov_params = np.linalg.pinv(self._xpx, hermitian=True)
+            params = normalized_cov_params @ self._xpy
+
+        res = IncrementalRegressionResults(
+            self, params, normalized_cov_params=normalized_cov_params,
+            use_t=use_t)
+        if resid_chunks is not None:
+            for chunk in resid_chunks:
+                res.update_resid(*chunk)
+        if cov_type != 'nonrobust':
+            if cov_kwds is None:
+                cov_kwds = {}
+            # same default as the robust covariances in RegressionResults
+            use_t = False if use_t is None else use_t
+            res.get_robustcov_results(cov_type=cov_type, use_self=True,
+                                      use_t=use_t, **cov_kwds)
+        return RegressionResultsWrapper(res)
+
+
+@Substitution(model_type='Ordinary', model='OLS',
+              update_args='endog, exog',
+              cross_products="X'X and X'y")
+@Appender(_doc)
+class IncrementalOLS(IncrementalWLS):
+    _weighted = False
+
+
+class _ResidMoments(object):
+    """
+    Residual based statistics accumulated in a pass over the data
+    """
+
+    def __init__(self, k):
+        self.nobs = 0
+        self.sums = np.zeros(4)
+        self.meat = np.zeros((3, k, k))
+        self.dw_num = 0.0
+        self.first = None
+        self.last = None
+
+    def update(self, wresid, wexog, hat):
+        if wresid.shape[0] == 0:
+            return
+        self.nobs += wresid.shape[0]
+        powers = wresid[:, None] ** np.arange(1, 5)
+        self.sums += powers.sum(0)
+        for i, het_scale in enumerate((wresid ** 2,
+                                       wresid ** 2 / (1 - hat),
+                                       (wresid / (1 - hat)) ** 2)):
+            self.meat[i] += wexog.T @ (het_scale[:, None] * wexog)
+        self.dw_num += np.sum(np.diff(wresid) ** 2)
+        if self.last is not None:
+            self.dw_num += (wresid[0] - self.last) ** 2
+        if self.first is None:
+            self.first = wresid[0]
+        self.last = wresid[-1]
+
+    def merge(self, other):
+        if other.nobs == 0:
+            return
+        self.nobs += other.nobs
+        self.sums += other.sums
+        self.meat += other.meat
+        self.dw_num += other.dw_num
+        if self.last is not None:
+            self.dw_num += (other.first - self.last) ** 2
+        if self.first is None:
+            self.first = other.first
+        self.last = other.last
+
+
+def _normality_stats(nobs, sums):
+    """
+    Jarque-Bera and omnibus normality tests from raw moment sums
+
+    Matches ``jarque_bera`` and ``omni_normtest`` in
+    ``statsmodels.stats.stattools`` which require the residuals.
+    """
+    n = float(nobs)
+    m1, m2r, m3r, m4r = sums / n
+    m2 = m2r - m1 ** 2
+    m3 = m3r - 3 * m1 * m2r + 2 * m1 ** 3
+    m4 = m4r - 4 * m1 * m3r + 6 * m1 ** 2 * m2r - 3 * m1 ** 4
+    skew = m3 / m2 ** 1.5
+    kurtosis = m4 / m2 ** 2
+    jb = n / 6 * (skew ** 2 + (kurtosis - 3) ** 2 / 4)
+    jbpv = stats.chi2.sf(jb, 2)
+    if n < 8:
+        return jb, jbpv, skew, kurtosis, np.nan, np.nan
+
+    # D'Agostino skewness test
+    y = skew * np.sqrt(((n + 1) * (n + 3)) / (6.0 * (n - 2)))
+    beta2 = (3.0 * (n ** 2 + 27 * n - 70) * (n + 1) * (n + 3) /
+             ((n - 2.0) * (n + 5) * (n + 7) * (n + 9)))
+    w2 = -1 + np.sqrt(2 * (beta2 - 1))
+    delta = 1 / np.sqrt(0.5 * np.log(w2))
+    alpha = np.sqrt(2.0 / (w2 - 1))
+    y = 1 if y == 0 else y
+    z_skew = delta * np.log(y / alpha + np.sqrt((y / alpha) ** 2 + 1))
+
+    # Anscombe-Glynn kurtosis test
+    mean = 3.0 * (n - 1) / (n + 1)
+    var = (24.0 * n * (n - 2) * (n - 3) /
+           ((n + 1) * (n + 1.) * (n + 3) * (n + 5)))
+    x = (kurtosis - mean) / np.sqrt(var)
+    sqrtbeta1 = (6.0 * (n * n - 5 * n + 2) / ((n + 7) * (n + 9)) *
+                 np.sqrt((6.0 * (n + 3) * (n + 5)) / (n * (n - 2) * (n - 3))))
+    a = 6.0 + 8.0 / sqrtbeta1 * (2.0 / sqrtbeta1 +
+                                 np.sqrt(1 + 4.0 / (sqrtbeta1 ** 2)))
+    term1 = 1 - 2 / (9.0 * a)
+    denom = 1 + x * np.sqrt(2 / (a - 4.0))
+    if denom == 0:
+        term2 = np.nan
+    else:
+        term2 = np.sign(denom) * ((1 - 2.0 / a) / np.abs(denom)) ** (1 / 3.0)
+    z_kurt = (term1 - term2) / np.sqrt(2 / (9.0 * a))
+
+    omni = z_skew ** 2 + z_kurt ** 2
+    return jb, jbpv, skew, kurtosis, omni, stats.chi2.sf(omni, 2)
+
+
+class IncrementalRegressionResults(RegressionResults):
+    """
+    Results from a regression estimated by IncrementalOLS or IncrementalWLS
+
+    Parameters
+    ----------
+    model : IncrementalWLS
+        The accumulator instance that created the results.
+    params : ndarray
+        The estimated parameters.
+    normalized_cov_params : ndarray
+        The normalized covariance parameters.
+    scale : float
+        The estimated scale of the residuals.
+    cov_type : str
+        The covariance estimator used in the results.
+    cov_kwds : dict
+        Additional keywords used in the covariance specification.
+    use_t : bool
+        Flag indicating to use the Student's t in inference.
+    **kwargs
+        Additional keyword arguments used to initialize the results.
+
+    Notes
+    -----
+    All statistics that only depend on the sufficient statistics, such as
+    params, bse, rsquared, llf and the F-test, are available immediately.
+    Per-observation arrays such as resid and fittedvalues are not
+    available. The heteroscedasticity robust covariances and the residual
+    diagnostics used in ``summary`` are available after a pass over the data
+    using ``update_resid``.
+    """
+
+    def __init__(self, model, params, normalized_cov_params=None, scale=1.,
+                 cov_type='nonrobust', cov_kwds=None, use_t=None, **kwargs):
+        self._resid_moments = _ResidMoments(len(params))
+        super(IncrementalRegressionResults, self).__init__(
+            model, params, normalized_cov_params=normalized_cov_params,
+            scale=scale, cov_type=cov_type, cov_kwds=cov_kwds, use_t=use_t,
+            **kwargs)
+        # the statistics of the accumulator at the time of the fit
+        self._wexog_singular_values = model._wexog_singular_values()
+
+    def update_resid(self, endog, exog, weights=None):
+        """
+        Accumulate residual based statistics for a block of observations.
+
+        Parameters
+        ----------
+        endog : array_like
+            1-d endogenous response variable for the block.
+        exog : array_like
+            A nobs_block x k array with the regressors for the block.
+        weights : array_like, optional
+            1-d array of weights for the block, interpreted as in WLS.
+
+        Notes
+        -----
+        The blocks must be the same as those used to estimate the model.
+        The Durbin-Watson statistic assumes that the blocks are provided in
+        the original order of the observations.
+        """
+        endog, exog, w_half = _as_chunk_arrays(endog, exog, weights)
+        wexog = w_half[:, None] * exog
+        wresid = w_half * endog - wexog @ self.params
+        hat = ((wexog @ self.normalized_cov_params) * wexog).sum(1)
+        self._resid_moments.update(wresid, wexog, hat)
+        self._reset_resid_cache()
+
+    def merge_resid(self, other):
+        """
+        Merge residual statistics accumulated by another results instance.
+
+        Parameters
+        ----------
+        other : IncrementalRegressionResults
+            Results with the same parameters where ``update_resid`` has been
+            called on a different partition of the data. Partitions must be
+            merged in the original order of the observations for the
+            Durbin-Watson statistic to be exact.
+        """
+        other = getattr(other, '_results', other)
+        self._resid_moments.merge(other._resid_moments)
+        self._reset_resid_cache()
+
+    def _reset_resid_cache(self):
+        for key in ('cov_HC0', 'cov_HC1', 'cov_HC2', 'cov_HC3', 'HC0_se',
+                    'HC1_se', 'HC2_se', 'HC3_se'):
+            self._cache.pop(key, None)
+
+    def _check_resid_moments(self):
+        if self._resid_moments.nobs != self.nobs:
+            raise ValueError('residual based statistics require a pass over '
+                             'all {0} observations using update_resid, {1} '
+                             'observations have been used'.format(
+                                 int(self.nobs), self._resid_moments.nobs))
+
+    @cache_readonly
+    def nobs(self):
+        """Number of observations n."""
+        return float(self.model.nobs)
+
+    @cache_readonly
+    def fittedvalues(self):
+        """Not available since the data are not stored."""
+        raise ValueError('fittedvalues are not available for incrementally '
+                         'estimated models. Use predict.')
+
+    @cache_readonly
+    def wresid(self):
+        """Not available since the data are not stored."""
+        raise ValueError('wresid is not available for incrementally '
+                         'estimated models.')
+
+    @cache_readonly
+    def resid(self):
+        """Not available since the data are not stored."""
+        raise ValueError('resid is not available for incrementally '
+                         'estimated models.')
+
+    @cache_writable()
+    def scale(self):
+        """
+        A scale factor for the covariance matrix.
+
+        The Default value is ssr/(n-p).  Note that the square root of `scale`
+        is often called the standard error of the regression.
+        """
+        return self.ssr / self.df_resid
+
+    @cache_readonly
+    def ssr(self):
+        """Sum of squared (whitened) residuals."""
+        return self.model._ssr(self.params)
+
+    @cache_readonly
+    def centered_tss(self):
+        """The total (weighted) sum of squares centered about the mean."""
+        model = self.model
+        return model._ypy - model._sum_wy ** 2 / model._sum_w
+
+    @cache_readonly
+    def uncentered_tss(self):
+        """
+        Uncentered sum of squares.
+
+        The sum of the squared values of the (whitened) endogenous response
+        variable.
+        """
+        return self.model._ypy
+
+    @cache_readonly
+    def eigenvals(self):
+        """
+        Return eigenvalues sorted in decreasing order.
+        """
+        return np.sort(self._wexog_singular_values ** 2)[::-1]
+
+    def _HCCM(self, meat):
+        cov_p = self.normalized_cov_params
+        return cov_p @ meat @ cov_p
+
+    @cache_readonly
+    def cov_HC0(self):
+        """
+        Heteroscedasticity robust covariance matrix. See HC0_se.
+        """
+        self._check_resid_moments()
+        return self._HCCM(self._resid_moments.meat[0])
+
+    @cache_readonly
+    def cov_HC1(self):
+        """
+        Heteroscedasticity robust covariance matrix. See HC1_se.
+        """
+        return self.nobs / self.df_resid * self.cov_HC0
+
+    @cache_readonly
+    def cov_HC2(self):
+        """
+        Heteroscedasticity robust covariance matrix. See HC2_se.
+        """
+        self._check_resid_moments()
+        return self._HCCM(self._resid_moments.meat[1])
+
+    @cache_readonly
+    def cov_HC3(self):
+        """
+        Heteroscedasticity robust covariance matrix. See HC3_se.
+        """
+        self._check_resid_moments()
+        return self._HCCM(self._resid_moments.meat[2])
+
+    @cache_readonly
+    def resid_pearson(self):
+        """Not available since the data are not stored."""
+        raise ValueError('resid_pearson is not available for incrementally '
+                         'estimated models.')
+
+    def _resid_diagnostics(self):
+        moments = self._resid_moments
+        if moments.nobs != self.nobs:
+            return (np.nan,) * 7
+        stats_ = _normality_stats(moments.nobs, moments.sums)
+        dw = moments.dw_num / moments.sums[1]
+        return stats_ + (dw,)
+
+    def get_prediction(self, exog=None, transform=True, weights=None,
+                       row_labels=None, **kwargs):
+        if exog is None:
+            raise ValueError('exog is required since the model does not '
+                             'keep the data')
+        if np.ndim(exog) == 1 and len(self.params) == 1:
+            exog = np.asarray(exog)[:, None]
+        return super(IncrementalRegressionResults, self).get_prediction(
+            exog=exog, transform=transform, weights=weights,
+            row_labels=row_labels, **kwargs)
+
+    get_prediction.__doc__ = RegressionResults.get_prediction.__doc__
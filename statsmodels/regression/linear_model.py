@@ -36,22 +36,27 @@ from statsmodels.compat.python import lrange, lzip
 from statsmodels.compat.pandas import Appender
 
 import numpy as np
+from scipy import sparse
 from scipy.linalg import toeplitz
 from scipy import stats
 from scipy import optimize
+from scipy.sparse.linalg import LinearOperator
 
-from statsmodels.tools.tools import pinv_extended
-from statsmodels.tools.decorators import (cache_readonly,
+from statsmodels.tools.tools import _row_chunks, pinv_extended
+from statsmodels.tools.decorators import (cache_readonly, cached_obs_data,
                                           cache_writable)
 import statsmodels.base.model as base
 import statsmodels.base.wrapper as wrap
 from statsmodels.emplike.elregress import _ELRegOpts
 import warnings
 from statsmodels.tools.sm_exceptions import InvalidTestWarning
+from statsmodels.tools.validation import string_like
 
 # need import in module instead of lazily to copy `__doc__`
 from statsmodels.regression._prediction import PredictionResults
 from . import _prediction as pred
+from ._tools import (_matrix_rank, _sparse_lstsq, _sparse_whiten,
+                     _SparseXpxInverse)
 
 __docformat__ = 'restructuredtext en'
 
@@ -179,6 +184,43 @@ def _get_sigma(sigma, nobs):
     return sigma, cholsigmainv
 
 
+def _minimal_lstsq(wexog, wendog, method="pinv", rcond=1e-15):
+    """
+    Least squares using only the triangular factor of [wexog, wendog].
+
+    Returns params, effects, normalized_cov_params, singular values and rank
+    without keeping any nobs x k array. `method` "pinv" truncates small
+    singular values as `pinv_extended` does, "qr" solves with R directly.
+    """
+    k = wexog.shape[1]
+    wendog = np.asarray(wendog)
+    y = wendog.reshape(wendog.shape[0], -1)
+    r = np.linalg.qr(np.column_stack((wexog, y)), mode='r')
+    r_x, effects = r[:k, :k], r[:k, k:]
+    if method == "qr":
+        params = np.linalg.solve(r_x, effects)
+        normalized_cov_params = np.linalg.inv(np.dot(r_x.T, r_x))
+        singular_values = np.linalg.svd(r_x, 0, 0)
+        rank = np.linalg.matrix_rank(r_x)
+    else:
+        u, singular_values, vt = np.linalg.svd(r_x, 0)
+        s_inv = np.zeros_like(singular_values)
+        keep = singular_values > rcond * singular_values.max()
+        s_inv[keep] = 1. / singular_values[keep]
+        params = np.dot(vt.T, s_inv[:, None] * np.dot(u.T, effects))
+        normalized_cov_params = np.dot(vt.T * s_inv ** 2, vt)
+        rank = np.linalg.matrix_rank(np.diag(singular_values))
+    if wendog.ndim == 1:
+        params, effects = params[:, 0], effects[:, 0]
+    return params, effects, normalized_cov_params, singular_values, rank
+
+
+def _path_deviance(model, params):
+    # deviance along a regularization path, module level for pickling
+    resid = model.wendog - model.wexog.dot(params)
+    return np.dot(resid, resid)
+
+
 class RegressionModel(base.LikelihoodModel):
     """
     Base class for linear regression models. Should not be directly called.
@@ -199,6 +241,25 @@ class RegressionModel(base.LikelihoodModel):
         self._df_model = None
         self._df_resid = None
         self.rank = None
+        self._xpx_inv = None
+
+    def _get_rank(self):
+        if sparse.issparse(self.wexog):
+            # the factorization is shared with fit
+            return self._sparse_xpx_inverse().rank
+        return _matrix_rank(self.exog)
+
+    def _sparse_xpx_inverse(self):
+        """
+        The pseudoinverse of wexog.T wexog for a sparse wexog.
+
+        It is computed once per model, reusing the ordering of `_xpx_like`
+        if a model with the same sparsity pattern has set it.
+        """
+        if getattr(self, '_xpx_inv', None) is None:
+            self._xpx_inv = _SparseXpxInverse(
+                self.wexog, like=getattr(self, '_xpx_like', None))
+        return self._xpx_inv
 
     @property
     def df_model(self):
@@ -210,7 +271,7 @@ class RegressionModel(base.LikelihoodModel):
         """
         if self._df_model is None:
             if self.rank is None:
-                self.rank = np.linalg.matrix_rank(self.exog)
+                self.rank = self._get_rank()
             self._df_model = float(self.rank - self.k_constant)
         return self._df_model
 
@@ -229,7 +290,7 @@ class RegressionModel(base.LikelihoodModel):
 
         if self._df_resid is None:
             if self.rank is None:
-                self.rank = np.linalg.matrix_rank(self.exog)
+                self.rank = self._get_rank()
             self._df_resid = self.nobs - self.rank
         return self._df_resid
 
@@ -249,7 +310,7 @@ class RegressionModel(base.LikelihoodModel):
         raise NotImplementedError("Subclasses must implement.")
 
     def fit(self, method="pinv", cov_type='nonrobust', cov_kwds=None,
-            use_t=None, **kwargs):
+            use_t=None, store='full', **kwargs):
         """
         Full fit of the model.
 
@@ -261,7 +322,11 @@ class RegressionModel(base.LikelihoodModel):
         method : str, optional
             Can be "pinv", "qr".  "pinv" uses the Moore-Penrose pseudoinverse
             to solve the least squares problem. "qr" uses the QR
-            factorization.
+            factorization. If `exog` is a scipy.sparse matrix, "pinv" solves
+            the normal equations and "lsqr" uses scipy.sparse.linalg.lsqr
+            for the parameters. `normalized_cov_params` is then a
+            LinearOperator that solves with the sparse factorization, see
+            `cov_params`.
         cov_type : str, optional
             See `regression.linear_model.RegressionResults` for a description
             of the available covariance estimators.
@@ -274,6 +339,15 @@ class RegressionModel(base.LikelihoodModel):
             p-values.  Default behavior depends on cov_type. See
             `linear_model.RegressionResults.get_robustcov_results` for
             implementation details.
+        store : {"full", "minimal"}, optional
+            "full", the default, attaches the nobs x k pseudoinverse (or the
+            QR factors) of `wexog` to the model and caches residuals and
+            fitted values in the results. "minimal" computes the estimates
+            from the triangular factor of ``[wexog, wendog]`` and keeps only
+            k x k arrays, so that the memory footprint of the results does
+            not grow with the number of observations. Per-observation
+            attributes such as `resid` are then recomputed from the model data
+            on every access.
         **kwargs
             Additional keyword arguments that contain information used when
             constructing a model using the formula interface.
@@ -296,7 +370,30 @@ class RegressionModel(base.LikelihoodModel):
         The fit method uses the pseudoinverse of the design/exogenous variables
         to solve the least squares minimization.
         """
-        if method == "pinv":
+        store = string_like(store, 'store', options=('full', 'minimal'))
+        if sparse.issparse(self.wexog):
+            if method not in ('pinv', 'lsqr'):
+                raise ValueError('method has to be "pinv" or "lsqr" if exog '
+                                 'is sparse')
+            # normalized_cov_params is a LinearOperator, nothing to keep
+            # for "full"
+            beta, normalized_cov_params, singular_values, rank = \
+                _sparse_lstsq(self.wexog, self.wendog, method,
+                              self._sparse_xpx_inverse())
+            self.normalized_cov_params = normalized_cov_params
+            self.wexog_singular_values = singular_values
+            self.rank = rank
+        elif store == 'minimal':
+            if method not in ('pinv', 'qr'):
+                raise ValueError('method has to be "pinv" or "qr"')
+            beta, effects, normalized_cov_params, singular_values, rank = \
+                _minimal_lstsq(self.wexog, self.wendog, method)
+            self.normalized_cov_params = normalized_cov_params
+            self.wexog_singular_values = singular_values
+            self.rank = rank
+            if method == "qr":
+                self.effects = effects
+        elif method == "pinv":
             if not (hasattr(self, 'pinv_wexog') and
                     hasattr(self, 'normalized_cov_params') and
                     hasattr(self, 'rank')):
@@ -341,13 +438,14 @@ class RegressionModel(base.LikelihoodModel):
             lfit = OLSResults(
                 self, beta,
                 normalized_cov_params=self.normalized_cov_params,
-                cov_type=cov_type, cov_kwds=cov_kwds, use_t=use_t)
+                cov_type=cov_type, cov_kwds=cov_kwds, use_t=use_t,
+                store=store)
         else:
             lfit = RegressionResults(
                 self, beta,
                 normalized_cov_params=self.normalized_cov_params,
                 cov_type=cov_type, cov_kwds=cov_kwds, use_t=use_t,
-                **kwargs)
+                store=store, **kwargs)
         return RegressionResultsWrapper(lfit)
 
     def predict(self, params, exog=None):
@@ -376,6 +474,8 @@ class RegressionModel(base.LikelihoodModel):
         if exog is None:
             exog = self.exog
 
+        if sparse.issparse(exog):
+            return exog.dot(params)
         return np.dot(exog, params)
 
     def get_distribution(self, params, scale, exog=None, dist_class=None):
@@ -526,6 +626,12 @@ class GLS(RegressionModel):
         --------
         GLS : Fit a linear model using Generalized Least Squares.
         """
+        if sparse.issparse(x):
+            if self.sigma is None or self.sigma.shape == ():
+                return x
+            elif self.sigma.ndim == 1:
+                return _sparse_whiten(x, self.cholsigmainv)
+            raise ValueError('sparse exog requires a diagonal sigma')
         x = np.asarray(x)
         if self.sigma is None or self.sigma.shape == ():
             return x
@@ -567,7 +673,7 @@ class GLS(RegressionModel):
         """
         # TODO: combine this with OLS/WLS loglike and add _det_sigma argument
         nobs2 = self.nobs / 2.0
-        SSR = np.sum((self.wendog - np.dot(self.wexog, params))**2, axis=0)
+        SSR = np.sum((self.wendog - self.wexog.dot(params))**2, axis=0)
         llf = -np.log(SSR) * nobs2      # concentrated likelihood
         llf -= (1+np.log(np.pi/nobs2))*nobs2  # with likelihood constant
         if np.any(self.sigma):
@@ -721,6 +827,8 @@ class WLS(RegressionModel):
             The whitened values sqrt(weights)*X.
         """
 
+        if sparse.issparse(x):
+            return _sparse_whiten(x, np.sqrt(self.weights))
         x = np.asarray(x)
         if x.ndim == 1:
             return x * np.sqrt(self.weights)
@@ -755,7 +863,7 @@ class WLS(RegressionModel):
         the sum of the squared weighted residuals.
         """
         nobs2 = self.nobs / 2.0
-        SSR = np.sum((self.wendog - np.dot(self.wexog, params))**2, axis=0)
+        SSR = np.sum((self.wendog - self.wexog.dot(params))**2, axis=0)
         llf = -np.log(SSR) * nobs2      # concentrated likelihood
         llf -= (1+np.log(np.pi/nobs2))*nobs2  # with constant
         llf += 0.5 * np.sum(np.log(self.weights))
@@ -879,7 +987,7 @@ class OLS(WLS):
         """
         nobs2 = self.nobs / 2.0
         nobs = float(self.nobs)
-        resid = self.endog - np.dot(self.exog, params)
+        resid = self.endog - self.exog.dot(params)
         if hasattr(self, 'offset'):
             resid -= self.offset
         ssr = np.sum(resid**2)
@@ -1067,6 +1175,67 @@ class OLS(WLS):
                               check_step=False,
                               **defaults)
 
+    def fit_regularized_path(self, alphas=None, L1_wt=1., cv=None, n_jobs=1,
+                             **kwargs):
+        r"""
+        Compute the elastic net regularization path.
+
+        Parameters
+        ----------
+        alphas : array_like, optional
+            The penalty weights.  The path is computed from the largest
+            to the smallest value.  If not provided, a log-spaced grid
+            starting at the smallest penalty weight for which all
+            penalized coefficients are zero is used.
+        L1_wt : float
+            Must be in [0, 1].  The L1 penalty has weight L1_wt and the
+            L2 penalty has weight 1 - L1_wt.
+        cv : int or cross-validation iterator, optional
+            If provided, the test set deviance along the path is
+            computed for each fold, e.g. ``cv=5`` for 5-fold
+            cross-validation.
+        n_jobs : int
+            The number of folds fit in parallel.  Requires joblib.
+        **kwargs
+            Additional keyword arguments, see ``fit_elasticnet_path``
+            in ``statsmodels.base.elastic_net``.  These include
+            `n_alphas`, `alpha_min_ratio`, `penalty_weights` (e.g. 0
+            for the constant), `screening` and the options of
+            `fit_regularized`.
+
+        Returns
+        -------
+        RegularizedPathResults
+            The path with the coefficient matrix ``params`` (one row
+            per alpha), ``deviance`` (the sum of squared residuals),
+            ``df`` and the cross-validation results ``cv_mean``,
+            ``cv_se``, ``alpha_min`` and ``alpha_1se`` if `cv` is
+            provided.
+
+        Notes
+        -----
+        The function that is minimized at each alpha is the same as in
+        `fit_regularized` with ``profile_scale=False``:
+
+        .. math::
+
+            0.5*RSS/n + alpha*((1-L1\_wt)*|params|_2^2/2 + L1\_wt*|params|_1)
+
+        Each fit is warm started at the solution for the previous alpha,
+        and the strong rule is used to restrict the fit to the variables
+        that are likely to be nonzero.
+        """
+        from statsmodels.base.elastic_net import fit_elasticnet_path
+
+        defaults = {"maxiter": 50, "cnvrg_tol": 1e-10, "zero_tol": 1e-8,
+                    "check_step": False, "loglike_kwds": {"scale": 1},
+                    "score_kwds": {"scale": 1}, "hess_kwds": {"scale": 1}}
+        defaults.update(kwargs)
+
+        return fit_elasticnet_path(self, alphas=alphas, L1_wt=L1_wt, cv=cv,
+                                   n_jobs=n_jobs,
+                                   deviance_func=_path_deviance, **defaults)
+
     def _sqrt_lasso(self, alpha, refit, zero_tol):
 
         try:
@@ -1489,6 +1658,10 @@ class RegressionResults(base.LikelihoodModelResults):
         Additional keywords used in the covariance specification.
     use_t : bool
         Flag indicating to use the Student's t in inference.
+    store : {"full", "minimal"}
+        If "minimal", per-observation attributes such as `resid`,
+        `fittedvalues` and `het_scale` are recomputed from the model data on
+        access instead of being stored. See `RegressionModel.fit`.
     **kwargs
         Additional keyword arguments used to initialize the results.
 
@@ -1521,11 +1694,13 @@ class RegressionResults(base.LikelihoodModelResults):
     _cache = {}  # needs to be a class attribute for scale setter?
 
     def __init__(self, model, params, normalized_cov_params=None, scale=1.,
-                 cov_type='nonrobust', cov_kwds=None, use_t=None, **kwargs):
+                 cov_type='nonrobust', cov_kwds=None, use_t=None,
+                 store='full', **kwargs):
         super(RegressionResults, self).__init__(
             model, params, normalized_cov_params, scale)
 
         self._cache = {}
+        self._store_minimal = store == 'minimal'
         if hasattr(model, 'wexog_singular_values'):
             self._wexog_singular_values = model.wexog_singular_values
         else:
@@ -1587,12 +1762,12 @@ class RegressionResults(base.LikelihoodModelResults):
         """Number of observations n."""
         return float(self.model.wexog.shape[0])
 
-    @cache_readonly
+    @cached_obs_data
     def fittedvalues(self):
         """The predicted values for the original (unwhitened) design."""
         return self.model.predict(self.params, self.model.exog)
 
-    @cache_readonly
+    @cached_obs_data
     def wresid(self):
         """
         The residuals of the transformed/whitened regressand and regressor(s).
@@ -1600,7 +1775,7 @@ class RegressionResults(base.LikelihoodModelResults):
         return self.model.wendog - self.model.predict(
             self.params, self.model.wexog)
 
-    @cache_readonly
+    @cached_obs_data
     def resid(self):
         """The residuals of the model."""
         return self.model.endog - self.model.predict(
@@ -1780,6 +1955,11 @@ class RegressionResults(base.LikelihoodModelResults):
     @cache_readonly
     def bse(self):
         """The standard errors of the parameter estimates."""
+        ncp = self.normalized_cov_params
+        if (not hasattr(self, 'cov_params_default') and
+                isinstance(ncp, LinearOperator)):
+            # only the diagonal of the inverse of a sparse wexog.T wexog
+            return np.sqrt(ncp.diagonal() * self.scale)
         return np.sqrt(np.diag(self.cov_params()))
 
     @cache_readonly
@@ -1811,8 +1991,11 @@ class RegressionResults(base.LikelihoodModelResults):
         if self._wexog_singular_values is not None:
             eigvals = self._wexog_singular_values ** 2
         else:
-            eigvals = np.linalg.linalg.eigvalsh(np.dot(self.model.wexog.T,
-                                                       self.model.wexog))
+            wexog = self.model.wexog
+            xpx = wexog.T.dot(wexog)
+            if sparse.issparse(xpx):
+                xpx = xpx.toarray()
+            eigvals = np.linalg.linalg.eigvalsh(xpx)
         return np.sort(eigvals)[::-1]
 
     @cache_readonly
@@ -1827,50 +2010,65 @@ class RegressionResults(base.LikelihoodModelResults):
 
     # TODO: make these properties reset bse
     def _HCCM(self, scale):
-        H = np.dot(self.model.pinv_wexog,
-                   scale[:, None] * self.model.pinv_wexog.T)
-        return H
+        if not self._store_minimal:
+            self.het_scale = scale
+        if hasattr(self.model, 'pinv_wexog'):
+            return np.dot(self.model.pinv_wexog,
+                          scale[:, None] * self.model.pinv_wexog.T)
+        # pinv(wexog) is not available after fit(..., store="minimal")
+        # or with a sparse exog
+        wexog = self.model.wexog
+        ncp = self.normalized_cov_params
+        if sparse.issparse(wexog):
+            meat = wexog.T.dot(_sparse_whiten(wexog, scale)).toarray()
+            return ncp.dot(ncp.dot(meat).T)
+        meat = np.dot(wexog.T, scale[:, None] * wexog)
+        return np.dot(ncp, np.dot(meat, ncp))
+
+    def _wexog_leverage(self):
+        # diag of wexog @ normalized_cov_params @ wexog.T without nobs x nobs
+        wexog = self.model.wexog
+        ncp = self.normalized_cov_params
+        if not sparse.issparse(wexog):
+            return (np.dot(wexog, ncp) * wexog).sum(1)
+        # chunk rows so that wexog @ ncp is never formed for all rows
+        wexog = wexog.tocsr()
+        h = np.empty(wexog.shape[0])
+        for rows in _row_chunks(*wexog.shape):
+            x = wexog[rows]
+            h[rows] = np.asarray(
+                x.multiply(ncp.dot(x.T.toarray()).T).sum(1)).ravel()
+        return h
 
     @cache_readonly
     def cov_HC0(self):
         """
         Heteroscedasticity robust covariance matrix. See HC0_se.
         """
-        self.het_scale = self.wresid**2
-        cov_HC0 = self._HCCM(self.het_scale)
-        return cov_HC0
+        return self._HCCM(self.wresid**2)
 
     @cache_readonly
     def cov_HC1(self):
         """
         Heteroscedasticity robust covariance matrix. See HC1_se.
         """
-        self.het_scale = self.nobs/(self.df_resid)*(self.wresid**2)
-        cov_HC1 = self._HCCM(self.het_scale)
-        return cov_HC1
+        return self._HCCM(self.nobs/(self.df_resid)*(self.wresid**2))
 
     @cache_readonly
     def cov_HC2(self):
         """
         Heteroscedasticity robust covariance matrix. See HC2_se.
         """
-        # probably could be optimized
-        wexog = self.model.wexog
-        h = np.diag(wexog @ self.normalized_cov_params @ wexog.T)
-        self.het_scale = self.wresid**2/(1-h)
-        cov_HC2 = self._HCCM(self.het_scale)
-        return cov_HC2
+        h = self._wexog_leverage()
+        return self._HCCM(self.wresid**2/(1-h))
 
     @cache_readonly
     def cov_HC3(self):
         """
         Heteroscedasticity robust covariance matrix. See HC3_se.
         """
-        wexog = self.model.wexog
-        h = np.diag(wexog @ self.normalized_cov_params @ wexog.T)
-        self.het_scale = (self.wresid / (1 - h))**2
-        cov_HC3 = self._HCCM(self.het_scale)
-        return cov_HC3
+        h = self._wexog_leverage()
+        return self._HCCM((self.wresid / (1 - h))**2)
 
     @cache_readonly
     def HC0_se(self):
@@ -1935,7 +2133,7 @@ class RegressionResults(base.LikelihoodModelResults):
         """
         return np.sqrt(np.diag(self.cov_HC3))
 
-    @cache_readonly
+    @cached_obs_data
     def resid_pearson(self):
         """
         Residuals, normalized to have unit variance.
@@ -2529,6 +2727,25 @@ class RegressionResults(base.LikelihoodModelResults):
             self, exog=exog, transform=transform, weights=weights,
             row_labels=row_labels, **kwargs)
 
+    def _resid_diagnostics(self):
+        """
+        Residual normality and autocorrelation statistics used in summaries.
+
+        Returns
+        -------
+        tuple
+            Jarque-Bera statistic and p-value, skew, kurtosis, omnibus
+            statistic and p-value and the Durbin-Watson statistic, all
+            computed from `wresid`.
+        """
+        from statsmodels.stats.stattools import (
+            jarque_bera, omni_normtest, durbin_watson)
+
+        jb, jbpv, skew, kurtosis = jarque_bera(self.wresid)
+        omni, omnipv = omni_normtest(self.wresid)
+        dw = durbin_watson(self.wresid)
+        return jb, jbpv, skew, kurtosis, omni, omnipv, dw
+
     def summary(self, yname=None, xname=None, title=None, alpha=.05):
         """
         Summarize the Regression Results.
@@ -2557,11 +2774,8 @@ class RegressionResults(base.LikelihoodModelResults):
         --------
         statsmodels.iolib.summary.Summary : A class that holds summary results.
         """
-        from statsmodels.stats.stattools import (
-            jarque_bera, omni_normtest, durbin_watson)
-
-        jb, jbpv, skew, kurtosis = jarque_bera(self.wresid)
-        omni, omnipv = omni_normtest(self.wresid)
+        jb, jbpv, skew, kurtosis, omni, omnipv, dw = \
+            self._resid_diagnostics()
 
         eigvals = self.eigenvals
         condno = self.condition_number
@@ -2611,7 +2825,7 @@ class RegressionResults(base.LikelihoodModelResults):
                       ]
 
         diagn_right = [('Durbin-Watson:',
-                        ["%#8.3f" % durbin_watson(self.wresid)]
+                        ["%#8.3f" % dw]
                         ),
                        ('Jarque-Bera (JB):', ["%#8.3f" % jb]),
                        ('Prob(JB):', ["%#8.3g" % jbpv]),
@@ -2637,7 +2851,7 @@ class RegressionResults(base.LikelihoodModelResults):
         etext = []
         if hasattr(self, 'cov_type'):
             etext.append(self.cov_kwds['description'])
-        if self.model.exog.shape[0] < self.model.exog.shape[1]:
+        if self.nobs < len(self.params):
             wstr = "The input rank is higher than the number of observations."
             etext.append(wstr)
         if eigvals[-1] < 1e-10:
@@ -2696,14 +2910,9 @@ class RegressionResults(base.LikelihoodModelResults):
             A class that holds summary results.
         """
         # Diagnostics
-        from statsmodels.stats.stattools import (jarque_bera,
-                                                 omni_normtest,
-                                                 durbin_watson)
-
         from collections import OrderedDict
-        jb, jbpv, skew, kurtosis = jarque_bera(self.wresid)
-        omni, omnipv = omni_normtest(self.wresid)
-        dw = durbin_watson(self.wresid)
+        jb, jbpv, skew, kurtosis, omni, omnipv, dw = \
+            self._resid_diagnostics()
         eigvals = self.eigenvals
         condno = self.condition_number
         eigvals = np.sort(eigvals)  # in increasing order
@@ -2778,10 +2987,16 @@ class OLSResults(RegressionResults):
     - conf_int_el
     """
 
-    def get_influence(self):
+    def get_influence(self, chunksize=None):
         """
         Calculate influence and outlier measures.
 
+        Parameters
+        ----------
+        chunksize : int, optional
+            The number of observations that are processed at a time, see
+            `OLSInfluence`.
+
         Returns
         -------
         OLSInfluence
@@ -2794,7 +3009,7 @@ class OLSResults(RegressionResults):
             A class that exposes methods to examine observation influence.
         """
         from statsmodels.stats.outliers_influence import OLSInfluence
-        return OLSInfluence(self)
+        return OLSInfluence(self, chunksize=chunksize)
 
     def outlier_test(self, method='bonf', alpha=.05, labels=None,
                      order=False, cutoff=None):
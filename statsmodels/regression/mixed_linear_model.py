@@ -148,13 +148,18 @@ import statsmodels.base.model as base
 from statsmodels.tools.decorators import cache_readonly
 from statsmodels.tools import data as data_tools
 from scipy.stats.distributions import norm
-from scipy import sparse
+from scipy import linalg, sparse
 import pandas as pd
 import patsy
 from collections import OrderedDict
+import os
+import re
 import warnings
 from statsmodels.tools.sm_exceptions import ConvergenceWarning
 from statsmodels.base._penalties import Penalty
+from statsmodels.tools.tools import Bunch, _row_chunks
+from statsmodels.regression import _sparse_cholesky
+from statsmodels.regression._tools import _fill_reducing_order
 
 
 def _dot(x, y):
@@ -548,6 +553,511 @@ def _smw_logdet(s, A, AtA, Qi, di, B_logdet):
     return B_logdet + ld + ld1
 
 
+class _SparseFactor(object):
+    """
+    Cholesky factor of the random effects system, see `_SparseRE.factor`.
+
+    Unlike a Bunch, it is not part of a reference cycle, so that the
+    dense blocks of a factor are released as soon as it is replaced.
+    """
+
+    def __init__(self, **kwds):
+        self.__dict__.update(kwds)
+        self.zx = None
+        self.z22 = None
+
+
+class _SparseRE(object):
+    """
+    Random effects of all groups as a single sparse system.
+
+    The marginal covariance of the data, relative to the scale, is
+    ``V = I + Z G Z'``, where ``Z`` is the block diagonal matrix of the
+    random effects and variance components designs of all groups, and
+    ``G`` is block diagonal with `cov_re` and the variance components.
+    With ``G = L L'`` and ``M = L' Z' Z L + I``, the log determinant of
+    the marginal covariance is ``log|M|``, and
+
+    ``V^{-1} = I - Z L M^{-1} L' Z'``.
+
+    The cross products of ``Z`` and ``[X, y]`` are formed once, so that
+    each evaluation only requires the sparse Cholesky factorization of
+    ``M``.  Quadratic forms of the residuals are computed from the
+    residuals to avoid the loss of precision of the difference above.
+    The sparsity pattern of ``M`` does not depend on the parameters, the
+    fill reducing ordering and the pattern of the factor are computed at
+    the first factorization and reused afterwards.  The trailing columns
+    of the factor that are mostly filled in, as for crossed random
+    effects, are factored as a dense block.
+
+    The derivatives with respect to the covariance parameters depend on
+    ``W = Z' V^{-1} Z = A - A L M^{-1} L' A`` with ``A = Z' Z``.  The
+    score only needs the diagonal blocks of ``W``, which follow from
+    ``L' W L = I - M^{-1}`` and the entries of ``M^{-1}`` on the pattern
+    of the factor.  The Hessian also needs the entries of ``W`` between
+    the blocks, its columns are computed by solving with the factor.
+
+    The dense trailing block has about as many columns as the smaller of
+    two crossed factors has levels, and its memory grows with the square
+    of that number, which limits the smaller factor to about 10^4
+    levels.  The Hessian solves for all columns of ``W``, its cost grows
+    with the square of the number of random effects.  On a single core,
+    a factor with 10^5 levels crossed with one with 100 levels and
+    3 * 10^5 observations takes about 10 minutes and 350 MB to fit,
+    almost all of it for the Hessian at the end of the fit, and two
+    factors with 10^4 levels each and 10^5 observations take about 5
+    minutes and 1.3 GB.  See the ``MixedLMSparseCrossed`` benchmark.
+    """
+
+    # Blocks of L with L' A L smaller than this on the diagonal are
+    # (nearly) singular, their blocks of W are computed from the columns
+    # of W instead of from L' W L.
+    _singular_tol = 1e-6
+
+    # The trailing block of the factor is treated as dense from the
+    # first column at which at least this fraction of it is nonzero.
+    _dense_tail = 0.5
+
+    def __init__(self, model):
+        k_re, k_vc = model.k_re, model.k_vc
+        data, rows, cols = [], [], []
+        re_cols, vc_cols, vc_index = [], [], []
+        nrow, ncol = 0, 0
+        col_offsets = [0]
+        for group_ix, group in enumerate(model.group_labels):
+            ex = sparse.coo_matrix(model._aex_r[group_ix])
+            data.append(ex.data)
+            rows.append(nrow + ex.row)
+            cols.append(ncol + ex.col)
+            re_cols.append(ncol + np.arange(k_re))
+            pos = ncol + k_re
+            for j in range(k_vc):
+                d = model.exog_vc.mats[j][group_ix].shape[1]
+                vc_cols.append(pos + np.arange(d))
+                vc_index.append(np.full(d, j))
+                pos += d
+            nrow += ex.shape[0]
+            ncol += ex.shape[1]
+            col_offsets.append(ncol)
+        z = sparse.csc_matrix((np.concatenate(data),
+                               (np.concatenate(rows), np.concatenate(cols))),
+                              shape=(nrow, ncol))
+        self.q = ncol
+        self.col_offsets = np.array(col_offsets)
+        self.n_groups = model.n_groups
+        self.row_order = np.concatenate([model.row_indices[g]
+                                         for g in model.group_labels])
+        self.z = z
+        self.re_cols = np.array(re_cols).reshape(model.n_groups, k_re)
+        if k_vc > 0:
+            self.vc_cols = np.concatenate(vc_cols)
+            self.vc_index = np.concatenate(vc_index)
+        else:
+            self.vc_cols = np.zeros(0, dtype=np.int64)
+            self.vc_index = np.zeros(0, dtype=np.int64)
+
+        self.exog = model.exog[self.row_order]
+        self.endog = model.endog[self.row_order]
+        endex = np.column_stack((self.exog, self.endog))
+        self.ztz = z.T.dot(z).tocsc()
+        self.ztz_diag = self.ztz.diagonal()
+        self.ztendex = np.asarray(z.T.dot(endex))
+        self.endex2 = np.dot(endex.T, endex)
+
+        # Sparsity pattern of L, the entries are numbered to find
+        # their position in the csc data array.
+        ii, jj = np.tril_indices(k_re)
+        self._tril = (ii, jj)
+        lrows = np.concatenate((self.re_cols[:, ii].ravel(), self.vc_cols))
+        lcols = np.concatenate((self.re_cols[:, jj].ravel(), self.vc_cols))
+        nnz = len(lrows)
+        lam = sparse.csc_matrix((np.arange(1., nnz + 1), (lrows, lcols)),
+                                shape=(self.q, self.q))
+        self._lam = lam
+        self._lam_order = lam.data.astype(np.int64) - 1
+        self._symbolic = None
+        self._key = None
+        self._factor = None
+
+    def _sqrt_cov_re(self, cov_re):
+        """Lower triangular square root of `cov_re`"""
+        try:
+            return np.linalg.cholesky(cov_re)
+        except np.linalg.LinAlgError:
+            # Project an indefinite cov_re to the nearest psd matrix.
+            evals, evecs = np.linalg.eigh(cov_re)
+            sq = evecs * np.sqrt(np.clip(evals, 0, np.inf))
+            return np.linalg.qr(sq.T)[1].T
+
+    def lam(self, cov_re, vcomp):
+        """Sparse square root of the random effects covariance"""
+        if cov_re.shape[0] > 0:
+            sq = self._sqrt_cov_re(cov_re)
+            lre = np.tile(sq[self._tril], self.n_groups)
+        else:
+            lre = np.zeros(0)
+        vals = np.concatenate((lre, np.sqrt(np.clip(vcomp, 0, np.inf))
+                               [self.vc_index]))
+        lam = self._lam.copy()
+        lam.data = vals[self._lam_order]
+        return lam
+
+    def _analyze(self):
+        """
+        Fill reducing ordering and symbolic factorization of ``M``.
+        """
+        q = self.q
+        lam = self._lam.copy()
+        lam.data = np.ones_like(lam.data)
+        # The pattern of M for any parameters, L' L covers the diagonal
+        # blocks when the random effects have no data.
+        pat = lam.T.dot(abs(self.ztz)).dot(lam) + lam.T.dot(lam)
+        pat = (pat + sparse.identity(q)).tocsc()
+        perm = _fill_reducing_order(pat)
+        iperm = np.empty_like(perm)
+        iperm[perm] = np.arange(q)
+
+        cmat = pat[perm, :][:, perm].tocsc()
+        cmat.sort_indices()
+        cp = cmat.indptr.astype(np.intp)
+        ci = cmat.indices.astype(np.intp)
+        parent, lp, li = _sparse_cholesky.symbolic(cp, ci)
+        size = np.arange(q, 0, -1)
+        tail_nnz = np.cumsum(np.diff(lp)[::-1])[::-1]
+        nsparse = np.argmax(tail_nnz >= self._dense_tail * size *
+                            (size + 1) / 2)
+        # Keys of the entries in column major order to locate them in the
+        # data arrays of M and of the factor.
+        ckeys = np.repeat(np.arange(q, dtype=np.int64), np.diff(cp)) * q + ci
+        lkeys = np.repeat(np.arange(q, dtype=np.int64), np.diff(lp)) * q + li
+        self._symbolic = Bunch(perm=perm, iperm=iperm, cp=cp, ci=ci,
+                               ckeys=ckeys, parent=parent, lp=lp, li=li,
+                               lkeys=lkeys, nsparse=nsparse)
+
+    def factor(self, cov_re, vcomp):
+        """
+        Factor the system for given covariance parameters.
+
+        Returns a _SparseFactor with the log determinant of the marginal
+        covariance `logdet`, `endex_vi_endex` (``[X, y]' V^{-1} [X, y]``),
+        the square root `lam` and a `solve` function for ``M``.  The last
+        factorization is cached.
+        """
+        cov_re = np.asarray(cov_re, dtype=np.float64)
+        vcomp = np.asarray(vcomp, dtype=np.float64)
+        key = (cov_re.tobytes(), vcomp.tobytes())
+        if key == self._key:
+            return self._factor
+        # Release the previous factor before forming the next one
+        self._key = self._factor = None
+        if self._symbolic is None:
+            self._analyze()
+        sym = self._symbolic
+
+        lam = self.lam(cov_re, vcomp)
+        mat = lam.T.dot(self.ztz).dot(lam)
+        mat = (mat + sparse.identity(self.q)).tocoo()
+        keys = sym.iperm[mat.col].astype(np.int64) * self.q
+        keys += sym.iperm[mat.row]
+        cx = np.zeros(len(sym.ci))
+        cx[np.searchsorted(sym.ckeys, keys)] = mat.data
+        lx = np.empty(len(sym.li))
+        t = sym.nsparse
+        s22 = np.zeros((self.q - t, self.q - t))
+        info = _sparse_cholesky.numeric(sym.cp, sym.ci, cx, sym.parent,
+                                        sym.lp, sym.li, lx, s22)
+        if info >= 0:
+            raise np.linalg.LinAlgError("The random effects system is not "
+                                        "positive definite")
+        l22 = linalg.cholesky(s22, lower=True)
+        logdet = 2 * (np.sum(np.log(lx[sym.lp[0:t]])) +
+                      np.sum(np.log(np.diag(l22))))
+
+        def solve(rhs):
+            rhs = np.asarray(rhs, dtype=np.float64)
+            b = np.ascontiguousarray(rhs.reshape(self.q, -1)[sym.perm])
+            _sparse_cholesky.solve_lower(sym.lp, sym.li, lx, b, t)
+            b[t:] = linalg.cho_solve((l22, True), b[t:])
+            _sparse_cholesky.solve_upper(sym.lp, sym.li, lx, b, t)
+            x = np.empty_like(b)
+            x[sym.perm] = b
+            return x.reshape(rhs.shape)
+
+        lzte = np.asarray(lam.T.dot(self.ztendex))
+        c = solve(lzte)
+        evie = self.endex2 - np.dot(lzte.T, c)
+        self._factor = _SparseFactor(lam=lam, solve=solve, logdet=logdet,
+                                     endex_vi_endex=evie, lzte=lzte, lc=c,
+                                     lx=lx, l22=l22)
+        self._key = key
+        return self._factor
+
+    def _resid_terms(self, f, fe_params):
+        """
+        ``r' V^{-1} r``, ``X' V^{-1} r`` and ``Z' V^{-1} r`` for the
+        residuals `r`.
+        """
+        resid = self.endog - np.dot(self.exog, fe_params)
+        ztr = self.z.T.dot(resid)
+        c = f.lam.T.dot(ztr)
+        vc = f.solve(c)
+        k = len(fe_params)
+        xvr = np.dot(self.exog.T, resid) - np.dot(f.lzte[:, 0:k].T, vc)
+        zvr = ztr - self.ztz.dot(f.lam.dot(vc))
+        return np.dot(resid, resid) - np.dot(c, vc), xvr, zvr
+
+    def loglike_terms(self, cov_re, vcomp, fe_params):
+        """
+        Log determinant, quadratic form of the residuals and
+        ``X' V^{-1} X``.
+        """
+        f = self.factor(cov_re, vcomp)
+        qf = self._resid_terms(f, fe_params)[0]
+        k = len(fe_params)
+        return f.logdet, qf, f.endex_vi_endex[0:k, 0:k]
+
+    def fe_params(self, cov_re, vcomp, k_fe):
+        """GLS estimate of the fixed effects parameters"""
+        f = self.factor(cov_re, vcomp)
+        xvx = f.endex_vi_endex[0:k_fe, 0:k_fe]
+        fe_params = np.linalg.solve(xvx, f.endex_vi_endex[0:k_fe, k_fe])
+        # One step of iterative refinement
+        xvr = self._resid_terms(f, fe_params)[1]
+        return fe_params + np.linalg.solve(xvx, xvr)
+
+    def blup(self, cov_re, vcomp, fe_params):
+        """
+        Conditional means of the random effects, ``G Z' V^{-1} r``.
+        """
+        f = self.factor(cov_re, vcomp)
+        resid = self.endog - np.dot(self.exog, fe_params)
+        # G Z' V^{-1} = L M^{-1} L' Z'
+        return f.lam.dot(f.solve(f.lam.T.dot(self.z.T.dot(resid))))
+
+    def cond_cov(self, cov_re, vcomp, cols):
+        """
+        Conditional covariance of the random effects in `cols` given
+        the data, ``L M^{-1} L'``, relative to the scale.
+        """
+        f = self.factor(cov_re, vcomp)
+        rhs = f.lam.tocsr()[cols, :].T.toarray()
+        return np.asarray(f.lam.tocsr()[cols, :].dot(f.solve(rhs)))
+
+    def dv_pairs(self, k_re, k_vc):
+        """
+        Yields the column indices (left, right) of Z such that the
+        derivative of the marginal covariance with respect to each
+        covariance parameter is ``Z[:, l] Z[:, r]' + Z[:, r] Z[:, l]'``
+        (only the first term if symmetric).
+        """
+        for j1 in range(k_re):
+            for j2 in range(j1 + 1):
+                yield (self.re_cols[:, j1], self.re_cols[:, j2], j1 == j2)
+        for j in range(k_vc):
+            ii = self.vc_cols[self.vc_index == j]
+            yield ii, ii, True
+
+    def _minv(self, f, rows, cols):
+        """
+        Entries of ``M^{-1}`` at (`rows`, `cols`), which must be on the
+        pattern of the factor.
+        """
+        sym = self._symbolic
+        t = sym.nsparse
+        if f.zx is None:
+            # only the lower triangle of the trailing block is used
+            z22, info = linalg.lapack.dpotri(f.l22, lower=1)
+            f.z22 = np.ascontiguousarray(z22)
+            f.zx = _sparse_cholesky.selected_inverse(sym.lp, sym.li, f.lx,
+                                                     f.z22)
+        r, c = sym.iperm[rows], sym.iperm[cols]
+        lo, hi = np.minimum(r, c), np.maximum(r, c)
+        minv = np.empty(lo.shape)
+        tail = lo >= t
+        minv[tail] = f.z22[hi[tail] - t, lo[tail] - t]
+        keys = lo[~tail].astype(np.int64) * self.q + hi[~tail]
+        minv[~tail] = f.zx[np.searchsorted(sym.lkeys, keys)]
+        return minv
+
+    def _w_cols(self, f, cols):
+        """The columns `cols` of ``W = Z' V^{-1} Z``"""
+        acols = self.ztz[:, cols]
+        rhs = f.lam.T.dot(acols).toarray()
+        return acols.toarray() - self.ztz.dot(f.lam.dot(f.solve(rhs)))
+
+    def _w_dot(self, f, mat):
+        """``W mat`` for a dense `mat`"""
+        amat = self.ztz.dot(mat)
+        return amat - self.ztz.dot(f.lam.dot(f.solve(f.lam.T.dot(amat))))
+
+    def _w_blocks(self, f, cov_re, vcomp):
+        """
+        The diagonal blocks of ``W``, one ``k_re x k_re`` block per group
+        for the random effects and the diagonal for the variance
+        components.
+        """
+        k_re = self.re_cols.shape[1]
+        tol = self._singular_tol
+        w_re = np.zeros((self.n_groups, k_re, k_re))
+        w_vc = np.zeros(len(self.vc_cols))
+        if k_re > 0:
+            sq = self._sqrt_cov_re(cov_re)
+            ok = (np.diag(sq)**2 * self.ztz_diag[self.re_cols] >= tol).all(1)
+            if ok.any():
+                ii, jj = np.meshgrid(np.arange(k_re), np.arange(k_re),
+                                     indexing="ij")
+                cols = self.re_cols[ok]
+                minv = self._minv(f, cols[:, ii.ravel()], cols[:, jj.ravel()])
+                # W_g = L^{-T} (I - M^{-1}_g) L^{-1}
+                sqi = np.linalg.inv(sq)
+                imm = np.eye(k_re) - minv.reshape(-1, k_re, k_re)
+                w_re[ok] = np.einsum("ji,gjk,kl->gil", sqi, imm, sqi)
+            groups = np.flatnonzero(~ok)
+            for sl in _row_chunks(len(groups), k_re * self.q):
+                gix = groups[sl]
+                cols = self.re_cols[gix].ravel()
+                wc = self._w_cols(f, cols)[cols]
+                wc = wc.reshape(len(gix), k_re, len(gix), k_re)
+                ix = np.arange(len(gix))
+                w_re[gix] = wc[ix, :, ix, :]
+        if len(self.vc_cols) > 0:
+            v = np.clip(vcomp, 0, np.inf)[self.vc_index]
+            ok = v * self.ztz_diag[self.vc_cols] >= tol
+            cols = self.vc_cols[ok]
+            w_vc[ok] = (1 - self._minv(f, cols, cols)) / v[ok]
+            ix = np.flatnonzero(~ok)
+            for sl in _row_chunks(len(ix), self.q):
+                cols = self.vc_cols[ix[sl]]
+                w_vc[ix[sl]] = np.diag(self._w_cols(f, cols)[cols])
+        return w_re, w_vc
+
+    def _zt_vinv_exog(self, f, k_fe):
+        """``Z' V^{-1} X``"""
+        return (self.ztendex[:, 0:k_fe] -
+                self.ztz.dot(f.lam.dot(f.lc[:, 0:k_fe])))
+
+    def score_terms(self, fe_params, cov_re, vcomp, reml):
+        """
+        The sums over the groups that are computed by
+        `MixedLM._score_full_groups`.
+        """
+        f = self.factor(cov_re, vcomp)
+        k_fe = len(fe_params)
+        k_re, k_vc = self.re_cols.shape[1], len(vcomp)
+        rvir, xtvir, zvr = self._resid_terms(f, fe_params)
+        xtvix = f.endex_vi_endex[0:k_fe, 0:k_fe]
+        zvx = self._zt_vinv_exog(f, k_fe) if reml else None
+
+        w_re, w_vc = self._w_blocks(f, cov_re, vcomp)
+        ii, jj = self._tril
+        dlv = np.concatenate((np.where(ii == jj, 1, 2) *
+                              w_re[:, ii, jj].sum(0),
+                              np.bincount(self.vc_index, w_vc,
+                                          minlength=k_vc)))
+        rvavr = np.zeros(len(dlv))
+        xtax = [0] * len(dlv)
+        for j, (left, right, sym) in enumerate(self.dv_pairs(k_re, k_vc)):
+            rvavr[j] = (1 if sym else 2) * np.dot(zvr[left], zvr[right])
+            if reml:
+                a = np.dot(zvx[left].T, zvx[right])
+                xtax[j] = a if sym else a + a.T
+        return dlv, rvavr, xtax, xtvix, rvir, xtvir
+
+    def hessian_terms(self, fe_params, cov_re, vcomp, reml):
+        """
+        The sums over the groups that are computed by
+        `MixedLM._hessian_groups`.
+        """
+        f = self.factor(cov_re, vcomp)
+        q, k_fe = self.q, len(fe_params)
+        k_re, k_vc = self.re_cols.shape[1], len(vcomp)
+        rvir, _, zvr = self._resid_terms(f, fe_params)
+        xtvix = f.endex_vi_endex[0:k_fe, 0:k_fe]
+        zvx = self._zt_vinv_exog(f, k_fe)
+        pairs = list(self.dv_pairs(k_re, k_vc))
+        m = len(pairs)
+
+        hess_fere = np.zeros((m, k_fe))
+        xtax = [None] * m
+        B = np.zeros(m)
+        # The derivatives of V times V^{-1} r and V^{-1} X, projected on Z
+        ey = np.zeros((q, m))
+        ex = np.zeros((m, q, k_fe))
+        for j, (left, right, sym) in enumerate(pairs):
+            hess_fere[j] = np.dot(zvx[left].T, zvr[right])
+            a = np.dot(zvx[left].T, zvx[right])
+            B[j] = np.dot(zvr[left], zvr[right])
+            ey[left, j] += zvr[right]
+            ex[j, left] += zvx[right]
+            if not sym:
+                hess_fere[j] += np.dot(zvx[right].T, zvr[left])
+                a = a + a.T
+                B[j] *= 2
+                ey[right, j] += zvr[left]
+                ex[j, right] += zvx[left]
+            xtax[j] = a
+
+        D = 2 * np.dot(ey.T, self._w_dot(f, ey))
+        F = None
+        if reml:
+            wex = self._w_dot(f, ex.transpose(1, 0, 2).reshape(q, -1))
+            wex = wex.reshape(q, m, k_fe)
+            F = np.einsum("jpa,pib->ijab", ex, wex)
+            F = F + F.transpose(0, 1, 3, 2)
+
+        # 0.5 * tr(W E_i W E_j), with the columns of W for the pairs of
+        # each parameter computed in chunks
+        hess_re = np.zeros((m, m))
+        for j, (lj, rj, symj) in enumerate(pairs):
+            for sl in _row_chunks(len(lj), 2 * q):
+                wl = self._w_cols(f, lj[sl])
+                wr = wl if symj else self._w_cols(f, rj[sl])
+                for i, (li, ri, symi) in enumerate(pairs[:j + 1]):
+                    t1 = np.sum(wl[ri] * wr[li])
+                    t2 = np.sum(wr[ri] * wl[li])
+                    ns_i, ns_j = int(not symi), int(not symj)
+                    hess_re[i, j] += 0.5 * (t1 * (1 + ns_i * ns_j) +
+                                            t2 * (ns_i + ns_j))
+        hess_re = np.triu(hess_re) + np.triu(hess_re, 1).T
+
+        return xtvix, rvir, hess_fere, hess_re, xtax, B, D, F
+
+
+def _vc_factor(formula, data):
+    """
+    Returns the variable name if `formula` is of the form '0 + C(var)',
+    otherwise None.
+    """
+    m = re.match(r"^\s*0\s*\+\s*C\(\s*(\w+)\s*\)\s*$", formula)
+    if m is None or m.group(1) not in data:
+        return None
+    return m.group(1)
+
+
+def _sparse_vc_dummies(values, name, gb, groups):
+    """
+    Sparse indicator matrices of the levels of `values` within each
+    group, with the column names used by patsy for '0 + C(name)'.
+    """
+    values = pd.Series(values)
+    categories = None
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        categories = values.cat.categories
+    mats, colnames = [], []
+    for group in groups:
+        vals = values.loc[gb.groups[group]]
+        if categories is None:
+            levels, codes = np.unique(np.asarray(vals), return_inverse=True)
+        else:
+            levels = categories
+            codes = np.asarray(vals.cat.codes)
+        n = len(codes)
+        mats.append(sparse.csr_matrix((np.ones(n), (np.arange(n), codes)),
+                                      shape=(n, len(levels))))
+        colnames.append(["C(%s)[%s]" % (name, lev) for lev in levels])
+    return mats, colnames
+
+
 def _convert_vc(exog_vc):
 
     vc_names = []
@@ -611,6 +1121,17 @@ class MixedLM(base.LikelihoodModel):
         lower triangle of the random effects covariance matrix.
     missing : str
         The approach to missing data handling
+    use_sparse : bool
+        If True, the random effects of all groups are handled as a
+        single sparse system, see Notes.
+    n_jobs : int
+        The number of chunks of groups whose contributions to the
+        log-likelihood and its derivatives are evaluated in parallel.
+        If -1, the number of CPUs is used.
+    executor : concurrent.futures.Executor, optional
+        The executor that evaluates the chunks of groups if `n_jobs`
+        is larger than 1.  If None, a thread pool with `n_jobs`
+        threads is used.
 
     Notes
     -----
@@ -632,6 +1153,30 @@ class MixedLM(base.LikelihoodModel):
     the covariance structure are set (using the `free` argument to
     `fit`) that cannot be expressed in terms of the Cholesky factor L.
 
+    If `use_sparse` is True, the log-likelihood is evaluated using a
+    sparse factorization of the random effects system of all groups,
+    so that no dense matrices of the size of the random effects design
+    of a group are formed.  This is useful for models with many
+    variance component levels within a group, in particular crossed
+    random effects that are specified as variance components of a
+    single group.  The score and the Hessian are computed analytically
+    from the same factorization.  The variance component matrices
+    should be sparse, see `from_formula`.  The cost grows with the fill
+    in of the factorization and, for the Hessian, with the square of the
+    number of random effects; crossed factors with up to about 10^5
+    levels, of which the smaller one has up to about 10^4 levels, can
+    be fit in minutes.
+
+    If `n_jobs` is larger than 1, the groups are split into `n_jobs`
+    contiguous chunks of about equal size, and the contributions of
+    the chunks to the log-likelihood, the score, the Hessian and the
+    GLS estimate of the fixed effects are evaluated in parallel.  The
+    linear algebra of numpy releases the GIL so that the default
+    thread pool can use several cores if the groups are not too small.
+    With a process pool, the model is sent to the worker processes in
+    each evaluation.  The executor is not pickled with the model.
+    Parallel evaluation does not apply to `use_sparse`.
+
     Examples
     --------
     A basic mixed model with fixed effects for the columns of
@@ -671,7 +1216,7 @@ class MixedLM(base.LikelihoodModel):
 
     def __init__(self, endog, exog, groups, exog_re=None,
                  exog_vc=None, use_sqrt=True, missing='none',
-                 **kwargs):
+                 use_sparse=False, n_jobs=1, executor=None, **kwargs):
 
         _allowed_kwargs = ["missing_idx", "design_info", "formula"]
         for x in kwargs.keys():
@@ -680,6 +1225,13 @@ class MixedLM(base.LikelihoodModel):
                     "argument %s not permitted for MixedLM initialization" % x)
 
         self.use_sqrt = use_sqrt
+        self.use_sparse = use_sparse
+        if n_jobs < 0:
+            n_jobs = max(os.cpu_count() + 1 + n_jobs, 1)
+        self.n_jobs = n_jobs
+        self.executor = executor
+        self._executor = None
+        self._chunks = None
 
         # Some defaults
         self.reml = True
@@ -717,7 +1269,8 @@ class MixedLM(base.LikelihoodModel):
                                       exog_re=exog_re, missing=missing,
                                       **kwargs)
 
-        self._init_keys.extend(["use_sqrt", "exog_vc"])
+        self._init_keys.extend(["use_sqrt", "exog_vc", "use_sparse",
+                                "n_jobs", "executor"])
 
         # Number of fixed effects parameters
         self.k_fe = exog.shape[1]
@@ -796,20 +1349,84 @@ class MixedLM(base.LikelihoodModel):
 
         # Precompute this
         self._aex_r = []
-        self._aex_r2 = []
         for i in range(self.n_groups):
             a = self._augment_exog(i)
             self._aex_r.append(a)
+        self._aex_r2_li = None
 
-            # This matrix is not very sparse so convert it to dense.
-            ma = _dot(a.T, a)
-            if sparse.issparse(ma):
-                ma = ma.todense()
-            self._aex_r2.append(ma)
+        if use_sparse:
+            self._sparse_re = _SparseRE(self)
+        else:
+            self._sparse_re = None
 
         # Precompute this
         self._lin, self._quad = self._reparam()
 
+    @property
+    def _aex_r2(self):
+        """
+        The cross products of the random effects design of each group.
+
+        These are dense, and are only formed when needed.
+        """
+        if self._aex_r2_li is None:
+            aex_r2 = []
+            for a in self._aex_r:
+                # This matrix is not very sparse so convert it to dense.
+                ma = _dot(a.T, a)
+                if sparse.issparse(ma):
+                    ma = ma.todense()
+                aex_r2.append(ma)
+            self._aex_r2_li = aex_r2
+        return self._aex_r2_li
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Executors cannot be pickled
+        state['executor'] = None
+        state['_executor'] = None
+        return state
+
+    def _group_chunks(self):
+        """
+        Partition of the group indices into `n_jobs` contiguous chunks
+        of about equal cost.
+        """
+        if self._chunks is None:
+            cost = np.array([a.shape[0] * (a.shape[1] + self.k_fe + 1)
+                             for a in self._aex_r], dtype=np.float64)
+            cumcost = np.cumsum(cost)
+            n_chunks = min(self.n_jobs, self.n_groups)
+            cuts = np.linspace(0, cumcost[-1], n_chunks + 1)[1:-1]
+            cuts = np.searchsorted(cumcost, cuts, side='right')
+            chunks = np.split(np.arange(self.n_groups), cuts)
+            self._chunks = [c for c in chunks if len(c) > 0]
+        return self._chunks
+
+    def _sum_groups(self, func, *args):
+        """
+        Evaluates `func` for the chunks of groups, in parallel if
+        `n_jobs` is larger than 1, and sums the results.
+
+        `func` is called as ``func(group_ixs, *args)`` and returns a
+        tuple of the summed contributions of the groups in `group_ixs`.
+        """
+        chunks = self._group_chunks()
+        if len(chunks) == 1:
+            return func(chunks[0], *args)
+
+        if self.executor is not None:
+            executor = self.executor
+        else:
+            if self._executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self._executor = ThreadPoolExecutor(max_workers=self.n_jobs)
+            executor = self._executor
+
+        args = [[a] * len(chunks) for a in args]
+        results = list(executor.map(func, chunks, *args))
+        return tuple(sum(x) for x in zip(*results))
+
     def _make_param_names(self, exog_re):
         """
         Returns the full parameter names list, just the exogenous random
@@ -861,6 +1478,10 @@ class MixedLM(base.LikelihoodModel):
             An array-like object of booleans, integers, or index
             values that indicate the subset of df to use in the
             model. Assumes df is a `pandas.DataFrame`
+        use_sparse : bool
+            If True, the variance components matrices are stored as
+            sparse matrices and the model uses the sparse
+            log-likelihood evaluation, see `MixedLM`.
         missing : str
             Either 'none' or 'drop'
         args : extra arguments
@@ -898,6 +1519,10 @@ class MixedLM(base.LikelihoodModel):
         be affected by whether the group labels are distinct or
         re-used over the top-level groups.
 
+        If `use_sparse` is True, variance components formulas of the
+        form '0 + C(var)' are converted to sparse indicator matrices
+        without forming the dense design matrix.
+
         Examples
         --------
         Suppose we have data from an educational study with students
@@ -996,8 +1621,15 @@ class MixedLM(base.LikelihoodModel):
             kylist = sorted(gb.groups.keys())
             vcf = sorted(vc_formula.keys())
             for vc_name in vcf:
-                md = patsy.ModelDesc.from_formula(vc_formula[vc_name])
                 vc_names.append(vc_name)
+                factor = _vc_factor(vc_formula[vc_name], data)
+                if use_sparse and factor is not None:
+                    evc_mats, evc_colnames = _sparse_vc_dummies(
+                        data[factor], factor, gb, kylist)
+                    vc_mats.append(evc_mats)
+                    vc_colnames.append(evc_colnames)
+                    continue
+                md = patsy.ModelDesc.from_formula(vc_formula[vc_name])
                 evc_mats, evc_colnames = [], []
                 for group_ix, group in enumerate(kylist):
                     ii = gb.groups[group]
@@ -1021,6 +1653,7 @@ class MixedLM(base.LikelihoodModel):
         kwargs["exog_re"] = exog_re
         kwargs["exog_vc"] = exog_vc
         kwargs["groups"] = groups
+        kwargs["use_sparse"] = use_sparse
         mod = super(MixedLM, cls).from_formula(
             formula, data, *args, **kwargs)
 
@@ -1258,6 +1891,9 @@ class MixedLM(base.LikelihoodModel):
         if self.k_fe == 0:
             return np.array([])
 
+        if self.use_sparse:
+            return self._sparse_re.fe_params(cov_re, vcomp, self.k_fe)
+
         if self.k_re == 0:
             cov_re_inv = np.empty((0, 0))
         else:
@@ -1272,8 +1908,18 @@ class MixedLM(base.LikelihoodModel):
                      self.endog_li[group_ix][:, None]), axis=1)
                 self._endex_li.append(mat)
 
+        xtxy, = self._sum_groups(self._fe_params_groups, cov_re_inv, vcomp)
+
+        fe_params = np.linalg.solve(xtxy[:, 0:-1], xtxy[:, -1])
+
+        return fe_params
+
+    def _fe_params_groups(self, group_ixs, cov_re_inv, vcomp):
+        """
+        Contributions of the groups in `group_ixs` to `get_fe_params`.
+        """
         xtxy = 0.
-        for group_ix, group in enumerate(self.group_labels):
+        for group_ix in group_ixs:
             vc_var = self._expand_vcomp(vcomp, group_ix)
             exog = self.exog_li[group_ix]
             ex_r, ex2_r = self._aex_r[group_ix], self._aex_r2[group_ix]
@@ -1281,9 +1927,7 @@ class MixedLM(base.LikelihoodModel):
             u = solver(self._endex_li[group_ix])
             xtxy += np.dot(exog.T, u)
 
-        fe_params = np.linalg.solve(xtxy[:, 0:-1], xtxy[:, -1])
-
-        return fe_params
+        return xtxy,
 
     def _reparam(self):
         """
@@ -1463,8 +2107,45 @@ class MixedLM(base.LikelihoodModel):
             likeval -= self.fe_pen.func(fe_params)
 
         xvx, qf = 0., 0.
-        for group_ix, group in enumerate(self.group_labels):
+        if self.use_sparse:
+            ld, qf, xvx = self._sparse_re.loglike_terms(cov_re, vcomp,
+                                                        fe_params)
+            likeval -= ld / 2.
+        else:
+            ld, qf, xvx = self._sum_groups(
+                self._loglike_groups, resid_all, cov_re_inv, cov_re_logdet,
+                vcomp)
+            likeval -= ld / 2.
+
+        if self.reml:
+            likeval -= (self.n_totobs - self.k_fe) * np.log(qf) / 2.
+            _, ld = np.linalg.slogdet(xvx)
+            likeval -= ld / 2.
+            likeval -= (self.n_totobs - self.k_fe) * np.log(2 * np.pi) / 2.
+            likeval += ((self.n_totobs - self.k_fe) *
+                        np.log(self.n_totobs - self.k_fe) / 2.)
+            likeval -= (self.n_totobs - self.k_fe) / 2.
+        else:
+            likeval -= self.n_totobs * np.log(qf) / 2.
+            likeval -= self.n_totobs * np.log(2 * np.pi) / 2.
+            likeval += self.n_totobs * np.log(self.n_totobs) / 2.
+            likeval -= self.n_totobs / 2.
 
+        return likeval
+
+    def _loglike_groups(self, group_ixs, resid_all, cov_re_inv,
+                        cov_re_logdet, vcomp):
+        """
+        Contributions of the groups in `group_ixs` to `loglike`.
+
+        Returns the sum of the log determinants of the marginal
+        covariances, the quadratic form of the residuals and, for REML,
+        ``X' V^{-1} X``.
+        """
+        ldsum, xvx, qf = 0., 0., 0.
+        for group_ix in group_ixs:
+
+            group = self.group_labels[group_ix]
             vc_var = self._expand_vcomp(vcomp, group_ix)
             cov_aug_logdet = cov_re_logdet + np.sum(np.log(vc_var))
 
@@ -1477,7 +2158,7 @@ class MixedLM(base.LikelihoodModel):
             # Part 1 of the log likelihood (for both ML and REML)
             ld = _smw_logdet(1., ex_r, ex2_r, cov_re_inv, 1 / vc_var,
                              cov_aug_logdet)
-            likeval -= ld / 2.
+            ldsum += ld
 
             # Part 2 of the log likelihood (for both ML and REML)
             u = solver(resid)
@@ -1488,21 +2169,7 @@ class MixedLM(base.LikelihoodModel):
                 mat = solver(exog)
                 xvx += np.dot(exog.T, mat)
 
-        if self.reml:
-            likeval -= (self.n_totobs - self.k_fe) * np.log(qf) / 2.
-            _, ld = np.linalg.slogdet(xvx)
-            likeval -= ld / 2.
-            likeval -= (self.n_totobs - self.k_fe) * np.log(2 * np.pi) / 2.
-            likeval += ((self.n_totobs - self.k_fe) *
-                        np.log(self.n_totobs - self.k_fe) / 2.)
-            likeval -= (self.n_totobs - self.k_fe) / 2.
-        else:
-            likeval -= self.n_totobs * np.log(qf) / 2.
-            likeval -= self.n_totobs * np.log(2 * np.pi) / 2.
-            likeval += self.n_totobs * np.log(self.n_totobs) / 2.
-            likeval -= self.n_totobs / 2.
-
-        return likeval
+        return ldsum, qf, xvx
 
     def _gen_dV_dPar(self, ex_r, solver, group_ix, max_ix=None):
         """
@@ -1641,6 +2308,48 @@ class MixedLM(base.LikelihoodModel):
         if calc_fe and (self.fe_pen is not None):
             score_fe -= self.fe_pen.deriv(fe_params)
 
+        if self.use_sparse:
+            (dlv, rvavr, xtax, xtvix, rvir,
+             xtvir) = self._sparse_re.score_terms(fe_params, cov_re, vcomp,
+                                                  self.reml)
+        else:
+            (dlv, rvavr, xtax, xtvix, rvir, xtvir) = self._sum_groups(
+                self._score_full_groups, fe_params, cov_re_inv, vcomp,
+                calc_fe)
+
+        # Contribution of log|V| to the covariance parameter gradient.
+        if self.k_re > 0:
+            score_re -= 0.5 * dlv[0:self.k_re2]
+        if self.k_vc > 0:
+            score_vc -= 0.5 * dlv[self.k_re2:]
+
+        fac = self.n_totobs
+        if self.reml:
+            fac -= self.k_fe
+
+        if calc_fe and self.k_fe > 0:
+            score_fe += fac * xtvir / rvir
+
+        if self.k_re > 0:
+            score_re += 0.5 * fac * rvavr[0:self.k_re2] / rvir
+        if self.k_vc > 0:
+            score_vc += 0.5 * fac * rvavr[self.k_re2:] / rvir
+
+        if self.reml:
+            xtvixi = np.linalg.inv(xtvix)
+            for j in range(self.k_re2):
+                score_re[j] += 0.5 * _dotsum(xtvixi.T, xtax[j])
+            for j in range(self.k_vc):
+                score_vc[j] += 0.5 * _dotsum(xtvixi.T, xtax[self.k_re2 + j])
+
+        return score_fe, score_re, score_vc
+
+    def _score_full_groups(self, group_ixs, fe_params, cov_re_inv, vcomp,
+                           calc_fe):
+        """
+        Contributions of the groups in `group_ixs` to `score_full`.
+        """
+
         # resid' V^{-1} resid, summed over the groups (a scalar)
         rvir = 0.
 
@@ -1654,15 +2363,16 @@ class MixedLM(base.LikelihoodModel):
 
         # V^{-1} exog' dV/dQ_jj exog V^{-1}, where Q_jj is the jj^th
         # covariance parameter.
-        xtax = [0., ] * (self.k_re2 + self.k_vc)
+        xtax = np.zeros((self.k_re2 + self.k_vc, self.k_fe, self.k_fe))
 
         # Temporary related to the gradient of log |V|
         dlv = np.zeros(self.k_re2 + self.k_vc)
+        dlvsum = np.zeros(self.k_re2 + self.k_vc)
 
         # resid' V^{-1} dV/dQ_jj V^{-1} resid (a scalar)
         rvavr = np.zeros(self.k_re2 + self.k_vc)
 
-        for group_ix, group in enumerate(self.group_labels):
+        for group_ix in group_ixs:
 
             vc_var = self._expand_vcomp(vcomp, group_ix)
 
@@ -1705,36 +2415,14 @@ class MixedLM(base.LikelihoodModel):
 
             # Contribution of log|V| to the covariance parameter
             # gradient.
-            if self.k_re > 0:
-                score_re -= 0.5 * dlv[0:self.k_re2]
-            if self.k_vc > 0:
-                score_vc -= 0.5 * dlv[self.k_re2:]
+            dlvsum += dlv
 
             rvir += np.dot(resid, vir)
 
             if calc_fe:
                 xtvir += np.dot(exog.T, vir)
 
-        fac = self.n_totobs
-        if self.reml:
-            fac -= self.k_fe
-
-        if calc_fe and self.k_fe > 0:
-            score_fe += fac * xtvir / rvir
-
-        if self.k_re > 0:
-            score_re += 0.5 * fac * rvavr[0:self.k_re2] / rvir
-        if self.k_vc > 0:
-            score_vc += 0.5 * fac * rvavr[self.k_re2:] / rvir
-
-        if self.reml:
-            xtvixi = np.linalg.inv(xtvix)
-            for j in range(self.k_re2):
-                score_re[j] += 0.5 * _dotsum(xtvixi.T, xtax[j])
-            for j in range(self.k_vc):
-                score_vc[j] += 0.5 * _dotsum(xtvixi.T, xtax[self.k_re2 + j])
-
-        return score_fe, score_re, score_vc
+        return dlvsum, rvavr, xtax, xtvix, rvir, xtvir
 
     def score_sqrt(self, params, calc_fe=True):
         """
@@ -1811,28 +2499,65 @@ class MixedLM(base.LikelihoodModel):
         fe_params = params.fe_params
         vcomp = params.vcomp
         cov_re = params.cov_re
-        if self.k_re > 0:
-            cov_re_inv = np.linalg.inv(cov_re)
-        else:
-            cov_re_inv = np.empty((0, 0))
-
-        # Blocks for the fixed and random effects parameters.
-        hess_fe = 0.
-        hess_re = np.zeros((self.k_re2 + self.k_vc, self.k_re2 + self.k_vc))
-        hess_fere = np.zeros((self.k_re2 + self.k_vc, self.k_fe))
 
         fac = self.n_totobs
         if self.reml:
             fac -= self.exog.shape[1]
 
+        # Blocks for the fixed and random effects parameters.
+        if self.use_sparse:
+            (xtvix, rvir, hess_fere, hess_re, xtax, B, D,
+             F) = self._sparse_re.hessian_terms(fe_params, cov_re, vcomp,
+                                                self.reml)
+        else:
+            if self.k_re > 0:
+                cov_re_inv = np.linalg.inv(cov_re)
+            else:
+                cov_re_inv = np.empty((0, 0))
+            (xtvix, rvir, hess_fere, hess_re, xtax, B, D,
+             F) = self._sum_groups(self._hessian_groups, fe_params,
+                                   cov_re_inv, vcomp)
+
+        hess_fe = -fac * xtvix / rvir
+        hess_re = hess_re - 0.5 * fac * (D/rvir - np.outer(B, B) / rvir**2)
+        hess_fere = -fac * hess_fere / rvir
+
+        if self.reml:
+            QL = [np.linalg.solve(xtvix, x) for x in xtax]
+            for j1 in range(self.k_re2 + self.k_vc):
+                for j2 in range(j1 + 1):
+                    a = _dotsum(QL[j1].T, QL[j2])
+                    a -= np.trace(np.linalg.solve(xtvix, F[j1][j2]))
+                    a *= 0.5
+                    hess_re[j1, j2] += a
+                    if j1 > j2:
+                        hess_re[j2, j1] += a
+
+        # Put the blocks together to get the Hessian.
+        m = self.k_fe + self.k_re2 + self.k_vc
+        hess = np.zeros((m, m))
+        hess[0:self.k_fe, 0:self.k_fe] = hess_fe
+        hess[0:self.k_fe, self.k_fe:] = hess_fere.T
+        hess[self.k_fe:, 0:self.k_fe] = hess_fere
+        hess[self.k_fe:, self.k_fe:] = hess_re
+
+        return hess
+
+    def _hessian_groups(self, group_ixs, fe_params, cov_re_inv, vcomp):
+        """
+        Contributions of the groups in `group_ixs` to `hessian`.
+        """
+
+        m = self.k_re2 + self.k_vc
+        hess_re = np.zeros((m, m))
+        hess_fere = np.zeros((m, self.k_fe))
         rvir = 0.
         xtvix = 0.
-        xtax = [0., ] * (self.k_re2 + self.k_vc)
-        m = self.k_re2 + self.k_vc
+        xtax = np.zeros((m, self.k_fe, self.k_fe))
         B = np.zeros(m)
         D = np.zeros((m, m))
-        F = [[0.] * m for k in range(m)]
-        for group_ix, group in enumerate(self.group_labels):
+        F = np.zeros((m, m, self.k_fe, self.k_fe))
+        for group_ix in group_ixs:
 
             vc_var = self._expand_vcomp(vcomp, group_ix)
 
@@ -1917,30 +2642,7 @@ class MixedLM(base.LikelihoodModel):
                             um = np.dot(u1, u2)
                             F[jj1][jj2] += um + um.T
 
-        hess_fe -= fac * xtvix / rvir
-        hess_re = hess_re - 0.5 * fac * (D/rvir - np.outer(B, B) / rvir**2)
-        hess_fere = -fac * hess_fere / rvir
-
-        if self.reml:
-            QL = [np.linalg.solve(xtvix, x) for x in xtax]
-            for j1 in range(self.k_re2 + self.k_vc):
-                for j2 in range(j1 + 1):
-                    a = _dotsum(QL[j1].T, QL[j2])
-                    a -= np.trace(np.linalg.solve(xtvix, F[j1][j2]))
-                    a *= 0.5
-                    hess_re[j1, j2] += a
-                    if j1 > j2:
-                        hess_re[j2, j1] += a
-
-        # Put the blocks together to get the Hessian.
-        m = self.k_fe + self.k_re2 + self.k_vc
-        hess = np.zeros((m, m))
-        hess[0:self.k_fe, 0:self.k_fe] = hess_fe
-        hess[0:self.k_fe, self.k_fe:] = hess_fere.T
-        hess[self.k_fe:, 0:self.k_fe] = hess_fere
-        hess[self.k_fe:, self.k_fe:] = hess_re
-
-        return hess
+        return xtvix, rvir, hess_fere, hess_re, xtax, B, D, F
 
     def get_scale(self, fe_params, cov_re, vcomp):
         """
@@ -1962,6 +2664,12 @@ class MixedLM(base.LikelihoodModel):
             The estimated error variance.
         """
 
+        if self.use_sparse:
+            qf = self._sparse_re.loglike_terms(cov_re, vcomp, fe_params)[1]
+            if self.reml:
+                return qf / (self.n_totobs - self.k_fe)
+            return qf / self.n_totobs
+
         try:
             cov_re_inv = np.linalg.inv(cov_re)
         except np.linalg.LinAlgError:
@@ -2333,6 +3041,11 @@ class MixedLMResults(base.LikelihoodModelResults, base.ResultMixin):
         fixed effects and the predicted random effects.
         """
         fit = np.dot(self.model.exog, self.fe_params)
+        if self.model.use_sparse:
+            sre = self.model._sparse_re
+            fit[sre.row_order] += sre.z.dot(self._sparse_blup)
+            return fit
+
         re = self.random_effects
         for group_ix, group in enumerate(self.model.group_labels):
             ix = self.model.row_indices[group]
@@ -2395,6 +3108,15 @@ class MixedLMResults(base.LikelihoodModelResults, base.ResultMixin):
 
         return names
 
+    @cache_readonly
+    def _sparse_blup(self):
+        """
+        The conditional means of the random effects of all groups
+        """
+        return self.model._sparse_re.blup(self.cov_re_unscaled,
+                                          self.vcomp / self.scale,
+                                          self.fe_params)
+
     @cache_readonly
     def random_effects(self):
         """
@@ -2407,6 +3129,16 @@ class MixedLMResults(base.LikelihoodModelResults, base.ResultMixin):
             conditional means of the random effects for the group
             given the data.
         """
+        if self.model.use_sparse:
+            offsets = self.model._sparse_re.col_offsets
+            u = self._sparse_blup
+            ranef_dict = {}
+            for group_ix, group in enumerate(self.model.group_labels):
+                ranef_dict[group] = pd.Series(
+                    u[offsets[group_ix]:offsets[group_ix + 1]],
+                    index=self._expand_re_names(group_ix))
+            return ranef_dict
+
         try:
             cov_re_inv = np.linalg.inv(self.cov_re)
         except np.linalg.LinAlgError:
@@ -2458,6 +3190,18 @@ class MixedLMResults(base.LikelihoodModelResults, base.ResultMixin):
             random effects given the data.
         """
 
+        if self.model.use_sparse:
+            sre = self.model._sparse_re
+            offsets = sre.col_offsets
+            ranef_dict = {}
+            for group_ix, group in enumerate(self.model.group_labels):
+                cols = np.arange(offsets[group_ix], offsets[group_ix + 1])
+                v = self.scale * sre.cond_cov(self.cov_re_unscaled,
+                                              self.vcomp / self.scale, cols)
+                na = self._expand_re_names(group_ix)
+                ranef_dict[group] = pd.DataFrame(v, index=na, columns=na)
+            return ranef_dict
+
         try:
             cov_re_inv = np.linalg.inv(self.cov_re)
         except np.linalg.LinAlgError:
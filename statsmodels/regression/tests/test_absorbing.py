@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_allclose, assert_equal
+
+from statsmodels.regression.absorbing import AbsorbingLS
+from statsmodels.regression.linear_model import OLS, WLS
+from statsmodels.tools.grouputils import Group, absorbed_df, demean_groups
+from statsmodels.tools.sm_exceptions import (CollinearityWarning,
+                                             MissingDataError)
+from statsmodels.tools.tools import add_constant
+
+
+def gen_data(nobs=500, seed=0):
+    rs = np.random.RandomState(seed)
+    firm = rs.randint(0, 40, size=nobs)
+    year = rs.randint(0, 8, size=nobs)
+    x = rs.standard_normal((nobs, 2)) + 0.1 * firm[:, None]
+    y = (x.dot([1., -0.5]) + 0.05 * firm + np.sin(year) +
+         rs.standard_normal(nobs))
+    weights = rs.uniform(0.5, 2, size=nobs)
+    return y, x, firm, year, weights
+
+
+def dummies(*groups):
+    return np.column_stack([pd.get_dummies(g).values[:, 1:] for g in groups])
+
+
+@pytest.mark.parametrize('weighted', [False, True])
+@pytest.mark.parametrize('n_factors', [1, 2])
+def test_absorbing_ls(weighted, n_factors):
+    y, x, firm, year, weights = gen_data()
+    factors = [firm, year][:n_factors]
+    exog = add_constant(x)
+    if weighted:
+        mod = AbsorbingLS(y, exog, absorb=factors, weights=weights,
+                          demean_tol=1e-12)
+        mod_d = WLS(y, np.column_stack((exog, dummies(*factors))),
+                    weights=weights)
+    else:
+        mod = AbsorbingLS(y, exog, absorb=factors, demean_tol=1e-12)
+        mod_d = OLS(y, np.column_stack((exog, dummies(*factors))))
+    for cov_type, cov_kwds in [('nonrobust', None), ('HC1', None),
+                               ('cluster', {'groups': firm})]:
+        res = mod.fit(cov_type=cov_type, cov_kwds=cov_kwds)
+        res_d = mod_d.fit(cov_type=cov_type, cov_kwds=cov_kwds)
+        assert_allclose(res.params[1:], res_d.params[1:3], rtol=1e-8)
+        if cov_type == 'cluster':
+            # small sample correction only counts the parameters of exog
+            k, k_d = 3, res_d.params.shape[0]
+            nobs = res.nobs
+            ratio = (nobs - k_d) / (nobs - k)
+            assert_allclose(res.bse[1:], res_d.bse[1:3] * np.sqrt(ratio),
+                            rtol=1e-6)
+        else:
+            assert_allclose(res.bse[1:], res_d.bse[1:3], rtol=1e-6)
+
+    assert_equal(res.df_resid, res_d.df_resid)
+    assert_equal(res.df_model, 2)
+    assert_allclose(res.ssr, res_d.ssr, rtol=1e-8)
+    assert_allclose(res.scale, res_d.scale, rtol=1e-8)
+    assert_allclose(res.rsquared, res_d.rsquared, rtol=1e-8)
+    assert_allclose(res.rsquared_adj, res_d.rsquared_adj, rtol=1e-8)
+    assert_allclose(res.resid, res_d.resid, atol=1e-8)
+    assert_allclose(res.fittedvalues, res_d.fittedvalues, rtol=1e-8)
+    assert_allclose(res.absorbed_effects,
+                    res.fittedvalues - exog.dot(res.params), atol=1e-10)
+    assert 0 < res.rsquared_within < res.rsquared
+
+    # within regression without constant
+    mod_nc = AbsorbingLS(y, x, absorb=factors,
+                         weights=weights if weighted else 1.,
+                         demean_tol=1e-12)
+    res_nc = mod_nc.fit()
+    assert_allclose(res_nc.params, res.params[1:], rtol=1e-8)
+    assert_allclose(res_nc.bse, mod.fit().bse[1:], rtol=1e-8)
+    assert_equal(res_nc.df_resid, res.df_resid)
+    assert_allclose(res_nc.resid, res.resid, atol=1e-8)
+    assert_allclose(res_nc.rsquared_within, res.rsquared_within, rtol=1e-8)
+
+
+def test_absorbing_ls_pandas_missing():
+    y, x, firm, year, _ = gen_data()
+    data = pd.DataFrame({'y': y, 'x0': x[:, 0], 'x1': x[:, 1],
+                         'firm': ['f%d' % i for i in firm], 'year': year})
+    data.loc[[3, 10], 'year'] = np.nan
+    data.loc[5, 'y'] = np.nan
+    mod = AbsorbingLS(data['y'], add_constant(data[['x0', 'x1']]),
+                      absorb=data[['firm', 'year']], missing='drop')
+    res = mod.fit()
+    assert_equal(res.nobs, len(data) - 3)
+    assert_equal(list(res.params.index), ['const', 'x0', 'x1'])
+    assert isinstance(res.absorbed_effects, pd.Series)
+
+    sub = data.dropna()
+    res2 = AbsorbingLS(sub['y'].values, add_constant(sub[['x0', 'x1']].values),
+                       absorb=[sub['firm'].values, sub['year'].values]).fit()
+    assert_allclose(res.params.values, res2.params)
+    assert_allclose(res.bse.values, res2.bse)
+
+
+def test_absorbing_ls_missing_none():
+    y, x, firm, year, _ = gen_data()
+    year = year.astype(float)
+    year[3] = np.nan
+    with pytest.raises(MissingDataError, match='absorb contains missing'):
+        AbsorbingLS(y, x, absorb=[firm, year])
+    with pytest.raises(MissingDataError):
+        AbsorbingLS(y, x, absorb=[firm, year], missing='raise')
+
+
+def test_absorbed_exog():
+    y, x, firm, year, _ = gen_data()
+    exog = add_constant(np.column_stack((x, firm % 3)))
+    with pytest.warns(CollinearityWarning):
+        mod = AbsorbingLS(y, exog, absorb=[firm, year])
+    assert_equal(mod.absorbed_exog, [False, False, False, True])
+    res = mod.fit()
+    res_ref = AbsorbingLS(y, exog[:, :3], absorb=[firm, year]).fit()
+    assert_equal(res.params[3], 0)
+    assert_allclose(res.params[:3], res_ref.params)
+    assert_allclose(res.bse[:3], res_ref.bse)
+    assert_equal(res.df_resid, res_ref.df_resid)
+
+
+def test_demean_groups():
+    y, x, firm, year, weights = gen_data()
+    groups = [Group(firm), Group(year)]
+    data = np.column_stack((y, x))
+    dmy = dummies(firm, year)
+    for w in [None, weights]:
+        xd, n_iter = demean_groups(data, groups, weights=w, tol=1e-12)
+        assert n_iter > 1
+        w_ = np.ones_like(y) if w is None else w
+        d = add_constant(dmy)
+        ref = WLS(data, d, weights=w_).fit().resid
+        assert_allclose(xd, ref, atol=1e-8)
+        # starting point shifted by group effects
+        xd2 = demean_groups(data + dmy[:, [3]] - 2 * dmy[:, [42]], groups,
+                            weights=w, tol=1e-12)[0]
+        assert_allclose(xd2, ref, atol=1e-8)
+        xd1 = demean_groups(y, groups, weights=w, tol=1e-12)[0]
+        assert_allclose(xd1, ref[:, 0], atol=1e-8)
+
+    # single set of groups is exact
+    xd, n_iter = demean_groups(data, groups[:1])
+    assert_equal(n_iter, 1)
+    assert_allclose(xd, data - groups[0].group_demean(data)[1][firm])
+    assert_allclose(np.bincount(firm, weights=xd[:, 0]), 0, atol=1e-10)
+
+
+def test_absorbed_df():
+    g1 = np.repeat(np.arange(6), 5)
+    g2 = np.tile(np.arange(5), 6)
+    groups = [Group(g1), Group(g2)]
+    assert_equal(absorbed_df(groups), 6 + 5 - 1)
+    # two disconnected blocks: levels 0-2 of g1 only see levels 0-1 of g2
+    g2 = np.where(g1 < 3, g2 % 2, 2 + g2 % 3)
+    groups = [Group(g1), Group(g2)]
+    rank = np.linalg.matrix_rank(dummies(g1, g2).astype(float)) + 1
+    assert_equal(absorbed_df(groups), rank)
+    assert_equal(absorbed_df(groups), 6 + 5 - 2)
@@ -0,0 +1,182 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_allclose, assert_equal
+
+from statsmodels.regression.incremental import IncrementalOLS, IncrementalWLS
+from statsmodels.regression.linear_model import OLS, WLS
+from statsmodels.tools.tools import add_constant
+
+
+def gen_data(nobs=1000, nvar=3, const=True, pandas=False):
+    rs = np.random.RandomState(1234567)
+    x = rs.standard_normal((nobs, nvar))
+    cols = ['x{0}'.format(i) for i in range(nvar)]
+    if const:
+        x = add_constant(x)
+        cols = ['const'] + cols
+    y = x.sum(1) + rs.standard_normal(nobs) * (1 + np.abs(x[:, -1]))
+    w = rs.chisquare(5, nobs) / 5
+    if pandas:
+        x = pd.DataFrame(x, columns=cols)
+        y = pd.Series(y, name='y')
+        w = pd.Series(w, name='weights')
+    return y, x, w
+
+
+def chunked(*arrays, size=137):
+    nobs = len(arrays[0])
+    for i in range(0, nobs, size):
+        yield tuple(arr[i:i + size] for arr in arrays)
+
+
+attributes = ['params', 'bse', 'tvalues', 'pvalues', 'rsquared',
+              'rsquared_adj', 'llf', 'aic', 'bic', 'fvalue', 'f_pvalue',
+              'ssr', 'ess', 'centered_tss', 'uncentered_tss', 'scale',
+              'df_model', 'df_resid', 'nobs', 'condition_number']
+
+
+@pytest.mark.parametrize('method', ['qr', 'pinv'])
+@pytest.mark.parametrize('const', [True, False])
+def test_ols(method, const):
+    y, x, _ = gen_data(const=const)
+    mod = IncrementalOLS(method=method)
+    for endog, exog in chunked(y, x):
+        mod.update(endog, exog)
+    res = mod.fit()
+    ref = OLS(y, x).fit()
+    assert_equal(res.k_constant, ref.k_constant)
+    for attr in attributes:
+        assert_allclose(getattr(res, attr), getattr(ref, attr), rtol=1e-9,
+                        err_msg=attr)
+    assert_allclose(res.conf_int(), ref.conf_int(), rtol=1e-9)
+
+
+@pytest.mark.parametrize('method', ['qr', 'pinv'])
+@pytest.mark.parametrize('cov_type', ['HC0', 'HC1', 'HC2', 'HC3'])
+def test_wls_robust(method, cov_type):
+    y, x, w = gen_data()
+    mod = IncrementalWLS(method=method)
+    for chunk in chunked(y, x, w):
+        mod.update(*chunk)
+    res = mod.fit(cov_type=cov_type, resid_chunks=chunked(y, x, w))
+    ref = WLS(y, x, weights=w).fit(cov_type=cov_type)
+    assert_equal(res.cov_type, cov_type)
+    for attr in attributes:
+        assert_allclose(getattr(res, attr), getattr(ref, attr), rtol=1e-9,
+                        err_msg=attr)
+    assert_allclose(res.cov_params(), ref.cov_params(), rtol=1e-9)
+    assert_allclose(res._resid_diagnostics(), ref._resid_diagnostics(),
+                    rtol=1e-8)
+
+
+@pytest.mark.parametrize('method', ['qr', 'pinv'])
+def test_rank_deficient(method):
+    y, x, _ = gen_data()
+    x = np.column_stack((x, x[:, 1] + x[:, 2]))
+    mod = IncrementalOLS(method=method)
+    for endog, exog in chunked(y, x):
+        mod.update(endog, exog)
+    res = mod.fit()
+    ref = OLS(y, x).fit()
+    assert_equal(res.df_model, 3)
+    for attr in ['params', 'bse', 'llf', 'scale', 'df_model', 'df_resid']:
+        assert_allclose(getattr(res, attr), getattr(ref, attr), rtol=1e-8,
+                        err_msg=attr)
+
+
+def test_qr_ssr():
+    # the sum of squared residuals of the qr method does not suffer from
+    # the cancellation in y'y - 2 b'X'y + b'X'Xb
+    rs = np.random.RandomState(0)
+    x = add_constant(rs.standard_normal(1000))
+    y = 1e6 + x[:, 1] + 1e-3 * rs.standard_normal(1000)
+    mod = IncrementalOLS(method='qr')
+    for chunk in chunked(y, x):
+        mod.update(*chunk)
+    res = mod.fit()
+    ref = OLS(y, x).fit(method='qr')
+    assert_allclose(res.ssr, ref.ssr, rtol=1e-6)
+    assert_allclose(res.bse, ref.bse, rtol=1e-6)
+    assert_allclose(res.llf, ref.llf, rtol=1e-7)
+    assert_allclose(res.condition_number, ref.condition_number, rtol=1e-9)
+    # fit does not change the accumulator
+    assert not hasattr(mod, 'wexog_singular_values')
+
+
+def test_merge_and_pickle():
+    y, x, w = gen_data()
+    parts = []
+    for chunk in chunked(y, x, w, size=250):
+        part = IncrementalWLS().update(*chunk)
+        parts.append(pickle.loads(pickle.dumps(part)))
+    mod = IncrementalWLS()
+    for part in parts:
+        mod.merge(part)
+    res = mod.fit()
+
+    res_parts = []
+    for chunk in chunked(y, x, w, size=250):
+        res_part = pickle.loads(pickle.dumps(res))
+        res_part.update_resid(*chunk)
+        res_parts.append(res_part)
+    for res_part in res_parts:
+        res.merge_resid(res_part)
+
+    ref = WLS(y, x, weights=w).fit()
+    assert_allclose(res.params, ref.params, rtol=1e-9)
+    assert_allclose(res.bse, ref.bse, rtol=1e-9)
+    assert_allclose(res.HC1_se, ref.HC1_se, rtol=1e-9)
+    assert_allclose(res._resid_diagnostics(), ref._resid_diagnostics(),
+                    rtol=1e-8)
+
+
+def test_pandas_summary():
+    y, x, _ = gen_data(pandas=True)
+    mod = IncrementalOLS()
+    for chunk in chunked(y, x):
+        mod.update(*chunk)
+    res = mod.fit(resid_chunks=chunked(y, x))
+    ref = OLS(y, x).fit()
+    assert isinstance(res.params, pd.Series)
+    assert_equal(list(res.params.index), list(ref.params.index))
+    assert_equal(mod.endog_names, 'y')
+    assert_equal(mod.data.const_idx, 0)
+    smry = res.summary().as_text()
+    assert 'IncrementalOLS Regression Results' in smry
+    assert 'Durbin-Watson' in smry
+
+    pred = res.get_prediction(x.iloc[:5]).summary_frame()
+    ref_pred = ref.get_prediction(x.iloc[:5]).summary_frame()
+    assert_allclose(pred, ref_pred, rtol=1e-9)
+
+
+def test_errors():
+    y, x, w = gen_data()
+    mod = IncrementalOLS()
+    with pytest.raises(ValueError, match='update must be called'):
+        mod.fit()
+    with pytest.raises(ValueError, match='weights are not supported'):
+        mod.update(y, x, w)
+    mod.update(y[:500], x[:500])
+    with pytest.raises(ValueError, match='exog must have'):
+        mod.update(y, x[:, :2])
+    res = mod.fit()
+    with pytest.raises(ValueError, match='update_resid'):
+        res.cov_HC0
+    with pytest.raises(ValueError, match='resid is not available'):
+        res.resid
+    with pytest.raises(ValueError, match='same method'):
+        mod.merge(IncrementalOLS(method='pinv').update(y, x))
+    with pytest.raises(ValueError, match='same hasconst'):
+        mod.merge(IncrementalOLS(hasconst=True).update(y, x))
+    # merging into an empty accumulator keeps its options
+    empty = IncrementalOLS(method='pinv')
+    with pytest.raises(ValueError, match='same method'):
+        empty.merge(mod)
+    empty = IncrementalOLS().merge(mod)
+    assert_equal(empty.nobs, mod.nobs)
+    assert empty._r is not mod._r
+    assert_allclose(empty.fit().params, res.params)
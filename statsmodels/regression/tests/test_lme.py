@@ -387,6 +387,141 @@ class TestMixedLM(object):
         assert_allclose(result.params, result2.params)
         assert_allclose(result.bse, result2.bse)
 
+    @pytest.mark.parametrize("reml", [False, True])
+    def test_sparse_crossed(self, reml):
+        # Crossed random effects as variance components of a single
+        # group, sparse and dense evaluation.
+        np.random.seed(3423)
+        n = 300
+        a = np.random.randint(0, 30, n)
+        b = np.random.randint(0, 20, n)
+        x = np.random.normal(size=n)
+        y = (x + np.random.normal(size=30)[a] +
+             0.5 * np.random.normal(size=20)[b] + np.random.normal(size=n))
+        df = pd.DataFrame({"y": y, "x": x, "a": a, "b": b,
+                           "g": np.ones(n)})
+        vcf = {"a": "0 + C(a)", "b": "0 + C(b)"}
+
+        model1 = MixedLM.from_formula("y ~ x", groups="g", vc_formula=vcf,
+                                      data=df)
+        model2 = MixedLM.from_formula("y ~ x", groups="g", vc_formula=vcf,
+                                      use_sparse=True, data=df)
+        assert_(sparse.issparse(model2.exog_vc.mats[0][0]))
+        assert_equal(model1.exog_vc.colnames, model2.exog_vc.colnames)
+
+        result1 = model1.fit(reml=reml)
+        result2 = model2.fit(reml=reml)
+        assert_allclose(result2.params, result1.params, rtol=1e-10)
+        assert_allclose(result2.bse, result1.bse, rtol=1e-10)
+        assert_allclose(result2.llf, result1.llf, rtol=1e-12)
+        assert_allclose(result2.fittedvalues, result1.fittedvalues,
+                        rtol=1e-10)
+        assert_allclose(result2.random_effects[1.],
+                        result1.random_effects[1.], rtol=1e-10)
+        assert_allclose(result2.random_effects_cov[1.].iloc[0:5, 0:5],
+                        result1.random_effects_cov[1.].iloc[0:5, 0:5],
+                        rtol=1e-10)
+
+        params = np.r_[0.8, 0.3]
+        assert_allclose(model2.loglike(params), model1.loglike(params),
+                        rtol=1e-10)
+        assert_allclose(model2.score(params), model1.score(params),
+                        rtol=1e-10)
+        params = MixedLMParams.from_components(
+            fe_params=np.r_[0.5, 1.], cov_re=np.zeros((0, 0)),
+            vcomp=np.r_[0.8, 0.3])
+        assert_allclose(model2.score(params.copy(), profile_fe=False),
+                        model1.score(params.copy(), profile_fe=False),
+                        rtol=1e-10)
+        assert_allclose(model2.hessian(params), model1.hessian(params),
+                        rtol=1e-10)
+        # A variance component close to zero, its blocks of W are
+        # computed from the columns of W
+        params = MixedLMParams.from_components(
+            fe_params=np.r_[0.5, 1.], cov_re=np.zeros((0, 0)),
+            vcomp=np.r_[0.8, 1e-8])
+        assert_allclose(model2.score(params.copy(), profile_fe=False),
+                        model1.score(params.copy(), profile_fe=False),
+                        rtol=1e-8)
+        assert_allclose(model2.hessian(params), model1.hessian(params),
+                        rtol=1e-8)
+
+    def test_sparse_slopes(self):
+        # Correlated random intercepts and slopes with a nested
+        # variance component.
+        np.random.seed(8234)
+        n_groups, n_per = 50, 8
+        n = n_groups * n_per
+        groups = np.kron(np.arange(n_groups), np.ones(n_per))
+        x = np.random.normal(size=n)
+        sub = np.random.randint(0, 3, n)
+        gi = groups.astype(int)
+        re = np.random.normal(size=(n_groups, 2))
+        y = (re[gi, 0] + (1 + re[gi, 1]) * x +
+             np.random.normal(size=3 * n_groups)[3 * gi + sub] +
+             np.random.normal(size=n))
+        df = pd.DataFrame({"y": y, "x": x, "sub": sub, "groups": groups})
+        vcf = {"sub": "0 + C(sub)"}
+
+        model1 = MixedLM.from_formula("y ~ x", groups="groups",
+                                      re_formula="1 + x", vc_formula=vcf,
+                                      data=df)
+        model2 = MixedLM.from_formula("y ~ x", groups="groups",
+                                      re_formula="1 + x", vc_formula=vcf,
+                                      use_sparse=True, data=df)
+        result1 = model1.fit()
+        result2 = model2.fit()
+        assert_allclose(result2.params, result1.params, rtol=1e-10)
+        assert_allclose(result2.bse, result1.bse, rtol=1e-10)
+
+        params = MixedLMParams.from_components(
+            fe_params=np.r_[0.2, 1.], cov_re=np.r_[[[1., 0.2], [0.2, 0.5]]],
+            vcomp=np.r_[0.7])
+        assert_allclose(model2.loglike(params, profile_fe=False),
+                        model1.loglike(params, profile_fe=False),
+                        rtol=1e-10)
+        hess1 = model1.hessian(params)
+        hess2 = model2.hessian(params)
+        assert_allclose(hess2, hess1, rtol=1e-10)
+        assert_allclose(model2.score_full(params, True)[1],
+                        model1.score_full(params, True)[1], rtol=1e-10)
+
+    @pytest.mark.parametrize("reml", [False, True])
+    def test_n_jobs(self, reml):
+        from concurrent.futures import ThreadPoolExecutor
+
+        np.random.seed(3425)
+        n_groups = 40
+        sizes = np.random.randint(2, 12, n_groups)
+        groups = np.repeat(np.arange(n_groups), sizes)
+        n = len(groups)
+        exog = np.column_stack((np.ones(n), np.random.normal(size=(n, 2))))
+        exog_re = exog[:, 0:2]
+        re = np.random.normal(size=(n_groups, 2))
+        endog = (exog.sum(1) + (re[groups] * exog_re).sum(1) +
+                 np.random.normal(size=n))
+
+        model1 = MixedLM(endog, exog, groups, exog_re=exog_re)
+        result1 = model1.fit(reml=reml)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            for kwds in [{"n_jobs": 3}, {"n_jobs": 5, "executor": executor}]:
+                model2 = MixedLM(endog, exog, groups, exog_re=exog_re,
+                                 **kwds)
+                chunks = model2._group_chunks()
+                assert_equal(len(chunks), kwds["n_jobs"])
+                assert_equal(np.concatenate(chunks), np.arange(n_groups))
+                result2 = model2.fit(reml=reml)
+                assert_allclose(result2.params, result1.params, rtol=1e-8)
+                assert_allclose(result2.bse, result1.bse, rtol=1e-8)
+                assert_allclose(result2.llf, result1.llf, rtol=1e-10)
+
+                params = result1.params_object
+                assert_allclose(model2.hessian(params),
+                                model1.hessian(params), rtol=1e-10)
+                score1 = model1.score(params.copy(), profile_fe=False)
+                score2 = model2.score(params.copy(), profile_fe=False)
+                assert_allclose(score2, score1, rtol=1e-8, atol=1e-10)
+
     def test_dietox(self):
         # dietox data from geepack using random intercepts
         #
@@ -3,6 +3,7 @@ Test functions for models.regression
 """
 # TODO: Test for LM
 from statsmodels.compat.python import lrange
+import pickle
 import warnings
 import pandas
 import numpy as np
@@ -1075,6 +1076,74 @@ class TestRegularizedFit(object):
                 mod.fit_regularized(L1_wt=L1_wt, alpha=lam,
                                     profile_scale=True)
 
+    def test_regularized_path(self):
+
+        import os
+        from .results import glmnet_r_results
+
+        cur_dir = os.path.dirname(os.path.abspath(__file__))
+        data = np.loadtxt(os.path.join(cur_dir, "results", "lasso_data.csv"),
+                          delimiter=",")
+
+        tests = [x for x in dir(glmnet_r_results) if x.startswith("rslt_")]
+        vecs = [getattr(glmnet_r_results, test) for test in tests]
+        # paths for the largest data set
+        n, p = max((vec[0], vec[1]) for vec in vecs)
+        endog = data[0:int(n), 0]
+        exog = data[0:int(n), 1:(int(p)+1)]
+        endog = endog - endog.mean()
+        endog /= endog.std(ddof=1)
+        exog = exog - exog.mean(0)
+        exog /= exog.std(0, ddof=1)
+        mod = OLS(endog, exog)
+
+        for L1_wt in set(float(vec[2]) for vec in vecs
+                         if vec[0] == n and vec[1] == p):
+            vecs_wt = [vec for vec in vecs if vec[0] == n and vec[1] == p
+                       and float(vec[2]) == L1_wt]
+            alphas = [float(vec[3]) for vec in vecs_wt]
+            path = mod.fit_regularized_path(alphas=alphas, L1_wt=L1_wt)
+            assert_equal(path.params.shape, (len(alphas), p))
+            assert np.all(np.diff(path.alphas) <= 0)
+            for vec in vecs_wt:
+                params = vec[4:].astype(np.float64)
+                assert_almost_equal(path.get_params(float(vec[3])), params,
+                                    decimal=3)
+
+    def test_regularized_path_screening(self):
+
+        np.random.seed(5234)
+        n, p = 200, 20
+        exog = np.random.normal(size=(n, p))
+        endog = exog[:, :4].sum(1) + np.random.normal(size=n)
+        mod = OLS(endog, exog)
+
+        path = mod.fit_regularized_path(n_alphas=10)
+        path0 = mod.fit_regularized_path(alphas=path.alphas, screening=False)
+        assert_allclose(path.params, path0.params, atol=1e-8)
+        assert_allclose(path.deviance, path0.deviance, rtol=1e-8)
+        # no variables are selected at the largest alpha
+        assert_equal(path.df[0], 0)
+        assert_equal(path.df, np.count_nonzero(path.params, axis=1))
+        assert np.all(np.diff(path.deviance) <= 1e-8)
+        resid = endog - exog.dot(path.params[3])
+        assert_allclose(path.deviance[3], np.dot(resid, resid))
+
+        # each point on the path solves the optimization problem
+        for i in [2, 5]:
+            alpha = path.alphas[i]
+            rslt = mod.fit_regularized(alpha=alpha,
+                                       start_params=path.params[i])
+            assert_allclose(rslt.params, path.params[i], atol=1e-6)
+
+        path = mod.fit_regularized_path(alphas=path.alphas, cv=4)
+        assert_equal(path.cv_deviance.shape, (4, 10))
+        assert path.alpha_1se >= path.alpha_min
+        frame = path.summary_frame()
+        assert_equal(list(frame.columns[:5]),
+                     ["alpha", "df", "deviance", "cv_mean", "cv_se"])
+        assert_allclose(frame["x1"], path.params[:, 0])
+
     def test_regularized_weights(self):
 
         np.random.seed(1432)
@@ -1351,3 +1420,138 @@ def test_bool_regressor(reset_randomstate):
     bool_res = OLS(endog, exog).fit()
     res = OLS(endog, exog.astype(np.double)).fit()
     assert_allclose(bool_res.params, res.params)
+
+
+@pytest.mark.parametrize("method", ["pinv", "qr"])
+@pytest.mark.parametrize("cov_type", ["nonrobust", "HC1", "HC3"])
+def test_store_minimal(reset_randomstate, method, cov_type):
+    exog = add_constant(np.random.standard_normal((500, 3)))
+    endog = exog.sum(1) + np.random.standard_normal(500) * (1 + exog[:, 1]**2)
+    weights = np.random.chisquare(5, 500)
+    for model, kwds in [(OLS, {}), (WLS, {"weights": weights})]:
+        res = model(endog, exog, **kwds).fit(method=method,
+                                             cov_type=cov_type)
+        mod_min = model(endog, exog, **kwds)
+        res_min = mod_min.fit(method=method, cov_type=cov_type,
+                              store="minimal")
+        assert not hasattr(mod_min, "pinv_wexog")
+        assert not hasattr(mod_min, "exog_Q")
+        for attr in ["params", "bse", "rsquared", "llf", "fvalue",
+                     "condition_number", "HC0_se", "HC2_se"]:
+            assert_allclose(getattr(res_min, attr), getattr(res, attr),
+                            rtol=1e-10, err_msg=attr)
+        assert_allclose(res_min.resid, res.resid, rtol=1e-10)
+        res_min.summary()
+        cache = res_min._results._cache
+        for attr in ["resid", "wresid", "fittedvalues"]:
+            assert attr not in cache
+        assert not hasattr(res_min._results, "het_scale")
+
+
+def test_store_minimal_rank_deficient():
+    exog = add_constant(np.random.RandomState(0).standard_normal((100, 3)))
+    exog = np.column_stack((exog, exog[:, 1] + exog[:, 2]))
+    endog = exog.sum(1) + np.random.RandomState(1).standard_normal(100)
+    res = OLS(endog, exog).fit()
+    res_min = OLS(endog, exog).fit(store="minimal")
+    assert_equal(res_min.model.rank, res.model.rank)
+    assert_allclose(res_min.params, res.params, rtol=1e-10)
+    assert_allclose(res_min.bse, res.bse, rtol=1e-10)
+    with pytest.raises(ValueError, match="store must be one of"):
+        OLS(endog, exog).fit(store="none")
+
+
+@pytest.mark.parametrize("method", ["pinv", "lsqr"])
+def test_sparse_exog(reset_randomstate, method):
+    from scipy import sparse
+    nobs = 300
+    groups = np.random.randint(0, 10, size=nobs)
+    dummies = sparse.csr_matrix((np.ones(nobs), (np.arange(nobs), groups)))
+    exog = sparse.hstack([dummies, np.random.standard_normal((nobs, 2))],
+                         format="csr")
+    exog_dense = exog.toarray()
+    endog = exog_dense.dot(np.arange(12.)) + np.random.standard_normal(nobs)
+    weights = np.random.chisquare(5, nobs)
+    for model, kwds in [(OLS, {}), (WLS, {"weights": weights})]:
+        res = model(endog, exog, **kwds).fit(method=method, cov_type="HC2")
+        res_dense = model(endog, exog_dense, **kwds).fit(cov_type="HC2")
+        assert sparse.issparse(res.model.wexog)
+        assert_equal(res.model.k_constant, 1)
+        assert_equal(res.df_model, res_dense.df_model)
+        assert_allclose(res.params, res_dense.params, rtol=1e-8)
+        assert_allclose(res.bse, res_dense.bse, rtol=1e-8)
+        for attr in ["llf", "rsquared", "fvalue", "condition_number"]:
+            assert_allclose(getattr(res, attr), getattr(res_dense, attr),
+                            rtol=1e-8, err_msg=attr)
+        assert_allclose(res.predict(exog[:5]), res_dense.fittedvalues[:5],
+                        rtol=1e-8)
+        res.summary()
+
+    with pytest.raises(ValueError, match="sparse"):
+        OLS(endog, exog).fit(method="qr")
+
+
+@pytest.mark.parametrize("method", ["pinv", "lsqr"])
+def test_sparse_exog_rank_deficient(reset_randomstate, method):
+    from scipy import sparse
+    nobs = 200
+    groups = np.random.randint(0, 5, size=nobs)
+    dummies = sparse.csr_matrix((np.ones(nobs), (np.arange(nobs), groups)))
+    x = np.random.standard_normal((nobs, 1))
+    # the constant is the sum of the dummies
+    exog = sparse.hstack([np.ones((nobs, 1)), dummies, x], format="csr")
+    exog_dense = exog.toarray()
+    endog = x[:, 0] + groups + np.random.standard_normal(nobs)
+    res = OLS(endog, exog).fit(method=method)
+    res_dense = OLS(endog, exog_dense).fit()
+    assert_equal(res.model.rank, 6)
+    assert_equal(res.df_model, res_dense.df_model)
+    assert_allclose(res.params, res_dense.params, rtol=1e-7, atol=1e-10)
+    assert_allclose(res.bse, res_dense.bse, rtol=1e-7)
+
+
+def test_sparse_exog_lazy_cov(reset_randomstate):
+    from scipy import sparse
+    from scipy.sparse.linalg import LinearOperator
+    nobs = 300
+    groups = np.random.randint(0, 20, size=nobs)
+    # level 20 is empty, its column is zero
+    dummies = sparse.csr_matrix((np.ones(nobs), (np.arange(nobs), groups)),
+                                shape=(nobs, 21))
+    x = np.random.standard_normal((nobs, 2))
+    exog = sparse.hstack([np.ones((nobs, 1)), dummies, x], format="csr")
+    exog_dense = exog.toarray()
+    endog = x[:, 0] + groups / 10 + np.random.standard_normal(nobs)
+    res = OLS(endog, exog).fit()
+    res_dense = OLS(endog, exog_dense).fit()
+    ncp = res.normalized_cov_params
+    assert isinstance(ncp, LinearOperator)
+    assert_equal(res.model.rank, 22)
+    assert_equal(np.nonzero(ncp.dropped)[0].size, 2)
+    assert_allclose(ncp.toarray(), res_dense.normalized_cov_params,
+                    rtol=1e-8, atol=1e-12)
+    assert_allclose(ncp.diagonal(), np.diag(res_dense.normalized_cov_params),
+                    rtol=1e-8, atol=1e-12)
+    assert_allclose(res.params, res_dense.params, rtol=1e-8, atol=1e-12)
+    assert_allclose(res.bse, res_dense.bse, rtol=1e-8, atol=1e-12)
+    assert_allclose(res.cov_params(), res_dense.cov_params(), rtol=1e-8,
+                    atol=1e-12)
+    assert_allclose(res.cov_params(column=[2, 23]),
+                    res_dense.cov_params(column=[2, 23]), rtol=1e-8)
+    assert_allclose(res.cov_params(column=23),
+                    res_dense.cov_params(column=23), rtol=1e-8)
+    r_matrix = np.zeros((2, 24))
+    r_matrix[0, 1:3] = [1, -1]
+    r_matrix[1, 22:] = 1
+    tt = res.t_test(r_matrix)
+    tt_dense = res_dense.t_test(r_matrix)
+    assert_allclose(tt.sd, tt_dense.sd, rtol=1e-8)
+    assert_allclose(res.f_test(r_matrix).fvalue,
+                    res_dense.f_test(r_matrix).fvalue, rtol=1e-8)
+    # the factorization of the model is reused by fit
+    model = OLS(endog, exog)
+    assert_equal(model.df_model, res_dense.df_model)
+    assert model.fit().normalized_cov_params is model._xpx_inv
+
+    res_pickled = pickle.loads(pickle.dumps(res))
+    assert_allclose(res_pickled.bse, res.bse)
@@ -3,7 +3,7 @@ from numpy.testing import assert_allclose
 import pytest
 
 from statsmodels.regression.linear_model import WLS
-from statsmodels.regression._tools import _MinimalWLS
+from statsmodels.regression._tools import _CholeskyWLS, _MinimalWLS
 
 
 class TestMinimalWLS(object):
@@ -60,3 +60,61 @@ class TestMinimalWLS(object):
             weights[-1] = bad_value
             _MinimalWLS(self.endog1, self.exog1, weights,
                         check_endog=True, check_weights=True).fit()
+
+
+class TestCholeskyWLS(object):
+    @classmethod
+    def setup_class(cls):
+        rs = np.random.RandomState(1234)
+        cls.exog1 = rs.randn(200, 5)
+        cls.endog1 = cls.exog1.sum(1) + rs.randn(200)
+        cls.weights1 = 1.0 + np.sin(np.arange(200.0) / 100.0 * np.pi)
+        cls.exog2 = rs.randn(50, 1)
+        cls.endog2 = 0.3 * cls.exog2.ravel() + rs.randn(50)
+        cls.weights2 = 1.0 + np.log(np.arange(1.0, 51.0))
+
+    def test_equivalence_with_wls(self):
+        solver = _CholeskyWLS(self.exog1)
+        for weights in [self.weights1, np.ones(200)]:
+            res = WLS(self.endog1, self.exog1, weights=weights).fit()
+            chol = solver.fit(self.endog1, weights)
+            assert chol.method == 'cholesky'
+            assert_allclose(chol.params, res.params, rtol=1e-10)
+
+        res = WLS(self.endog2, self.exog2, weights=self.weights2).fit()
+        chol = _CholeskyWLS(self.exog2).fit(self.endog2, self.weights2)
+        assert_allclose(chol.params, res.params, rtol=1e-10)
+
+    def test_qr_fallback(self):
+        # exactly collinear columns and a badly scaled column
+        exog = np.column_stack((self.exog1, self.exog1[:, :2].sum(1)))
+        chol = _CholeskyWLS(exog).fit(self.endog1, self.weights1)
+        assert chol.method == 'qr'
+        res = WLS(self.endog1, exog, weights=self.weights1).fit()
+        assert_allclose(exog.dot(chol.params), res.fittedvalues, rtol=1e-10)
+
+        exog = self.exog1 * np.array([1, 1, 1, 1, 1e-7])
+        chol = _CholeskyWLS(exog).fit(self.endog1, self.weights1)
+        assert chol.method == 'qr'
+        res = WLS(self.endog1, exog, weights=self.weights1).fit()
+        assert_allclose(chol.params, res.params, rtol=1e-8)
+
+    @pytest.mark.parametrize('bad_value', [np.nan, np.inf, -1.])
+    def test_inf_nan(self, bad_value):
+        solver = _CholeskyWLS(self.exog1)
+        if np.isfinite(bad_value):
+            endog = self.endog1
+        else:
+            endog = self.endog1.copy()
+            endog[0] = bad_value
+            with pytest.raises(ValueError, match='detected in endog'):
+                solver.fit(endog, self.weights1, check_endog=True)
+        weights = self.weights1.copy()
+        weights[-1] = bad_value
+        with pytest.raises(ValueError, match='detected in weights'):
+            solver.fit(self.endog1, weights, check_weights=True)
+
+    def test_sparse(self):
+        from scipy import sparse
+        with pytest.raises(ValueError, match='sparse'):
+            _CholeskyWLS(sparse.csr_matrix(self.exog1))
@@ -16,7 +16,7 @@ from statsmodels.graphics._regressionplots_doc import _plot_influence_doc
 from statsmodels.regression.linear_model import OLS
 from statsmodels.stats.multitest import multipletests
 from statsmodels.tools.decorators import cache_readonly
-from statsmodels.tools.tools import maybe_unwrap_results
+from statsmodels.tools.tools import _row_chunks, maybe_unwrap_results
 
 
 # outliers test convenience wrapper
@@ -194,6 +194,40 @@ def variance_inflation_factor(exog, exog_idx):
     return vif
 
 
+def _pinv_factor(exog, chunksize=None):
+    """
+    Factor F with ``F F' = pinv(exog' exog)`` from a thin QR of exog
+
+    The triangular factor R of the QR decomposition is updated one block of
+    rows at a time, so that Q and no other nobs x nobs or nobs x k_vars
+    intermediate array is formed. Since ``exog = Q R``,
+    ``pinv(exog' exog) = pinv(R) pinv(R)'`` and ``pinv(exog) = F F' exog'``.
+    """
+    nobs, k_vars = exog.shape
+    r = np.zeros((0, k_vars))
+    for sl in _row_chunks(nobs, k_vars, chunksize):
+        r = np.linalg.qr(np.vstack((r, exog[sl])), mode='r')
+    return np.linalg.pinv(r)
+
+
+def _hat_matrix_diag(exog, factor, exog_right=None, chunksize=None):
+    """
+    Diagonal of ``exog pinv(exog' exog) exog_right'`` computed by blocks
+
+    `factor` is the output of `_pinv_factor`, `exog_right` defaults to
+    `exog`.
+    """
+    nobs, k_vars = exog.shape
+    hii = np.empty(nobs)
+    for sl in _row_chunks(nobs, k_vars, chunksize):
+        xf = exog[sl].dot(factor)
+        if exog_right is None:
+            hii[sl] = (xf ** 2).sum(1)
+        else:
+            hii[sl] = (xf * exog_right[sl].dot(factor)).sum(1)
+    return hii
+
+
 class _BaseInfluenceMixin(object):
     """common methods between OLSInfluence and MLE/GLMInfluence
     """
@@ -313,9 +347,9 @@ class MLEInfluence(_BaseInfluenceMixin):
     other arguments are only to override default behavior and are used instead
     of the corresponding attribute of the results class.
     By default resid_pearson is used as resid.
-
-
-
+    chunksize : int, optional
+        The number of observations that are processed at a time in the
+        computations that are done by blocks.
 
     Attributes
     ----------
@@ -359,7 +393,8 @@ class MLEInfluence(_BaseInfluenceMixin):
     """
 
     def __init__(self, results, resid=None, endog=None, exog=None,
-                 hat_matrix_diag=None, cov_params=None, scale=None):
+                 hat_matrix_diag=None, cov_params=None, scale=None,
+                 chunksize=None):
         # I'm not calling super for now, OLS attributes might not be available
         # check which model is allowed
         self.results = results = maybe_unwrap_results(results)
@@ -372,6 +407,7 @@ class MLEInfluence(_BaseInfluenceMixin):
         self.cov_params = (cov_params if cov_params is not None
                            else results.cov_params())
         self.model_class = results.model.__class__
+        self.chunksize = chunksize
 
         self.hessian = self.results.model.hessian(self.results.params)
         self.score_obs = self.results.model.score_obs(self.results.params)
@@ -549,20 +585,24 @@ class OLSInfluence(_BaseInfluenceMixin):
     ----------
     results : RegressionResults
         currently assumes the results are from an OLS regression
+    chunksize : int, optional
+        The number of observations that are processed at a time. The
+        default depends on the number of explanatory variables.
 
     Notes
     -----
     One part of the results can be calculated without any auxiliary regression
     (some of which have the `_internal` postfix in the name. Other statistics
-    require leave-one-observation-out (LOOO) auxiliary regression, and will be
-    slower (mainly results with `_external` postfix in the name).
-    The auxiliary LOOO regression only the required results are stored.
+    are based on the leave-one-observation-out (LOOO) regressions (mainly
+    results with `_external` postfix in the name).
 
-    Using the LOO measures is currently only recommended if the data set
-    is not too large. One possible approach for LOOO measures would be to
-    identify possible problem observations with the _internal measures, and
-    then run the leave-one-observation-out only with observations that are
-    possible outliers. (However, this is not yet available in an automated way.)
+    The LOOO parameters, error variances and determinants of the covariance
+    of the parameters are computed with the deletion formulas from the
+    residuals and the diagonal of the hat matrix, without reestimating the
+    model. The hat matrix diagonal is computed from the triangular factor of
+    a thin QR decomposition of ``wexog`` that is updated one block of
+    observations at a time, so that no temporary array grows with the
+    number of observations beyond the returned influence measures.
 
     This should be extended to general least squares.
 
@@ -570,7 +610,7 @@ class OLSInfluence(_BaseInfluenceMixin):
     used.
     """
 
-    def __init__(self, results):
+    def __init__(self, results, chunksize=None):
         # check which model is allowed
         self.results = maybe_unwrap_results(results)
         self.nobs, self.k_vars = results.model.exog.shape
@@ -581,10 +621,16 @@ class OLSInfluence(_BaseInfluenceMixin):
 
         # self.sigma_est = np.sqrt(results.mse_resid)
         self.scale = results.mse_resid
+        self.chunksize = chunksize
 
         self.aux_regression_exog = {}
         self.aux_regression_endog = {}
 
+    @cache_readonly
+    def _pinv_factor(self):
+        """Factor of pinv(wexog' wexog) from the thin QR of wexog"""
+        return _pinv_factor(self.results.model.wexog, self.chunksize)
+
     @cache_readonly
     def hat_matrix_diag(self):
         """Diagonal of the hat_matrix for OLS
@@ -593,7 +639,9 @@ class OLSInfluence(_BaseInfluenceMixin):
         -----
         temporarily calculated here, this should go to model class
         """
-        return (self.exog * self.results.model.pinv_wexog.T).sum(1)
+        return _hat_matrix_diag(self.exog, self._pinv_factor,
+                                exog_right=self.results.model.wexog,
+                                chunksize=self.chunksize)
 
     @cache_readonly
     def resid_press(self):
@@ -927,33 +975,39 @@ class OLSInfluence(_BaseInfluenceMixin):
 
     @cache_readonly
     def _res_looo(self):
-        """collect required results from the LOOO loop
+        """collect required results of the LOOO regressions
 
-        all results will be attached.
-        currently only 'params', 'mse_resid', 'det_cov_params' are stored
+        currently only 'params', 'mse_resid', 'det_cov_params' are computed
 
-        regresses endog on exog dropping one observation at a time
+        This uses the deletion formulas for the regression of endog on exog
+        dropping one observation at a time, with ``e`` the whitened
+        residuals and ``h`` the diagonal of the hat matrix of wexog ::
 
-        this uses a nobs loop, only attributes of the OLS instance are stored.
-        """
-        from statsmodels.sandbox.tools.cross_val import LeaveOneOut
+            params - params_i = pinv(X'X) x_i e_i / (1 - h_i)
+            mse_resid_i = (ssr - e_i**2 / (1 - h_i)) / (df_resid - 1)
+            det_cov_params_i = mse_resid_i**k det(pinv(X'X)) / (1 - h_i)
 
-        def get_det_cov_params(res):
-            return np.linalg.det(res.cov_params())
-
-        endog = self.results.model.endog
-        exog = self.results.model.exog
-
-        params = np.zeros(exog.shape, dtype=np.float)
-        mse_resid = np.zeros(endog.shape, dtype=np.float)
-        det_cov_params = np.zeros(endog.shape, dtype=np.float)
-
-        cv_iter = LeaveOneOut(self.nobs)
-        for inidx, outidx in cv_iter:
-            res_i = self.model_class(endog[inidx], exog[inidx]).fit()
-            params[outidx] = res_i.params
-            mse_resid[outidx] = res_i.mse_resid
-            det_cov_params[outidx] = get_det_cov_params(res_i)
+        The computations are done by blocks of observations.
+        """
+        results = self.results
+        model = results.model
+        wexog = model.wexog
+        wresid = results.wresid
+        factor = self._pinv_factor
+        nobs, k_vars = wexog.shape
+
+        hii = _hat_matrix_diag(wexog, factor, chunksize=self.chunksize)
+        resid_press = wresid / (1 - hii)
+        df_resid = results.df_resid - 1
+        mse_resid = (results.ssr - wresid * resid_press) / df_resid
+        det_cov = np.linalg.det(results.normalized_cov_params)
+        det_cov_params = mse_resid ** k_vars * det_cov / (1 - hii)
+
+        params = np.empty((nobs, k_vars))
+        for sl in _row_chunks(nobs, k_vars, self.chunksize):
+            dparams = wexog[sl].dot(factor).dot(factor.T)
+            dparams *= resid_press[sl, None]
+            params[sl] = results.params - dparams
 
         return dict(params=params, mse_resid=mse_resid,
                     det_cov_params=det_cov_params)
@@ -1196,7 +1250,7 @@ class GLMInfluence(MLEInfluence):
         if hasattr(self, '_hat_matrix_diag'):
             return self._hat_matrix_diag
         else:
-            return self.results.get_hat_matrix()
+            return self.results.get_hat_matrix_diag(chunksize=self.chunksize)
 
     @cache_readonly
     def d_params(self):
@@ -1207,10 +1261,16 @@ class GLMInfluence(MLEInfluence):
         This uses one-step approximation of the parameter change to deleting
         one observation.
         """
-
-        beta_i = np.linalg.pinv(self.exog) * self.resid_studentized
-        beta_i /= np.sqrt(1 - self.hat_matrix_diag)
-        return beta_i.T
+        exog = self.exog
+        factor = _pinv_factor(exog, self.chunksize)
+        resid_factor = self.resid_studentized
+        resid_factor = resid_factor / np.sqrt(1 - self.hat_matrix_diag)
+        beta_i = np.empty(exog.shape)
+        # rows of pinv(exog).T, computed by blocks
+        for sl in _row_chunks(exog.shape[0], exog.shape[1], self.chunksize):
+            beta_i[sl] = exog[sl].dot(factor).dot(factor.T)
+            beta_i[sl] *= resid_factor[sl, None]
+        return beta_i
 
     # same computation as OLS
     @cache_readonly
@@ -13,11 +13,11 @@ import pandas as pd
 
 import pytest
 
-from statsmodels.regression.linear_model import OLS
+from statsmodels.regression.linear_model import OLS, WLS
 from statsmodels.genmod.generalized_linear_model import GLM
 from statsmodels.genmod import families
 
-from statsmodels.stats.outliers_influence import MLEInfluence
+from statsmodels.stats.outliers_influence import MLEInfluence, OLSInfluence
 
 cur_dir = os.path.abspath(os.path.dirname(__file__))
 
@@ -246,3 +246,52 @@ class TestInfluenceGaussianGLMOLS(InfluenceCompareExact):
         cols = ['cooks_d', 'standard_resid', 'hat_diag', 'dffits_internal']
         assert_allclose(df0[cols].values, df1[cols].values, rtol=1e-5)
         pdt.assert_index_equal(df0.index, df1.index)
+
+
+@pytest.mark.parametrize('weighted', [False, True])
+def test_looo_deletion_formulas(weighted):
+    # deletion formulas agree with reestimating without each observation
+    np.random.seed(987125)
+    nobs = 50
+    exog = np.column_stack((np.ones(nobs), np.random.randn(nobs, 2)))
+    endog = exog.sum(1) + np.random.standard_t(3, size=nobs)
+    weights = np.random.uniform(0.5, 2, size=nobs) if weighted else 1.
+    res = WLS(endog, exog, weights=weights).fit()
+    infl = OLSInfluence(res, chunksize=7)
+
+    weights = np.broadcast_to(weights, endog.shape)
+    params = np.empty(exog.shape)
+    mse_resid = np.empty(nobs)
+    det_cov_params = np.empty(nobs)
+    for i in range(nobs):
+        mask = np.arange(nobs) != i
+        res_i = WLS(endog[mask], exog[mask], weights=weights[mask]).fit()
+        params[i] = res_i.params
+        mse_resid[i] = res_i.mse_resid
+        det_cov_params[i] = np.linalg.det(res_i.cov_params())
+
+    assert_allclose(infl.params_not_obsi, params, rtol=1e-10)
+    assert_allclose(infl.sigma2_not_obsi, mse_resid, rtol=1e-10)
+    assert_allclose(infl.det_cov_params_not_obsi, det_cov_params, rtol=1e-10)
+    hat = (exog * np.linalg.pinv(res.model.wexog).T).sum(1)
+    assert_allclose(infl.hat_matrix_diag, hat, rtol=1e-10)
+
+
+def test_hat_matrix_diag_chunked():
+    # rank deficient exog
+    np.random.seed(987125)
+    nobs = 100
+    exog = np.random.randn(nobs, 3)
+    exog = np.column_stack((exog, exog[:, 0] + exog[:, 1]))
+    endog = np.random.poisson(np.exp(0.2 * exog[:, 0]))
+    res = GLM(endog, exog, family=families.Poisson()).fit()
+
+    wexog = np.sqrt(res.model.hessian_factor(res.params))[:, None] * exog
+    hat = (wexog * np.linalg.pinv(wexog).T).sum(1)
+    assert_allclose(res.get_hat_matrix_diag(chunksize=9), hat, rtol=1e-10)
+    assert_allclose(hat.sum(), 3, rtol=1e-10)
+
+    infl = res.get_influence(chunksize=9)
+    d_params = np.linalg.pinv(wexog).T * (infl.resid_studentized /
+                                          np.sqrt(1 - hat))[:, None]
+    assert_allclose(infl.d_params, d_params, rtol=1e-8, atol=1e-12)
@@ -3,8 +3,8 @@ from statsmodels.compat.pandas import cache_readonly as PandasCacheReadonly
 
 import warnings
 
-__all__ = ['cache_readonly', 'cache_writable', 'deprecated_alias',
-           'ResettableCache']
+__all__ = ['cache_readonly', 'cache_writable', 'cached_obs_data',
+           'deprecated_alias', 'ResettableCache']
 
 
 class ResettableCache(dict):
@@ -150,6 +150,41 @@ cached_data = PandasCacheReadonly
 cached_value = PandasCacheReadonly
 
 
+class cached_obs_data(object):
+    """
+    Cache an attribute with one value per observation
+
+    Behaves like ``cache_readonly`` unless the instance has
+    ``_store_minimal`` set, in which case the value is recomputed on every
+    access and never stored. This keeps results created with
+    ``store="minimal"`` free of arrays that grow with the number of
+    observations. ``remove_data`` treats these attributes like
+    ``cached_data``.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+        self.__name__ = func.__name__
+
+    def __get__(self, obj, typ=None):
+        if obj is None:
+            return self
+        cache = getattr(obj, '_cache', None)
+        if cache is None:
+            cache = obj._cache = {}
+        name = self.__name__
+        if name in cache:
+            return cache[name]
+        val = self.func(obj)
+        if not getattr(obj, '_store_minimal', False):
+            cache[name] = val
+        return val
+
+    def __set__(self, obj, value):
+        raise AttributeError("Can't set attribute")
+
+
 def nottest(fn):
     fn.__test__ = False
     return fn
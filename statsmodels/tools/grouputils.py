@@ -28,10 +28,13 @@ Not all methods and options have been tried out yet after refactoring
 need more efficient loop if groups are sorted -> see GroupSorted.group_iter
 """
 from statsmodels.compat.python import lrange, lzip
+import warnings
+
 import numpy as np
 import pandas as pd
 
 import statsmodels.tools.data as data_util
+from statsmodels.tools.sm_exceptions import ConvergenceWarning
 from pandas import Index, MultiIndex
 
 
@@ -77,6 +80,54 @@ def combine_indices(groups, prefix='', sep='.', return_labels=False):
         return uni_inv, uni_idx, uni
 
 
+def factorize_rows(arrays):
+    """
+    Integer codes of the unique rows of several arrays by hashing
+
+    Parameters
+    ----------
+    arrays : array_like or tuple of array_like
+        A 1d or 2d array, or a tuple of 1d and 2d arrays with the same
+        number of rows. The rows are compared across all columns of all
+        arrays, which are not stacked.
+
+    Returns
+    -------
+    codes : ndarray
+        Array of shape (nobs,) with the index of the unique row of each
+        observation. The unique rows are numbered in the order of their
+        first appearance.
+    first : ndarray
+        The index of the first observation of each unique row, so that
+        ``x[first][codes]`` is equal to ``x`` for each of the arrays.
+
+    Notes
+    -----
+    Unlike `combine_indices`, the rows are not sorted. Each column is
+    factorized with a hash table and combined with the codes of the previous
+    columns, which are factorized again so that the combined codes stay
+    smaller than nobs**2. The cost is linear in the number of observations
+    and columns. Missing values are treated as equal to each other.
+    """
+    if not isinstance(arrays, tuple):
+        arrays = (arrays,)
+    codes = None
+    for arr in arrays:
+        arr = np.asarray(arr)
+        columns = [arr] if arr.ndim == 1 else arr.T
+        for col in columns:
+            col_codes, uniques = pd.factorize(col)
+            # missing values are coded as -1
+            col_codes[col_codes < 0] = len(uniques)
+            if codes is None:
+                codes = col_codes.astype(np.int64)
+            else:
+                codes = codes * (len(uniques) + 1) + col_codes
+                codes = pd.factorize(codes)[0]
+    first = np.flatnonzero(~pd.Series(codes).duplicated().values)
+    return codes, first
+
+
 # written for and used in try_covariance_grouploop.py
 def group_sums(x, group, use_bincount=True):
     """simple bincount version, again
@@ -180,6 +231,118 @@ def dummy_sparse(groups):
     return indi
 
 
+def demean_groups(x, groups, weights=None, tol=1e-8, maxiter=1000):
+    """
+    Partial out several sets of group effects by alternating projections
+
+    Parameters
+    ----------
+    x : array_like
+        Array of shape (nobs,) or (nobs, k).
+    groups : list of Group
+        The sets of group effects to remove.
+    weights : array_like, optional
+        Observation weights of shape (nobs,). If given, the projections are
+        orthogonal in the weighted inner product.
+    tol : float
+        Convergence tolerance. A column is converged when the norm of the
+        change in one sweep over all sets of groups is less than `tol` times
+        the norm of the column.
+    maxiter : int
+        Maximum number of sweeps.
+
+    Returns
+    -------
+    x_demeaned : ndarray
+        The residuals of `x` after projecting on the dummy variables of all
+        sets of groups, same shape as `x`.
+    n_iter : int
+        The number of sweeps.
+
+    Notes
+    -----
+    The group means of each set are removed in turn until the residuals do
+    not change anymore (method of alternating projections, see Gaure 2013).
+    This converges to the residuals of the regression on the dummy
+    variables of all groups without forming them. A single set of groups
+    needs one sweep. Columns are dropped from the iterations as soon as they
+    have converged.
+
+    Subtracting a linear combination of the dummy variables from `x` does not
+    change the limit, so that a previous solution for a similar `x` can be
+    used to provide a better starting point.
+
+    References
+    ----------
+    Gaure, S. 2013. "OLS with multiple high dimensional category variables."
+    Computational Statistics & Data Analysis 66: 8-18.
+    """
+    x = np.array(x, dtype=float)
+    is1d = x.ndim == 1
+    if is1d:
+        x = x[:, None]
+    if len(groups) == 1:
+        x = groups[0].group_demean(x, weights=weights)[0]
+        return (x[:, 0] if is1d else x), 1
+
+    norm0 = np.sqrt((x ** 2).sum(0))
+    norm0[norm0 == 0] = 1
+    active = np.arange(x.shape[1])
+    for n_iter in range(1, maxiter + 1):
+        x_old = x[:, active]
+        x_new = x_old
+        for group in groups:
+            x_new = group.group_demean(x_new, weights=weights)[0]
+        x[:, active] = x_new
+        change = np.sqrt(((x_new - x_old) ** 2).sum(0)) / norm0[active]
+        active = active[change > tol]
+        if active.size == 0:
+            break
+    else:
+        warnings.warn('demean_groups did not converge in %d iterations'
+                      % maxiter, ConvergenceWarning)
+    return (x[:, 0] if is1d else x), n_iter
+
+
+def absorbed_df(groups):
+    """
+    Number of parameters of the dummy variables of several sets of groups
+
+    Parameters
+    ----------
+    groups : list of Group
+        The sets of group effects.
+
+    Returns
+    -------
+    int
+        The rank of the matrix of dummy variables of all sets of groups.
+
+    Notes
+    -----
+    The rank is exact for up to two sets of groups, where the redundant
+    dummies are given by the number of connected components of the
+    bipartite graph of the two sets (Abowd, Creecy and Kramarz 2002). Each
+    additional set is assumed to lose one dummy variable, so that the
+    degrees of freedom are conservative if the sets are nested.
+    """
+    from scipy import sparse
+    from scipy.sparse.csgraph import connected_components
+
+    df = groups[0].n_groups
+    if len(groups) > 1:
+        n0, n1 = groups[0].n_groups, groups[1].n_groups
+        ones = np.ones(len(groups[0].group_int))
+        graph = sparse.coo_matrix(
+            (ones, (groups[0].group_int, n0 + groups[1].group_int)),
+            shape=(n0 + n1, n0 + n1))
+        n_components = connected_components(graph, directed=False)[0]
+        df += n1 - n_components
+    for group in groups[2:]:
+        df += group.n_groups - 1
+    return int(df)
+
+
 class Group(object):
 
     def __init__(self, group, name=''):
@@ -244,11 +407,46 @@ class Group(object):
     def group_sums(self, x, use_bincount=True):
         return group_sums(x, self.group_int, use_bincount=use_bincount)
 
-    def group_demean(self, x, use_bincount=True):
-        nobs = float(len(x))
-        means_g = group_sums(x / nobs, self.group_int,
-                             use_bincount=use_bincount)
-        x_demeaned = x - means_g[self.group_int]  # check reverse_index?
+    def group_demean(self, x, use_bincount=True, weights=None):
+        """
+        Subtract the group means
+
+        Parameters
+        ----------
+        x : array_like
+            Array of shape (nobs,) or (nobs, k).
+        use_bincount : bool
+            Whether to compute the group sums with ``np.bincount``.
+        weights : array_like, optional
+            Observation weights of shape (nobs,). If given, weighted group
+            means are subtracted.
+
+        Returns
+        -------
+        x_demeaned : ndarray
+            `x` with the group means subtracted, same shape as `x`.
+        means_g : ndarray
+            The group means, shape (n_groups,) or (n_groups, k). The mean
+            of a group with zero total weight is set to zero.
+        """
+        x = np.asarray(x, dtype=float)
+        x2d = x[:, None] if x.ndim == 1 else x
+        if weights is None:
+            counts = np.bincount(self.group_int).astype(float)
+        else:
+            weights = np.asarray(weights, dtype=float)
+            counts = np.bincount(self.group_int, weights=weights)
+            x2d = x2d * weights[:, None]
+        sums = group_sums(x2d, self.group_int, use_bincount=use_bincount)
+        if use_bincount:
+            sums = sums.T
+        zero = counts == 0
+        counts[zero] = 1
+        means_g = sums / counts[:, None]
+        means_g[zero] = 0
+        if x.ndim == 1:
+            means_g = means_g[:, 0]
+        x_demeaned = x - means_g[self.group_int]
         return x_demeaned, means_g
 
 
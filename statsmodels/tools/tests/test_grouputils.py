@@ -6,7 +6,8 @@ import pytest
 from scipy import sparse
 
 from statsmodels.tools.grouputils import (dummy_sparse, Grouping, Group,
-                                          combine_indices, group_sums)
+                                          combine_indices, factorize_rows,
+                                          group_sums)
 from statsmodels.tools.tools import categorical
 from statsmodels.datasets import grunfeld, anes96
 
@@ -276,6 +277,25 @@ def test_combine_indices():
     assert_equal(group_joint, group_joint_expected)
 
 
+def test_factorize_rows():
+    np.random.seed(985367)
+    x = np.random.randint(0, 3, size=(200, 3)).astype(float)
+    x[:5, 1] = np.nan
+    offset = np.random.randint(0, 2, size=200) * 0.5
+    codes, first = factorize_rows((x, offset))
+    data = np.column_stack((x, offset))
+    assert_equal(data[first][codes], data)
+    assert_equal(codes[first], np.arange(len(first)))
+    assert_equal(first, np.sort(first))
+    # same partition as sorting the rows
+    uni = combine_indices(np.nan_to_num(data, nan=-1))[2]
+    assert_equal(len(first), len(uni))
+
+    codes, first = factorize_rows(x[:, 0])
+    assert_equal(np.sort(x[first, 0]), [0, 1, 2])
+    assert_equal(x[first, 0][codes], x[:, 0])
+
+
 @pytest.mark.smoke
 def test_group_sums():
     # Moved from grouputils __main__ section
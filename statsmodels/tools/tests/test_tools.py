@@ -698,3 +698,12 @@ def test_categorical_errors(string_var):
         tools.categorical(string_var, (0, 1))
     with pytest.raises(ValueError, match='data.name does not match col'):
         tools.categorical(string_var, {'a': 1})
+
+
+def test_row_chunks():
+    chunks = tools._row_chunks(10, 3, chunksize=4)
+    assert_equal([(sl.start, sl.stop) for sl in chunks],
+                 [(0, 4), (4, 8), (8, 12)])
+    assert_equal(len(tools._row_chunks(2**21 + 1, 2)), 2)
+    assert_equal(len(tools._row_chunks(5, 0)), 1)
+    assert_equal(tools._row_chunks(0, 3), [])
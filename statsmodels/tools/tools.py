@@ -570,6 +570,34 @@ def maybe_unwrap_results(results):
     return getattr(results, '_results', results)
 
 
+def _row_chunks(nobs, size, chunksize=None):
+    """
+    Slices that split `nobs` rows into consecutive blocks
+
+    Parameters
+    ----------
+    nobs : int
+        The number of rows.
+    size : int
+        The number of elements per row of the temporary arrays that are
+        formed for each block.
+    chunksize : int, optional
+        The number of rows in each block. The default limits the temporary
+        arrays to about 2**22 elements (32 MiB of float64), which keeps the
+        memory use bounded independently of `nobs` while the blocks are
+        still large enough that the Python overhead per block is negligible.
+
+    Returns
+    -------
+    list of slice
+        The row slices of the blocks.
+    """
+    if chunksize is None:
+        chunksize = max(2**22 // max(size, 1), 1)
+    return [slice(start, start + chunksize)
+            for start in range(0, nobs, chunksize)]
+
+
 class Bunch(dict):
     """
     Returns a dict-like object with keys accessible via attribute lookup.
@@ -0,0 +1,169 @@
+#cython: boundscheck=False
+#cython: wraparound=False
+#cython: cdivision=True
+"""
+State Space Model - Batched Kalman filter
+
+Loglikelihood evaluation for a batch of state space models that share the
+same dimensions, with a univariate observation equation and time-invariant
+system matrices other than the intercepts. The batch is the leading axis of
+all arrays.
+
+License: Simplified-BSD
+"""
+
+cimport numpy as np
+cimport cython
+import numpy as np
+
+from libc.math cimport log, isnan, NAN
+
+np.import_array()
+
+cdef double LOG_2PI = log(2 * np.pi)
+
+
+def batch_loglikeobs(double[:, ::1] endog, double[:, ::1] design,
+                     double[:, ::1] obs_intercept, double[::1] obs_cov,
+                     double[:, :, ::1] transition,
+                     double[:, :, ::1] state_intercept,
+                     double[:, :, ::1] selected_state_cov,
+                     double[:, ::1] initial_state,
+                     double[:, :, ::1] initial_state_cov):
+    """
+    batch_loglikeobs(endog, design, obs_intercept, obs_cov, transition,
+                     state_intercept, selected_state_cov, initial_state,
+                     initial_state_cov)
+
+    Loglikelihood of each observation for a batch of univariate models
+
+    Parameters
+    ----------
+    endog : ndarray
+        Observations, shaped (n_batch, nobs). Missing values are NaN.
+    design : ndarray
+        Design vectors, shaped (n_batch, k_states).
+    obs_intercept : ndarray
+        Observation intercepts, shaped (n_batch, nobs).
+    obs_cov : ndarray
+        Observation disturbance variances, shaped (n_batch,).
+    transition : ndarray
+        Transition matrices, shaped (n_batch, k_states, k_states).
+    state_intercept : ndarray
+        State intercepts, shaped (n_batch, nobs, k_states).
+    selected_state_cov : ndarray
+        The matrices :math:`R Q R'`, shaped (n_batch, k_states, k_states).
+    initial_state : ndarray
+        Initial state means, shaped (n_batch, k_states).
+    initial_state_cov : ndarray
+        Initial state covariance matrices, shaped
+        (n_batch, k_states, k_states).
+
+    Returns
+    -------
+    llf_obs : ndarray
+        The loglikelihood of each observation, shaped (n_batch, nobs).
+        Missing observations contribute zero. If the forecast error
+        variance is not positive, the loglikelihood is NaN.
+    """
+    cdef:
+        int n_batch = endog.shape[0]
+        int nobs = endog.shape[1]
+        int k_states = design.shape[1]
+        int b, t, i, j, l, n, nnz
+        double y, v, F, s
+        np.ndarray[np.float64_t, ndim=2] llf_obs
+        double[::1] a, a_tmp, K, nz_val
+        double[:, ::1] P, P_tmp, TP
+        int[::1] nz_row, nz_col
+
+    llf_obs = np.zeros((n_batch, nobs))
+    a = np.zeros(k_states)
+    a_tmp = np.zeros(k_states)
+    K = np.zeros(k_states)
+    P = np.zeros((k_states, k_states))
+    TP = np.zeros((k_states, k_states))
+    P_tmp = np.zeros((k_states, k_states))
+    # nonzero elements of the transition matrix
+    nz_row = np.zeros(k_states * k_states, dtype=np.intc)
+    nz_col = np.zeros(k_states * k_states, dtype=np.intc)
+    nz_val = np.zeros(k_states * k_states)
+
+    for b in range(n_batch):
+        nnz = 0
+        for i in range(k_states):
+            for j in range(k_states):
+                if transition[b, i, j] != 0:
+                    nz_row[nnz] = i
+                    nz_col[nnz] = j
+                    nz_val[nnz] = transition[b, i, j]
+                    nnz = nnz + 1
+
+        for i in range(k_states):
+            a[i] = initial_state[b, i]
+            for j in range(k_states):
+                P[i, j] = initial_state_cov[b, i, j]
+
+        for t in range(nobs):
+            y = endog[b, t]
+
+            # Updating step
+            if not isnan(y):
+                # K = P Z'
+                for i in range(k_states):
+                    s = 0
+                    for j in range(k_states):
+                        s = s + P[i, j] * design[b, j]
+                    K[i] = s
+                F = obs_cov[b]
+                v = y - obs_intercept[b, t]
+                for i in range(k_states):
+                    F = F + design[b, i] * K[i]
+                    v = v - design[b, i] * a[i]
+
+                if not F > 0:
+                    llf_obs[b, t] = NAN
+                    break
+                llf_obs[b, t] = -0.5 * (LOG_2PI + log(F) + v * v / F)
+
+                for i in range(k_states):
+                    a[i] = a[i] + K[i] * v / F
+                    for j in range(k_states):
+                        P[i, j] = P[i, j] - K[i] * K[j] / F
+
+            # Prediction step
+            # a = T a + c
+            for i in range(k_states):
+                a_tmp[i] = state_intercept[b, t, i]
+            for n in range(nnz):
+                a_tmp[nz_row[n]] = (a_tmp[nz_row[n]] +
+                                    nz_val[n] * a[nz_col[n]])
+            for i in range(k_states):
+                a[i] = a_tmp[i]
+
+            # P = T P T' + R Q R', using only the nonzero elements of the
+            # transition matrix (companion matrices are sparse)
+            for i in range(k_states):
+                for j in range(k_states):
+                    TP[i, j] = 0
+                    P_tmp[i, j] = selected_state_cov[b, i, j]
+            for n in range(nnz):
+                i = nz_row[n]
+                l = nz_col[n]
+                s = nz_val[n]
+                for j in range(k_states):
+                    TP[i, j] = TP[i, j] + s * P[l, j]
+            for n in range(nnz):
+                j = nz_row[n]
+                l = nz_col[n]
+                s = nz_val[n]
+                for i in range(k_states):
+                    P_tmp[i, j] = P_tmp[i, j] + TP[i, l] * s
+            for i in range(k_states):
+                P[i, i] = P_tmp[i, i]
+                for j in range(i + 1, k_states):
+                    s = 0.5 * (P_tmp[i, j] + P_tmp[j, i])
+                    P[i, j] = s
+                    P[j, i] = s
+
+    return llf_obs
@@ -0,0 +1,347 @@
+#cython: boundscheck=False
+#cython: wraparound=False
+#cython: cdivision=True
+"""
+State Space Model - Analytic score
+
+Kalman filter that, along with the loglikelihood, propagates the partial
+derivatives of the predicted state and its covariance matrix with respect to
+each parameter, given the partial derivatives of the system matrices. The
+observation vector is processed one element at a time (univariate
+treatment), so the observation disturbance covariance matrix must be
+diagonal.
+
+Time-varying system matrices have the time index as their leading axis,
+which has length 1 for time-invariant matrices. Partial derivatives have an
+additional leading axis for the parameters.
+
+License: Simplified-BSD
+"""
+
+cimport numpy as np
+cimport cython
+import numpy as np
+
+from libc.math cimport log, isnan
+
+np.import_array()
+
+
+cdef int _nonzero(double[:, :] X, int[:] row, int[:] col,
+                  double[:] val) nogil:
+    # Collect the nonzero elements of a square matrix
+    cdef int i, j, nnz = 0
+    for i in range(X.shape[0]):
+        for j in range(X.shape[1]):
+            if X[i, j] != 0:
+                row[nnz] = i
+                col[nnz] = j
+                val[nnz] = X[i, j]
+                nnz = nnz + 1
+    return nnz
+
+
+def kalman_score(double[:, ::1] endog, double[:, :, ::1] design,
+                 double[:, ::1] obs_intercept, double[:, ::1] obs_cov,
+                 double[:, :, ::1] transition, double[:, ::1] state_intercept,
+                 double[:, :, ::1] selected_state_cov,
+                 double[::1] initial_state, double[:, ::1] initial_state_cov,
+                 double[:, :, :, ::1] d_design,
+                 double[:, :, ::1] d_obs_intercept,
+                 double[:, :, ::1] d_obs_cov,
+                 double[:, :, :, ::1] d_transition,
+                 double[:, :, ::1] d_state_intercept,
+                 double[:, :, :, ::1] d_selected_state_cov,
+                 double[:, ::1] d_initial_state,
+                 double[:, :, ::1] d_initial_state_cov,
+                 double tolerance=1e-10):
+    """
+    kalman_score(endog, design, obs_intercept, obs_cov, transition,
+                 state_intercept, selected_state_cov, initial_state,
+                 initial_state_cov, d_design, d_obs_intercept, d_obs_cov,
+                 d_transition, d_state_intercept, d_selected_state_cov,
+                 d_initial_state, d_initial_state_cov, tolerance=1e-10)
+
+    Loglikelihood components and their partial derivatives
+
+    Parameters
+    ----------
+    endog : ndarray
+        Observations, shaped (nobs, k_endog). Missing values are NaN.
+    design : ndarray
+        Design matrices, shaped (n_design, k_endog, k_states).
+    obs_intercept : ndarray
+        Observation intercepts, shaped (n_obs_intercept, k_endog).
+    obs_cov : ndarray
+        Diagonals of the observation disturbance covariance matrices, shaped
+        (n_obs_cov, k_endog).
+    transition : ndarray
+        Transition matrices, shaped (n_transition, k_states, k_states).
+    state_intercept : ndarray
+        State intercepts, shaped (n_state_intercept, k_states).
+    selected_state_cov : ndarray
+        The matrices :math:`R Q R'`, shaped
+        (n_selected_state_cov, k_states, k_states).
+    initial_state : ndarray
+        Initial state mean, shaped (k_states,).
+    initial_state_cov : ndarray
+        Initial state covariance matrix, shaped (k_states, k_states).
+    d_design, d_obs_intercept, d_obs_cov, d_transition, d_state_intercept, \
+    d_selected_state_cov, d_initial_state, d_initial_state_cov : ndarray
+        Partial derivatives of the corresponding arrays with respect to each
+        of the k_params parameters, with the parameters as the leading axis.
+    tolerance : float, optional
+        Forecast error variances at or below this value are treated as
+        singular and the observation is skipped, as in the univariate
+        Kalman filter.
+
+    Returns
+    -------
+    nobs_k : ndarray
+        Number of observations with a non-singular forecast error variance
+        at each time period, shaped (nobs,).
+    logF : ndarray
+        Sum of the log forecast error variances at each time period, shaped
+        (nobs,).
+    q : ndarray
+        Sum of the squared forecast errors divided by their variances at each
+        time period, shaped (nobs,).
+    d_logF : ndarray
+        Partial derivatives of `logF`, shaped (nobs, k_params).
+    d_q : ndarray
+        Partial derivatives of `q`, shaped (nobs, k_params).
+    """
+    cdef:
+        int nobs = endog.shape[0]
+        int k_endog = endog.shape[1]
+        int k_states = design.shape[2]
+        int k_params = d_design.shape[0]
+        int t, i, j, k, l, n, nnz, ix, prev_T
+        double y, v, F, s, dv, dF, v_F
+        np.ndarray[np.int_t, ndim=1] nobs_k
+        np.ndarray[np.float64_t, ndim=1] logF, q
+        np.ndarray[np.float64_t, ndim=2] d_logF, d_q
+        double[::1] a, a_tmp, M, dM, nz_val
+        double[:, ::1] P, P_tmp, TP, da, dT_val
+        double[:, :, ::1] dP
+        int[::1] nz_row, nz_col, dT_nnz
+        int[:, ::1] dT_row, dT_col
+        np.uint8_t[:, ::1] nonzero
+
+    nobs_k = np.zeros(nobs, dtype=np.int_)
+    logF = np.zeros(nobs)
+    q = np.zeros(nobs)
+    d_logF = np.zeros((nobs, k_params))
+    d_q = np.zeros((nobs, k_params))
+
+    a = np.array(initial_state, dtype=float)
+    P = np.array(initial_state_cov, dtype=float)
+    da = np.array(d_initial_state, dtype=float)
+    dP = np.array(d_initial_state_cov, dtype=float)
+    a_tmp = np.zeros(k_states)
+    M = np.zeros(k_states)
+    dM = np.zeros(k_states)
+    TP = np.zeros((k_states, k_states))
+    P_tmp = np.zeros((k_states, k_states))
+
+    # Which partial derivatives are nonzero, for each parameter, so that the
+    # corresponding terms can be skipped
+    nonzero = np.column_stack([
+        np.any(np.reshape(d_design, (k_params, -1)) != 0, axis=1),
+        np.any(np.reshape(d_obs_intercept, (k_params, -1)) != 0, axis=1),
+        np.any(np.reshape(d_obs_cov, (k_params, -1)) != 0, axis=1),
+        np.any(np.reshape(d_transition, (k_params, -1)) != 0, axis=1),
+        np.any(np.reshape(d_state_intercept, (k_params, -1)) != 0, axis=1),
+        np.any(np.reshape(d_selected_state_cov, (k_params, -1)) != 0,
+               axis=1)]).astype(np.uint8)
+
+    # Nonzero elements of the transition matrix and its partial derivatives
+    # (companion matrices are sparse)
+    nz_row = np.zeros(k_states * k_states, dtype=np.intc)
+    nz_col = np.zeros(k_states * k_states, dtype=np.intc)
+    nz_val = np.zeros(k_states * k_states)
+    dT_row = np.zeros((k_params, k_states * k_states), dtype=np.intc)
+    dT_col = np.zeros((k_params, k_states * k_states), dtype=np.intc)
+    dT_val = np.zeros((k_params, k_states * k_states))
+    dT_nnz = np.zeros(k_params, dtype=np.intc)
+    prev_T = -1
+
+    for t in range(nobs):
+        # Updating step, one element of the observation vector at a time
+        for i in range(k_endog):
+            y = endog[t, i]
+            if isnan(y):
+                continue
+            ix = t if design.shape[0] > 1 else 0
+
+            # M = P Z_i', F = Z_i P Z_i' + H_i, v = y_i - Z_i a - d_i
+            F = obs_cov[t if obs_cov.shape[0] > 1 else 0, i]
+            v = y - obs_intercept[t if obs_intercept.shape[0] > 1 else 0, i]
+            for j in range(k_states):
+                s = 0
+                for l in range(k_states):
+                    s = s + P[j, l] * design[ix, i, l]
+                M[j] = s
+                F = F + design[ix, i, j] * s
+                v = v - design[ix, i, j] * a[j]
+
+            if not F > tolerance:
+                continue
+            v_F = v / F
+            nobs_k[t] = nobs_k[t] + 1
+            logF[t] = logF[t] + log(F)
+            q[t] = q[t] + v * v_F
+
+            for k in range(k_params):
+                # dv = -dZ_i a - Z_i da - dd_i
+                # dM = dP Z_i' + P dZ_i'
+                # dF = dZ_i M + Z_i dM + dH_i
+                dv = 0
+                dF = 0
+                if nonzero[k, 1]:
+                    dv = -d_obs_intercept[
+                        k, t if d_obs_intercept.shape[1] > 1 else 0, i]
+                if nonzero[k, 2]:
+                    dF = d_obs_cov[k, t if d_obs_cov.shape[1] > 1 else 0, i]
+                for j in range(k_states):
+                    s = 0
+                    for l in range(k_states):
+                        s = s + dP[k, j, l] * design[ix, i, l]
+                    dM[j] = s
+                    dv = dv - design[ix, i, j] * da[k, j]
+                if nonzero[k, 0]:
+                    l = t if d_design.shape[1] > 1 else 0
+                    for j in range(k_states):
+                        dv = dv - d_design[k, l, i, j] * a[j]
+                        dF = dF + d_design[k, l, i, j] * M[j]
+                        for n in range(k_states):
+                            dM[j] = dM[j] + P[j, n] * d_design[k, l, i, n]
+                for j in range(k_states):
+                    dF = dF + design[ix, i, j] * dM[j]
+
+                d_logF[t, k] = d_logF[t, k] + dF / F
+                d_q[t, k] = d_q[t, k] + (2 * dv - v_F * dF) * v_F
+
+                # a + M v / F and P - M M' / F
+                s = dv / F - v_F * dF / F
+                for j in range(k_states):
+                    da[k, j] = da[k, j] + dM[j] * v_F + M[j] * s
+                    for l in range(k_states):
+                        dP[k, j, l] = dP[k, j, l] + (
+                            M[j] * M[l] * dF / F -
+                            dM[j] * M[l] - M[j] * dM[l]) / F
+
+            for j in range(k_states):
+                a[j] = a[j] + M[j] * v_F
+                for l in range(k_states):
+                    P[j, l] = P[j, l] - M[j] * M[l] / F
+
+        # Prediction step
+        ix = t if (transition.shape[0] > 1 or
+                   d_transition.shape[1] > 1) else 0
+        if ix != prev_T:
+            nnz = _nonzero(transition[t if transition.shape[0] > 1 else 0],
+                           nz_row, nz_col, nz_val)
+            l = t if d_transition.shape[1] > 1 else 0
+            for k in range(k_params):
+                if nonzero[k, 3]:
+                    dT_nnz[k] = _nonzero(d_transition[k, l], dT_row[k],
+                                         dT_col[k], dT_val[k])
+            prev_T = ix
+
+        # T P
+        for i in range(k_states):
+            for j in range(k_states):
+                TP[i, j] = 0
+        for n in range(nnz):
+            i = nz_row[n]
+            l = nz_col[n]
+            s = nz_val[n]
+            for j in range(k_states):
+                TP[i, j] = TP[i, j] + s * P[l, j]
+
+        for k in range(k_params):
+            # da = dT a + T da + dc
+            for i in range(k_states):
+                a_tmp[i] = 0
+            if nonzero[k, 4]:
+                l = t if d_state_intercept.shape[1] > 1 else 0
+                for i in range(k_states):
+                    a_tmp[i] = d_state_intercept[k, l, i]
+            for n in range(nnz):
+                a_tmp[nz_row[n]] = (a_tmp[nz_row[n]] +
+                                    nz_val[n] * da[k, nz_col[n]])
+            if nonzero[k, 3]:
+                for n in range(dT_nnz[k]):
+                    a_tmp[dT_row[k, n]] = (a_tmp[dT_row[k, n]] +
+                                           dT_val[k, n] * a[dT_col[k, n]])
+            for i in range(k_states):
+                da[k, i] = a_tmp[i]
+
+            # dP = T dP T' + dT P T' + T P dT' + d(R Q R')
+            for i in range(k_states):
+                for j in range(k_states):
+                    P_tmp[i, j] = 0
+            for n in range(nnz):
+                i = nz_row[n]
+                l = nz_col[n]
+                s = nz_val[n]
+                for j in range(k_states):
+                    P_tmp[i, j] = P_tmp[i, j] + s * dP[k, l, j]
+            for i in range(k_states):
+                for j in range(k_states):
+                    dP[k, i, j] = 0
+            if nonzero[k, 5]:
+                l = t if d_selected_state_cov.shape[1] > 1 else 0
+                for i in range(k_states):
+                    for j in range(k_states):
+                        dP[k, i, j] = d_selected_state_cov[k, l, i, j]
+            for n in range(nnz):
+                j = nz_row[n]
+                l = nz_col[n]
+                s = nz_val[n]
+                for i in range(k_states):
+                    dP[k, i, j] = dP[k, i, j] + P_tmp[i, l] * s
+            if nonzero[k, 3]:
+                # dT P T' = dT (T P)'
+                for n in range(dT_nnz[k]):
+                    i = dT_row[k, n]
+                    l = dT_col[k, n]
+                    s = dT_val[k, n]
+                    for j in range(k_states):
+                        dP[k, i, j] = dP[k, i, j] + s * TP[j, l]
+                        dP[k, j, i] = dP[k, j, i] + s * TP[j, l]
+            for i in range(k_states):
+                for j in range(i + 1, k_states):
+                    s = 0.5 * (dP[k, i, j] + dP[k, j, i])
+                    dP[k, i, j] = s
+                    dP[k, j, i] = s
+
+        # a = T a + c
+        l = t if state_intercept.shape[0] > 1 else 0
+        for i in range(k_states):
+            a_tmp[i] = state_intercept[l, i]
+        for n in range(nnz):
+            a_tmp[nz_row[n]] = a_tmp[nz_row[n]] + nz_val[n] * a[nz_col[n]]
+        for i in range(k_states):
+            a[i] = a_tmp[i]
+
+        # P = T P T' + R Q R'
+        l = t if selected_state_cov.shape[0] > 1 else 0
+        for i in range(k_states):
+            for j in range(k_states):
+                P_tmp[i, j] = selected_state_cov[l, i, j]
+        for n in range(nnz):
+            j = nz_row[n]
+            l = nz_col[n]
+            s = nz_val[n]
+            for i in range(k_states):
+                P_tmp[i, j] = P_tmp[i, j] + TP[i, l] * s
+        for i in range(k_states):
+            P[i, i] = P_tmp[i, i]
+            for j in range(i + 1, k_states):
+                s = 0.5 * (P_tmp[i, j] + P_tmp[j, i])
+                P[i, j] = s
+                P[j, i] = s
+
+    return nobs_k, logF, q, d_logF, d_q
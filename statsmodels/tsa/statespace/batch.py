@@ -0,0 +1,660 @@
+"""
+Batched estimation of many state space models with a common specification
+
+The loglikelihood of all models is evaluated by a single call to a Cython
+Kalman filter loop over the batch, and the models are estimated jointly by
+a BFGS optimizer that is vectorized over the models.
+
+License: Simplified-BSD
+"""
+import warnings
+
+import numpy as np
+
+from statsmodels.tools.numdiff import _get_epsilon
+from statsmodels.tools.sm_exceptions import ConvergenceWarning
+from statsmodels.tsa.statespace._batch_filter import (
+    batch_loglikeobs as _batch_loglikeobs)
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+
+def _check_models(models):
+    if len(models) == 0:
+        raise ValueError('At least one model is required.')
+    ssm = models[0].ssm
+    for mod in models:
+        if mod.ssm.k_endog != 1:
+            raise NotImplementedError('Batched filtering is only available'
+                                      ' for univariate models.')
+        if (mod.ssm.nobs != ssm.nobs or mod.ssm.k_states != ssm.k_states or
+                mod.k_params != models[0].k_params):
+            raise ValueError('All models must have the same number of'
+                             ' observations, states and parameters.')
+        if mod.ssm.filter_concentrated:
+            raise NotImplementedError('Batched filtering is not available'
+                                      ' with a concentrated scale.')
+
+
+def _constrain_stationary(unconstrained):
+    """
+    Stacked version of `constrain_stationary_univariate`, one row per model
+    """
+    n_batch, order = unconstrained.shape
+    r = unconstrained / ((1 + unconstrained**2)**0.5)
+    y = np.zeros((n_batch, 0))
+    for k in range(order):
+        y = np.column_stack([y + r[:, k:k + 1] * y[:, ::-1], r[:, k]])
+    return -y
+
+
+def _polymul(a, b):
+    """Products of the lag polynomials in the rows of `a` and `b`"""
+    out = np.zeros((a.shape[0], a.shape[1] + b.shape[1] - 1))
+    for i in range(a.shape[1]):
+        out[:, i:i + b.shape[1]] += a[:, i:i + 1] * b
+    return out
+
+
+def _solve_discrete_lyapunov(a, q, maxiter=64):
+    """
+    Solve the stacked discrete Lyapunov equations x = a x a' + q
+
+    Uses the doubling algorithm, which only requires matrix products and so
+    is vectorized over the stacked equations.
+    """
+    x = q.copy()
+    eps = np.finfo(float).eps
+    for _ in range(maxiter):
+        dx = a @ x @ a.transpose(0, 2, 1)
+        x += dx
+        if np.all(np.abs(dx).max((1, 2)) <= eps * np.abs(x).max((1, 2))):
+            break
+        a = a @ a
+    return x
+
+
+def _batch_initialization(init, transition, state_intercept,
+                          selected_state_cov, initial_state,
+                          initial_state_cov, index=None):
+    """
+    Stacked version of `Initialization.__call__`, filled in place
+    """
+    if init.initialization_type is None:
+        for block_index, block in init.blocks.items():
+            if index is not None:
+                block_index = tuple(np.array(index)[block_index, ])
+            _batch_initialization(block, transition, state_intercept,
+                                  selected_state_cov, initial_state,
+                                  initial_state_cov, index=block_index)
+        return
+
+    if index is None:
+        ix1 = np.s_[:]
+        ix2 = np.s_[:, :]
+    else:
+        ix1 = np.s_[index[0]:index[-1] + 1]
+        ix2 = np.ix_(index, index)
+    ix2 = (slice(None),) + ix2
+
+    if init.initialization_type == 'diffuse':
+        raise NotImplementedError('Batched filtering is not available'
+                                  ' with exact diffuse initialization.')
+    elif init.initialization_type == 'stationary':
+        a = transition[ix2]
+        eigvals = np.linalg.eigvals(a)
+        if not np.max(np.abs(eigvals)) < 1. - 1e-10:
+            raise ValueError('Transition equation is not stationary,'
+                             ' and so stationary initialization cannot'
+                             ' be used.')
+        eye = np.eye(init.k_states)
+        initial_state[:, ix1] = np.linalg.solve(
+            eye - a, state_intercept[:, 0, ix1, None])[..., 0]
+        initial_state_cov[ix2] = _solve_discrete_lyapunov(
+            a, selected_state_cov[ix2])
+    else:
+        initial_state[:, ix1] = init.constant
+        if init.initialization_type == 'known':
+            initial_state_cov[ix2] = init.stationary_cov
+        else:
+            initial_state_cov[ix2] = (
+                np.eye(init.k_states) * init.approximate_diffuse_variance)
+
+
+def _initialization_spec(init):
+    return (init.initialization_type, init.constant.tobytes(),
+            init.stationary_cov.tobytes(), init.approximate_diffuse_variance,
+            [(index, _initialization_spec(block))
+             for index, block in init.blocks.items()])
+
+
+def _sarimax_spec(mod):
+    """
+    The options of a SARIMAX model that determine its system matrices
+
+    Returns None if the matrices of the model cannot be built by
+    `_sarimax_system_matrices`.
+    """
+    if (type(mod) is not SARIMAX or mod.state_regression or
+            mod.ssm.initialization is None):
+        return None
+    return (mod.order, mod.seasonal_order, mod.simple_differencing,
+            mod.hamilton_representation, mod.enforce_stationarity,
+            mod.enforce_invertibility, mod.measurement_error,
+            mod.state_error, mod.concentrate_scale, mod.mle_regression,
+            mod._k_exog, mod._k_trend,
+            mod._trend_data.tobytes() if mod._k_trend > 0 else None,
+            tuple(mod.param_names) if mod._has_fixed_params else None,
+            tuple(mod._fixed_params) if mod._has_fixed_params else None,
+            _initialization_spec(mod.ssm.initialization))
+
+
+def _sarimax_param_slices(mod):
+    sizes = [('trend', mod._k_trend),
+             ('exog', mod._k_exog if mod.mle_regression else 0),
+             ('ar', mod.k_ar_params), ('ma', mod.k_ma_params),
+             ('seasonal_ar', mod.k_seasonal_ar_params),
+             ('seasonal_ma', mod.k_seasonal_ma_params),
+             ('measurement_variance', int(mod.measurement_error)),
+             ('variance', int(mod.state_error and
+                              not mod.concentrate_scale))]
+    slices = {}
+    start = 0
+    for name, k in sizes:
+        slices[name] = slice(start, start + k)
+        start += k
+    return slices
+
+
+def _sarimax_system_matrices(models, params, transformed=True,
+                             includes_fixed=False):
+    """
+    Stacked system matrices of SARIMAX models with the same specification
+
+    Equivalent to `SARIMAX.update` followed by the initialization for each
+    model, but computed for all the models at once.
+    """
+    mod = models[0]
+    ssm = mod.ssm
+    n_batch = len(models)
+    nobs = ssm.nobs
+    k_states = ssm.k_states
+    s = _sarimax_param_slices(mod)
+
+    params = np.array(params, dtype=float, ndmin=2)
+    handle_fixed = not includes_fixed and mod._has_fixed_params
+    if handle_fixed:
+        fixed = np.array([list(m._fixed_params.values()) for m in models])
+        full = np.zeros((n_batch, len(mod.param_names)))
+        full[:, mod._free_params_index] = params
+        full[:, mod._fixed_params_index] = fixed
+        params = full
+    if not transformed:
+        constrained = params.copy()
+        if mod.enforce_stationarity:
+            for name in ['ar', 'seasonal_ar']:
+                constrained[:, s[name]] = _constrain_stationary(
+                    params[:, s[name]])
+        if mod.enforce_invertibility:
+            for name in ['ma', 'seasonal_ma']:
+                constrained[:, s[name]] = -_constrain_stationary(
+                    params[:, s[name]])
+        for name in ['measurement_variance', 'variance']:
+            constrained[:, s[name]] = params[:, s[name]]**2
+        params = constrained
+        if handle_fixed:
+            params[:, mod._fixed_params_index] = fixed
+
+    # Lag polynomials
+    polynomials = {}
+    for name, sign in [('ar', -1), ('ma', 1), ('seasonal_ar', -1),
+                       ('seasonal_ma', 1)]:
+        poly = getattr(mod, '_polynomial_' + name).real
+        poly = np.repeat(poly[None, :], n_batch, 0)
+        poly[:, getattr(mod, '_polynomial_%s_idx' % name)] = (
+            sign * params[:, s[name]])
+        polynomials[name] = poly
+    if mod.k_seasonal_ar > 0:
+        reduced_polynomial_ar = -_polymul(polynomials['ar'],
+                                          polynomials['seasonal_ar'])
+    else:
+        reduced_polynomial_ar = -polynomials['ar']
+    if mod.k_seasonal_ma > 0:
+        reduced_polynomial_ma = _polymul(polynomials['ma'],
+                                         polynomials['seasonal_ma'])
+    else:
+        reduced_polynomial_ma = polynomials['ma']
+
+    def stack(matrix):
+        return np.repeat(matrix[None, ..., 0].real.astype(float), n_batch, 0)
+
+    design = stack(ssm._design)[:, 0]
+    obs_intercept = np.zeros((n_batch, nobs))
+    obs_cov = stack(ssm._obs_cov)[:, 0, 0]
+    transition = stack(ssm._transition)
+    state_intercept = np.zeros((n_batch, nobs, k_states))
+    selection = stack(ssm._selection)
+    state_cov = stack(ssm._state_cov)
+
+    if mod.mle_regression:
+        exog = np.array([m.exog for m in models], dtype=float)
+        obs_intercept += (exog @ params[:, s['exog'], None])[..., 0]
+    if mod._k_trend > 0:
+        data = params[:, s['trend']] @ mod._trend_data.T
+        if not mod.hamilton_representation:
+            state_intercept[:, :, mod._k_states_diff] = data
+        else:
+            data /= np.sum(-reduced_polynomial_ar, 1)[:, None]
+            obs_intercept += data
+    if mod.measurement_error:
+        obs_cov[:] = params[:, s['measurement_variance'].start]
+    if mod.k_ar > 0 or mod.k_seasonal_ar > 0:
+        transition[(slice(None),) + mod.transition_ar_params_idx[1:]] = (
+            reduced_polynomial_ar[:, 1:])
+    if mod.k_ma > 0 or mod.k_seasonal_ma > 0:
+        if not mod.hamilton_representation:
+            selection[(slice(None),) + mod.selection_ma_params_idx[1:]] = (
+                reduced_polynomial_ma[:, 1:])
+        else:
+            design[(slice(None),) + mod.design_ma_params_idx[2:]] = (
+                reduced_polynomial_ma[:, 1:])
+    if mod.state_error and not mod.concentrate_scale:
+        state_cov[:, 0, 0] = params[:, s['variance'].start]
+    selected_state_cov = selection @ state_cov @ selection.transpose(0, 2, 1)
+
+    initial_state = np.zeros((n_batch, k_states))
+    initial_state_cov = np.zeros((n_batch, k_states, k_states))
+    _batch_initialization(ssm.initialization, transition, state_intercept,
+                          selected_state_cov, initial_state,
+                          initial_state_cov)
+
+    return {'design': design, 'obs_intercept': obs_intercept,
+            'obs_cov': obs_cov, 'transition': transition,
+            'state_intercept': state_intercept,
+            'selected_state_cov': selected_state_cov,
+            'initial_state': initial_state,
+            'initial_state_cov': initial_state_cov}
+
+
+def batch_system_matrices(models, params, transformed=True,
+                          includes_fixed=False):
+    """
+    Stack the system matrices of the models along a batch axis
+
+    Parameters
+    ----------
+    models : list of MLEModel
+        Univariate models with the same dimensions and time-invariant
+        system matrices other than the intercepts.
+    params : array_like
+        Parameters, with one row for each model.
+    transformed : bool, optional
+        Whether or not `params` is already transformed. Default is True.
+    includes_fixed : bool, optional
+        Whether or not `params` also includes any fixed parameters.
+        Default is False.
+
+    Returns
+    -------
+    dict
+        The keyword arguments of the batched Kalman filter: `design`,
+        `obs_intercept`, `obs_cov`, `transition`, `state_intercept`,
+        `selected_state_cov`, `initial_state` and `initial_state_cov`.
+
+    Notes
+    -----
+    If all the models are SARIMAX models with the same specification, the
+    matrices of all the models are computed at once from the stacked
+    parameters. Otherwise each model is updated with its parameters in
+    turn.
+    """
+    unique = list({id(mod): mod for mod in models}.values())
+    spec = _sarimax_spec(unique[0])
+    if spec is not None and all(_sarimax_spec(mod) == spec
+                                for mod in unique[1:]):
+        return _sarimax_system_matrices(models, params,
+                                        transformed=transformed,
+                                        includes_fixed=includes_fixed)
+
+    n_batch = len(models)
+    nobs = models[0].ssm.nobs
+    k_states = models[0].ssm.k_states
+    design = np.zeros((n_batch, k_states))
+    obs_intercept = np.zeros((n_batch, nobs))
+    obs_cov = np.zeros(n_batch)
+    transition = np.zeros((n_batch, k_states, k_states))
+    state_intercept = np.zeros((n_batch, nobs, k_states))
+    selected_state_cov = np.zeros((n_batch, k_states, k_states))
+    initial_state = np.zeros((n_batch, k_states))
+    initial_state_cov = np.zeros((n_batch, k_states, k_states))
+
+    for i, (mod, p) in enumerate(zip(models, params)):
+        mod.update(p, transformed=transformed, includes_fixed=includes_fixed)
+        ssm = mod.ssm
+        if (ssm._design.shape[2] > 1 or ssm._obs_cov.shape[2] > 1 or
+                ssm._transition.shape[2] > 1 or
+                ssm._selection.shape[2] > 1 or ssm._state_cov.shape[2] > 1):
+            raise NotImplementedError('Batched filtering is only available'
+                                      ' for time-invariant models.')
+        if ssm.initialization is None:
+            raise RuntimeError('Statespace model not initialized.')
+        design[i] = ssm._design[0, :, 0]
+        obs_intercept[i] = ssm._obs_intercept[0]
+        obs_cov[i] = ssm._obs_cov[0, 0, 0]
+        transition[i] = ssm._transition[:, :, 0]
+        state_intercept[i] = ssm._state_intercept.T
+        selection = ssm._selection[:, :, 0]
+        selected_state_cov[i] = selection.dot(
+            ssm._state_cov[:, :, 0]).dot(selection.T)
+
+        init = ssm.initialization(model=ssm)
+        if np.any(init[1] != 0):
+            raise NotImplementedError('Batched filtering is not available'
+                                      ' with exact diffuse initialization.')
+        initial_state[i] = init[0]
+        initial_state_cov[i] = init[2]
+
+    return {'design': design, 'obs_intercept': obs_intercept,
+            'obs_cov': obs_cov, 'transition': transition,
+            'state_intercept': state_intercept,
+            'selected_state_cov': selected_state_cov,
+            'initial_state': initial_state,
+            'initial_state_cov': initial_state_cov}
+
+
+def batch_loglikeobs(models, params, transformed=True, includes_fixed=False):
+    """
+    Loglikelihood of each observation for a batch of models
+
+    Parameters
+    ----------
+    models : list of MLEModel
+        Univariate models with the same dimensions and time-invariant
+        system matrices other than the intercepts. A model can appear more
+        than once.
+    params : array_like
+        Parameters, with one row for each model.
+    transformed : bool, optional
+        Whether or not `params` is already transformed. Default is True.
+    includes_fixed : bool, optional
+        Whether or not `params` also includes any fixed parameters.
+        Default is False.
+
+    Returns
+    -------
+    ndarray
+        The loglikelihood of each observation, with one row for each model.
+        As in `MLEModel.loglikeobs`, the first `loglikelihood_burn`
+        observations are set to zero.
+
+    Notes
+    -----
+    The system matrices of SARIMAX models with the same specification are
+    computed for all models at once, other models are updated with their
+    parameters one at a time, see `batch_system_matrices`. The filtering of
+    all models is done in a single Cython loop. Only the conventional
+    Kalman filter is available, and the model options that affect
+    filtering (other than `loglikelihood_burn`) are ignored.
+    """
+    _check_models(models)
+    params = np.atleast_2d(params)
+    endog = np.array([mod.ssm.endog[0] for mod in models], dtype=float)
+    system = batch_system_matrices(models, params, transformed=transformed,
+                                   includes_fixed=includes_fixed)
+    llf_obs = _batch_loglikeobs(endog, **system)
+    burn = np.array([mod.ssm.loglikelihood_burn for mod in models])
+    llf_obs[np.arange(llf_obs.shape[1]) < burn[:, None]] = 0
+    return llf_obs
+
+
+def batch_loglike(models, params, transformed=True, includes_fixed=False):
+    """
+    Loglikelihood of a batch of models
+
+    Parameters
+    ----------
+    models : list of MLEModel
+        Univariate models with the same dimensions and time-invariant
+        system matrices other than the intercepts. A model can appear more
+        than once.
+    params : array_like
+        Parameters, with one row for each model.
+    transformed : bool, optional
+        Whether or not `params` is already transformed. Default is True.
+    includes_fixed : bool, optional
+        Whether or not `params` also includes any fixed parameters.
+        Default is False.
+
+    Returns
+    -------
+    ndarray
+        The loglikelihood of each model.
+    """
+    llf_obs = batch_loglikeobs(models, params, transformed=transformed,
+                               includes_fixed=includes_fixed)
+    return llf_obs.sum(1)
+
+
+def _minimize_bfgs_batch(func, x0, maxiter=50, gtol=1e-5, ftol=2.2e-9,
+                         max_halving=30):
+    """
+    Minimize many independent functions with BFGS, vectorized over them
+
+    `func(x, idx)` returns the function values for the rows of `x`, where
+    `idx` gives the function that applies to each row. Gradients are
+    computed with centered finite differences, and all the function
+    evaluations required for the gradients are done in one call.
+
+    Returns the minimizers, the function values, the gradients, the number
+    of iterations and a warning flag for each function (0 converged,
+    1 maximum iterations reached, 2 line search failed).
+    """
+    x = np.array(x0, dtype=float)
+    n, k = x.shape
+    eye = np.eye(k)
+
+    def fun(x, idx):
+        f = func(x, idx)
+        f[~np.isfinite(f)] = np.inf
+        return f
+
+    def grad(x, idx):
+        h = _get_epsilon(x.T, 3, None, k).T / 2.
+        xh = np.repeat(x[:, None, :], 2 * k, 1)
+        for j in range(k):
+            xh[:, 2 * j, j] += h[:, j]
+            xh[:, 2 * j + 1, j] -= h[:, j]
+        f = fun(xh.reshape(-1, k), np.repeat(idx, 2 * k))
+        f = f.reshape(-1, k, 2)
+        return (f[:, :, 0] - f[:, :, 1]) / (2 * h)
+
+    idx = np.arange(n)
+    f = fun(x, idx)
+    g = grad(x, idx)
+    hess_inv = np.tile(eye, (n, 1, 1))
+    iterations = np.zeros(n, dtype=int)
+    warnflag = np.ones(n, dtype=int)
+    warnflag[np.max(np.abs(g), 1) <= gtol] = 0
+
+    for _ in range(maxiter):
+        act = np.flatnonzero(warnflag == 1)
+        if len(act) == 0:
+            break
+
+        d = -np.einsum('nij,nj->ni', hess_inv[act], g[act])
+        slope = np.sum(g[act] * d, 1)
+        # reset the Hessian approximation if it is not a descent direction
+        reset = ~(slope < 0)
+        if reset.any():
+            hess_inv[act[reset]] = eye
+            d[reset] = -g[act[reset]]
+            slope[reset] = -np.sum(g[act[reset]] ** 2, 1)
+
+        # backtracking line search with the Armijo condition
+        step = np.ones(len(act))
+        x_new = x[act].copy()
+        f_new = f[act].copy()
+        accepted = np.zeros(len(act), dtype=bool)
+        for _ in range(max_halving):
+            todo = np.flatnonzero(~accepted)
+            if len(todo) == 0:
+                break
+            xt = x[act[todo]] + step[todo, None] * d[todo]
+            ft = fun(xt, act[todo])
+            ok = ft <= f[act[todo]] + 1e-4 * step[todo] * slope[todo]
+            x_new[todo[ok]] = xt[ok]
+            f_new[todo[ok]] = ft[ok]
+            accepted[todo[ok]] = True
+            step[todo[~ok]] /= 2
+        warnflag[act[~accepted]] = 2
+
+        rows = act[accepted]
+        if len(rows) == 0:
+            continue
+        x_new = x_new[accepted]
+        f_new = f_new[accepted]
+        g_new = grad(x_new, rows)
+
+        # BFGS update of the inverse Hessian approximation
+        s = x_new - x[rows]
+        y = g_new - g[rows]
+        sy = np.sum(s * y, 1)
+        upd = sy > 1e-10
+        if upd.any():
+            rho = 1. / sy[upd]
+            a = eye - rho[:, None, None] * s[upd, :, None] * y[upd, None, :]
+            hess_inv[rows[upd]] = (
+                a @ hess_inv[rows[upd]] @ a.transpose(0, 2, 1) +
+                rho[:, None, None] * s[upd, :, None] * s[upd, None, :])
+
+        f_dec = f[rows] - f_new
+        x[rows] = x_new
+        f[rows] = f_new
+        g[rows] = g_new
+        iterations[rows] += 1
+        converged = ((np.max(np.abs(g_new), 1) <= gtol) |
+                     (f_dec <= ftol * np.maximum(np.abs(f_new), 1)))
+        warnflag[rows[converged]] = 0
+
+    return x, f, g, iterations, warnflag
+
+
+def fit_many(models, start_params=None, transformed=True,
+             includes_fixed=False, cov_type=None, cov_kwds=None, maxiter=50,
+             gtol=1e-5, return_params=False, disp=False):
+    """
+    Fit many state space models with the same specification jointly
+
+    Parameters
+    ----------
+    models : list of MLEModel
+        Univariate models with the same dimensions and time-invariant
+        system matrices other than the intercepts, usually the same model
+        class and options applied to different series.
+    start_params : array_like, optional
+        Starting parameters, with one row for each model. If None, the
+        default is given by the `start_params` of each model.
+    transformed : bool, optional
+        Whether or not `start_params` is already transformed. Default is
+        True.
+    includes_fixed : bool, optional
+        Whether or not `start_params` also includes any fixed parameters.
+        Default is False.
+    cov_type : str, optional
+        The covariance type of the results, see `MLEModel.fit`. The
+        covariance matrix is computed separately for each model, 'none'
+        avoids this cost.
+    cov_kwds : dict or None, optional
+        Keywords for the covariance matrix computation.
+    maxiter : int, optional
+        The maximum number of iterations.
+    gtol : float, optional
+        The optimization of a model stops when the largest absolute
+        element of the gradient of its average loglikelihood is smaller
+        than `gtol`.
+    return_params : bool, optional
+        Whether or not to return only the array of maximizing parameters,
+        with one row for each model. Default is False.
+    disp : bool, optional
+        Whether or not to print the number of converged models.
+
+    Returns
+    -------
+    list of MLEResults or ndarray
+        The smoothed results of each model, or the parameters if
+        `return_params` is True.
+
+    Notes
+    -----
+    The average loglikelihood of each model is maximized with BFGS and a
+    backtracking line search. All operations of the optimizer are
+    vectorized over the models and the loglikelihoods of all models,
+    including all the evaluations required for the finite difference
+    gradients, are computed by one call to the batched Kalman filter.
+    The optimization of each model stops separately.
+
+    The results of each model are obtained by filtering and smoothing the
+    model at its estimated parameters, so that they are the same as the
+    results of `MLEModel.fit` at the same parameters.
+    """
+    _check_models(models)
+
+    if start_params is None:
+        start_params = [mod.start_params for mod in models]
+        transformed = True
+        includes_fixed = True
+    start_params = np.atleast_2d(start_params)
+
+    # Unconstrained starting parameters without the fixed parameters
+    x0 = []
+    for mod, p in zip(models, start_params):
+        p = mod.handle_params(p, transformed=True,
+                              includes_fixed=includes_fixed)
+        if transformed:
+            p = mod.untransform_params(p)
+        if mod._has_fixed_params:
+            p = p[mod._free_params_index]
+        x0.append(p)
+    x0 = np.array(x0)
+
+    nobs = np.array([mod.nobs for mod in models], dtype=float)
+
+    def func(x, idx):
+        llf = batch_loglike([models[i] for i in idx], x, transformed=False)
+        return -llf / nobs[idx]
+
+    x, f, g, iterations, warnflag = _minimize_bfgs_batch(
+        func, x0, maxiter=maxiter, gtol=gtol)
+
+    n_failed = np.count_nonzero(warnflag)
+    if n_failed > 0:
+        warnings.warn('Maximum Likelihood optimization failed to converge'
+                      ' for %d of %d models. Check mle_retvals'
+                      % (n_failed, len(models)), ConvergenceWarning)
+    if disp:
+        print('Converged: %d of %d models' % (len(models) - n_failed,
+                                              len(models)))
+
+    if return_params:
+        return np.array([
+            mod.handle_params(p, transformed=False, includes_fixed=False)
+            for mod, p in zip(models, x)])
+
+    mle_settings = {'optimizer': 'bfgs_batch', 'gtol': gtol,
+                    'maxiter': maxiter}
+    results = []
+    for i, mod in enumerate(models):
+        if (mod.ssm.memory_no_predicted or mod.ssm.memory_no_gain
+                or mod.ssm.memory_no_smoothing):
+            fit_func = mod.filter
+        else:
+            fit_func = mod.smooth
+        res = fit_func(x[i], transformed=False, includes_fixed=False,
+                       cov_type=cov_type, cov_kwds=cov_kwds)
+        res.mle_retvals = {'fopt': f[i], 'gopt': g[i],
+                           'iterations': iterations[i],
+                           'warnflag': warnflag[i],
+                           'converged': warnflag[i] == 0}
+        res.mle_settings = mle_settings
+        results.append(res)
+
+    return results
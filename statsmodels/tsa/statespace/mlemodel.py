@@ -29,9 +29,11 @@ from statsmodels.genmod.families.links import identity
 from statsmodels.base.data import PandasData
 import statsmodels.tsa.base.tsa_model as tsbase
 
+from ._kalman_score import kalman_score
 from .simulation_smoother import SimulationSmoother
 from .kalman_smoother import SmootherResults
-from .kalman_filter import INVERT_UNIVARIATE, SOLVE_LU, MEMORY_CONSERVE
+from .kalman_filter import (INVERT_UNIVARIATE, SOLVE_LU, MEMORY_CONSERVE,
+                            FilterResults)
 from .initialization import Initialization
 from .tools import prepare_exog, concat
 
@@ -81,6 +83,95 @@ def _check_index(desired_index, dta, title='data'):
                              ' model.' % title)
 
 
+def _append_filter_results(results, previous, new):
+    """
+    Fill in filter output by joining that of consecutive datasets
+
+    Parameters
+    ----------
+    results : FilterResults
+        Results object for the combined dataset, with the state space
+        representation and the filter options already set. Its filter
+        output is set in-place.
+    previous : FilterResults
+        Filter output for the first part of the dataset.
+    new : FilterResults
+        Filter output for the remainder of the dataset, with the filter
+        initialized by the final predicted state of `previous`.
+
+    Notes
+    -----
+    Only output that both `previous` and `new` store for every period is
+    joined, other output is taken from `new`. The memory conservation
+    options of `results` must be the union of those of `previous` and
+    `new`.
+    """
+    for name in ['filter_method', 'inversion_method', 'stability_method',
+                 'filter_timing', 'tolerance', 'loglikelihood_burn',
+                 'nobs_diffuse', 'initial_state', 'initial_state_cov',
+                 'initial_diffuse_state_cov']:
+        setattr(results, name, getattr(previous, name))
+    results.conserve_memory = previous.conserve_memory | new.conserve_memory
+    results.converged = new.converged
+    results.period_converged = previous.nobs + new.period_converged
+    results.scale = 1.
+
+    def join(prev, new_, prev_nobs, new_nobs, predicted=False):
+        # Arrays that were not stored (or only stored for the final periods,
+        # due to memory conservation) cannot be joined
+        if prev is None or new_ is None:
+            return None
+        if (prev.shape[-1] != prev_nobs + predicted or
+                new_.shape[-1] != new_nobs + predicted):
+            return new_
+        if predicted:
+            prev = prev[..., :-1]
+        return np.concatenate([prev, new_], axis=-1)
+
+    for name in ['filtered_state', 'filtered_state_cov', 'forecasts',
+                 'forecasts_error', 'forecasts_error_cov', 'llf_obs',
+                 'tmp1', 'tmp2', 'tmp3', 'tmp4', '_kalman_gain',
+                 '_standardized_forecasts_error']:
+        setattr(results, name, join(getattr(previous, name, None),
+                                    getattr(new, name, None),
+                                    previous.nobs, new.nobs))
+    for name in ['predicted_state', 'predicted_state_cov']:
+        setattr(results, name, join(getattr(previous, name),
+                                    getattr(new, name),
+                                    previous.nobs, new.nobs, predicted=True))
+
+    # Where there are no missing observations, these are the same as the
+    # forecasts, etc.
+    for name in ['forecasts', 'forecasts_error', 'forecasts_error_cov']:
+        prev = getattr(previous, 'missing_' + name)
+        new_ = getattr(new, 'missing_' + name)
+        if prev is None and new_ is None:
+            value = None
+        else:
+            value = join(getattr(previous, name) if prev is None else prev,
+                         getattr(new, name) if new_ is None else new_,
+                         previous.nobs, new.nobs)
+        setattr(results, 'missing_' + name, value)
+    for name in ['collapsed_forecasts', 'collapsed_forecasts_error',
+                 'collapsed_forecasts_error_cov']:
+        setattr(results, name, None)
+
+    # The diffuse periods are all in the first part of the dataset
+    results.forecasts_error_diffuse_cov = None
+    results.predicted_diffuse_state_cov = None
+    if previous.nobs_diffuse > 0:
+        results.forecasts_error_diffuse_cov = np.concatenate([
+            previous.forecasts_error_diffuse_cov,
+            np.zeros(previous.forecasts_error_diffuse_cov.shape[:-1] +
+                     (new.nobs,))], axis=-1)
+        results.predicted_diffuse_state_cov = np.concatenate([
+            previous.predicted_diffuse_state_cov,
+            np.zeros(previous.predicted_diffuse_state_cov.shape[:-1] +
+                     (new.nobs,))], axis=-1)
+
+    results.llf = previous.llf + new.llf
+
+
 class MLEModel(tsbase.TimeSeriesModel):
     r"""
     State space model for maximum likelihood estimation
@@ -567,13 +658,17 @@ class MLEModel(tsbase.TimeSeriesModel):
         return_params : bool, optional
             Whether or not to return only the array of maximizing parameters.
             Default is False.
-        optim_score : {'harvey', 'approx'} or None, optional
+        optim_score : {'harvey', 'approx', 'analytic'} or None, optional
             The method by which the score vector is calculated. 'harvey' uses
             the method from Harvey (1989), 'approx' uses either finite
             difference or complex step differentiation depending upon the
-            value of `optim_complex_step`, and None uses the built-in gradient
-            approximation of the optimizer. Default is None. This keyword is
-            only relevant if the optimization method uses the score.
+            value of `optim_complex_step`, 'analytic' uses a Kalman filter
+            pass that propagates the partial derivatives of the state (only
+            available with a diagonal observation covariance matrix and
+            without exact diffuse initialization), and None uses the built-in
+            gradient approximation of the optimizer. Default is None. This
+            keyword is only relevant if the optimization method uses the
+            score.
         optim_complex_step : bool, optional
             Whether or not to use complex step differentiation when
             approximating the score; if False, finite difference approximation
@@ -688,6 +783,76 @@ class MLEModel(tsbase.TimeSeriesModel):
 
             return res
 
+    @classmethod
+    def fit_many(cls, endogs, start_params=None, transformed=True,
+                 includes_fixed=False, cov_type=None, cov_kwds=None,
+                 maxiter=50, return_params=False, disp=False, **kwargs):
+        """
+        Fit the model to many series jointly by maximum likelihood.
+
+        Parameters
+        ----------
+        endogs : iterable of array_like or 2-d array_like
+            The observed time-series. If a 2-d array or DataFrame, each
+            column is one series.
+        start_params : array_like, optional
+            Starting parameters, with one row for each series. If None, the
+            default is given by the `start_params` of each model.
+        transformed : bool, optional
+            Whether or not `start_params` is already transformed. Default is
+            True.
+        includes_fixed : bool, optional
+            Whether or not `start_params` also includes any fixed
+            parameters. Default is False.
+        cov_type : str, optional
+            The covariance type of each results instance, see `fit`. Use
+            'none' to avoid computing a covariance matrix for each series.
+        cov_kwds : dict or None, optional
+            A dictionary of arguments affecting covariance matrix
+            computation.
+        maxiter : int, optional
+            The maximum number of iterations to perform.
+        return_params : bool, optional
+            Whether or not to return only the array of maximizing parameters,
+            with one row for each series. Default is False.
+        disp : bool, optional
+            Set to True to print the number of converged series.
+        **kwargs
+            Keyword arguments used to create the model of each series.
+
+        Returns
+        -------
+        list of MLEResults or ndarray
+
+        Notes
+        -----
+        The models must be univariate, have the same dimensions and
+        time-invariant system matrices other than the intercepts, and must
+        not use exact diffuse initialization or a concentrated scale. The
+        loglikelihoods of all series are evaluated by one batched Kalman
+        filter, and a BFGS optimizer that is vectorized over the series
+        maximizes them jointly, see
+        `statsmodels.tsa.statespace.batch.fit_many`.
+
+        Examples
+        --------
+        >>> res = sm.tsa.SARIMAX.fit_many(endogs, order=(1, 1, 1),
+        ...                               seasonal_order=(0, 1, 1, 12))
+        """
+        from .batch import fit_many
+
+        if isinstance(endogs, pd.DataFrame):
+            endogs = [endogs[col] for col in endogs.columns]
+        elif isinstance(endogs, np.ndarray) and endogs.ndim == 2:
+            endogs = list(endogs.T)
+        models = [cls(endog, **kwargs) for endog in endogs]
+
+        return fit_many(models, start_params=start_params,
+                        transformed=transformed,
+                        includes_fixed=includes_fixed, cov_type=cov_type,
+                        cov_kwds=cov_kwds, maxiter=maxiter,
+                        return_params=return_params, disp=disp)
+
     def fit_constrained(self, constraints, start_params=None, **fit_kwds):
         """
         Fit the model with some parameters subject to equality constraints.
@@ -1270,6 +1435,132 @@ class MLEModel(tsbase.TimeSeriesModel):
 
         return -partials / 2.
 
+    def _score_system_arrays(self, complex_step=False):
+        # System matrices in the layout of `_kalman_score.kalman_score`, with
+        # the time index as the leading axis
+        ssm = self.ssm
+        prefix = 'z' if complex_step else 'd'
+        dtype = complex if complex_step else float
+
+        ssm._initialize_representation(prefix=prefix)
+        ssm._initialize_state(prefix=prefix, complex_step=complex_step)
+        _ss = ssm._statespaces[prefix]
+        if np.any(np.asarray(_ss.initial_diffuse_state_cov) != 0):
+            raise NotImplementedError('Analytic score is not available with'
+                                      ' exact diffuse initialization.')
+
+        obs_cov = np.asarray(ssm._obs_cov, dtype=dtype)
+        obs_cov_diag = np.diagonal(obs_cov, axis1=0, axis2=1).copy()
+        if np.any(obs_cov != np.einsum('ij,tj->ijt', np.eye(ssm.k_endog),
+                                       obs_cov_diag)):
+            raise NotImplementedError('Analytic score is only available with'
+                                      ' a diagonal observation covariance'
+                                      ' matrix.')
+        selection = np.asarray(ssm._selection, dtype=dtype).transpose(2, 0, 1)
+        state_cov = np.asarray(ssm._state_cov, dtype=dtype).transpose(2, 0, 1)
+
+        return {
+            'design': np.asarray(ssm._design, dtype=dtype).transpose(2, 0, 1),
+            'obs_intercept': np.asarray(ssm._obs_intercept, dtype=dtype).T,
+            'obs_cov': obs_cov_diag,
+            'transition': np.asarray(
+                ssm._transition, dtype=dtype).transpose(2, 0, 1),
+            'state_intercept': np.asarray(ssm._state_intercept,
+                                          dtype=dtype).T,
+            'selected_state_cov': np.matmul(
+                np.matmul(selection, state_cov),
+                selection.transpose(0, 2, 1)),
+            'initial_state': np.array(_ss.initial_state, dtype=dtype),
+            'initial_state_cov': np.array(_ss.initial_state_cov, dtype=dtype)}
+
+    def _score_obs_analytic(self, params, includes_fixed=False, **kwargs):
+        """
+        Score per observation, computed by an analytic derivative filter
+
+        Parameters
+        ----------
+        params : array_like
+            Array of transformed parameters at which to evaluate the score.
+        includes_fixed : bool, optional
+            Whether or not `params` also includes any fixed parameters.
+
+        Returns
+        -------
+        score_obs : ndarray
+            Score per observation, evaluated at `params`.
+
+        Notes
+        -----
+        The partial derivatives of the predicted state and its covariance
+        matrix are propagated through the Kalman filter recursions along
+        with the filter itself, in a single pass that treats the elements of
+        the observation vector one at a time (e.g. Koopman and Shephard,
+        1992). Only the partial derivatives of the system matrices are
+        computed numerically, by complex-step differentiation of `update`,
+        which requires no additional Kalman filter passes and is accurate
+        to machine precision.
+
+        This is available if the observation disturbance covariance matrix
+        is diagonal and the initialization is not exact diffuse.
+
+        References
+        ----------
+        .. [*] Koopman, Siem Jan, and Neil Shephard. 1992.
+           "Exact Score for Time Series Models in State Space Form."
+           Biometrika 79 (4): 823-26.
+        """
+        params = self.handle_params(params, transformed=True,
+                                    includes_fixed=includes_fixed)
+        n = len(params)
+        ssm = self.ssm
+        if ssm._complex_endog:
+            raise ValueError('Analytic score is not available when data or'
+                             ' parameters are complex.')
+        if ssm.filter_collapsed or ssm.timing_init_filtered:
+            raise NotImplementedError('Analytic score is not available with'
+                                      ' the collapsed filter or with the'
+                                      ' filtered-state timing convention.')
+
+        # Partial derivatives of the system matrices by complex-step
+        # differentiation of `update`
+        epsilon = _get_epsilon(params, 2., None, n)
+        partials = []
+        for i in range(n):
+            ih = np.zeros(n, dtype=complex)
+            ih[i] = 1j * epsilon[i]
+            self.update(params + ih, transformed=True, includes_fixed=True,
+                        complex_step=True)
+            partials.append({
+                key: value.imag / epsilon[i] for key, value in
+                self._score_system_arrays(complex_step=True).items()})
+        self.update(params, transformed=True, includes_fixed=True)
+        arrays = self._score_system_arrays()
+        for key in list(arrays):
+            arrays['d_' + key] = np.array([partial[key] for partial
+                                           in partials]).reshape(
+                (n,) + arrays[key].shape)
+        arrays = {key: np.ascontiguousarray(value)
+                  for key, value in arrays.items()}
+
+        nobs_k, logF, q, d_logF, d_q = kalman_score(
+            np.ascontiguousarray(ssm.endog.T), **arrays)
+
+        d = ssm.loglikelihood_burn
+        if ssm.filter_concentrated:
+            # Scale concentrated out of the loglikelihood, see
+            # `KalmanFilter.loglikeobs`
+            nobs_k_endog = np.sum(nobs_k[d:])
+            scale = np.sum(q[d:]) / nobs_k_endog
+            d_scale = np.sum(d_q[d:], axis=0) / nobs_k_endog
+            score_obs = -0.5 * (
+                d_logF + (d_q + nobs_k[:, None] * d_scale) / scale -
+                q[:, None] * d_scale / scale**2)
+        else:
+            score_obs = -0.5 * (d_logF + d_q)
+        score_obs[:d] = 0
+
+        return score_obs
+
     _score_param_names = ['transformed', 'includes_fixed', 'score_method',
                           'approx_complex_step', 'approx_centered']
     _score_param_defaults = [True, False, 'approx', None, False]
@@ -1294,8 +1585,11 @@ class MLEModel(tsbase.TimeSeriesModel):
 
         Notes
         -----
-        This is a numerical approximation, calculated using first-order complex
-        step differentiation on the `loglike` method.
+        By default, this is a numerical approximation, calculated using
+        first-order complex step differentiation on the `loglike` method. With
+        `score_method='analytic'`, the exact score is computed by a single
+        Kalman filter pass that also propagates the partial derivatives of the
+        state, which is much faster for models with many parameters.
 
         Both args and kwargs are necessary because the optimizer from
         `fit` must call this function and only supports passing arguments via
@@ -1329,6 +1623,9 @@ class MLEModel(tsbase.TimeSeriesModel):
             kwargs['includes_fixed'] = True
             score = self._score_harvey(
                 params, approx_complex_step=approx_complex_step, **kwargs)
+        elif method == 'analytic':
+            score = np.sum(self._score_obs_analytic(
+                params, includes_fixed=True), axis=0)
         elif method == 'approx' and approx_complex_step:
             kwargs['includes_fixed'] = True
             score = self._score_complex_step(params, **kwargs)
@@ -1367,8 +1664,11 @@ class MLEModel(tsbase.TimeSeriesModel):
 
         Notes
         -----
-        This is a numerical approximation, calculated using first-order complex
-        step differentiation on the `loglikeobs` method.
+        By default, this is a numerical approximation, calculated using
+        first-order complex step differentiation on the `loglikeobs` method.
+        With `method='analytic'`, the score is computed by a Kalman filter
+        pass that also propagates the partial derivatives of the state (see
+        `_score_obs_analytic` for the requirements).
         """
         if not transformed and approx_complex_step:
             raise ValueError("Cannot use complex-step approximations to"
@@ -1389,6 +1689,15 @@ class MLEModel(tsbase.TimeSeriesModel):
         if method == 'harvey':
             score = self._score_obs_harvey(
                 params, approx_complex_step=approx_complex_step, **kwargs)
+        elif method == 'analytic':
+            if transformed:
+                score = self._score_obs_analytic(params, includes_fixed=True)
+            else:
+                params, transform_score = self.handle_params(
+                    params, transformed=False, includes_fixed=True,
+                    return_jacobian=True)
+                score = np.dot(self._score_obs_analytic(
+                    params, includes_fixed=True), transform_score.T)
         elif method == 'approx' and approx_complex_step:
             # the default epsilon can be too small
             epsilon = _get_epsilon(params, 2., None, len(params))
@@ -3545,6 +3854,45 @@ class MLEResults(tsbase.TimeSeriesModelResults):
 
         return res
 
+    def _get_append_model(self, endog, exog=None, **kwargs):
+        # Model for the dataset created by appending `endog` and `exog` to
+        # the original dataset
+        start = self.nobs
+        end = self.nobs + len(endog) - 1
+        _, _, _, append_ix = self.model._get_prediction_index(start, end)
+
+        # Check the index of the new data
+        if isinstance(self.model.data, PandasData):
+            _check_index(append_ix, endog, '`endog`')
+
+        # Concatenate the new data to original data
+        new_endog = concat([self.model.data.orig_endog, endog], axis=0,
+                           allow_mix=True)
+
+        # Create a continuous index for the combined data
+        if isinstance(self.model.data, PandasData):
+            start = 0
+            end = len(new_endog) - 1
+            _, _, _, new_index = self.model._get_prediction_index(start, end)
+            # Standardize `endog` to have the right index and columns
+            columns = self.model.endog_names
+            if not isinstance(columns, list):
+                columns = [columns]
+            new_endog = pd.DataFrame(new_endog, index=new_index,
+                                     columns=columns)
+
+        # Handle `exog`
+        if exog is not None:
+            _, exog = prepare_exog(exog)
+            _check_index(append_ix, exog, '`exog`')
+
+            new_exog = concat([self.model.data.orig_exog, exog], axis=0,
+                              allow_mix=True)
+        else:
+            new_exog = None
+
+        return self.model.clone(new_endog, exog=new_exog, **kwargs)
+
     def append(self, endog, exog=None, refit=False, fit_kwargs=None, **kwargs):
         """
         Recreate the results object with new data appended to the original data
@@ -3630,44 +3978,35 @@ class MLEResults(tsbase.TimeSeriesModelResults):
         statsmodels.tsa.statespace.mlemodel.MLEResults.extend
         statsmodels.tsa.statespace.mlemodel.MLEResults.apply
         """
+        mod = self._get_append_model(endog, exog=exog, **kwargs)
+        res = self._apply(mod, refit=refit, fit_kwargs=fit_kwargs, **kwargs)
+
+        return res
+
+    def _get_extension_model(self, endog, exog=None, **kwargs):
+        # Model for a dataset that follows directly after the original
+        # dataset, initialized with the final predicted state
         start = self.nobs
         end = self.nobs + len(endog) - 1
-        _, _, _, append_ix = self.model._get_prediction_index(start, end)
+        _, _, _, extend_ix = self.model._get_prediction_index(start, end)
 
-        # Check the index of the new data
         if isinstance(self.model.data, PandasData):
-            _check_index(append_ix, endog, '`endog`')
-
-        # Concatenate the new data to original data
-        new_endog = concat([self.model.data.orig_endog, endog], axis=0,
-                           allow_mix=True)
+            _check_index(extend_ix, endog, '`endog`')
 
-        # Create a continuous index for the combined data
-        if isinstance(self.model.data, PandasData):
-            start = 0
-            end = len(new_endog) - 1
-            _, _, _, new_index = self.model._get_prediction_index(start, end)
             # Standardize `endog` to have the right index and columns
             columns = self.model.endog_names
             if not isinstance(columns, list):
                 columns = [columns]
-            new_endog = pd.DataFrame(new_endog, index=new_index,
-                                     columns=columns)
-
-        # Handle `exog`
-        if exog is not None:
-            _, exog = prepare_exog(exog)
-            _check_index(append_ix, exog, '`exog`')
-
-            new_exog = concat([self.model.data.orig_exog, exog], axis=0,
-                              allow_mix=True)
-        else:
-            new_exog = None
-
-        mod = self.model.clone(new_endog, exog=new_exog, **kwargs)
-        res = self._apply(mod, refit=refit, fit_kwargs=fit_kwargs, **kwargs)
-
-        return res
+            endog = pd.DataFrame(endog, index=extend_ix, columns=columns)
+        # Extend the current fit result to additional data
+        mod = self.model.clone(endog, exog=exog, **kwargs)
+        # the final predicted state is also stored with memory conservation
+        predicted_state = self.filter_results.predicted_state
+        predicted_state_cov = self.filter_results.predicted_state_cov
+        mod.ssm.initialization = Initialization(
+            mod.k_states, 'known', constant=predicted_state[..., -1],
+            stationary_cov=predicted_state_cov[..., -1])
+        return mod
 
     def extend(self, endog, exog=None, fit_kwargs=None, **kwargs):
         """
@@ -3744,24 +4083,127 @@ class MLEResults(tsbase.TimeSeriesModelResults):
         statsmodels.tsa.statespace.mlemodel.MLEResults.append
         statsmodels.tsa.statespace.mlemodel.MLEResults.apply
         """
-        start = self.nobs
-        end = self.nobs + len(endog) - 1
-        _, _, _, extend_ix = self.model._get_prediction_index(start, end)
+        mod = self._get_extension_model(endog, exog=exog, **kwargs)
+        res = self._apply(mod, refit=False, fit_kwargs=fit_kwargs, **kwargs)
 
-        if isinstance(self.model.data, PandasData):
-            _check_index(extend_ix, endog, '`endog`')
+        return res
 
-            # Standardize `endog` to have the right index and columns
-            columns = self.model.endog_names
-            if not isinstance(columns, list):
-                columns = [columns]
-            endog = pd.DataFrame(endog, index=extend_ix, columns=columns)
-        # Extend the current fit result to additional data
-        mod = self.model.clone(endog, exog=exog, **kwargs)
-        mod.ssm.initialization = Initialization(
-            mod.k_states, 'known', constant=self.predicted_state[..., -1],
-            stationary_cov=self.predicted_state_cov[..., -1])
-        res = self._apply(mod, refit=False, fit_kwargs=fit_kwargs, **kwargs)
+    def update(self, endog, exog=None, fit_kwargs=None, **kwargs):
+        """
+        Update the results object with new observations
+
+        Creates a new results object for the dataset created by appending new
+        data to the end of the model's original data, as in `append`, but
+        the Kalman filter is only applied to the new data, starting from the
+        final predicted state of this results object.
+
+        Parameters
+        ----------
+        endog : array_like
+            New observations from the modeled time-series process.
+        exog : array_like, optional
+            New observations of exogenous regressors, if applicable.
+        fit_kwargs : dict, optional
+            Keyword arguments to pass to `filter`. By default, the memory
+            conservation options of this results object are used.
+        **kwargs
+            Keyword arguments may be used to modify model specification
+            arguments when created the new model object.
+
+        Returns
+        -------
+        results
+            Updated Results object, that includes filter output for both the
+            original dataset and the new dataset.
+
+        Notes
+        -----
+        The filter output of the returned results object is the same as that
+        of `append` (with `refit=False`) followed by filtering, so that e.g.
+        the loglikelihood, the forecasts and in-sample predictions are
+        available, but the Kalman filter recursions are only applied to the
+        new observations. The model of the combined dataset is created as in
+        `append`, and the output that is stored for every period is joined
+        with that of this results object, which copies the output of the
+        original dataset. Only the recursions are incremental: with the
+        default of storing all output, e.g. the filtered and predicted state
+        covariances, the cost of the update grows with the size of the
+        original dataset. If this results object was created with
+        `low_memory=True`, the update also conserves memory and only the
+        forecasts and forecast errors of the original dataset are copied.
+
+        Since smoothing requires a pass over the entire dataset, the
+        returned results object does not include smoother output, even if
+        this results object does.
+
+        This method is not available if the scale is concentrated out of the
+        likelihood or if the original dataset is entirely within the diffuse
+        periods of an exact diffuse initialization.
+
+        See Also
+        --------
+        statsmodels.tsa.statespace.mlemodel.MLEResults.append
+        statsmodels.tsa.statespace.mlemodel.MLEResults.extend
+        """
+        previous = self.filter_results
+        if previous.filter_concentrated:
+            raise NotImplementedError('Cannot update results for which the'
+                                      ' scale was concentrated out of the'
+                                      ' likelihood.')
+        if previous.filter_collapsed:
+            raise NotImplementedError('Cannot update results from the'
+                                      ' collapsed filter.')
+        if previous.nobs_diffuse >= self.nobs:
+            raise NotImplementedError('Cannot update results that are still'
+                                      ' in the diffuse periods of an exact'
+                                      ' diffuse initialization.')
+        if fit_kwargs is None:
+            fit_kwargs = {}
+        fit_kwargs = dict(fit_kwargs)
+        for key in ['cov_type', 'cov_kwds']:
+            if key in fit_kwargs:
+                raise ValueError('Cannot specify `%s` in `fit_kwargs` when'
+                                 ' updating results.' % key)
+        fit_kwargs.setdefault('conserve_memory', previous.conserve_memory)
+
+        # Model for the combined dataset
+        mod = self._get_append_model(endog, exog=exog, **kwargs)
+
+        # Filter the new observations (taken from the combined dataset, so
+        # that they are standardized in the same way)
+        endog = mod.data.orig_endog[self.nobs:]
+        if exog is not None:
+            exog = mod.data.orig_exog[self.nobs:]
+        ext_mod = self._get_extension_model(endog, exog=exog, **kwargs)
+        fit_kwargs['loglikelihood_burn'] = 0
+        new = ext_mod.filter(self.params, includes_fixed=True,
+                             return_ssm=True, **fit_kwargs)
+
+        # Join the filter output
+        mod.update(self.params, transformed=True, includes_fixed=True)
+        mod.data.param_names = mod.param_names
+        mod.ssm._initialize_representation()
+        mod.ssm._initialize_state()
+        conserve_memory = mod.ssm.conserve_memory
+        mod.ssm.set_conserve_memory(previous.conserve_memory |
+                                    new.conserve_memory)
+        results = FilterResults(mod.ssm)
+        mod.ssm.set_conserve_memory(conserve_memory)
+        _append_filter_results(results, previous, new)
+
+        cov_kwds = {
+            'custom_cov_type': self.cov_type,
+            'custom_cov_params': self.cov_params_default,
+            'custom_description': ('Parameters and standard errors were'
+                                   ' estimated using the original dataset'
+                                   ' and were then applied to the updated'
+                                   ' dataset. %s'
+                                   % self.cov_kwds['description'])}
+        with contextlib.ExitStack() as stack:
+            if self._has_fixed_params:
+                stack.enter_context(mod.fix_params(self._fixed_params))
+            res = mod._wrap_results(self.params, results, False,
+                                    cov_type='custom', cov_kwds=cov_kwds)
 
         return res
 
@@ -1874,9 +1874,10 @@ class SARIMAXResults(MLEResults):
         # Handle removing data
         self._data_attr_model.extend(['orig_endog', 'orig_exog'])
 
-    def extend(self, endog, exog=None, **kwargs):
+    def _get_extension_model(self, endog, exog=None, **kwargs):
         kwargs.setdefault('trend_offset', self.nobs + 1)
-        return super(SARIMAXResults, self).extend(endog, exog=exog, **kwargs)
+        return super(SARIMAXResults, self)._get_extension_model(
+            endog, exog=exog, **kwargs)
 
     @cache_readonly
     def arroots(self):
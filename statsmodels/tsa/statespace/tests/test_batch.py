@@ -0,0 +1,182 @@
+"""
+Tests for batched loglikelihood evaluation and estimation
+
+License: Simplified-BSD
+"""
+import contextlib
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_allclose, assert_equal
+
+from statsmodels.tsa.statespace import batch, sarimax, varmax
+from statsmodels.tsa.statespace.structural import UnobservedComponents
+
+
+def get_endogs(n_series=4, nobs=80, seed=1234):
+    rs = np.random.RandomState(seed)
+    endogs = []
+    for i in range(n_series):
+        eps = rs.standard_normal(nobs + 1)
+        y = np.cumsum(eps[1:] + 0.4 * eps[:-1]) + 10
+        endogs.append(y)
+    return np.column_stack(endogs)
+
+
+@pytest.mark.parametrize('spec', [
+    dict(order=(1, 0, 0)),
+    dict(order=(1, 0, 1), trend='c', measurement_error=True),
+    dict(order=(1, 1, 1), seasonal_order=(0, 1, 1, 4)),
+    dict(order=(2, 1, 0), enforce_stationarity=False),
+    dict(order=(1, 0, 0), exog=np.arange(80.)),
+    dict(order=(2, 0, 1), trend='ct', hamilton_representation=True),
+    dict(order=([1, 3], 0, [2]), seasonal_order=(1, 0, 1, 4), trend='t'),
+    dict(order=(1, 1, 1), simple_differencing=True,
+         exog=np.sin(np.arange(160.)).reshape(80, 2))])
+def test_batch_loglike(spec):
+    endogs = get_endogs()
+    endogs[5:8, 1] = np.nan
+    mods = [sarimax.SARIMAX(endog, **spec) for endog in endogs.T]
+    params = np.array([mod.start_params for mod in mods])
+
+    llf = batch.batch_loglike(mods, params)
+    llf_obs = batch.batch_loglikeobs(mods, params)
+    for i, mod in enumerate(mods):
+        assert_allclose(llf[i], mod.loglike(params[i]), rtol=1e-8)
+        assert_allclose(llf_obs[i], mod.loglikeobs(params[i]), rtol=1e-8,
+                        atol=1e-8)
+
+    # untransformed parameters and repeated models
+    uparams = np.array([mod.untransform_params(p)
+                        for mod, p in zip(mods, params)])
+    llf2 = batch.batch_loglike([mods[0], mods[2], mods[0]],
+                               uparams[[0, 2, 0]], transformed=False)
+    assert_allclose(llf2, llf[[0, 2, 0]], rtol=1e-10)
+
+
+class SARIMAXSubclass(sarimax.SARIMAX):
+    pass
+
+
+@pytest.mark.parametrize('transformed', [True, False])
+def test_batch_system_matrices(transformed):
+    # The system matrices of SARIMAX models are computed for all models at
+    # once, those of other models by updating each model in turn
+    endogs = get_endogs()
+    spec = dict(order=(1, 1, 1), seasonal_order=(1, 0, 1, 4), trend='c')
+    mods = [sarimax.SARIMAX(endog, **spec) for endog in endogs.T]
+    mods_loop = [SARIMAXSubclass(endog, **spec) for endog in endogs.T]
+    params = np.array([mod.start_params for mod in mods])
+    if not transformed:
+        params = np.array([mod.untransform_params(p)
+                           for mod, p in zip(mods, params)])
+
+    system = batch.batch_system_matrices(mods, params,
+                                         transformed=transformed)
+    system_loop = batch.batch_system_matrices(mods_loop, params,
+                                              transformed=transformed)
+    assert_equal(sorted(system), sorted(system_loop))
+    for name in system:
+        assert_allclose(system[name], system_loop[name], rtol=1e-10,
+                        atol=1e-12)
+
+    # models with different specifications are updated in turn
+    mod = sarimax.SARIMAX(endogs[:, 0], order=(1, 1, 1),
+                          seasonal_order=(1, 0, 1, 4), trend='t')
+    system = batch.batch_system_matrices(mods[:1] + [mod], params[:2],
+                                         transformed=transformed)
+    assert_allclose(system['state_intercept'][1],
+                    mod.ssm['state_intercept'].T)
+
+
+def test_batch_loglike_uc():
+    endogs = get_endogs()
+    mods = [UnobservedComponents(endog, 'llevel', autoregressive=1)
+            for endog in endogs.T]
+    params = np.array([mod.start_params for mod in mods])
+    llf = batch.batch_loglike(mods, params)
+    assert_allclose(llf, [mod.loglike(p) for mod, p in zip(mods, params)],
+                    rtol=1e-8)
+
+
+def test_fit_many():
+    endogs = get_endogs()
+    spec = dict(order=(1, 1, 1), seasonal_order=(0, 1, 1, 4))
+    res = sarimax.SARIMAX.fit_many(endogs, **spec)
+    assert_equal(len(res), 4)
+
+    for i in range(4):
+        mod = sarimax.SARIMAX(endogs[:, i], **spec)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            res_i = mod.fit(disp=False, method='bfgs', gtol=1e-8,
+                            maxiter=500)
+        assert res[i].mle_retvals['converged']
+        # The batched fit stops once the relative decrease of the average
+        # loglikelihood is below ftol=2.2e-9. The loglikelihood is flat
+        # along the AR and MA parameters (the inverse Hessian of the
+        # average loglikelihood has eigenvalues of up to about 100 here),
+        # so that the parameters are only within about
+        # sqrt(2 * 100 * ftol * |llf / nobs|) ~ 1e-3 of the optimum.
+        assert_allclose(res[i].llf, res_i.llf, rtol=2e-7)
+        assert res[i].llf <= res_i.llf + 1e-8
+        assert_allclose(res[i].params, res_i.params, atol=1e-3)
+        assert_equal(res[i].cov_type, 'opg')
+        assert_allclose(res[i].smoothed_state, res[i].model.smooth(
+            res[i].params).smoothed_state)
+
+    params = sarimax.SARIMAX.fit_many(pd.DataFrame(endogs),
+                                      return_params=True, **spec)
+    assert_allclose(params, [r.params for r in res])
+
+    # starting from the solution
+    res2 = sarimax.SARIMAX.fit_many(endogs, start_params=params,
+                                    cov_type='none', **spec)
+    # The line search only accepts steps that increase the loglikelihood.
+    # The first fit can stop when the relative decrease of the objective
+    # is below ftol=2.2e-9 before the gradient tolerance is met, so that
+    # the loglikelihoods only agree to a small multiple of ftol, and the
+    # parameters to the tolerance of the comparison with the single fits.
+    llf = np.array([r.llf for r in res])
+    llf2 = np.array([r.llf for r in res2])
+    assert np.all(llf2 >= llf - 1e-12 * np.abs(llf))
+    assert_allclose(llf2, llf, rtol=1e-7)
+    assert_allclose([r.params for r in res2], params, atol=1e-3)
+
+
+def test_fit_many_fixed_params():
+    endogs = get_endogs()
+    mods = [sarimax.SARIMAX(endog, order=(1, 0, 1)) for endog in endogs.T]
+    with contextlib.ExitStack() as stack:
+        for mod in mods:
+            stack.enter_context(mod.fix_params({'ar.L1': 0.9}))
+        res = batch.fit_many(mods, cov_type='none')
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            res_0 = mods[0].fit(disp=False, cov_type='none')
+    assert_allclose([r.params[0] for r in res], 0.9)
+    assert_allclose(res[0].llf, res_0.llf, rtol=1e-5)
+
+
+def test_invalid():
+    endogs = get_endogs()
+    mods = [sarimax.SARIMAX(endog, order=(1, 0, 0)) for endog in endogs.T]
+    mod = varmax.VARMAX(endogs[:, :2], order=(1, 0))
+    with pytest.raises(NotImplementedError, match='univariate'):
+        batch.batch_loglike([mod], [mod.start_params])
+
+    mod = sarimax.SARIMAX(endogs[:, 0], order=(1, 0, 0), exog=np.arange(80),
+                          mle_regression=False, time_varying_regression=True)
+    with pytest.raises(NotImplementedError, match='time-invariant'):
+        batch.batch_loglike([mod], [mod.start_params])
+
+    mod = sarimax.SARIMAX(endogs[:, 0], order=(1, 0, 0),
+                          concentrate_scale=True)
+    with pytest.raises(NotImplementedError, match='concentrated'):
+        batch.batch_loglike([mod], [mod.start_params])
+
+    mod = sarimax.SARIMAX(endogs[:40, 0], order=(1, 0, 0))
+    with pytest.raises(ValueError, match='same number'):
+        batch.batch_loglike([mods[0], mod], [[0.5, 1], [0.5, 1]])
@@ -69,6 +69,27 @@ def test_results_append():
     assert_allclose(res2_fit.llf_obs, res_full_fit.llf_obs)
 
 
+def test_results_update():
+    endog = macrodata['infl']
+    endog1 = endog.iloc[:100]
+    endog2 = endog.iloc[100:]
+
+    mod_full = sarimax.SARIMAX(endog)
+    with mod_full.fix_params({'ar.L1': 0.5}):
+        res_full = mod_full.filter([1.], includes_fixed=False)
+
+    mod = sarimax.SARIMAX(endog1)
+    with mod.fix_params({'ar.L1': 0.5}):
+        res1 = mod.smooth([1.], includes_fixed=False)
+
+    res2 = res1.update(endog2)
+
+    assert_allclose(res2.params, res_full.params)
+    assert_equal(res2._fixed_params, res_full._fixed_params)
+    assert_equal(res2.df_model, res_full.df_model)
+    assert_allclose(res2.llf_obs, res_full.llf_obs)
+
+
 def test_results_extend():
     endog = macrodata['infl']
     endog1 = endog.iloc[:100]
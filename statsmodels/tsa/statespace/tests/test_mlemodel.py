@@ -16,6 +16,7 @@ import pytest
 from statsmodels.tsa.statespace import (sarimax, varmax, kalman_filter,
                                         kalman_smoother)
 from statsmodels.tsa.statespace.mlemodel import MLEModel, MLEResultsWrapper
+from statsmodels.tsa.statespace.structural import UnobservedComponents
 from statsmodels.datasets import nile
 from numpy.testing import (
     assert_almost_equal, assert_equal, assert_allclose, assert_raises)
@@ -272,6 +273,58 @@ def test_score_misc():
     mod.score(res.params)
 
 
+@pytest.mark.parametrize('spec', [
+    dict(order=(2, 1, 1), seasonal_order=(1, 0, 1, 4)),
+    dict(order=(1, 0, 1), trend='ct', measurement_error=True, exog=True),
+    dict(order=(1, 0, 0), exog=True, mle_regression=False,
+         time_varying_regression=True),
+    dict(order=(1, 0, 1), concentrate_scale=True),
+    dict(level='lltrend', autoregressive=1, seasonal=4),
+    dict(order=(1, 0), trend='c', measurement_error=True),
+    dict(order=(2, 0), error_cov_type='diagonal')])
+def test_score_analytic(spec):
+    # Test the analytic score against the complex-step approximation
+    rs = np.random.RandomState(1234)
+    endog = np.cumsum(rs.standard_normal((120, 2)), axis=0)
+    endog[10:13, 0] = np.nan
+    exog = rs.standard_normal(120)
+    if spec.pop('exog', False):
+        spec['exog'] = exog
+    if 'level' in spec:
+        mod = UnobservedComponents(endog[:, 0], **spec)
+    elif 'seasonal_order' in spec or 'exog' in spec or len(spec['order']) == 3:
+        mod = sarimax.SARIMAX(endog[:, 0], **spec)
+    else:
+        mod = varmax.VARMAX(np.diff(endog, axis=0)[20:], **spec)
+    params = np.array(mod.start_params) * 0.9
+
+    assert_allclose(mod.score(params, method='analytic'),
+                    mod.score(params), rtol=1e-6, atol=1e-6)
+    assert_allclose(mod.score_obs(params, method='analytic'),
+                    mod.score_obs(params), rtol=1e-6, atol=1e-6)
+
+    uparams = mod.untransform_params(params)
+    assert_allclose(mod.score(uparams, transformed=False, method='analytic'),
+                    mod.score(uparams, transformed=False),
+                    rtol=1e-6, atol=1e-6)
+
+
+def test_fit_score_analytic():
+    endog = nile.load_pandas().data['volume']
+    mod = sarimax.SARIMAX(endog, order=(1, 1, 1))
+    res = mod.fit(disp=False)
+    res_analytic = mod.fit(method='bfgs', optim_score='analytic', disp=False)
+    assert_allclose(res_analytic.llf, res.llf, rtol=1e-7)
+    assert_allclose(res_analytic.params, res.params, rtol=1e-3)
+
+
+def test_score_analytic_invalid():
+    endog = np.arange(20.)
+    mod = sarimax.SARIMAX(endog, order=(1, 1, 0), use_exact_diffuse=True)
+    assert_raises(NotImplementedError, mod.score, [0.5, 1.],
+                  method='analytic')
+
+
 def test_from_formula():
     assert_raises(NotImplementedError, lambda: MLEModel.from_formula(1, 2, 3))
 
@@ -317,6 +370,8 @@ def test_score_analytic_ar1():
                                    approx_complex_step=False,
                                    approx_centered=True)
     assert_allclose(harvey_fd_centered, analytic_score, atol=1e-5)
+    analytic = mod.score(params, transformed=True, method='analytic')
+    assert_allclose(analytic, analytic_score)
 
     # Check the approximations for untransformed parameters. The analytic
     # check now comes from chain rule with the analytic derivative of the
@@ -362,6 +417,8 @@ def test_score_analytic_ar1():
                                    approx_complex_step=False,
                                    approx_centered=True)
     assert_allclose(harvey_fd_centered, analytic_score, atol=1e-5)
+    analytic = mod.score(uparams, transformed=False, method='analytic')
+    assert_allclose(analytic, analytic_score)
 
     # Check the Hessian: these approximations are not very good, particularly
     # when phi is close to 0
@@ -1041,6 +1098,12 @@ def test_append_extend_apply_invalid():
     assert_raises(ValueError, res1.extend, endog2, fit_kwargs={'cov_kwds': {}})
     assert_raises(ValueError, res1.apply, endog2, fit_kwargs={'cov_kwds': {}})
 
+    # Updating requires the filter output to be independent of the scale
+    assert_raises(NotImplementedError, res1.update, endog2)
+    res2 = sarimax.SARIMAX(endog1, order=(1, 0, 0)).smooth([0.5, 1.])
+    assert_raises(ValueError, res2.update, endog2,
+                  fit_kwargs={'cov_type': 'approx'})
+
     # Test for exception when given a different frequency
     wrong_freq = niledata.iloc[20:40]
     wrong_freq.index = pd.date_range(
@@ -2582,6 +2582,84 @@ def test_extend_results():
         res2.extend(endog[50:])
 
 
+def test_update_results():
+    endog = np.arange(100) * 1.
+    endog[60:63] = np.nan
+    exog = np.ones_like(endog)
+    params = [1., 1., 0.1, 1.]
+
+    mod1 = sarimax.SARIMAX(endog, exog=exog, order=(1, 0, 0), trend='t')
+    res1 = mod1.filter(params)
+
+    mod2 = sarimax.SARIMAX(endog[:50], exog=exog[:50], order=(1, 0, 0),
+                           trend='t')
+    res2 = mod2.smooth(params)
+    fit_kwargs = {}
+    res3 = res2.update(endog[50:80], exog=exog[50:80], fit_kwargs=fit_kwargs)
+    res3 = res3.update(endog[80:], exog=exog[80:])
+    assert_equal(fit_kwargs, {})
+
+    assert_equal(res1.specification, res3.specification)
+    assert_allclose(res3.cov_params_default, res2.cov_params_default)
+    assert_equal(res3.smoother_results, None)
+    for attr in ['nobs', 'loglikelihood_burn']:
+        assert_equal(getattr(res3, attr), getattr(res1, attr))
+    assert_allclose(res3.llf, res1.llf)
+    assert_allclose(res3.llf_obs, res1.llf_obs)
+
+    for attr in [
+            'filtered_state', 'filtered_state_cov', 'predicted_state',
+            'predicted_state_cov', 'forecasts', 'forecasts_error',
+            'forecasts_error_cov', 'standardized_forecasts_error']:
+        assert_allclose(getattr(res3, attr), getattr(res1, attr))
+    assert_allclose(res3.filter_results.kalman_gain,
+                    res1.filter_results.kalman_gain)
+
+    assert_allclose(res3.forecast(10, exog=np.ones(10)),
+                    res1.forecast(10, exog=np.ones(10)))
+    desired = res1.get_prediction(start=40, end=105, exog=np.ones(6))
+    actual = res3.get_prediction(start=40, end=105, exog=np.ones(6))
+    assert_allclose(actual.predicted_mean, desired.predicted_mean)
+    assert_allclose(actual.var_pred_mean, desired.var_pred_mean)
+
+    # Check that we get an error if we try to update without exog
+    with pytest.raises(ValueError, match='Cloning a model with an exogenous'):
+        res2.update(endog[50:])
+
+
+def test_update_results_low_memory():
+    endog = np.arange(100) * 1.
+    exog = np.ones_like(endog)
+    params = [1., 1., 0.1, 1.]
+
+    mod1 = sarimax.SARIMAX(endog, exog=exog, order=(1, 0, 0), trend='t')
+    res1 = mod1.filter(params)
+
+    mod2 = sarimax.SARIMAX(endog[:50], exog=exog[:50], order=(1, 0, 0),
+                           trend='t')
+    res2 = mod2.filter(params, low_memory=True)
+    res3 = res2.update(endog[50:], exog=exog[50:])
+
+    # the memory conservation options are kept, so that the covariances of
+    # the original dataset are not copied
+    assert_equal(res3.filter_results.conserve_memory,
+                 res2.filter_results.conserve_memory)
+    assert_equal(res3.filtered_state_cov, None)
+    assert_equal(res3.filter_results.filtered_state_cov.shape[-1], 2)
+    assert_allclose(res3.llf, res1.llf)
+    assert_allclose(res3.forecasts, res1.forecasts)
+    assert_allclose(res3.forecast(10, exog=np.ones(10)),
+                    res1.forecast(10, exog=np.ones(10)))
+
+    # storing all output of the new observations
+    res4 = res2.update(endog[50:], exog=exog[50:],
+                       fit_kwargs={'conserve_memory': 0})
+    assert_equal(res4.filter_results.conserve_memory,
+                 res2.filter_results.conserve_memory)
+    assert_allclose(res4.forecast(10, exog=np.ones(10)),
+                    res1.forecast(10, exog=np.ones(10)))
+
+
 def test_apply_results():
     endog = np.arange(100)
     exog = np.ones_like(endog)
@@ -677,6 +677,41 @@ def test_extend_results():
                     res1.forecast(10, exog=np.ones(10)))
 
 
+@pytest.mark.parametrize('use_exact_diffuse', [False, True])
+def test_update_results(use_exact_diffuse):
+    endog = np.arange(100) * 1.
+    exog = np.ones_like(endog)
+    params = [1., 1., 0.1, 1.]
+
+    mod1 = UnobservedComponents(endog, 'lltrend', exog=exog,
+                                use_exact_diffuse=use_exact_diffuse)
+    res1 = mod1.filter(params)
+
+    mod2 = UnobservedComponents(endog[:50], 'lltrend', exog=exog[:50],
+                                use_exact_diffuse=use_exact_diffuse)
+    res2 = mod2.smooth(params)
+    res3 = res2.update(endog[50:], exog=exog[50:])
+
+    for attr in ['nobs', 'nobs_diffuse', 'loglikelihood_burn']:
+        assert_equal(getattr(res3, attr), getattr(res1, attr))
+    assert_allclose(res3.llf, res1.llf)
+    assert_allclose(res3.llf_obs, res1.llf_obs)
+
+    for attr in [
+            'filtered_state', 'filtered_state_cov', 'predicted_state',
+            'predicted_state_cov', 'forecasts', 'forecasts_error',
+            'forecasts_error_cov', 'forecasts_error_diffuse_cov',
+            'predicted_diffuse_state_cov']:
+        desired = getattr(res1, attr)
+        if desired is None:
+            assert_equal(getattr(res3, attr), None)
+        else:
+            assert_allclose(getattr(res3, attr), desired, atol=1e-10)
+
+    assert_allclose(res3.forecast(10, exog=np.ones(10)),
+                    res1.forecast(10, exog=np.ones(10)))
+
+
 def test_apply_results():
     endog = np.arange(100)
     exog = np.ones_like(endog)
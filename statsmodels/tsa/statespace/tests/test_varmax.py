@@ -1051,6 +1051,37 @@ def test_append_results():
                     res1.forecast(10, exog=np.ones(10)))
 
 
+def test_update_results():
+    endog = np.arange(200.).reshape(100, 2)
+    endog[60, 0] = np.nan
+    endog[61] = np.nan
+    exog = np.ones(100)
+    params = [0.1, 0.2,
+              0.5, -0.1, 0.0, 0.2,
+              1., 2.,
+              1., 0., 1.]
+
+    mod1 = varmax.VARMAX(endog, order=(1, 0), trend='t', exog=exog)
+    res1 = mod1.filter(params)
+
+    mod2 = varmax.VARMAX(endog[:50], order=(1, 0), trend='t', exog=exog[:50])
+    res2 = mod2.filter(params)
+    res3 = res2.update(endog[50:], exog=exog[50:])
+
+    assert_allclose(res3.llf, res1.llf)
+    assert_allclose(res3.llf_obs, res1.llf_obs)
+    for attr in [
+            'filtered_state', 'filtered_state_cov', 'predicted_state',
+            'predicted_state_cov', 'forecasts', 'forecasts_error',
+            'forecasts_error_cov']:
+        assert_allclose(getattr(res3, attr), getattr(res1, attr))
+    assert_allclose(res3.filter_results.kalman_gain,
+                    res1.filter_results.kalman_gain)
+
+    assert_allclose(res3.forecast(10, exog=np.ones(10)),
+                    res1.forecast(10, exog=np.ones(10)))
+
+
 def test_extend_results():
     endog = np.arange(200).reshape(100, 2)
     exog = np.ones(100)
@@ -893,7 +893,7 @@ class VARMAXResults(MLEResults):
                 ma_params.reshape(k_endog * k_ma, k_endog).T
             ).reshape(k_endog, k_endog, k_ma).T
 
-    def extend(self, endog, exog=None, **kwargs):
+    def _get_extension_model(self, endog, exog=None, **kwargs):
         # If we have exog, then the last element of predicted_state and
         # predicted_state_cov are nan (since they depend on the exog associated
         # with the first out-of-sample point), so we need to compute them here
@@ -912,6 +912,10 @@ class VARMAXResults(MLEResults):
         mod.ssm.initialization = Initialization(
             mod.k_states, 'known', constant=initial_state,
             stationary_cov=initial_state_cov)
+        return mod
+
+    def extend(self, endog, exog=None, **kwargs):
+        mod = self._get_extension_model(endog, exog=exog, **kwargs)
 
         if self.smoother_results is not None:
             res = mod.smooth(self.params)